@@ -0,0 +1,995 @@
+import io
+import os
+import json
+import math
+import mmap
+import stat
+import time
+import shutil
+import hashlib
+import tarfile
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import zstandard
+
+from build_env import append_file, copy_file, transfer_files, user_cache_dir
+from data_tools import HashCache
+from project_store import project_dir, read_json, write_json, state_dir
+
+MANIFEST_DIR = "manifests"
+MANIFEST_CACHE_FILE = "manifest-cache.json"
+# Files up to this size are read in one call, larger ones are hashed from a memory map
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+
+def default_manifest_cache():
+    """Digest cache keyed by device and inode, so renamed or moved outputs aren't rehashed"""
+    return HashCache(os.path.join(user_cache_dir(), MANIFEST_CACHE_FILE))
+
+
+def inode_key(st):
+    return f"{st.st_dev}:{st.st_ino}"
+
+
+def sha256_file(path, size=None):
+    """SHA-256 of a file, memory mapping large files so hashlib can hash them without the GIL"""
+    size = os.path.getsize(path) if size is None else size
+    with open(path, "rb") as f:
+        if size < MMAP_THRESHOLD:
+            return hashlib.sha256(f.read()).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return hashlib.sha256(data).hexdigest()
+
+
+def artifact_path(output_dir, main_file, onefile=False):
+    """The build's shipped artifact: the onefile executable or the .dist folder, or None"""
+    stem = os.path.splitext(os.path.basename(main_file))[0]
+    if onefile:
+        for name in (stem + ".exe", stem + ".bin", stem):
+            path = os.path.join(output_dir, name)
+            if os.path.isfile(path):
+                return path
+        return None
+    path = os.path.join(output_dir, stem + ".dist")
+    return path if os.path.isdir(path) else None
+
+
+def scan_artifact(artifact):
+    """Regular files as (relative posix path, absolute path, stat) and symlinks as (relative path, target)
+
+    Symlinks are not followed, they are recorded with their target and recreated as links.
+    """
+    if os.path.isfile(artifact):
+        return [(os.path.basename(artifact), artifact, os.stat(artifact))], []
+    files, links = [], []
+    pending = [artifact]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                rel = os.path.relpath(entry.path, artifact).replace(os.sep, "/")
+                if entry.is_symlink():
+                    links.append((rel, os.readlink(entry.path).replace(os.sep, "/")))
+                elif entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append((rel, entry.path, entry.stat()))
+                else:
+                    raise ValueError(f"{entry.path} is neither a file, a folder nor a symlink")
+    return sorted(files), sorted(links)
+
+
+def artifact_files(artifact):
+    """(relative posix path, absolute path, stat) of every regular file of an artifact"""
+    return scan_artifact(artifact)[0]
+
+
+def artifact_links(artifact):
+    """(relative posix path, target) of every symlink of an artifact"""
+    return scan_artifact(artifact)[1]
+
+
+def make_link(target, path):
+    """Create or replace the symlink path pointing at a posix style target"""
+    link = target.replace("/", os.sep)
+    temp = path + ".link-tmp"
+    if os.path.lexists(temp):
+        os.remove(temp)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    directory = os.path.isdir(os.path.join(os.path.dirname(path), link))
+    os.symlink(link, temp, target_is_directory=directory)
+    os.replace(temp, path)
+
+
+def build_manifest(artifact, cache=None, workers=None, log=print, should_stop=lambda: False):
+    """Path, size and SHA-256 of every file of an artifact, hashed in parallel
+
+    Digests are reused from cache while a file's inode, size and mtime are unchanged.
+    """
+    started = time.perf_counter()
+    files, links = scan_artifact(artifact)
+    digests, pending = {}, []
+    for rel, path, st in files:
+        digest = cache.get(inode_key(st), st) if cache else None
+        if digest:
+            digests[rel] = digest
+        else:
+            pending.append((rel, path, st))
+
+    def hash_file(item):
+        rel, path, st = item
+        if should_stop():
+            return rel, None
+        return rel, sha256_file(path, st.st_size)
+
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+        for (rel, digest), (_, _, st) in zip(pool.map(hash_file, pending), pending):
+            if digest:
+                digests[rel] = digest
+                if cache:
+                    cache.put(inode_key(st), st, digest)
+    if cache:
+        cache.save()
+
+    total = sum(st.st_size for _, _, st in files)
+    elapsed = time.perf_counter() - started
+    log(f"🧾 Manifest: {len(files)} files" + (f", {len(links)} symlinks" if links else "")
+        + f", {total / 1024 / 1024:.1f} MB in {elapsed:.1f}s "
+        f"({len(pending)} hashed, {len(files) - len(pending)} cached)")
+    return {
+        "artifact": os.path.basename(artifact),
+        "created": time.time(),
+        "total_bytes": total,
+        "files": {rel: [st.st_size, digests.get(rel)] for rel, _, st in files},
+        "links": dict(links),
+    }
+
+
+def save_manifest(main_file, manifest, name):
+    """Store a manifest in the project state directory, returns its path"""
+    folder = os.path.join(state_dir(main_file), MANIFEST_DIR)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{name}.json")
+    write_json(path, manifest)
+    return path
+
+
+def load_manifest(path):
+    return read_json(path, None)
+
+
+def manifest_entries(manifest):
+    """Files and symlinks of a manifest, a symlink as [None, "-> target"] so a retargeted link differs"""
+    entries = dict(manifest["files"])
+    entries.update((rel, [None, "-> " + target]) for rel, target in manifest.get("links", {}).items())
+    return entries
+
+
+def write_checksum_file(manifest, path):
+    """Write the manifest in sha256sum format, verifiable with sha256sum -c"""
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for rel, (_, digest) in sorted(manifest["files"].items()):
+            f.write(f"{digest}  {rel}\n")
+
+
+def verify_manifest(artifact, manifest, workers=None, log=print, should_stop=lambda: False):
+    """Rehash an artifact without the cache and compare it to its manifest"""
+    current = build_manifest(artifact, None, workers, log=lambda message: None, should_stop=should_stop)
+    expected, actual = manifest_entries(manifest), manifest_entries(current)
+    result = {
+        "missing": sorted(set(expected) - set(actual)),
+        "extra": sorted(set(actual) - set(expected)),
+        "changed": sorted(rel for rel in set(expected) & set(actual) if expected[rel] != actual[rel]),
+    }
+    result["ok"] = not any(result.values())
+    log(f"{'✅' if result['ok'] else '❌'} Integrity check: {len(result['missing'])} missing, "
+        f"{len(result['changed'])} changed, {len(result['extra'])} unexpected files")
+    return result
+
+
+def compare_manifests(old, new):
+    """Files and symlinks added, removed and changed between two manifests with their sizes"""
+    old_files, new_files = manifest_entries(old), manifest_entries(new)
+    changes = []
+    for rel in sorted(set(old_files) | set(new_files)):
+        before, after = old_files.get(rel), new_files.get(rel)
+        if before == after:
+            continue
+        kind = "added" if before is None else "removed" if after is None else "changed"
+        changes.append({"change": kind, "path": rel,
+                        "old_size": before[0] if before else None, "new_size": after[0] if after else None})
+    return {
+        "changes": changes,
+        "unchanged": sum(1 for rel in old_files if old_files[rel] == new_files.get(rel)),
+        "delta_bytes": new["total_bytes"] - old["total_bytes"],
+    }
+
+
+ARCHIVE_FORMATS = {"tar.zst": ".tar.zst", "zip": ".zip"}
+ARCHIVE_BLOCKS_DIR = "archive-blocks"
+COPY_CHUNK = 1024 * 1024
+TAR_END = b"\0" * (2 * tarfile.BLOCKSIZE)
+
+
+class ProgressReader:
+    """File wrapper reporting the number of bytes read"""
+
+    def __init__(self, f, on_read):
+        self.f = f
+        self.on_read = on_read
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.on_read(len(data))
+        return data
+
+
+def archive_path(artifact, dest_dir, fmt):
+    """Archive file name for an artifact: app.dist -> app.tar.zst"""
+    stem = os.path.splitext(os.path.basename(artifact))[0]
+    return os.path.join(dest_dir, stem + ARCHIVE_FORMATS[fmt])
+
+
+def archive_root(artifact):
+    """Top level folder inside the archive, empty for a single file artifact"""
+    return os.path.basename(artifact) if os.path.isdir(artifact) else ""
+
+
+def tar_info(name, st, directory=False):
+    info = tarfile.TarInfo(name)
+    info.mode = stat.S_IMODE(st.st_mode)
+    info.mtime = int(st.st_mtime)
+    if directory:
+        info.type = tarfile.DIRTYPE
+    else:
+        info.size = st.st_size
+    return info
+
+
+def link_info(artifact, rel, target):
+    info = tarfile.TarInfo(member_name(artifact, rel))
+    info.type = tarfile.SYMTYPE
+    info.linkname = target
+    info.mode = 0o777
+    info.mtime = int(os.lstat(artifact_file(artifact, rel)).st_mtime)
+    return info
+
+
+def directory_entries(artifact, files, links=()):
+    """(archive name, stat) of the folders containing files and symlinks, parents first"""
+    root = archive_root(artifact)
+    if not root:
+        return []
+    folders = {""}
+    for rel in [rel for rel, _, _ in files] + [rel for rel, _ in links]:
+        parts = rel.split("/")[:-1]
+        folders.update("/".join(parts[:i]) for i in range(1, len(parts) + 1))
+    return [(f"{root}/{rel}" if rel else root, os.stat(os.path.join(artifact, rel)))
+            for rel in sorted(folders)]
+
+
+def member_name(artifact, rel):
+    root = archive_root(artifact)
+    return f"{root}/{rel}" if root else rel
+
+
+class ExportProgress:
+    """Thread safe byte counter reporting percent done"""
+
+    def __init__(self, total, progress):
+        self.total = max(1, total)
+        self.done = 0
+        self.progress = progress
+        self.last = -1
+        self.lock = threading.Lock()
+
+    def __call__(self, count):
+        with self.lock:
+            self.done += count
+            percent = min(100, self.done * 100 // self.total)
+            if percent == self.last:
+                return
+            self.last = percent
+        self.progress(percent)
+
+
+def export_tar_zst(artifact, dest, level=3, threads=-1, progress=lambda value: None, should_stop=lambda: False):
+    """Stream an artifact into a .tar.zst archive with multithreaded zstd, one file chunk at a time"""
+    files, links = scan_artifact(artifact)
+    counter = ExportProgress(sum(st.st_size for _, _, st in files), progress)
+    temp = dest + ".tmp"
+    compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+    with open(temp, "wb") as raw:
+        with compressor.stream_writer(raw, closefd=False) as writer:
+            with tarfile.open(fileobj=writer, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                for name, st in directory_entries(artifact, files, links):
+                    tar.addfile(tar_info(name, st, directory=True))
+                for rel, target in links:
+                    tar.addfile(link_info(artifact, rel, target))
+                for rel, path, st in files:
+                    if should_stop():
+                        break
+                    with open(path, "rb") as f:
+                        tar.addfile(tar_info(member_name(artifact, rel), st), ProgressReader(f, counter))
+    if should_stop():
+        os.remove(temp)
+        return None
+    os.replace(temp, dest)
+    return {"files": len(files), "reused": 0, "compressed": len(files)}
+
+
+def export_zip(artifact, dest, level=6, progress=lambda value: None, should_stop=lambda: False):
+    """Stream an artifact into a deflate .zip archive"""
+    files, links = scan_artifact(artifact)
+    counter = ExportProgress(sum(st.st_size for _, _, st in files), progress)
+    temp = dest + ".tmp"
+    with zipfile.ZipFile(temp, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=min(9, level),
+                         allowZip64=True) as archive:
+        for rel, target in links:
+            # Symlinks are stored the way Info-ZIP does: unix file type in the attributes, target as data
+            info = zipfile.ZipInfo(member_name(artifact, rel))
+            info.create_system = 3
+            info.external_attr = (stat.S_IFLNK | 0o777) << 16
+            archive.writestr(info, target)
+        for rel, path, st in files:
+            if should_stop():
+                break
+            # ZipFile.write copies the file in chunks
+            archive.write(path, member_name(artifact, rel))
+            counter(st.st_size)
+    if should_stop():
+        os.remove(temp)
+        return None
+    os.replace(temp, dest)
+    return {"files": len(files), "reused": 0, "compressed": len(files)}
+
+
+def block_dir(artifact):
+    """Cache folder of compressed tar blocks for an artifact location"""
+    key = hashlib.sha256(os.path.abspath(artifact).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(user_cache_dir(), ARCHIVE_BLOCKS_DIR, key)
+
+
+def block_key(name, digest, mode, level):
+    return hashlib.sha256(f"{name}\0{digest}\0{mode:o}\0{level}".encode("utf-8")).hexdigest()[:32]
+
+
+def compress_block(path, info, block_path, level, on_read):
+    """Compress one tar member (header, data, padding) into its own zstd frame"""
+    temp = f"{block_path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as raw:
+        with zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=False) as writer:
+            writer.write(info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape"))
+            with open(path, "rb") as f:
+                while True:
+                    chunk = f.read(COPY_CHUNK)
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    on_read(len(chunk))
+            remainder = info.size % tarfile.BLOCKSIZE
+            if remainder:
+                writer.write(b"\0" * (tarfile.BLOCKSIZE - remainder))
+    os.replace(temp, block_path)
+
+
+def export_tar_zst_incremental(artifact, dest, manifest, level=3, workers=None, log=print,
+                               progress=lambda value: None, should_stop=lambda: False):
+    """Write a .tar.zst as one zstd frame per file, reusing cached frames of unchanged files
+
+    Concatenated zstd frames decompress to the concatenated tar stream, so frames of files
+    whose manifest digest is unchanged are copied instead of compressed again.
+    """
+    files, links = scan_artifact(artifact)
+    blocks = block_dir(artifact)
+    os.makedirs(blocks, exist_ok=True)
+    members = []
+    for rel, path, st in files:
+        name = member_name(artifact, rel)
+        digest = manifest["files"].get(rel, [None, None])[1] or sha256_file(path, st.st_size)
+        key = block_key(name, digest, stat.S_IMODE(st.st_mode), level)
+        members.append((path, tar_info(name, st), os.path.join(blocks, key + ".zst")))
+
+    pending = [member for member in members if not os.path.isfile(member[2])]
+    counter = ExportProgress(sum(info.size for _, info, _ in pending) or 1, progress)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(compress_block, path, info, block_path, level, counter)
+                   for path, info, block_path in pending if not should_stop()]
+        for future in futures:
+            future.result()
+    if should_stop():
+        return None
+
+    temp = dest + ".tmp"
+    compressor = zstandard.ZstdCompressor(level=level)
+    with open(temp, "wb") as out:
+        headers = b"".join(
+            [tar_info(name, st, directory=True).tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+             for name, st in directory_entries(artifact, files, links)]
+            + [link_info(artifact, rel, target).tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+               for rel, target in links])
+        if headers:
+            out.write(compressor.compress(headers))
+        for _, _, block_path in members:
+            append_file(block_path, out)
+        out.write(compressor.compress(TAR_END))
+    os.replace(temp, dest)
+
+    # Only the blocks of this export are needed for the next one
+    used = {os.path.basename(block_path) for _, _, block_path in members}
+    for name in os.listdir(blocks):
+        if name not in used:
+            try:
+                os.remove(os.path.join(blocks, name))
+            except OSError:
+                pass
+    progress(100)
+    result = {"files": len(files), "reused": len(members) - len(pending), "compressed": len(pending)}
+    log(f"♻️ Reused {result['reused']} compressed files, compressed {result['compressed']}")
+    return result
+
+
+def export_archive(artifact, dest_dir, fmt="tar.zst", level=3, incremental=False, log=print,
+                   progress=lambda value: None, should_stop=lambda: False):
+    """Export an artifact as .tar.zst or .zip into dest_dir, returns the result with the archive path"""
+    os.makedirs(dest_dir, exist_ok=True)
+    dest = archive_path(artifact, dest_dir, fmt)
+    started = time.perf_counter()
+    if fmt == "zip":
+        result = export_zip(artifact, dest, level, progress, should_stop)
+    elif incremental:
+        manifest = build_manifest(artifact, default_manifest_cache(), log=log, should_stop=should_stop)
+        result = export_tar_zst_incremental(artifact, dest, manifest, level, log=log,
+                                            progress=progress, should_stop=should_stop)
+    else:
+        result = export_tar_zst(artifact, dest, level, progress=progress, should_stop=should_stop)
+    if result is None:
+        log("🛑 Export stopped")
+        return None
+    result.update(path=dest, bytes=os.path.getsize(dest), seconds=time.perf_counter() - started,
+                  source_bytes=sum(st.st_size for _, _, st in artifact_files(artifact)))
+    log(f"📦 Exported {dest}: {result['source_bytes'] / 1024 / 1024:.1f} MB -> "
+        f"{result['bytes'] / 1024 / 1024:.1f} MB in {result['seconds']:.1f}s")
+    return result
+
+
+RELEASES_DIR = "releases"
+DELTA_FORMAT = 1
+DELTA_SUFFIX = ".delta.tar"
+DELTA_LEVEL = 19
+# Folder below the target where patched files are verified before they replace the old ones
+DELTA_STAGING_DIR = ".delta-staging"
+DELTA_INFO = "delta.json"
+
+
+def releases_dir(main_file):
+    """Cache folder holding copies of recent build outputs to diff against"""
+    key = hashlib.sha256(project_dir(main_file).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(user_cache_dir(), RELEASES_DIR, key)
+
+
+def artifact_file(artifact, rel):
+    """Path of a manifest entry inside an artifact"""
+    return os.path.join(artifact, *rel.split("/")) if os.path.isdir(artifact) else artifact
+
+
+def copy_artifact(artifact, dest, log=print):
+    """Copy an artifact concurrently, cloning data blocks where the filesystem supports it"""
+    files, links = scan_artifact(artifact)
+    pairs = [(path, os.path.join(dest, *rel.split("/")) if os.path.isdir(artifact) else os.path.join(dest, rel))
+             for rel, path, _ in files]
+    stats = transfer_files(pairs, log=log, stage="Copied build output")
+    for rel, target in links:
+        make_link(target, os.path.join(dest, *rel.split("/")))
+    return stats
+
+
+def retain_release(artifact, main_file, name, keep=3, log=print):
+    """Keep a copy of a build output for later deltas, pruning all but the newest keep copies"""
+    root = releases_dir(main_file)
+    dest = os.path.join(root, name, os.path.basename(artifact))
+    temp = os.path.join(root, name + ".tmp")
+    shutil.rmtree(temp, ignore_errors=True)
+    copy_artifact(artifact, os.path.join(temp, os.path.basename(artifact)) if os.path.isdir(artifact) else temp, log)
+    os.replace(temp, os.path.join(root, name))
+    for old in sorted(entry for entry in os.listdir(root) if not entry.endswith(".tmp"))[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    log(f"🗄 Kept a copy of the build output for delta updates ({name})")
+    return dest
+
+
+def patch_compressor(old_data, new_size, level=DELTA_LEVEL):
+    """zstd compressor using the old file as raw content dictionary, like zstd --patch-from"""
+    window_log = max(10, min(31, math.ceil(math.log2(len(old_data) + new_size + 1))))
+    params = zstandard.ZstdCompressionParameters.from_level(
+        level, source_size=new_size, window_log=window_log, enable_ldm=True)
+    dictionary = zstandard.ZstdCompressionDict(old_data, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+    return zstandard.ZstdCompressor(dict_data=dictionary, compression_params=params)
+
+
+def patch_decompressor(old_data):
+    dictionary = zstandard.ZstdCompressionDict(old_data, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+    return zstandard.ZstdDecompressor(dict_data=dictionary, max_window_size=2 ** 31)
+
+
+def write_blob(new_path, blob_path, old_path=None, level=DELTA_LEVEL):
+    """Compress new_path into blob_path, as a patch against old_path if given"""
+    size = os.path.getsize(new_path)
+    if old_path:
+        with open(old_path, "rb") as f:
+            compressor = patch_compressor(f.read(), size, level)
+    else:
+        compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+    with open(new_path, "rb") as src, open(blob_path, "wb") as dst:
+        compressor.copy_stream(src, dst, size=size, read_size=COPY_CHUNK, write_size=COPY_CHUNK)
+
+
+def make_delta(old_artifact, old_manifest, new_artifact, new_manifest, dest, level=DELTA_LEVEL, workers=None,
+               log=print, progress=lambda value: None, should_stop=lambda: False):
+    """Write a delta package turning old_artifact into new_artifact
+
+    Added files are zstd compressed, changed files are zstd patches against their old
+    version and removed files are listed. Returns sizes of the delta and the full output.
+    """
+    old_files, new_files = old_manifest["files"], new_manifest["files"]
+    if old_manifest.get("links", {}) != new_manifest.get("links", {}):
+        raise ValueError("Symlinks differ between the two builds, a delta package only carries files, "
+                         "ship the full build output instead")
+    ops = [{"op": "remove", "path": rel} for rel in sorted(set(old_files) - set(new_files))]
+    jobs = []
+    for rel, (size, digest) in sorted(new_files.items()):
+        if rel not in old_files:
+            jobs.append({"op": "add", "path": rel, "size": size, "digest": digest})
+        elif old_files[rel][1] != digest:
+            jobs.append({"op": "patch", "path": rel, "size": size, "digest": digest, "from_digest": old_files[rel][1]})
+
+    temp = dest + ".parts"
+    shutil.rmtree(temp, ignore_errors=True)
+    os.makedirs(temp)
+    counter = ExportProgress(sum(job["size"] for job in jobs) or 1, progress)
+
+    def build(index_job):
+        index, job = index_job
+        job["blob"] = f"blobs/{index}.zst"
+        if not should_stop():
+            old_path = artifact_file(old_artifact, job["path"]) if job["op"] == "patch" else None
+            write_blob(artifact_file(new_artifact, job["path"]), os.path.join(temp, f"{index}.zst"), old_path, level)
+        counter(job["size"])
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        list(pool.map(build, enumerate(jobs)))
+    if should_stop():
+        shutil.rmtree(temp, ignore_errors=True)
+        return None
+
+    info = {
+        "format": DELTA_FORMAT,
+        "artifact": new_manifest["artifact"],
+        "from_files": old_files,
+        "to_files": new_files,
+        "ops": ops + jobs,
+    }
+    data = json.dumps(info).encode("utf-8")
+    with tarfile.open(dest + ".tmp", "w", format=tarfile.PAX_FORMAT) as tar:
+        member = tarfile.TarInfo(DELTA_INFO)
+        member.size = len(data)
+        member.mtime = int(time.time())
+        tar.addfile(member, io.BytesIO(data))
+        for index, job in enumerate(jobs):
+            tar.add(os.path.join(temp, f"{index}.zst"), job["blob"])
+    os.replace(dest + ".tmp", dest)
+    shutil.rmtree(temp, ignore_errors=True)
+
+    result = {
+        "path": dest,
+        "bytes": os.path.getsize(dest),
+        "full_bytes": new_manifest["total_bytes"],
+        "added": sum(1 for job in jobs if job["op"] == "add"),
+        "patched": sum(1 for job in jobs if job["op"] == "patch"),
+        "removed": len(ops),
+        "unchanged": len(new_files) - len(jobs),
+    }
+    log(f"🧩 Delta {os.path.basename(dest)}: {result['bytes'] / 1024 / 1024:.2f} MB instead of "
+        f"{result['full_bytes'] / 1024 / 1024:.1f} MB ({result['added']} added, {result['patched']} patched, "
+        f"{result['removed']} removed, {result['unchanged']} unchanged)")
+    return result
+
+
+def delta_target_path(target, rel):
+    """Path of a delta package entry below target, refusing entries that would land outside it"""
+    root = os.path.abspath(target)
+    path = os.path.normpath(os.path.join(root, *rel.split("/")))
+    # Also resolve symlinked folders, a link inside target may point anywhere
+    real_root = os.path.join(os.path.realpath(root), "")
+    real_parent = os.path.join(os.path.realpath(os.path.dirname(path)), "")
+    if (not rel or os.path.isabs(rel) or not path.startswith(os.path.join(root, ""))
+            or not real_parent.startswith(real_root)
+            or os.path.relpath(path, root).split(os.sep)[0] == DELTA_STAGING_DIR):
+        raise ValueError(f"Delta package entry {rel!r} points outside {target}")
+    return path
+
+
+def apply_delta(package, target, log=print, progress=lambda value: None, should_stop=lambda: False):
+    """Verify target against the delta's source manifest, then apply the delta package
+
+    target is the installed .dist folder, or the folder holding a onefile executable. Nothing
+    is changed unless every file the delta expects matches, and every produced file is
+    checked against the new manifest before it replaces the old one.
+    """
+    with tarfile.open(package, "r") as tar:
+        info = json.load(tar.extractfile(DELTA_INFO))
+        if info.get("format") != DELTA_FORMAT:
+            raise ValueError(f"Unsupported delta package format: {info.get('format')}")
+
+        def locate(rel):
+            return delta_target_path(target, rel)
+
+        for rel in list(info["from_files"]) + [op["path"] for op in info["ops"]]:
+            locate(rel)
+        for op in info["ops"]:
+            if op["op"] != "remove":
+                member = tar.getmember(op["blob"])
+                if not member.isfile():
+                    raise ValueError(f"Delta package member {op['blob']!r} is not a regular file")
+
+        def check(item):
+            rel, (size, digest) = item
+            path = locate(rel)
+            if not os.path.isfile(path) or os.path.getsize(path) != size or sha256_file(path, size) != digest:
+                return rel
+            return None
+
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2)) as pool:
+            mismatched = [rel for rel in pool.map(check, info["from_files"].items()) if rel]
+        if mismatched:
+            log(f"❌ {len(mismatched)} installed files don't match the delta's source build, nothing changed")
+            return {"ok": False, "mismatched": mismatched}
+
+        staging = os.path.join(target, DELTA_STAGING_DIR)
+        shutil.rmtree(staging, ignore_errors=True)
+        jobs = [op for op in info["ops"] if op["op"] != "remove"]
+        try:
+            for index, job in enumerate(jobs):
+                if should_stop():
+                    return None
+                staged = os.path.join(staging, str(index))
+                os.makedirs(staging, exist_ok=True)
+                blob = tar.extractfile(job["blob"])
+                if job["op"] == "patch":
+                    with open(locate(job["path"]), "rb") as f:
+                        decompressor = patch_decompressor(f.read())
+                else:
+                    decompressor = zstandard.ZstdDecompressor(max_window_size=2 ** 31)
+                with open(staged, "wb") as out:
+                    decompressor.copy_stream(blob, out, read_size=COPY_CHUNK, write_size=COPY_CHUNK)
+                if sha256_file(staged) != job["digest"]:
+                    raise ValueError(f"Patched {job['path']} doesn't match the new build")
+                progress((index + 1) * 90 // max(1, len(jobs)))
+
+            # Everything is staged and verified, replace the files
+            for index, job in enumerate(jobs):
+                path = locate(job["path"])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                staged = os.path.join(staging, str(index))
+                if os.path.exists(path):
+                    shutil.copymode(path, staged)
+                os.replace(staged, path)
+            # locate() returns absolute paths, target may be relative
+            root = os.path.abspath(target)
+            for op in info["ops"]:
+                if op["op"] == "remove" and os.path.isfile(locate(op["path"])):
+                    os.remove(locate(op["path"]))
+                    folder = os.path.dirname(locate(op["path"]))
+                    while folder != root and os.path.isdir(folder) and not os.listdir(folder):
+                        os.rmdir(folder)
+                        folder = os.path.dirname(folder)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    progress(100)
+    log(f"✅ Applied {os.path.basename(package)}: {len(jobs)} files written, "
+        f"{len(info['ops']) - len(jobs)} removed")
+    return {"ok": True, "mismatched": [], "written": len(jobs), "removed": len(info["ops"]) - len(jobs)}
+
+
+STORE_OBJECTS_DIR = "objects"
+STORE_REFS_DIR = "refs"
+# Temporary objects younger than this may still be written by a running ingest
+STORE_TEMP_GRACE = 3600
+
+
+def default_artifact_store():
+    return os.path.join(user_cache_dir(), "artifact-store")
+
+
+def object_key(digest, mode):
+    """Store key of a file, executables are kept apart so hardlinks share the right mode"""
+    return digest + (".x" if mode & 0o111 else "")
+
+
+def object_path(store, key):
+    return os.path.join(store, STORE_OBJECTS_DIR, key[:2], key[2:])
+
+
+def ref_path(store, location):
+    key = hashlib.sha256(os.path.abspath(location).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(store, STORE_REFS_DIR, key + ".json")
+
+
+def link_file(source, target):
+    """Replace target with a hardlink to source, falling back to a reflink or copy"""
+    temp = target + ".link-tmp"
+    if os.path.exists(temp):
+        os.remove(temp)
+    try:
+        os.link(source, temp)
+        kind = "link"
+    except OSError:
+        kind = "reflink" if copy_file(source, temp) == "reflink" else "copy"
+    os.replace(temp, target)
+    return kind
+
+
+def store_object(store, path, key):
+    """Add a file to the store unless its content is already there, returns True if added"""
+    obj = object_path(store, key)
+    if os.path.exists(obj):
+        return False
+    os.makedirs(os.path.dirname(obj), exist_ok=True)
+    temp = f"{obj}.{threading.get_ident()}.tmp"
+    copy_file(path, temp)
+    os.replace(temp, obj)
+    return True
+
+
+def ingest_artifact(artifact, manifest, store, workers=None, log=print, should_stop=lambda: False):
+    """Move an artifact's files into the content addressed store and link them back in place"""
+    lock = threading.Lock()
+    totals = {"added": 0, "added_bytes": 0, "link": 0, "reflink": 0, "copy": 0, "shared": 0}
+
+    def ingest(item):
+        rel, (size, digest) = item
+        if should_stop():
+            return None
+        path = artifact_file(artifact, rel)
+        key = object_key(digest, os.stat(path).st_mode)
+        obj = object_path(store, key)
+        added = store_object(store, path, key)
+        if os.path.samefile(obj, path):
+            kind = "shared"
+        else:
+            kind = link_file(obj, path)
+        with lock:
+            totals[kind] += 1
+            if added:
+                totals["added"] += 1
+                totals["added_bytes"] += size
+        return rel, [size, key]
+
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+        entries = [entry for entry in pool.map(ingest, manifest["files"].items()) if entry]
+    if should_stop():
+        return None
+
+    # One ref per location: rebuilding into the same folder replaces the old ref
+    os.makedirs(os.path.join(store, STORE_REFS_DIR), exist_ok=True)
+    write_json(ref_path(store, artifact), {
+        "location": os.path.abspath(artifact),
+        "created": time.time(),
+        "files": dict(entries),
+    })
+    fallback = totals["reflink"] + totals["copy"]
+    log(f"🔗 Artifact store: {totals['added']} new objects ({totals['added_bytes'] / 1024 / 1024:.1f} MB), "
+        f"{len(entries) - totals['added']} files already stored"
+        + (f", {fallback} could not be hardlinked" if fallback else ""))
+    return totals
+
+
+def detach_artifact(artifact):
+    """Unlink hardlinked files of an old output so a build writing in place can't change stored objects"""
+    detached = 0
+    for _, path, _ in artifact_files(artifact):
+        # DirEntry.stat() leaves st_nlink at zero on Windows
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+            detached += 1
+    return detached
+
+
+def collect_garbage(store, log=print):
+    """Drop refs whose location is gone and delete objects no remaining ref uses
+
+    Temporary files of objects still being added are kept for STORE_TEMP_GRACE seconds.
+    """
+    refs_dir = os.path.join(store, STORE_REFS_DIR)
+    objects_dir = os.path.join(store, STORE_OBJECTS_DIR)
+    live, logical, refs, removed_refs = set(), 0, 0, 0
+    for entry in os.scandir(refs_dir) if os.path.isdir(refs_dir) else []:
+        ref = read_json(entry.path, None)
+        if not ref or not os.path.exists(ref.get("location", "")):
+            os.remove(entry.path)
+            removed_refs += 1
+            continue
+        refs += 1
+        for size, key in ref["files"].values():
+            live.add(key)
+            logical += size
+
+    objects, stored, freed, removed = 0, 0, 0, 0
+    now = time.time()
+    for bucket in os.scandir(objects_dir) if os.path.isdir(objects_dir) else []:
+        for entry in os.scandir(bucket.path):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # Renamed into place or removed meanwhile
+            size = st.st_size
+            if entry.name.endswith(".tmp") and now - st.st_mtime < STORE_TEMP_GRACE:
+                continue
+            if bucket.name + entry.name in live:
+                objects += 1
+                stored += size
+                continue
+            try:
+                os.remove(entry.path)
+            except OSError:
+                # Still mapped by a running program on Windows, retry next time
+                continue
+            removed += 1
+            freed += size
+    log(f"🧹 Artifact store: removed {removed} unused objects ({freed / 1024 / 1024:.1f} MB) and "
+        f"{removed_refs} stale refs, {stored / 1024 / 1024:.1f} MB stored for "
+        f"{logical / 1024 / 1024:.1f} MB of outputs")
+    return {"refs": refs, "objects": objects, "stored_bytes": stored, "logical_bytes": logical,
+            "removed_objects": removed, "removed_refs": removed_refs, "freed_bytes": freed}
+
+
+SYNC_SLOTS = ("a", "b")
+
+
+def sync_state_path(dest):
+    return dest + ".sync.json"
+
+
+def slot_path(dest, slot):
+    return f"{dest}.slot-{slot}"
+
+
+def can_symlink(folder):
+    """Whether folder supports symlinks, Windows shares and unprivileged Windows accounts usually don't"""
+    probe = os.path.join(folder, f".sync-probe-{os.getpid()}")
+    try:
+        os.symlink(".", probe, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        return False
+    try:
+        os.remove(probe)
+    except OSError:
+        # Directory symlinks are removed like folders on Windows
+        os.rmdir(probe)
+    return True
+
+
+def sync_file(artifact, dest, digest, state, log=print):
+    """Replace a single file deployment atomically unless it is already up to date"""
+    recorded = state.get("file")
+    try:
+        st = os.stat(dest)
+        unchanged = recorded == [st.st_size, st.st_mtime_ns, digest]
+    except OSError:
+        unchanged = False
+    if unchanged:
+        return {"copied": 0, "removed": 0, "unchanged": 1, "bytes": 0}
+    temp = dest + ".sync-tmp"
+    copy_file(artifact, temp)
+    os.replace(temp, dest)
+    st = os.stat(dest)
+    state["file"] = [st.st_size, st.st_mtime_ns, digest]
+    return {"copied": 1, "removed": 0, "unchanged": 0, "bytes": st.st_size}
+
+
+def sync_tree(artifact, target, files, recorded, links=None, workers=None, log=print):
+    """Make target match the artifact, copying only files whose recorded size, mtime and hash differ
+
+    Symlinks are recreated with their recorded target.
+    """
+    links = links or {}
+    os.makedirs(target, exist_ok=True)
+    existing_files, existing_links = scan_artifact(target)
+    for rel, link in existing_links:
+        if links.get(rel) != link:
+            os.remove(os.path.join(target, *rel.split("/")))
+    existing = {rel: st for rel, _, st in existing_files}
+    changed, entries = [], {}
+    for rel, (size, digest) in files.items():
+        st, record = existing.get(rel), recorded.get(rel)
+        if st and record and record == [st.st_size, st.st_mtime_ns, digest] and size == st.st_size:
+            entries[rel] = record
+        else:
+            changed.append(rel)
+
+    stale = sorted(set(existing) - set(files))
+    for rel in stale:
+        path = os.path.join(target, *rel.split("/"))
+        os.remove(path)
+        folder = os.path.dirname(path)
+        while folder != target and not os.listdir(folder):
+            os.rmdir(folder)
+            folder = os.path.dirname(folder)
+
+    pairs = [(os.path.join(artifact, *rel.split("/")), os.path.join(target, *rel.split("/"))) for rel in changed]
+    stats = transfer_files(pairs, workers, log, stage="Copied changed files")
+    for rel in changed:
+        st = os.stat(os.path.join(target, *rel.split("/")))
+        entries[rel] = [st.st_size, st.st_mtime_ns, files[rel][1]]
+    current = dict(existing_links)
+    for rel, link in links.items():
+        if current.get(rel) != link:
+            make_link(link, os.path.join(target, *rel.split("/")))
+    return entries, {"copied": len(changed), "removed": len(stale), "unchanged": len(files) - len(changed),
+                     "bytes": stats["bytes"]}
+
+
+def activate_slot(dest, slot, state, log=print):
+    """Point dest at a slot: an atomic symlink swap, or two renames where symlinks aren't available
+
+    The renames are not atomic, dest is briefly missing between them.
+    """
+    name = os.path.basename(slot_path(dest, slot))
+    if state["mode"] == "symlink":
+        temp = dest + ".sync-link"
+        if os.path.lexists(temp):
+            os.remove(temp)
+        os.symlink(name, temp, target_is_directory=True)
+        os.replace(temp, dest)
+        return
+    if os.path.isdir(dest):
+        os.rename(dest, slot_path(dest, state["active"]))
+    os.rename(slot_path(dest, slot), dest)
+
+
+def sync_artifact(artifact, dest_dir, manifest=None, workers=None, log=print, should_stop=lambda: False):
+    """Deploy the artifact into dest_dir, copying only what changed and swapping the new tree in at the end
+
+    Folders are kept in two slots next to the deployed path, dest is switched to the freshly synced
+    slot at the end, so anyone running the deployed app never sees a half copied tree. Changed files
+    are written to a temporary name and renamed over the old ones, so a copy still running from the
+    inactive slot keeps its mapped files. The switch is atomic where symlinks are supported.
+    """
+    started = time.perf_counter()
+    if manifest is None:
+        manifest = build_manifest(artifact, default_manifest_cache(), workers, log=lambda message: None,
+                                  should_stop=should_stop)
+    if should_stop():
+        return None
+    os.makedirs(dest_dir, exist_ok=True)
+    dest = os.path.join(dest_dir, os.path.basename(artifact))
+    state = read_json(sync_state_path(dest), {})
+
+    if os.path.isfile(artifact):
+        result = sync_file(artifact, dest, next(iter(manifest["files"].values()))[1], state, log)
+        slot = None
+    else:
+        if "mode" not in state:
+            state["mode"] = "symlink" if can_symlink(dest_dir) else "rename"
+            if state["mode"] == "rename":
+                log(f"ℹ️ {dest_dir} doesn't support symlinks, {os.path.basename(dest)} is swapped with two renames "
+                    f"and is briefly missing during each sync")
+        slots = state.setdefault("slots", {})
+        if os.path.isdir(dest) and not os.path.islink(dest) and not state.get("active"):
+            # First sync over a plainly copied folder: it becomes the active slot
+            state["active"] = SYNC_SLOTS[0]
+            if state["mode"] == "symlink":
+                os.rename(dest, slot_path(dest, SYNC_SLOTS[0]))
+        slot = SYNC_SLOTS[1] if state.get("active") == SYNC_SLOTS[0] else SYNC_SLOTS[0]
+        slots[slot], result = sync_tree(artifact, slot_path(dest, slot), manifest["files"], slots.get(slot, {}),
+                                        manifest.get("links", {}), workers, log)
+        write_json(sync_state_path(dest), state)
+        activate_slot(dest, slot, state, log)
+        state["active"] = slot
+    write_json(sync_state_path(dest), state)
+
+    result.update(path=dest, slot=slot, seconds=time.perf_counter() - started)
+    log(f"🚚 Synced {dest}: {result['copied']} copied ({result['bytes'] / 1024 / 1024:.1f} MB), "
+        f"{result['removed']} removed, {result['unchanged']} unchanged in {result['seconds']:.1f}s")
+    return result
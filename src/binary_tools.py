@@ -0,0 +1,631 @@
+import os
+import re
+import json
+import mmap
+import struct
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from build_env import copy_file
+from perf_tools import NO_WINDOW, path_size
+from preflight import reachable_sources
+
+# Plugin categories Nuitka's "sensible" default includes
+QT_SENSIBLE_PLUGINS = (
+    "egldeviceintegrations", "iconengines", "imageformats", "mediaservice", "platforms",
+    "platformthemes", "printsupport", "styles", "tls", "wayland-decoration-client",
+    "wayland-graphics-integration-client", "wayland-shell-integration", "xcbglintegrations",
+)
+# Needed on every machine, even if the traced run loaded a different platform plugin
+QT_REQUIRED_PLUGINS = ("platforms",)
+# Loaded depending on the desktop session, only judged from a run on a real display
+QT_SESSION_PLUGINS = re.compile(
+    r"^(?:platformthemes|platforminputcontexts|xcbglintegrations|egldeviceintegrations|wayland-.*)$")
+QT_HEADLESS_PLATFORMS = re.compile(r"q(?:offscreen|minimal)\w*\.", re.I)
+
+# Prints the Qt plugin and translation folders of the Qt binding the build interpreter has
+QT_INFO_SCRIPT = r"""
+import json
+for binding in ("PySide6", "PyQt6", "PySide2", "PyQt5"):
+    try:
+        QtCore = __import__(binding + ".QtCore", fromlist=["QtCore"])
+    except ImportError:
+        continue
+    info = QtCore.QLibraryInfo
+    if hasattr(info, "path"):
+        paths = [info.path(info.LibraryPath.PluginsPath), info.path(info.LibraryPath.TranslationsPath)]
+    else:
+        paths = [info.location(info.PluginsPath), info.location(info.TranslationsPath)]
+    print(json.dumps({"binding": binding, "plugins": paths[0], "translations": paths[1]}))
+    break
+else:
+    print("null")
+"""
+
+# Qt 5: loaded library "path"; Qt 6: qt.core.library: "path" loaded library
+LOADED_LIBRARY = re.compile(r'loaded library "([^"]+)"|"([^"]+)" loaded library')
+
+# Source patterns that load plugins lazily, which a short traced run may miss
+QT_PLUGIN_HINTS = {
+    "imageformats": re.compile(r"\.(?:jpe?g|gif|webp|tiff?|ico|icns|svgz?|tga|wbmp)\b|\bQImageReader\b", re.I),
+    "iconengines": re.compile(r"\.svgz?\b|\bQtSvg\b", re.I),
+    "tls": re.compile(r"\bQSsl\w*|https://"),
+    "networkinformation": re.compile(r"\bQNetworkInformation\b"),
+    "sqldrivers": re.compile(r"\bQtSql\b"),
+    "printsupport": re.compile(r"\bQtPrintSupport\b"),
+    "multimedia": re.compile(r"\bQtMultimedia\b"),
+    "qml": re.compile(r"\bQt(?:Qml|Quick)\w*\b"),
+}
+QT_TRANSLATION_HINT = re.compile(r"\bQTranslator\b|\binstallTranslator\b")
+
+
+def qt_paths(python):
+    """Qt binding, plugin and translation folders of the build interpreter, or None"""
+    try:
+        result = subprocess.run([python, "-c", QT_INFO_SCRIPT], capture_output=True, text=True,
+                                timeout=60, creationflags=NO_WINDOW)
+        return json.loads(result.stdout)
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return None
+
+
+def plugin_inventory(plugins_dir):
+    """{category: {plugin file: size}} of a Qt plugins folder"""
+    inventory = {}
+    for category in sorted(os.listdir(plugins_dir)):
+        folder = os.path.join(plugins_dir, category)
+        if os.path.isdir(folder):
+            inventory[category] = {name: path_size(os.path.join(folder, name)) for name in os.listdir(folder)}
+    return inventory
+
+
+def trace_qt_plugins(python, main_file, args=None, duration=10):
+    """Run the app with QT_DEBUG_PLUGINS and return the plugin libraries it loaded
+
+    GUI apps rarely exit on their own, so the app is stopped after duration seconds.
+    Returns (loaded paths, exit code or None if it was stopped).
+    """
+    env = dict(os.environ, QT_DEBUG_PLUGINS="1")
+    process = subprocess.Popen([python, os.path.abspath(main_file)] + list(args or []),
+                               cwd=os.path.dirname(os.path.abspath(main_file)), env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                               encoding="utf-8", errors="replace", creationflags=NO_WINDOW)
+    try:
+        _, stderr = process.communicate(timeout=duration)
+        code = process.returncode
+    except subprocess.TimeoutExpired:
+        process.kill()
+        _, stderr = process.communicate()
+        code = None
+    loaded = set()
+    for match in LOADED_LIBRARY.finditer(stderr):
+        loaded.add(os.path.normcase(os.path.abspath(match.group(1) or match.group(2))))
+    return loaded, code
+
+
+def source_hints(main_file):
+    """Plugin categories and translation use suggested by the project sources"""
+    categories, translations = set(), False
+    for path in reachable_sources(main_file):
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            continue
+        categories.update(name for name, pattern in QT_PLUGIN_HINTS.items() if pattern.search(text))
+        translations = translations or bool(QT_TRANSLATION_HINT.search(text))
+    return categories, translations
+
+
+def analyze_qt_plugins(python, main_file, args=None, duration=10, log=print):
+    """Find the Qt plugins and translations the app needs, returns None without a Qt binding
+
+    Combines a traced run of the app with source hints for plugins that load lazily.
+    """
+    paths = qt_paths(python)
+    if not paths:
+        return None
+    plugins_dir = os.path.normcase(os.path.abspath(paths["plugins"]))
+    inventory = plugin_inventory(plugins_dir) if os.path.isdir(plugins_dir) else {}
+
+    log(f"🔎 Tracing Qt plugin loads for {duration}s ({paths['binding']})")
+    loaded, code = trace_qt_plugins(python, main_file, args, duration)
+    if code:
+        log(f"⚠️ The app exited with code {code} during the trace, results may be incomplete")
+    hinted, translations_used = source_hints(main_file)
+    platform_folder = os.path.join(plugins_dir, "platforms")
+    headless = not any(os.path.dirname(path) == platform_folder and not QT_HEADLESS_PLATFORMS.search(path)
+                       for path in loaded)
+    if headless:
+        log("⚠️ No display platform plugin was loaded, keeping desktop integration plugins")
+
+    categories = []
+    for category, files in inventory.items():
+        folder = os.path.join(plugins_dir, category)
+        used = sorted(name for name in files if os.path.normcase(os.path.join(folder, name)) in loaded)
+        if used:
+            reason = "loaded"
+        elif category in QT_REQUIRED_PLUGINS:
+            reason = "required"
+        elif category in hinted:
+            reason = "referenced in sources"
+        elif headless and QT_SESSION_PLUGINS.match(category) and category in QT_SENSIBLE_PLUGINS:
+            reason = "desktop integration (not traced)"
+        else:
+            reason = ""
+        categories.append({"category": category, "files": len(files), "size": sum(files.values()),
+                           "loaded": used, "keep": bool(reason), "reason": reason})
+
+    keep = {c["category"] for c in categories if c["keep"]} | (hinted - set(inventory))
+    drop = [c for c in categories if not c["keep"] and c["category"] in QT_SENSIBLE_PLUGINS]
+    include = ["sensible"] + sorted(keep - set(QT_SENSIBLE_PLUGINS))
+    noinclude = sorted(c["category"] for c in drop)
+
+    translations_bytes = path_size(paths["translations"]) if os.path.isdir(paths["translations"]) else 0
+    options = [f"--include-qt-plugins={','.join(include)}"]
+    if noinclude:
+        options.append(f"--noinclude-qt-plugins={','.join(noinclude)}")
+    if not translations_used:
+        options.append("--noinclude-qt-translations")
+
+    return {
+        "binding": paths["binding"],
+        "categories": categories,
+        "include": include,
+        "noinclude": noinclude,
+        "translations_used": translations_used,
+        "translations_bytes": translations_bytes,
+        "saved_bytes": sum(c["size"] for c in drop) + (0 if translations_used else translations_bytes),
+        "options": options,
+    }
+
+
+# Shared libraries the target system provides, bundled copies can be excluded
+SYSTEM_LIBRARIES = re.compile(
+    r"^(?:ld-linux.*|(?:libc|libm|libdl|libpthread|librt|libutil|libresolv|libnsl|libcrypt|libGL|libGLX|libEGL"
+    r"|libGLdispatch|libOpenGL|libdrm|libgbm|libvulkan)\.so(?:\.\d+)*"
+    r"|(?:api-ms-win-.*|kernel32|user32|gdi32|advapi32|shell32|ole32|oleaut32|ws2_32|ucrtbase|opengl32|dxgi"
+    r"|d3d\d+)\.dll)$", re.I)
+# Qt plugins and QML modules are loaded at runtime, not linked
+RUNTIME_LOADED_DIRS = re.compile(r"(?:^|/)(?:qt-plugins|plugins|qml)/")
+LIBRARY_NAME = re.compile(r"\.(?:so(?:\.\d+)*|dll|pyd|dylib)$", re.I)
+# libfoo.so.1.2 -> libfoo.so, libcrypto-3.dll / libcrypto-1_1.dll -> libcrypto.dll
+VERSION_SUFFIX = (re.compile(r"(\.so)(?:\.\d+)+$"), re.compile(r"[-_]\d+(?:[._]\d+)*(\.dll)$", re.I))
+
+ELF_MAGIC = b"\x7fELF"
+PT_LOAD, PT_DYNAMIC, PT_INTERP = 1, 2, 3
+DT_NEEDED, DT_STRTAB, DT_STRSZ, DT_SONAME = 1, 5, 10, 14
+PE_DLL = 0x2000
+
+
+def read_cstring(data, offset):
+    end = data.find(b"\0", offset)
+    return data[offset:end if end >= 0 else len(data)].decode("utf-8", "replace")
+
+
+def elf_layout(data):
+    """ELF header fields and program headers as (p_type, offset, vaddr, filesz)"""
+    bits = 64 if data[4] == 2 else 32
+    endian = "<" if data[5] == 1 else ">"
+    e_type, = struct.unpack_from(endian + "H", data, 0x10)
+    if bits == 64:
+        phoff, = struct.unpack_from(endian + "Q", data, 0x20)
+        phentsize, phnum = struct.unpack_from(endian + "HH", data, 0x36)
+        header = endian + "IIQQQQQQ"
+    else:
+        phoff, = struct.unpack_from(endian + "I", data, 0x1C)
+        phentsize, phnum = struct.unpack_from(endian + "HH", data, 0x2A)
+        header = endian + "IIIIIIII"
+
+    segments = []
+    for i in range(phnum):
+        fields = struct.unpack_from(header, data, phoff + i * phentsize)
+        if bits == 64:
+            p_type, _, offset, vaddr, _, filesz, _, _ = fields
+        else:
+            p_type, offset, vaddr, _, filesz, _, _, _ = fields
+        segments.append((p_type, offset, vaddr, filesz))
+    return {"bits": bits, "endian": endian, "type": e_type, "segments": segments}
+
+
+def parse_elf(data):
+    """Dependencies of an ELF file: {kind, needed, soname, extension}"""
+    layout = elf_layout(data)
+    endian = layout["endian"]
+    dynamic_entry = endian + ("qQ" if layout["bits"] == 64 else "iI")
+    loads = [(vaddr, filesz, offset) for p_type, offset, vaddr, filesz in layout["segments"] if p_type == PT_LOAD]
+    dynamic = next(((offset, filesz) for p_type, offset, _, filesz in layout["segments"] if p_type == PT_DYNAMIC), None)
+    interpreter = any(p_type == PT_INTERP for p_type, _, _, _ in layout["segments"])
+
+    def file_offset(address):
+        for vaddr, filesz, offset in loads:
+            if vaddr <= address < vaddr + filesz:
+                return address - vaddr + offset
+        return None
+
+    entries = []
+    if dynamic:
+        size = struct.calcsize(dynamic_entry)
+        for offset in range(dynamic[0], dynamic[0] + dynamic[1], size):
+            tag, value = struct.unpack_from(dynamic_entry, data, offset)
+            if tag == 0:
+                break
+            entries.append((tag, value))
+    strtab = file_offset(next((v for t, v in entries if t == DT_STRTAB), -1))
+    strsz = next((v for t, v in entries if t == DT_STRSZ), 0)
+    needed, soname, extension = [], "", False
+    if strtab is not None:
+        needed = [read_cstring(data, strtab + v) for t, v in entries if t == DT_NEEDED]
+        soname = next((read_cstring(data, strtab + v) for t, v in entries if t == DT_SONAME), "")
+        extension = data.find(b"\0PyInit_", strtab, strtab + strsz) >= 0
+    # Position independent executables are ET_DYN with an interpreter
+    e_type = layout["type"]
+    kind = "executable" if e_type == 2 or (e_type == 3 and interpreter and not soname) else "library"
+    return {"format": "ELF", "kind": kind, "needed": needed, "soname": soname, "extension": extension}
+
+
+def pe_layout(data):
+    """PE characteristics plus data directory and RVA lookups, or None if not a PE file"""
+    pe, = struct.unpack_from("<I", data, 0x3C)
+    if data[pe:pe + 4] != b"PE\0\0":
+        return None
+    sections_count, = struct.unpack_from("<H", data, pe + 6)
+    optional_size, characteristics = struct.unpack_from("<HH", data, pe + 20)
+    optional = pe + 24
+    magic, = struct.unpack_from("<H", data, optional)
+    directories = optional + (112 if magic == 0x20B else 96)
+    directory_count, = struct.unpack_from("<I", data, directories - 4)
+
+    sections = []
+    for i in range(sections_count):
+        vsize, vaddr, raw_size, raw_offset = struct.unpack_from("<IIII", data, optional + optional_size + i * 40 + 8)
+        sections.append((vaddr, max(vsize, raw_size), raw_offset))
+
+    def file_offset(rva):
+        for vaddr, size, raw_offset in sections:
+            if vaddr <= rva < vaddr + size:
+                return rva - vaddr + raw_offset
+        return None
+
+    def directory(index):
+        """File offset and size of data directory index"""
+        if index >= directory_count:
+            return None, 0
+        rva, size = struct.unpack_from("<II", data, directories + index * 8)
+        return (file_offset(rva) if rva else None), size
+
+    return {"characteristics": characteristics, "directory": directory, "file_offset": file_offset}
+
+
+def parse_pe(data):
+    """Dependencies of a PE file: {kind, needed, soname, extension}"""
+    layout = pe_layout(data)
+    if not layout:
+        return None
+    directory, file_offset = layout["directory"], layout["file_offset"]
+    needed = []
+    # Import descriptors are 20 bytes with the name at +12, delay-load ones 32 bytes with the name at +4
+    for index, entry_size, name_at in ((1, 20, 12), (13, 32, 4)):
+        offset, _ = directory(index)
+        while offset is not None and offset + entry_size <= len(data):
+            entry = data[offset:offset + entry_size]
+            if not entry.strip(b"\0"):
+                break
+            name_offset = file_offset(struct.unpack_from("<I", entry, name_at)[0])
+            if name_offset is not None:
+                needed.append(read_cstring(data, name_offset))
+            offset += entry_size
+    exports, exports_size = directory(0)
+    extension = exports is not None and data.find(b"PyInit_", exports, exports + exports_size) >= 0
+    kind = "library" if layout["characteristics"] & PE_DLL else "executable"
+    return {"format": "PE", "kind": kind, "needed": needed, "soname": "", "extension": extension}
+
+
+def parse_binary(path):
+    """ELF/PE dependency information of path, or None for other files"""
+    try:
+        with open(path, "rb") as f:
+            if f.read(4)[:2] not in (ELF_MAGIC[:2], b"MZ"):
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:4] == ELF_MAGIC:
+                    return parse_elf(data)
+                if data[:2] == b"MZ":
+                    return parse_pe(data)
+    except (OSError, ValueError, struct.error, IndexError):
+        pass
+    return None
+
+
+def unversioned_name(name):
+    for pattern in VERSION_SUFFIX:
+        name = pattern.sub(r"\1", name)
+    return name.lower()
+
+
+def scan_dist_binaries(dist_dir, workers=None, should_stop=lambda: False):
+    """Parse all ELF/PE files of a .dist folder in parallel, returns {relative path: info}"""
+    paths = []
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if not os.path.islink(path):
+                paths.append(path)
+
+    def parse(path):
+        if should_stop():
+            return None
+        return parse_binary(path)
+
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        parsed = pool.map(parse, paths)
+        binaries = {}
+        for path, info in zip(paths, parsed):
+            if info:
+                info["size"] = os.path.getsize(path)
+                binaries[os.path.relpath(path, dist_dir).replace(os.sep, "/")] = info
+    return binaries
+
+
+def dll_exclusion_advice(dist_dir, log=print, should_stop=lambda: False):
+    """Build the shared library dependency graph of a .dist folder and suggest --noinclude-dlls patterns
+
+    Executables, Python extension modules and runtime loaded plugins are roots; libraries
+    no root reaches through DT_NEEDED/import table edges are reported as unused.
+    """
+    binaries = scan_dist_binaries(dist_dir, should_stop=should_stop)
+    log(f"🔎 Parsed {len(binaries)} ELF/PE files in {dist_dir}")
+
+    by_name = {}
+    for rel, info in binaries.items():
+        by_name.setdefault(os.path.basename(rel).lower(), rel)
+        if info["soname"]:
+            by_name.setdefault(info["soname"].lower(), rel)
+
+    needed_by = {rel: [] for rel in binaries}
+    unresolved = set()
+    for rel, info in binaries.items():
+        info["resolved"] = []
+        for name in info["needed"]:
+            target = by_name.get(name.lower())
+            if target and target != rel:
+                info["resolved"].append(target)
+                needed_by[target].append(rel)
+            elif not target:
+                unresolved.add(name)
+
+    roots = [rel for rel, info in binaries.items()
+             if info["kind"] == "executable" or info["extension"] or RUNTIME_LOADED_DIRS.search(rel)
+             or not LIBRARY_NAME.search(rel)]
+    reached, pending = set(), list(roots)
+    while pending:
+        rel = pending.pop()
+        if rel not in reached:
+            reached.add(rel)
+            pending.extend(binaries[rel]["resolved"])
+
+    groups = {}
+    for rel in binaries:
+        groups.setdefault(unversioned_name(os.path.basename(rel)), []).append(rel)
+    duplicates = [sorted(members) for members in groups.values() if len(members) > 1]
+
+    suggestions, suggested = [], set()
+    for members in duplicates:
+        used = [rel for rel in members if rel in reached]
+        for rel in members:
+            if rel in reached or not used:
+                continue
+            edge = next((f"{importer} needs {os.path.basename(kept)}"
+                         for kept in used for importer in needed_by[kept]), f"{used[0]} is used")
+            suggestions.append({"pattern": rel, "bytes": binaries[rel]["size"],
+                                "reason": f"Version duplicate of {os.path.basename(used[0])}: {edge}"})
+            suggested.add(rel)
+
+    for rel in sorted(set(binaries) - reached - suggested):
+        importers = needed_by[rel]
+        edge = (f"needed only by {', '.join(os.path.basename(i) for i in importers)} (unused)" if importers
+                else "nothing links to it (make sure it isn't loaded with ctypes)")
+        suggestions.append({"pattern": rel, "bytes": binaries[rel]["size"], "reason": f"Unused: {edge}"})
+        suggested.add(rel)
+
+    for rel in sorted(reached - set(roots)):
+        if SYSTEM_LIBRARIES.match(os.path.basename(rel)):
+            importers = ", ".join([os.path.basename(i) for i in needed_by[rel] if i in reached][:3])
+            suggestions.append({"pattern": rel, "bytes": binaries[rel]["size"],
+                                "reason": f"Provided by the target system (needed by {importers})"})
+
+    libraries = []
+    for rel, info in sorted(binaries.items()):
+        libraries.append({
+            "path": rel,
+            "format": info["format"],
+            "size": info["size"],
+            "root": rel in roots,
+            "used": rel in reached,
+            "needs": [os.path.basename(target) for target in info["resolved"]],
+            "needed_by": [os.path.basename(importer) for importer in needed_by[rel]],
+        })
+    return {
+        "libraries": libraries,
+        "duplicates": duplicates,
+        "unresolved": sorted(unresolved),
+        "suggestions": suggestions,
+        "saved_bytes": sum(s["bytes"] for s in suggestions),
+    }
+
+
+PT_NOTE = 4
+NT_GNU_BUILD_ID = 3
+PE_DEBUG_CODEVIEW = 2
+DEBUG_SECTION = re.compile(rb"^\.z?debug_")
+
+
+def elf_build_id(data, layout):
+    """Hex GNU build ID from the ELF note segments, or None"""
+    endian = layout["endian"]
+    for p_type, offset, _, filesz in layout["segments"]:
+        if p_type != PT_NOTE:
+            continue
+        position, end = offset, offset + filesz
+        while position + 12 <= end:
+            namesz, descsz, note_type = struct.unpack_from(endian + "III", data, position)
+            name_start = position + 12
+            desc_start = name_start + (namesz + 3) // 4 * 4
+            if note_type == NT_GNU_BUILD_ID and data[name_start:name_start + namesz] == b"GNU\0":
+                return data[desc_start:desc_start + descsz].hex()
+            position = desc_start + (descsz + 3) // 4 * 4
+    return None
+
+
+def elf_has_debug_info(data, layout):
+    """Whether the ELF section table has .debug_* sections"""
+    endian = layout["endian"]
+    if layout["bits"] == 64:
+        shoff, = struct.unpack_from(endian + "Q", data, 0x28)
+        shentsize, shnum, shstrndx = struct.unpack_from(endian + "HHH", data, 0x3A)
+        name_offset = lambda index: struct.unpack_from(endian + "I", data, shoff + index * shentsize)[0]
+        section_offset = lambda index: struct.unpack_from(endian + "Q", data, shoff + index * shentsize + 0x18)[0]
+    else:
+        shoff, = struct.unpack_from(endian + "I", data, 0x20)
+        shentsize, shnum, shstrndx = struct.unpack_from(endian + "HHH", data, 0x2E)
+        name_offset = lambda index: struct.unpack_from(endian + "I", data, shoff + index * shentsize)[0]
+        section_offset = lambda index: struct.unpack_from(endian + "I", data, shoff + index * shentsize + 0x10)[0]
+    if not shoff or shstrndx >= shnum:
+        return False
+    names = section_offset(shstrndx)
+    for index in range(shnum):
+        start = names + name_offset(index)
+        if DEBUG_SECTION.match(data[start:start + 16]):
+            return True
+    return False
+
+
+def pe_pdb_reference(data):
+    """(pdb path, symbol server key) from the PE CodeView debug record, or None"""
+    layout = pe_layout(data)
+    if not layout:
+        return None
+    offset, size = layout["directory"](6)
+    for entry in range(offset or 0, (offset or 0) + size, 28):
+        debug_type, = struct.unpack_from("<I", data, entry + 12)
+        raw, = struct.unpack_from("<I", data, entry + 24)
+        if debug_type == PE_DEBUG_CODEVIEW and data[raw:raw + 4] == b"RSDS":
+            d1, d2, d3 = struct.unpack_from("<IHH", data, raw + 4)
+            age, = struct.unpack_from("<I", data, raw + 20)
+            key = f"{d1:08X}{d2:04X}{d3:04X}{data[raw + 12:raw + 20].hex().upper()}{age:X}"
+            return read_cstring(data, raw + 24), key
+    return None
+
+
+def debug_info(path):
+    """Build ID and debug information of an ELF/PE file, or None for other files"""
+    try:
+        with open(path, "rb") as f:
+            if f.read(4)[:2] not in (ELF_MAGIC[:2], b"MZ"):
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:4] == ELF_MAGIC:
+                    layout = elf_layout(data)
+                    kind = parse_elf(data)["kind"]
+                    return {"format": "ELF", "kind": kind, "build_id": elf_build_id(data, layout),
+                            "debug": elf_has_debug_info(data, layout)}
+                if data[:2] == b"MZ" and pe_layout(data):
+                    return {"format": "PE", "pdb": pe_pdb_reference(data)}
+    except (OSError, ValueError, struct.error, IndexError):
+        pass
+    return None
+
+
+def split_elf_debug(path, info, store, objcopy):
+    """Move the debug sections of an ELF file to store/.build-id/xx/rest.debug and strip it"""
+    if not info["debug"]:
+        return "no debug info"
+    if not info["build_id"]:
+        return "no build ID, left unstripped"
+    if not objcopy:
+        return "objcopy not found, left unstripped"
+    build_id = info["build_id"]
+    symbol_file = os.path.join(store, ".build-id", build_id[:2], build_id[2:] + ".debug")
+    # Same build ID means same binary, the stored symbols can be reused
+    if not os.path.isfile(symbol_file):
+        os.makedirs(os.path.dirname(symbol_file), exist_ok=True)
+        temp = f"{symbol_file}.{os.getpid()}.tmp"
+        subprocess.run([objcopy, "--only-keep-debug", "--compress-debug-sections", path, temp],
+                       check=True, capture_output=True, creationflags=NO_WINDOW)
+        os.replace(temp, symbol_file)
+
+    strip = "--strip-all" if info["kind"] == "executable" else "--strip-unneeded"
+    temp = f"{path}.strip.tmp"
+    subprocess.run([objcopy, strip, f"--add-gnu-debuglink={symbol_file}", path, temp],
+                   check=True, capture_output=True, creationflags=NO_WINDOW)
+    shutil.copymode(path, temp)
+    os.replace(temp, path)
+    return "split"
+
+
+def store_pdb(path, info, store):
+    """Copy the PDB of a PE file to the symbol server layout store/name.pdb/KEY/name.pdb
+
+    A PDB inside the .dist folder is removed afterwards so it isn't shipped.
+    """
+    if not info["pdb"]:
+        return "no debug info"
+    pdb_path, key = info["pdb"]
+    name = os.path.basename(pdb_path.replace("\\", "/"))
+    local = os.path.join(os.path.dirname(path), name)
+    source = local if os.path.isfile(local) else pdb_path if os.path.isfile(pdb_path) else None
+    if not source:
+        return f"{name} not found"
+    symbol_file = os.path.join(store, name, key, name)
+    if not os.path.isfile(symbol_file):
+        os.makedirs(os.path.dirname(symbol_file), exist_ok=True)
+        copy_file(source, symbol_file + ".tmp")
+        os.replace(symbol_file + ".tmp", symbol_file)
+    if source == local:
+        os.remove(local)
+    return "split"
+
+
+def split_debug_symbols(dist_dir, store, workers=None, log=print, should_stop=lambda: False):
+    """Split debug information of all binaries in dist_dir into the symbol store and strip them
+
+    ELF files are keyed by GNU build ID, PE files by their PDB signature.
+    """
+    objcopy = shutil.which("objcopy")
+    paths = [os.path.join(root, name) for root, _, files in os.walk(dist_dir) for name in files
+             if not os.path.islink(os.path.join(root, name)) and not name.lower().endswith(".pdb")]
+    before = path_size(dist_dir)
+
+    def split(path):
+        if should_stop():
+            return None
+        info = debug_info(path)
+        if not info:
+            return None
+        size = os.path.getsize(path)
+        try:
+            if info["format"] == "ELF":
+                status = split_elf_debug(path, info, store, objcopy)
+            else:
+                status = store_pdb(path, info, store)
+        except (OSError, subprocess.CalledProcessError) as e:
+            status = f"failed: {e}"
+        return {
+            "path": os.path.relpath(path, dist_dir).replace(os.sep, "/"),
+            "status": status,
+            "build_id": info.get("build_id") or (info.get("pdb") or ("", ""))[1],
+            "before": size,
+            "after": os.path.getsize(path),
+        }
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        binaries = [result for result in pool.map(split, paths) if result]
+    after = path_size(dist_dir)
+    split_count = sum(1 for b in binaries if b["status"] == "split")
+    log(f"🔧 Split debug info of {split_count}/{len(binaries)} binaries into {store}: "
+        f"{before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB")
+    for binary in binaries:
+        if binary["status"].startswith(("failed", "objcopy", "no build ID")):
+            log(f"⚠️ {binary['path']}: {binary['status']}")
+    return {"binaries": binaries, "before": before, "after": after, "store": store}
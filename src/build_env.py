@@ -0,0 +1,730 @@
+import os
+import sys
+import errno
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from project_store import STATE_DIR_NAME, build_options, project_dir, read_json, write_json
+from perf_tools import NO_WINDOW, option_name, path_size
+
+# Working folders Nuitka leaves next to the outputs
+BUILD_DIR_SUFFIXES = (".build", ".onefile-build")
+
+
+def user_cache_dir():
+    """Per-user cache directory of the packager"""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return os.path.join(base, "NuitkaPackager")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/NuitkaPackager")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "nuitka-gui-packager")
+
+
+def configuration_key(main_file, command):
+    """Stable key identifying a project and the options it is built with"""
+    options = [opt for opt in build_options(command) if opt.split("=", 1)[0] not in ("--remove-output", "--jobs")]
+    payload = json.dumps([os.path.abspath(main_file), command[0], sorted(options)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def build_dir_names(main_file):
+    """Names of the working folders Nuitka creates for main_file"""
+    stem = os.path.splitext(os.path.basename(main_file))[0]
+    return [stem + suffix for suffix in BUILD_DIR_SUFFIXES]
+
+
+class BuildDirStore:
+    """Persistent store of Nuitka build folders, one per project configuration, with LRU eviction"""
+    INDEX_FILE = "index.json"
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key):
+        return os.path.join(self.root, key)
+
+    def load_index(self):
+        return read_json(os.path.join(self.root, self.INDEX_FILE), {})
+
+    def save_index(self, index):
+        os.makedirs(self.root, exist_ok=True)
+        write_json(os.path.join(self.root, self.INDEX_FILE), index)
+
+    def checkout(self, key, main_file, output_dir, log=print):
+        """Move the stored build folders for key into output_dir, returns True if reused"""
+        stored = self.entry_path(key)
+        if not os.path.isdir(stored):
+            log("🗂 No stored build directory for this configuration, starting fresh")
+            return False
+        os.makedirs(output_dir, exist_ok=True)
+        for name in build_dir_names(main_file):
+            source = os.path.join(stored, name)
+            if not os.path.isdir(source):
+                continue
+            target = os.path.join(output_dir, name)
+            shutil.rmtree(target, ignore_errors=True)
+            move_path(source, target, log=log, stage=f"Restored {name}")
+        index = self.load_index()
+        if key in index:
+            index[key]["last_used"] = time.time()
+            self.save_index(index)
+        log(f"🗂 Reusing stored build directory {key}")
+        return True
+
+    def checkin(self, key, main_file, output_dir, label="", log=print):
+        """Move the build folders from output_dir back into the store and enforce the size cap"""
+        stored = self.entry_path(key)
+        os.makedirs(stored, exist_ok=True)
+        for name in build_dir_names(main_file):
+            source = os.path.join(output_dir, name)
+            if not os.path.isdir(source):
+                continue
+            target = os.path.join(stored, name)
+            shutil.rmtree(target, ignore_errors=True)
+            move_path(source, target, log=log, stage=f"Stored {name}")
+
+        index = self.load_index()
+        index[key] = {
+            "project": os.path.abspath(main_file),
+            "label": label,
+            "size": path_size(stored),
+            "last_used": time.time(),
+        }
+        self.save_index(index)
+        log(f"🗂 Stored build directory {key} ({index[key]['size'] / 1024 / 1024:.1f} MB)")
+        for removed in self.evict(keep=key):
+            log(f"🗑 Evicted least recently used build directory {removed}")
+
+    def entries(self):
+        """Stored build folders, most recently used first"""
+        index = self.load_index()
+        items = [dict(value, key=key) for key, value in index.items()]
+        return sorted(items, key=lambda item: item.get("last_used", 0), reverse=True)
+
+    def total_size(self):
+        return sum(item.get("size", 0) for item in self.load_index().values())
+
+    def remove(self, key):
+        """Delete a stored build folder"""
+        shutil.rmtree(self.entry_path(key), ignore_errors=True)
+        index = self.load_index()
+        index.pop(key, None)
+        self.save_index(index)
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the store fits the size cap"""
+        index = self.load_index()
+        total = sum(item.get("size", 0) for item in index.values())
+        removed = []
+        for key, item in sorted(index.items(), key=lambda kv: kv[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            total -= item.get("size", 0)
+            removed.append(key)
+        if removed:
+            for key in removed:
+                index.pop(key, None)
+            self.save_index(index)
+        return removed
+
+
+# Assumed intermediate size when no previous build of the project was measured
+DEFAULT_INTERMEDIATE_BYTES = 1024 ** 3
+
+
+def default_scratch_dir():
+    """Fast scratch location: /dev/shm (tmpfs) where available, else the temp directory"""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def estimate_intermediate_bytes(history):
+    """Expected intermediate size of the next build from the last measured builds, with headroom"""
+    sizes = [entry["intermediate_bytes"] for entry in history if entry.get("intermediate_bytes")]
+    if not sizes:
+        return DEFAULT_INTERMEDIATE_BYTES
+    return int(max(sizes[-5:]) * 1.25)
+
+
+def check_scratch_space(scratch_root, required_bytes):
+    """Return (usable, free_bytes) for staging a build of required_bytes in scratch_root"""
+    if not os.path.isdir(scratch_root) or not os.access(scratch_root, os.W_OK):
+        return False, 0
+    free = shutil.disk_usage(scratch_root).free
+    return free >= required_bytes, free
+
+
+class ScratchStaging:
+    """Runs a build in a scratch directory and moves only the final artifacts to the output directory"""
+
+    def __init__(self, scratch_root, output_dir, main_file):
+        stem = os.path.splitext(os.path.basename(main_file))[0]
+        self.stage_dir = os.path.join(scratch_root, f"nuitka-packager-{os.getpid()}-{stem}")
+        self.output_dir = output_dir
+        self.main_file = main_file
+        self.intermediate_bytes = 0
+
+    def prepare(self, log=print):
+        shutil.rmtree(self.stage_dir, ignore_errors=True)
+        os.makedirs(self.stage_dir)
+        log(f"⚡ Staging build in {self.stage_dir}")
+
+    def collect(self, log=print, success=True):
+        """Measure intermediates and move the final artifacts into the output directory"""
+        build_dirs = set(build_dir_names(self.main_file))
+        self.intermediate_bytes = sum(path_size(os.path.join(self.stage_dir, name))
+                                      for name in build_dirs
+                                      if os.path.exists(os.path.join(self.stage_dir, name)))
+        if not success or not os.path.isdir(self.stage_dir):
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        moved, copied = 0, {"files": 0, "bytes": 0, "seconds": 0.0, "methods": {}}
+        for name in os.listdir(self.stage_dir):
+            if name in build_dirs:
+                continue
+            target = os.path.join(self.output_dir, name)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target)
+            elif os.path.lexists(target):
+                os.remove(target)
+            stats = move_path(os.path.join(self.stage_dir, name), target, log=lambda message: None)
+            for key in ("files", "bytes", "seconds"):
+                copied[key] += stats[key]
+            for method, count in stats["methods"].items():
+                copied["methods"][method] = copied["methods"].get(method, 0) + count
+            moved += 1
+        log(f"⚡ Moved {moved} artifacts to {self.output_dir} "
+            f"(intermediates: {self.intermediate_bytes / 1024 / 1024:.1f} MB)"
+            + (f", copied across filesystems: {format_transfer(copied)}" if copied["files"] else ""))
+
+    def cleanup(self, log=print, success=True):
+        shutil.rmtree(self.stage_dir, ignore_errors=True)
+
+
+# Folders never copied into a source snapshot
+SNAPSHOT_SKIP_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", ".venv", "venv", "node_modules",
+    ".tox", ".mypy_cache", ".pytest_cache", STATE_DIR_NAME,
+}
+# Linux ioctl cloning a file's data blocks (btrfs, xfs, bcachefs...)
+FICLONE = 0x40049409
+
+
+def reflink_file(source, target):
+    """Clone source into target sharing its data blocks, returns False if the filesystem can't"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def _link_file(source, target):
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        return False
+
+
+def _copy_file(source, target):
+    # The snapshot holds the contents a symlink points at, like the other methods
+    _copy_contents(source, target, reflink=False)
+    return True
+
+
+# Errors meaning "this kernel or filesystem pair can't do it", anything else is a real failure
+KERNEL_COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.ENOTSOCK}
+# Bytes per copy_file_range/sendfile call, large enough that syscall overhead doesn't matter
+KERNEL_COPY_CHUNK = 1 << 30
+
+
+def _kernel_copy(src, dst, size, dst_offset=0):
+    """Copy between open files without passing data through Python, returns the syscall used or None"""
+    for method in ("copy_file_range", "sendfile"):
+        call = getattr(os, method, None)
+        if call is None:
+            continue
+        offset = 0
+        dst.seek(dst_offset)
+        try:
+            while offset < size:
+                count = min(KERNEL_COPY_CHUNK, size - offset)
+                if method == "copy_file_range":
+                    count = call(src.fileno(), dst.fileno(), count, offset, dst_offset + offset)
+                else:
+                    count = call(dst.fileno(), src.fileno(), offset, count)
+                if not count:
+                    break
+                offset += count
+        except OSError as e:
+            if e.errno not in KERNEL_COPY_UNSUPPORTED:
+                raise
+        if offset == size:
+            return method
+        # Start over with the next method
+        dst.seek(dst_offset)
+        dst.truncate()
+    return None
+
+
+def append_file(source, dst):
+    """Append the contents of source to the open binary file dst kernel side"""
+    dst.flush()
+    start = dst.tell()
+    with open(source, "rb") as src:
+        size = os.fstat(src.fileno()).st_size
+        if _kernel_copy(src, dst, size, start) is None:
+            dst.seek(start)
+            shutil.copyfileobj(src, dst, 1 << 20)
+    # The syscalls bypass the file object's position
+    dst.seek(start + size)
+
+
+def _copy_contents(source, target, reflink):
+    if reflink and reflink_file(source, target):
+        return "reflink"
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        method = _kernel_copy(src, dst, os.fstat(src.fileno()).st_size)
+        if method is None:
+            # Windows and macOS: shutil uses CopyFile2 / fcopyfile where available
+            dst.close()
+            shutil.copyfile(source, target)
+            method = "copy"
+    shutil.copystat(source, target)
+    return method
+
+
+def copy_file(source, target, reflink=True):
+    """Copy a file with its metadata using the cheapest kernel side method, returns the method used
+
+    Tries a reflink, then copy_file_range and sendfile, and only falls back to a read/write loop
+    when the platform supports none of them. Symlinks are copied as links. The copy is written
+    next to target and renamed over it, so a running program never sees a half written file.
+    """
+    fd, temp = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", suffix=".tmp",
+                                dir=os.path.dirname(target) or ".")
+    os.close(fd)
+    try:
+        if os.path.islink(source):
+            os.remove(temp)
+            os.symlink(os.readlink(source), temp, target_is_directory=os.path.isdir(source))
+            method = "symlink"
+        else:
+            method = _copy_contents(source, temp, reflink)
+        os.replace(temp, target)
+    except BaseException:
+        if os.path.lexists(temp):
+            os.remove(temp)
+        raise
+    return method
+
+
+def transfer_files(pairs, workers=None, log=print, stage="Copy", reflink=True):
+    """Copy (source, target) pairs concurrently and log the throughput of the stage"""
+    started = time.perf_counter()
+    methods, lock = {}, threading.Lock()
+    total = 0
+
+    def transfer(pair):
+        source, target = pair
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        method = copy_file(source, target, reflink)
+        with lock:
+            methods[method] = methods.get(method, 0) + 1
+        return os.lstat(target).st_size
+
+    with ThreadPoolExecutor(max_workers=workers or min(16, (os.cpu_count() or 1) * 2)) as pool:
+        total = sum(pool.map(transfer, pairs))
+    stats = {"files": sum(methods.values()), "bytes": total, "seconds": time.perf_counter() - started,
+             "methods": methods}
+    if stats["files"]:
+        log(f"⚡ {stage}: {format_transfer(stats)}")
+    return stats
+
+
+def format_transfer(stats):
+    """Human readable size, throughput and methods of a transfer_files result"""
+    rate = stats["bytes"] / max(stats["seconds"], 1e-6) / 1024 / 1024
+    methods = ", ".join(f"{count} {method}" for method, count in sorted(stats["methods"].items()))
+    return (f"{stats['files']} files, {stats['bytes'] / 1024 / 1024:.1f} MB in {stats['seconds']:.2f}s "
+            f"({rate:.0f} MB/s; {methods or 'renamed'})")
+
+
+def tree_pairs(source, target):
+    """(source file, target file) pairs mirroring the source tree below target
+
+    Folders are created right away, symlinks to folders are returned as pairs and not entered.
+    """
+    pairs = []
+    for dirpath, dirnames, filenames in os.walk(source):
+        target_dir = os.path.join(target, os.path.relpath(dirpath, source))
+        os.makedirs(target_dir, exist_ok=True)
+        links = [name for name in dirnames if os.path.islink(os.path.join(dirpath, name))]
+        pairs.extend((os.path.join(dirpath, name), os.path.join(target_dir, name)) for name in links + filenames)
+    return pairs
+
+
+def move_path(source, target, workers=None, log=print, stage="Move"):
+    """Rename source to target, copying concurrently and deleting the source across filesystems"""
+    try:
+        os.rename(source, target)
+        return {"files": 0, "bytes": 0, "seconds": 0.0, "methods": {}}
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    is_dir = os.path.isdir(source) and not os.path.islink(source)
+    existed = os.path.lexists(target)
+    try:
+        if is_dir:
+            stats = transfer_files(tree_pairs(source, target), workers, log, stage)
+            shutil.copystat(source, target)
+        else:
+            stats = transfer_files([(source, target)], workers, log, stage)
+    except BaseException:
+        # Leave the source as it was and drop the partial copy
+        if not existed:
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target, ignore_errors=True)
+            elif os.path.lexists(target):
+                os.remove(target)
+        raise
+    if is_dir:
+        shutil.rmtree(source)
+    else:
+        os.remove(source)
+    return stats
+
+
+SNAPSHOT_METHODS = {"reflink": reflink_file, "hardlink": _link_file, "copy": _copy_file}
+# Sources are never hardlinked: an editor saving in place would change the snapshot too
+SNAPSHOT_NO_LINK = (".py", ".pyw", ".pyi", ".pyx", ".pxd")
+
+
+class SourceSnapshot:
+    """Frozen copy of the project tree the build reads from, updated incrementally between builds"""
+
+    def __init__(self, main_file, output_dir=None, root=None):
+        self.source_dir = project_dir(main_file)
+        key = hashlib.sha256(self.source_dir.encode("utf-8")).hexdigest()[:12]
+        self.snapshot_dir = os.path.join(root or os.path.join(user_cache_dir(), "snapshots"), key)
+        self.output_dir = os.path.abspath(output_dir) if output_dir else None
+        self.unsupported = set()
+        self.methods = set()
+        self.linked = {}
+
+    def rewrite(self, command):
+        """Point project paths in command at the snapshot
+
+        The interpreter and launcher, the output directory and paths under folders the snapshot
+        skips (such as a project-local .venv) are left alone.
+        """
+        def swap(path):
+            if path != self.source_dir and not path.startswith(self.source_dir + os.sep):
+                return path
+            current = self.source_dir
+            for name in path[len(self.source_dir):].split(os.sep):
+                current = os.path.join(current, name)
+                if name and self._skip_dir(current, name):
+                    return path
+            return self.snapshot_dir + path[len(self.source_dir):]
+
+        # Everything up to "-m nuitka" (or a nuitka launcher itself) runs from where it is
+        start = 1
+        for index in range(len(command) - 1):
+            if command[index] == "-m" and command[index + 1] == "nuitka":
+                start = index + 2
+                break
+        rewritten = list(command[:start])
+        for arg in command[start:]:
+            if arg.startswith("--output-dir"):
+                rewritten.append(arg)
+            else:
+                rewritten.append("=".join(swap(part) for part in arg.split("=")))
+        return rewritten
+
+    def _skip_dir(self, path, name):
+        if name in SNAPSHOT_SKIP_DIRS or name.endswith((".build", ".dist", ".onefile-build")):
+            return True
+        return self.output_dir is not None and os.path.abspath(path) == self.output_dir
+
+    def _place(self, source, target):
+        """Put source at target with the cheapest method the filesystem supports"""
+        methods = ["reflink", "copy"] if source.endswith(SNAPSHOT_NO_LINK) else list(SNAPSHOT_METHODS)
+        for method in methods:
+            if method not in self.unsupported and SNAPSHOT_METHODS[method](source, target):
+                self.methods.add(method)
+                return
+            self.unsupported.add(method)
+
+    def prepare(self, log=print):
+        """Bring the snapshot in line with the project tree, touching only changed files"""
+        started = time.perf_counter()
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        seen = set()
+        placed = 0
+        for dirpath, dirnames, filenames in os.walk(self.source_dir):
+            dirnames[:] = [d for d in dirnames if not self._skip_dir(os.path.join(dirpath, d), d)]
+            rel_dir = os.path.normpath(os.path.relpath(dirpath, self.source_dir))
+            target_dir = os.path.normpath(os.path.join(self.snapshot_dir, rel_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            seen.add(rel_dir)
+            for name in filenames:
+                source = os.path.join(dirpath, name)
+                target = os.path.join(target_dir, name)
+                seen.add(os.path.normpath(os.path.join(rel_dir, name)))
+                try:
+                    src_stat = os.stat(source)
+                except OSError:
+                    continue
+                try:
+                    dst_stat = os.lstat(target)
+                    unchanged = (dst_stat.st_size == src_stat.st_size
+                                 and dst_stat.st_mtime_ns == src_stat.st_mtime_ns)
+                except OSError:
+                    unchanged = False
+                if not unchanged:
+                    if os.path.lexists(target):
+                        os.remove(target)
+                    self._place(source, target)
+                    placed += 1
+                if os.path.samestat(src_stat, os.stat(target)):
+                    self.linked[source] = (src_stat.st_size, src_stat.st_mtime_ns)
+
+        # Drop files that no longer exist in the project
+        for dirpath, dirnames, filenames in os.walk(self.snapshot_dir, topdown=False):
+            rel_dir = os.path.normpath(os.path.relpath(dirpath, self.snapshot_dir))
+            for name in filenames:
+                if os.path.normpath(os.path.join(rel_dir, name)) not in seen:
+                    os.remove(os.path.join(dirpath, name))
+            if rel_dir not in seen and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+        log(f"📸 Source snapshot ready in {time.perf_counter() - started:.2f}s "
+            f"({placed} files updated, methods: {', '.join(sorted(self.methods)) or 'none'})")
+
+    def verify(self, log=print, success=True):
+        """Warn when hardlinked files were edited in place while the build ran"""
+        changed = []
+        for source, (size, mtime_ns) in self.linked.items():
+            try:
+                stat = os.stat(source)
+            except OSError:
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                changed.append(os.path.relpath(source, self.source_dir))
+        if changed:
+            log(f"⚠️ {len(changed)} hardlinked files were modified in place during the build, "
+                f"the binary may include those edits: {', '.join(changed[:5])}")
+
+
+# Options that change the code of a compiled module and therefore the prebuilt cache key
+PREBUILT_OPTIONS = ("--lto", "--python-flag", "--clang", "--mingw64", "--msvc")
+PREBUILT_EXTENSIONS = (".so", ".pyd")
+# Interpreter, Nuitka and package details the cache key is made of
+PREBUILT_INFO_SCRIPT = r"""
+import sys, json, sysconfig, importlib.util, importlib.metadata as metadata
+try:
+    from nuitka.Version import getNuitkaVersion
+    nuitka = getNuitkaVersion()
+except Exception:
+    nuitka = None
+distributions = metadata.packages_distributions()
+packages = {}
+for name in sys.argv[1:]:
+    try:
+        spec = importlib.util.find_spec(name)
+    except Exception:
+        spec = None
+    if spec is None or not spec.origin:
+        packages[name] = None
+        continue
+    version = None
+    for dist in distributions.get(name, []):
+        try:
+            version = metadata.version(dist)
+            break
+        except Exception:
+            pass
+    locations = list(spec.submodule_search_locations or [])
+    packages[name] = {"path": locations[0] if locations else spec.origin, "version": version}
+print(json.dumps({"python": sys.version.split()[0], "ext_suffix": sysconfig.get_config_var("EXT_SUFFIX"),
+                  "executable": sys.executable, "nuitka": nuitka, "packages": packages}))
+"""
+# Non-stdlib modules a package imports from outside itself, they must still be bundled with the app
+# Modules a package imports beyond what every interpreter loads at startup, standard library included:
+# a standalone build only bundles the stdlib modules it follows, and it no longer follows the package
+PREBUILT_IMPORTS_SCRIPT = r"""
+import sys, json
+before = set(sys.modules)
+__import__(sys.argv[1])
+print(json.dumps(sorted(name for name in set(sys.modules) - before
+                        if name not in sys.builtin_module_names and name.split(".")[0] != sys.argv[1])))
+"""
+
+
+def interpreter_info(python, packages, timeout=60):
+    """Version details of python, its Nuitka and the given packages"""
+    proc = subprocess.run([python, "-c", PREBUILT_INFO_SCRIPT] + list(packages), capture_output=True, text=True,
+                          timeout=timeout, creationflags=NO_WINDOW)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "interpreter failed")
+    return json.loads(proc.stdout)
+
+
+def module_options(command):
+    """The options of command that prebuilt modules must be compiled with too"""
+    return sorted(arg for arg in command if option_name(arg) in PREBUILT_OPTIONS)
+
+
+def package_extensions(path):
+    """Extension modules shipped inside a package folder"""
+    found = []
+    for dirpath, _, filenames in os.walk(path):
+        found.extend(os.path.join(dirpath, name) for name in filenames if name.endswith(PREBUILT_EXTENSIONS))
+    return found
+
+
+class PrebuiltModuleCache:
+    """Third-party packages compiled once with --module, keyed by interpreter, Nuitka, version and options"""
+    META_FILE = "meta.json"
+    # Bumped when the metadata changes meaning, older entries are rebuilt
+    FORMAT = 2
+
+    def __init__(self, root):
+        self.root = root
+
+    def key(self, info, package, options):
+        payload = json.dumps([info["python"], info["ext_suffix"], info["executable"], info["nuitka"], package,
+                              (info["packages"].get(package) or {}).get("version"), options])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def entry_path(self, key):
+        return os.path.join(self.root, key)
+
+    def module_path(self, meta):
+        return os.path.join(self.entry_path(meta["key"]), meta["file"])
+
+    def lookup(self, info, packages, options):
+        """Stored metadata of each package's prebuilt module for this configuration, or None"""
+        found = {}
+        for package in packages:
+            meta = read_json(os.path.join(self.entry_path(self.key(info, package, options)), self.META_FILE), None)
+            usable = meta and meta.get("format") == self.FORMAT and os.path.isfile(self.module_path(meta))
+            found[package] = meta if usable else None
+        return found
+
+    def build(self, python, package, info, options, log=print, should_stop=lambda: False):
+        """Compile package into one extension module and store it, returns its metadata"""
+        spec = info["packages"].get(package)
+        if not spec:
+            raise RuntimeError(f"{package} is not importable by {python}")
+        source = spec["path"]
+        if os.path.isdir(source):
+            extensions = package_extensions(source)
+            if extensions:
+                raise RuntimeError(f"{package} ships extension modules ({os.path.basename(extensions[0])}...), "
+                                   f"which a --module build can't include")
+        key = self.key(info, package, options)
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="nuitka-prebuild-") as work_dir:
+            command = [python, "-m", "nuitka", "--module", f"--output-dir={work_dir}", "--remove-output",
+                       "--assume-yes-for-downloads"] + options
+            if os.path.isdir(source):
+                command.append(f"--include-package={package}")
+            command.append(source)
+            log(f"🧱 Compiling {package} {spec.get('version') or '(unknown version)'} as an extension module...")
+            proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                    encoding="utf-8", errors="replace", cwd=work_dir, creationflags=NO_WINDOW)
+            output = []
+            for line in iter(proc.stdout.readline, ""):
+                output.append(line.rstrip())
+                if should_stop():
+                    proc.terminate()
+            if proc.wait() != 0:
+                raise RuntimeError(f"Compiling {package} failed: " + " | ".join(output[-3:]))
+            built = [name for name in os.listdir(work_dir)
+                     if name.startswith(package + ".") and name.endswith(PREBUILT_EXTENSIONS)]
+            if not built:
+                raise RuntimeError(f"Nuitka produced no extension module for {package}")
+
+            imports = subprocess.run([python, "-c", PREBUILT_IMPORTS_SCRIPT, package], capture_output=True,
+                                     text=True, timeout=120, creationflags=NO_WINDOW)
+            if imports.returncode != 0:
+                # Without the import list the app would miss modules only the package uses
+                error = imports.stderr.strip().splitlines()[-1:] or [f"exit code {imports.returncode}"]
+                raise RuntimeError(f"Importing {package} to record its imports failed: {error[0]}")
+            entry = self.entry_path(key)
+            temp = entry + ".tmp"
+            shutil.rmtree(temp, ignore_errors=True)
+            os.makedirs(temp)
+            copy_file(os.path.join(work_dir, built[0]), os.path.join(temp, built[0]))
+        meta = {
+            "format": self.FORMAT,
+            "key": key,
+            "package": package,
+            "version": spec.get("version"),
+            "python": info["python"],
+            "nuitka": info["nuitka"],
+            "options": options,
+            "file": built[0],
+            "imports": json.loads(imports.stdout),
+            "built": time.time(),
+            "build_s": round(time.perf_counter() - started, 1),
+        }
+        write_json(os.path.join(temp, self.META_FILE), meta)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(temp, entry)
+        log(f"🧱 Prebuilt {package} in {meta['build_s']:.0f}s ({os.path.getsize(self.module_path(meta)) / 1024 / 1024:.1f} MB)")
+        return meta
+
+    def build_missing(self, python, packages, options, log=print, progress=lambda value: None,
+                      should_stop=lambda: False):
+        """Prebuild every package that has no module for this configuration yet"""
+        info = interpreter_info(python, packages)
+        if not info["nuitka"]:
+            raise RuntimeError(f"Nuitka is not installed for {python}")
+        found = self.lookup(info, packages, options)
+        missing = [package for package, meta in found.items() if not meta]
+        for index, package in enumerate(missing):
+            if should_stop():
+                break
+            try:
+                found[package] = self.build(python, package, info, options, log, should_stop)
+            except (RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+                log(f"⚠️ {e}")
+            progress(int((index + 1) * 100 / len(missing)))
+        return found
+
+    def entries(self):
+        """Stored modules, newest first"""
+        items = []
+        for name in os.listdir(self.root) if os.path.isdir(self.root) else []:
+            meta = read_json(os.path.join(self.root, name, self.META_FILE), None)
+            if meta:
+                items.append(dict(meta, size=path_size(os.path.join(self.root, name))))
+        return sorted(items, key=lambda item: item.get("built", 0), reverse=True)
+
+    def remove(self, key):
+        shutil.rmtree(self.entry_path(key), ignore_errors=True)
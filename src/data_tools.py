@@ -0,0 +1,721 @@
+import io
+import os
+import re
+import sys
+import glob
+import time
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import zstandard
+
+from perf_tools import measure_startup, path_size
+from project_store import read_json, write_json
+from build_env import SNAPSHOT_SKIP_DIRS, user_cache_dir
+
+# Nuitka matches data file patterns case-insensitively where the filesystem is
+PATTERN_FLAGS = re.IGNORECASE if sys.platform.startswith("win") else 0
+
+
+def to_posix(path):
+    return path.replace(os.sep, "/")
+
+
+class ProjectIndex:
+    """In-memory index of the files of a project tree, updated one directory at a time"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.dirs = {}  # Relative posix directory ("" for the root) -> {file name: size}
+        self.listings = {}  # Relative directory -> {prefix: newline-joined prefixed file names}
+
+    def abs_dir(self, rel):
+        return os.path.join(self.root, *rel.split("/")) if rel else self.root
+
+    def scan_dir(self, rel):
+        """Index the files of one directory, returns its subdirectories"""
+        files, subdirs = {}, []
+        try:
+            with os.scandir(self.abs_dir(rel)) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SNAPSHOT_SKIP_DIRS:
+                                subdirs.append(f"{rel}/{entry.name}" if rel else entry.name)
+                        elif entry.is_file():
+                            files[entry.name] = entry.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            self.dirs.pop(rel, None)
+            self.listings.pop(rel, None)
+            return []
+        self.dirs[rel] = files
+        self.listings.pop(rel, None)
+        return subdirs
+
+    def build(self, rel="", should_stop=None):
+        """Index rel and everything below it, returns the indexed directories"""
+        pending, indexed = [rel], []
+        while pending:
+            if should_stop and should_stop():
+                break
+            current = pending.pop()
+            pending.extend(self.scan_dir(current))
+            indexed.append(current)
+        return indexed
+
+    def subtree(self, rel):
+        """Indexed directories at or below rel"""
+        if not rel:
+            return list(self.dirs)
+        prefix = rel + "/"
+        return [d for d in self.dirs if d == rel or d.startswith(prefix)]
+
+    def refresh_dir(self, path):
+        """Re-index the directory at path after a change, returns newly indexed directories"""
+        rel = self.relative(path)
+        if rel is None:
+            return []
+        known = set(self.subtree(rel))
+        subdirs = self.scan_dir(rel)
+        if rel not in self.dirs:
+            # The directory itself is gone
+            for stale in known:
+                self.dirs.pop(stale, None)
+                self.listings.pop(stale, None)
+            return []
+        added = []
+        for subdir in subdirs:
+            if subdir not in self.dirs:
+                added.extend(self.build(subdir))
+        # Drop subtrees whose top directory disappeared
+        present = set(subdirs)
+        for stale in known:
+            top = stale[len(rel) + 1:].split("/", 1)[0] if rel else stale.split("/", 1)[0]
+            if stale != rel and (f"{rel}/{top}" if rel else top) not in present:
+                self.dirs.pop(stale, None)
+                self.listings.pop(stale, None)
+        return added
+
+    def relative(self, path):
+        """Posix path of path relative to the root, or None when outside the project"""
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == os.curdir:
+            return ""
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep) or os.path.isabs(rel):
+            return None
+        return to_posix(rel)
+
+    def files_under(self, rel):
+        """(relative path, size) of every indexed file at or below rel"""
+        for directory in self.subtree(rel):
+            prefix = directory + "/" if directory else ""
+            for name, size in self.dirs.get(directory, {}).items():
+                yield prefix + name, size
+
+    def listing(self, directory, prefix):
+        """Newline-joined file names of directory with prefix, for matching a whole folder at once"""
+        cached = self.listings.setdefault(directory, {})
+        if prefix not in cached:
+            cached[prefix] = "\n".join(prefix + name for name in self.dirs[directory] if "\n" not in name)
+        return cached[prefix]
+
+    def file_count(self):
+        return sum(len(files) for files in self.dirs.values())
+
+
+def pattern_regex(pattern, cross_dirs):
+    """Regex source for a wildcard pattern matched against one line of a newline-joined listing
+
+    With cross_dirs, * spans directories as in fnmatch (--noinclude-data-files); otherwise only
+    ** does, as in a path glob (--include-data-files).
+    """
+    star = r"[^\n]*" if cross_dirs else r"[^/\n]*"
+    parts, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i) and not cross_dirs:
+            parts.append(r"(?:[^\n]*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern) and not cross_dirs:
+            parts.append(r"(?:/[^\n]*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(r"[^\n]*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append(star)
+            i += 1
+        elif pattern[i] == "?":
+            parts.append(r"[^\n]" if cross_dirs else r"[^/\n]")
+            i += 1
+        elif pattern[i] == "[" and pattern.find("]", i + 2) != -1:
+            end = pattern.find("]", i + 2)
+            body = pattern[i + 1:end]
+            negate = body.startswith("!")
+            # Escape the class body first, the negation prefix must stay a real regex escape
+            body = body[1:] if negate else body
+            body = body.replace("\\", "\\\\").replace("^", "\\^")
+            parts.append("[" + (r"^\n" if negate else "") + body + "]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+def compile_patterns(patterns, cross_dirs=True):
+    """Single precompiled matcher for a list of patterns, applied to newline-joined path listings"""
+    patterns = [clean_dest(p.strip()) for p in patterns if p.strip()]
+    if not patterns:
+        return None
+    alternatives = "|".join(pattern_regex(p, cross_dirs) for p in patterns)
+    return re.compile(f"^(?:{alternatives})$", re.MULTILINE | PATTERN_FLAGS)
+
+
+def split_mapping(entry):
+    """Split a Source=Destination entry"""
+    source, _, dest = entry.partition("=")
+    return source.strip(), dest.strip()
+
+
+def clean_dest(dest):
+    dest = to_posix(dest)
+    while dest.startswith("./"):
+        dest = dest[2:]
+    return dest
+
+
+def folder_targets(index, rel, dest):
+    """(indexed directory, destination prefix) for every folder below the included folder rel"""
+    cut = len(rel) + 1 if rel else 0
+    for directory in index.subtree(rel):
+        sub = directory[cut:] if directory != rel else ""
+        prefix = "/".join(part for part in (dest, sub) if part)
+        yield directory, prefix + "/" if prefix else ""
+
+
+def preview_data_files(index, data_dirs, data_files, exclude_patterns, base_dir):
+    """Count the files and bytes the include entries select, split by the exclude patterns"""
+    matcher = compile_patterns(exclude_patterns)
+    included_files = included_bytes = excluded_files = excluded_bytes = 0
+    outside = []
+
+    def resolve(path):
+        return index.relative(path if os.path.isabs(path) else os.path.join(base_dir, path))
+
+    for entry in data_dirs:
+        source, dest = split_mapping(entry)
+        rel = resolve(source)
+        if rel is None:
+            outside.append(source)
+            continue
+        dest = clean_dest(dest or os.path.basename(os.path.normpath(source))).rstrip("/")
+        for directory, prefix in folder_targets(index, rel, dest):
+            files = index.dirs[directory]
+            included_files += len(files)
+            included_bytes += sum(files.values())
+            if matcher is None or not files:
+                continue
+            cut = len(prefix)
+            for target in matcher.findall(index.listing(directory, prefix)):
+                excluded_files += 1
+                excluded_bytes += files[target[cut:]]
+
+    for entry in data_files:
+        source, dest = split_mapping(entry)
+        rel = resolve(source)
+        if rel is None:
+            outside.append(source)
+            continue
+        # Only walk below the literal part of the pattern
+        literal = []
+        for part in rel.split("/")[:-1]:
+            if glob.has_magic(part):
+                break
+            literal.append(part)
+        select = compile_patterns([rel], cross_dirs=False)
+        dest = clean_dest(dest)
+        for directory in index.subtree("/".join(literal)):
+            files = index.dirs[directory]
+            prefix = directory + "/" if directory else ""
+            for path in select.findall(index.listing(directory, prefix)):
+                name = path[len(prefix):]
+                size = files[name]
+                included_files += 1
+                included_bytes += size
+                target = dest + name if not dest or dest.endswith("/") else dest
+                if matcher is not None and matcher.match(target):
+                    excluded_files += 1
+                    excluded_bytes += size
+
+    return {
+        "included_files": included_files - excluded_files,
+        "included_bytes": included_bytes - excluded_bytes,
+        "excluded_files": excluded_files,
+        "excluded_bytes": excluded_bytes,
+        "outside": outside,
+    }
+
+
+HASH_CACHE_FILE = "hash-cache.json"
+# Bytes hashed before the full hash, to split equally sized files cheaply
+HEAD_BYTES = 64 * 1024
+HASH_CHUNK = 1024 * 1024
+
+
+class HashCache:
+    """SHA-256 of files keyed by path, reused while size and mtime are unchanged"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = read_json(path, {})
+        self.dirty = False
+
+    def get(self, path, stat):
+        entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        return None
+
+    def put(self, path, stat, digest):
+        self.entries[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.dirty = True
+
+    def save(self):
+        if self.dirty:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_json(self.path, self.entries)
+            self.dirty = False
+
+
+def default_hash_cache():
+    return HashCache(os.path.join(user_cache_dir(), HASH_CACHE_FILE))
+
+
+def file_digest(path, limit=None):
+    """SHA-256 of a file, or of its first limit bytes"""
+    digest = hashlib.sha256()
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(HASH_CHUNK if remaining is None else min(HASH_CHUNK, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def included_data_files(data_dirs, data_files, exclude_patterns, base_dir):
+    """(source path, destination path, size) of every file the include entries select"""
+    matcher = compile_patterns(exclude_patterns)
+    selected = []
+
+    def resolve(path):
+        return os.path.normpath(path if os.path.isabs(path) else os.path.join(base_dir, path))
+
+    def add(source, target):
+        if matcher is not None and matcher.match(target):
+            return
+        try:
+            selected.append((source, target, os.path.getsize(source)))
+        except OSError:
+            pass
+
+    for entry in data_dirs:
+        source, dest = split_mapping(entry)
+        source = resolve(source)
+        dest = clean_dest(dest or os.path.basename(source)).rstrip("/")
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames[:] = [d for d in dirnames if d not in SNAPSHOT_SKIP_DIRS]
+            rel = to_posix(os.path.relpath(dirpath, source))
+            prefix = "/".join(part for part in (dest, "" if rel == "." else rel) if part)
+            for name in filenames:
+                add(os.path.join(dirpath, name), f"{prefix}/{name}" if prefix else name)
+
+    for entry in data_files:
+        source, dest = split_mapping(entry)
+        dest = clean_dest(dest)
+        for path in glob.glob(resolve(source), recursive=True):
+            if os.path.isfile(path):
+                name = os.path.basename(path)
+                add(os.path.normpath(path), dest + name if not dest or dest.endswith("/") else dest)
+    return selected
+
+
+def find_duplicate_files(files, cache=None, workers=None, log=print, should_stop=None):
+    """Group (source, destination, size) entries with identical content
+
+    Only files sharing a size are read: first their leading bytes, then the full content of
+    those that still collide. Returns duplicate sets sorted by wasted bytes.
+    """
+    by_size = {}
+    for source, target, size in files:
+        if size:
+            by_size.setdefault(size, []).append((source, target))
+    candidates = {size: group for size, group in by_size.items() if len(group) > 1}
+
+    # The same source file included twice needs no hashing
+    def real(source):
+        return os.path.normcase(os.path.realpath(source))
+
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+        head_groups = {}
+        sources = {real(s) for group in candidates.values() for s, _ in group}
+        distinct_sizes = {size for size, group in candidates.items() if len({real(s) for s, _ in group}) > 1}
+        to_head = sorted({real(s) for size in distinct_sizes for s, _ in candidates[size]})
+        heads = dict(zip(to_head, pool.map(lambda p: file_digest(p, HEAD_BYTES), to_head)))
+
+        for size, group in candidates.items():
+            for source, target in group:
+                key = heads.get(real(source), real(source))
+                head_groups.setdefault((size, key), []).append((source, target))
+
+        full_needed = sorted({real(s) for (size, _), group in head_groups.items()
+                              if len(group) > 1 and size > HEAD_BYTES and len({real(x) for x, _ in group}) > 1
+                              for s, _ in group})
+        log(f"🔍 {len(files)} data files, {len(sources)} share a size, {len(full_needed)} need a full hash")
+
+        def full_hash(path):
+            if should_stop and should_stop():
+                return None
+            stat = os.stat(path)
+            cached = cache.get(path, stat) if cache else None
+            if cached is None:
+                cached = file_digest(path)
+                if cache:
+                    cache.put(path, stat, cached)
+            return cached
+
+        digests = dict(zip(full_needed, pool.map(full_hash, full_needed)))
+    if cache:
+        cache.save()
+    if should_stop and should_stop():
+        return []
+
+    sets = {}
+    for (size, head), group in head_groups.items():
+        if len(group) < 2:
+            continue
+        for source, target in group:
+            key = digests.get(real(source)) or head
+            sets.setdefault((size, key), []).append((source, target))
+
+    duplicates = []
+    for (size, digest), group in sets.items():
+        if len(group) > 1:
+            duplicates.append({
+                "size": size,
+                "digest": digest,
+                "files": sorted(group, key=lambda item: item[1]),
+                "wasted": size * (len(group) - 1),
+            })
+    return sorted(duplicates, key=lambda d: d["wasted"], reverse=True)
+
+
+def duplicate_suggestions(duplicates, data_dirs, base_dir):
+    """Suggested fixes for duplicate sets: {"text", "exclude": [patterns]}"""
+    suggestions = []
+
+    # Data directories nested in another included directory are copied twice
+    sources = []
+    for entry in data_dirs:
+        source, dest = split_mapping(entry)
+        path = os.path.normpath(source if os.path.isabs(source) else os.path.join(base_dir, source))
+        sources.append((entry, path, clean_dest(dest or os.path.basename(path)).rstrip("/")))
+    for entry, path, dest in sources:
+        for other_entry, other_path, other_dest in sources:
+            if path != other_path and path.startswith(other_path + os.sep):
+                inner = to_posix(os.path.relpath(path, other_path))
+                suggestions.append({
+                    "text": f"'{entry}' is inside '{other_entry}' (already shipped as {other_dest}/{inner}): "
+                            f"remove the entry, or exclude {other_dest}/{inner}/* from the outer one",
+                    "exclude": [f"{other_dest}/{inner}/*"],
+                })
+
+    # Otherwise keep one copy of each set and exclude the others, consistently with the above
+    nested = compile_patterns([pattern for s in suggestions for pattern in s["exclude"]])
+    for duplicate in duplicates:
+        targets = [target for _, target in duplicate["files"]]
+        remaining = [t for t in targets if nested is None or not nested.match(t)] or targets[:1]
+        keep, *others = remaining
+        if not others:
+            continue
+        suggestions.append({
+            "text": f"Keep {keep}, exclude {', '.join(others)} "
+                    f"(saves {duplicate['size'] * len(others) / 1024 / 1024:.2f} MB)",
+            "exclude": others,
+        })
+    return suggestions
+
+
+# zstd levels compared by the onefile payload benchmark
+ONEFILE_LEVELS = (1, 3, 9, 19, 22)
+# Level used to estimate per-file compressibility
+SAMPLE_LEVEL = 3
+
+
+def payload_files(dist_dir):
+    """(relative path, size) of every file packed into the onefile payload, largest first"""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(dist_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            files.append((to_posix(os.path.relpath(path, dist_dir)), os.path.getsize(path)))
+    return sorted(files, key=lambda item: item[1], reverse=True)
+
+
+def file_compressibility(dist_dir, files, level=SAMPLE_LEVEL, should_stop=None):
+    """Compressed size of each payload file at level, as {relative path: bytes}"""
+    compressor = zstandard.ZstdCompressor(level=level)
+    sizes = {}
+    for rel, _ in files:
+        if should_stop and should_stop():
+            break
+        with open(os.path.join(dist_dir, rel), "rb") as f:
+            sizes[rel] = len(compressor.compress(f.read()))
+    return sizes
+
+
+def compress_payload(dist_dir, files, level, threads=-1):
+    """Compress the payload files as one zstd stream like the onefile bootstrap expects"""
+    compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+    output = io.BytesIO()
+    with compressor.stream_writer(output, closefd=False) as writer:
+        for rel, _ in files:
+            with open(os.path.join(dist_dir, rel), "rb") as f:
+                shutil.copyfileobj(f, writer, HASH_CHUNK)
+    return output.getvalue()
+
+
+def decompress_time(payload, runs=3):
+    """Best time in seconds to decompress payload"""
+    decompressor = zstandard.ZstdDecompressor()
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        with decompressor.stream_reader(payload) as reader:
+            while reader.read(HASH_CHUNK):
+                pass
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_onefile_payload(dist_dir, levels=ONEFILE_LEVELS, read_mb_s=500, log=print,
+                              progress=None, should_stop=None):
+    """Measure payload size, compression time and startup extraction time per compression setting
+
+    Extraction time is estimated as reading the payload at read_mb_s plus decompressing it;
+    writing the extracted files costs the same for every setting and is left out.
+    """
+    files = payload_files(dist_dir)
+    raw_bytes = sum(size for _, size in files)
+    read_s = lambda size: size / (read_mb_s * 1024 * 1024)
+    log(f"📦 Onefile payload: {len(files)} files, {raw_bytes / 1024 / 1024:.1f} MB")
+
+    settings = [{
+        "setting": "none",
+        "level": None,
+        "payload_bytes": raw_bytes,
+        "compress_s": 0.0,
+        "decompress_ms": 0.0,
+        "extract_ms": read_s(raw_bytes) * 1000,
+    }]
+    steps = len(levels) + 1
+    for step, level in enumerate(levels, 1):
+        if should_stop and should_stop():
+            break
+        started = time.perf_counter()
+        payload = compress_payload(dist_dir, files, level)
+        compress_s = time.perf_counter() - started
+        decompress_s = decompress_time(payload)
+        settings.append({
+            "setting": f"zstd {level}",
+            "level": level,
+            "payload_bytes": len(payload),
+            "compress_s": compress_s,
+            "decompress_ms": decompress_s * 1000,
+            "extract_ms": (read_s(len(payload)) + decompress_s) * 1000,
+        })
+        log(f"📦 zstd {level}: {len(payload) / 1024 / 1024:.1f} MB in {compress_s:.1f}s, "
+            f"decompresses in {decompress_s * 1000:.0f} ms")
+        if progress:
+            progress(int(step * 100 / steps))
+
+    sample = file_compressibility(dist_dir, files, should_stop=should_stop)
+    if progress:
+        progress(100)
+    return {
+        "files": [{"path": rel, "size": size, "compressed": sample.get(rel)} for rel, size in files],
+        "raw_bytes": raw_bytes,
+        "settings": settings,
+        "fastest": min(settings, key=lambda s: s["extract_ms"]),
+        "smallest": min(settings, key=lambda s: s["payload_bytes"]),
+    }
+
+
+# Onefile extraction presets: key -> (label, base folder token); "" keeps Nuitka's per-launch extraction
+ONEFILE_CACHE_PRESETS = {
+    "per_launch": ("Extract on every launch (default)", ""),
+    "user_cache": ("Versioned cache in the user cache folder", "{CACHE_DIR}"),
+    "temp_cache": ("Versioned cache in the temp folder", "{TEMP}"),
+}
+# Folder Nuitka extracts to when no tempdir spec is given, with pid and time in the name
+DEFAULT_EXTRACT_PATTERN = re.compile(r"^onefile_(\d+)_\d+")
+
+
+def safe_path_part(text):
+    """Make metadata usable as a single folder name"""
+    return re.sub(r'[<>:"/\\|?*\s]+', "_", text.strip()).strip("._")
+
+
+def cached_tempdir_spec(base, company, product, version):
+    """Versioned --onefile-tempdir-spec, or "" when base is empty"""
+    if not base:
+        return ""
+    return "/".join([base] + [safe_path_part(part) for part in (company, product, version)])
+
+
+def spec_tokens():
+    """Local values of the folder tokens Nuitka expands in --onefile-tempdir-spec"""
+    if sys.platform.startswith("win"):
+        cache = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        cache = os.path.expanduser("~/Library/Caches")
+    else:
+        cache = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return {"{CACHE_DIR}": cache, "{TEMP}": tempfile.gettempdir(), "{HOME}": os.path.expanduser("~")}
+
+
+def expand_tempdir_spec(spec):
+    """Local path of a cached tempdir spec, or None when it changes per launch or can't be resolved"""
+    if not spec or "{PID}" in spec or "{TIME}" in spec:
+        return None
+    for token, value in spec_tokens().items():
+        spec = spec.replace(token, value)
+    if "{" in spec:
+        return None
+    return os.path.normpath(spec)
+
+
+def versioned_cache_dir(spec):
+    """Local folder of a {TOKEN}/company/product/version spec, or None for any other shape"""
+    parts = re.split(r"[/\\]", spec or "")
+    if len(parts) != 4 or parts[0] not in spec_tokens():
+        return None
+    if not all(part and part == safe_path_part(part) and "{" not in part for part in parts[1:]):
+        return None
+    return expand_tempdir_spec(spec)
+
+
+def deletable_cache(path):
+    """Whether path may be deleted: never a token folder, its direct child or one of its parents
+
+    Per-launch extraction folders directly in the temp folder are the one exception.
+    """
+    path = os.path.normcase(os.path.abspath(path))
+    temp = os.path.normcase(os.path.abspath(tempfile.gettempdir()))
+    for root in spec_tokens().values():
+        root = os.path.normcase(os.path.abspath(root))
+        if path == root or root.startswith(os.path.join(path, "")):
+            return False
+        if os.path.dirname(path) == root:
+            return root == temp and DEFAULT_EXTRACT_PATTERN.match(os.path.basename(path)) is not None
+    return True
+
+
+def pid_running(pid):
+    """Whether a process with pid exists"""
+    if sys.platform.startswith("win"):
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def find_stale_caches(current_spec=""):
+    """Extraction folders that are no longer used: {path, size, age_days, reason}
+
+    Finds other versions in the product folder of the current versioned cache, and per-launch
+    extraction folders left behind by processes that are gone.
+    """
+    stale = []
+    now = time.time()
+
+    def add(path, reason):
+        try:
+            age = (now - os.path.getmtime(path)) / 86400
+        except OSError:
+            return
+        stale.append({"path": path, "size": path_size(path), "age_days": age, "reason": reason})
+
+    current = versioned_cache_dir(current_spec)
+    if current:
+        parent = os.path.dirname(current)
+        if os.path.isdir(parent):
+            for name in sorted(os.listdir(parent)):
+                path = os.path.join(parent, name)
+                if os.path.isdir(path) and path != current and deletable_cache(path):
+                    add(path, f"Older version of {os.path.basename(parent)}")
+
+    temp = tempfile.gettempdir()
+    try:
+        names = os.listdir(temp)
+    except OSError:
+        names = []
+    for name in names:
+        match = DEFAULT_EXTRACT_PATTERN.match(name)
+        path = os.path.join(temp, name)
+        if match and os.path.isdir(path) and not pid_running(int(match.group(1))):
+            add(path, f"Left behind by process {match.group(1)}")
+    return sorted(stale, key=lambda item: item["size"], reverse=True)
+
+
+def prune_caches(paths, log=print):
+    """Delete extraction folders, returns the bytes freed"""
+    freed = 0
+    for path in paths:
+        if not deletable_cache(path):
+            log(f"⚠️ Refusing to delete {path}")
+            continue
+        size = path_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        if not os.path.exists(path):
+            freed += size
+            log(f"🗑 Removed {path}")
+    return freed
+
+
+def measure_cold_warm(binary, spec, args=None, runs=5, timeout=60):
+    """Startup time of a onefile binary with an empty (cold) and a filled (warm) extraction cache"""
+    # Only a versioned cache is cleared; any other fixed folder could hold unrelated files
+    cache = versioned_cache_dir(spec)
+    cleared = bool(cache) and deletable_cache(cache)
+    if cleared:
+        shutil.rmtree(cache, ignore_errors=True)
+    cold = measure_startup(binary, args, runs=1, warmup=0, timeout=timeout)
+    warm = measure_startup(binary, args, runs=runs, warmup=0, timeout=timeout)
+    if cold is None or warm is None:
+        return None
+    return {
+        "spec": spec,
+        "cached": expand_tempdir_spec(spec) is not None,
+        "cleared": cleared,
+        "cold_ms": cold["min_ms"],
+        "warm_ms": warm["median_ms"],
+        "measured": time.time(),
+    }
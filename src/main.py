@@ -2,16 +2,27 @@ import sys
 import os
 import subprocess
 import logging
+import time
+import shlex
 from datetime import datetime
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QLineEdit, QTextEdit, QPushButton, QCheckBox, QFileDialog, QMessageBox,
     QGroupBox, QFrame, QProgressBar, QSizePolicy, QTabWidget, QComboBox,
-    QSpinBox, QListWidget, QListWidgetItem, QAbstractItemView, QSplitter, QToolButton
+    QSpinBox, QListWidget, QListWidgetItem, QAbstractItemView, QSplitter, QToolButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QInputDialog
 )
-from PySide6.QtCore import Qt, QThread, Signal, QSettings
+from PySide6.QtCore import Qt, QThread, Signal, QSettings, QTimer, QFileSystemWatcher
 from PySide6.QtGui import QFont, QIcon, QTextCursor, QPalette, QColor
 
+import perf_tools
+import project_store
+import build_env
+import preflight
+import data_tools
+import binary_tools
+import artifact_tools
+
 # Set log format
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
@@ -22,44 +33,83 @@ class PackageThread(QThread):
     progress_signal = Signal(int)
     finished_signal = Signal(bool)
 
-    def __init__(self, command, parent=None):
+    def __init__(self, command, parent=None, before_build=None, after_build=None, cleanup=None, env=None):
         super().__init__(parent)
         self.command = command
+        self.env = env
         self.running = True
         self.process = None  # Reference to subprocess
+        self.before_build = before_build or []  # Callables taking (log), run before Nuitka starts, may return False to abort
+        self.after_build = after_build or []  # Callables taking (log, success), may return False to fail the build
+        self.cleanup = cleanup or []  # Callables taking (log, success), always run last, even after a stop
 
     def run(self):
         """Execute packaging command and capture output"""
         self.log_signal.emit(f"Starting packaging command: {' '.join(self.command)}\n")
+        success = False
         try:
-            # Create subprocess to execute command
-            self.process = subprocess.Popen(
-                self.command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                bufsize=1
-            )
+            # Prepare the build (e.g. restore reusable build directories), a step returning False aborts it
+            aborted = any(not self.running or step(self.log_signal.emit) is False for step in self.before_build)
+            if aborted:
+                self.log_signal.emit("\n❌ Packaging aborted before Nuitka started")
+            else:
+                # Create subprocess to execute command
+                self.process = subprocess.Popen(
+                    self.command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    encoding='utf-8',
+                    errors='replace',
+                    env=self.env,
+                    bufsize=1
+                )
 
-            # Read output in real-time
-            for line in iter(self.process.stdout.readline, ''):
-                if not self.running:
-                    break
-                self.log_signal.emit(line.strip())
+                # Read output in real-time
+                for line in iter(self.process.stdout.readline, ''):
+                    if not self.running:
+                        break
+                    self.log_signal.emit(line.strip())
 
-            # Wait for process to finish
-            return_code = self.process.wait()
-            if return_code == 0:
-                self.log_signal.emit("\n✅ Packaging completed successfully!")
-                self.finished_signal.emit(True)
-            else:
-                self.log_signal.emit(f"\n❌ Packaging failed with error code: {return_code}")
-                self.finished_signal.emit(False)
+                # Wait for process to finish
+                if not self.running:
+                    # A stopped Nuitka gets a few seconds to exit before it is killed
+                    try:
+                        self.process.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        self.process.kill()
+                return_code = self.process.wait()
+                success = return_code == 0 and self.running
+                if not success:
+                    self.log_signal.emit(f"\n❌ Packaging failed with error code: {return_code}")
         except Exception as e:
             self.log_signal.emit(f"\n❌ Error during execution: {str(e)}")
-            self.finished_signal.emit(False)
+
+        # Post-build steps also run after failures so they can clean up, a stop skips the remaining ones
+        try:
+            for step in self.after_build:
+                if not self.running:
+                    success = False
+                    self.log_signal.emit("🛑 Remaining post-build steps skipped")
+                    break
+                try:
+                    if step(self.log_signal.emit, success) is False:
+                        success = False
+                except Exception as e:
+                    self.log_signal.emit(f"⚠️ Post-build step failed: {str(e)}")
+        finally:
+            # Cleanup runs however the build ended, so nothing is left behind in scratch space
+            for step in self.cleanup:
+                try:
+                    step(self.log_signal.emit, success)
+                except Exception as e:
+                    self.log_signal.emit(f"⚠️ Cleanup step failed: {str(e)}")
+        if not self.running:
+            success = False
+
+        if success:
+            self.log_signal.emit("\n✅ Packaging completed successfully!")
+        self.finished_signal.emit(success)
 
     def stop(self):
         """Stop packaging process"""
@@ -74,6 +124,33 @@ class PackageThread(QThread):
                 self.log_signal.emit(f"⚠️ Failed to terminate process: {str(e)}")
 
 
+class ToolThread(QThread):
+    """Thread for running analysis and benchmark tasks in the background"""
+    log_signal = Signal(str)
+    progress_signal = Signal(int)
+    result_signal = Signal(object)
+    finished_signal = Signal(bool)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task  # Callable taking (log, progress, should_stop)
+        self.running = True
+
+    def run(self):
+        """Run the task and report its result"""
+        try:
+            result = self.task(self.log_signal.emit, self.progress_signal.emit, lambda: not self.running)
+            self.result_signal.emit(result)
+            self.finished_signal.emit(True)
+        except Exception as e:
+            self.log_signal.emit(f"❌ Error during execution: {str(e)}")
+            self.finished_signal.emit(False)
+
+    def stop(self):
+        """Ask the task to stop at the next checkpoint"""
+        self.running = False
+
+
 class NuitkaPackager(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -105,6 +182,26 @@ class NuitkaPackager(QMainWindow):
         self.output_dir = ""
         self.package_thread = None
         self.plugins = []
+        self.tool_thread = None
+        self.tuner_results = []
+        self.build_started = None
+        self.build_command_args = []
+        self.last_build_id = None
+        self.build_profile = ""
+        self.build_extra = {}
+        self.profiles = {}
+        self.payload_recommendation = None
+        self.qt_analysis = None
+        self.project_index = None
+        self.index_thread = None
+        self.input_check_thread = None
+        self.index_watcher = QFileSystemWatcher(self)
+        self.index_watcher.directoryChanged.connect(self.refresh_project_index)
+
+        # Load build profiles
+        self.reload_profiles()
+        self.refresh_build_store()
+        self.refresh_prebuilt_modules()
 
         # Apply styling
         self.set_style()
@@ -137,7 +234,21 @@ class NuitkaPackager(QMainWindow):
         self.theme_toggle_btn.setFixedWidth(120)
         self.theme_toggle_btn.clicked.connect(self.toggle_theme)
         
+        # Build profile selector
+        self.profile_label = QLabel("Profile:")
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumWidth(140)
+        self.profile_combo.setToolTip("Build profile: applies its option defaults and --jobs setting")
+        self.profile_combo.activated.connect(self.apply_profile)
+
+        self.save_profile_btn = QPushButton("Save Profile")
+        self.save_profile_btn.setFixedHeight(30)
+        self.save_profile_btn.clicked.connect(self.save_current_profile)
+
         title_layout.addWidget(title_label)
+        title_layout.addWidget(self.profile_label)
+        title_layout.addWidget(self.profile_combo)
+        title_layout.addWidget(self.save_profile_btn)
         title_layout.addWidget(self.theme_toggle_btn)
         main_layout.addLayout(title_layout)
 
@@ -303,6 +414,60 @@ class NuitkaPackager(QMainWindow):
         self.plugins_list.itemSelectionChanged.connect(self.update_command)
 
         plugins_layout.addWidget(plugins_group)
+
+        # Qt plugins group
+        qt_plugins_group = QGroupBox("Qt Plugins (used with --include-qt)")
+        qt_plugins_layout = QGridLayout(qt_plugins_group)
+        qt_plugins_layout.setSpacing(10)
+
+        self.qt_plugins_label = QLabel("Include Qt Plugins:")
+        self.qt_plugins_input = QLineEdit("sensible,styles")
+        self.qt_plugins_input.textChanged.connect(self.update_command)
+        self.qt_noinclude_plugins_label = QLabel("Exclude Qt Plugins:")
+        self.qt_noinclude_plugins_input = QLineEdit()
+        self.qt_noinclude_plugins_input.setPlaceholderText("Plugin categories to drop from 'sensible' (e.g., tls,printsupport)")
+        self.qt_noinclude_plugins_input.textChanged.connect(self.update_command)
+        self.noinclude_qt_translations_check = QCheckBox("--noinclude-qt-translations (Don't include Qt translations)")
+        self.noinclude_qt_translations_check.stateChanged.connect(self.update_command)
+
+        self.qt_trace_args_label = QLabel("Trace Arguments:")
+        self.qt_trace_args_input = QLineEdit()
+        self.qt_trace_args_input.setPlaceholderText("Arguments that exercise the app during the traced run")
+        self.qt_trace_spin = QSpinBox()
+        self.qt_trace_spin.setRange(1, 300)
+        self.qt_trace_spin.setValue(10)
+        self.qt_trace_spin.setPrefix("Run for: ")
+        self.qt_trace_spin.setSuffix(" s")
+        self.qt_analyze_btn = QPushButton("Analyze Qt Plugins")
+        self.qt_analyze_btn.clicked.connect(self.analyze_qt_plugins)
+
+        self.qt_plugins_table = QTableWidget(0, 5)
+        self.qt_plugins_table.setHorizontalHeaderLabels(["Category", "Files", "Size (MB)", "Loaded", "Keep"])
+        self.qt_plugins_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.qt_plugins_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.qt_plugins_table.setMinimumHeight(150)
+
+        self.qt_analysis_label = QLabel("Runs the app with QT_DEBUG_PLUGINS to see which plugins it loads; "
+                                        "use it until every window and image type has been shown")
+        self.qt_analysis_label.setWordWrap(True)
+        self.qt_apply_btn = QPushButton("Apply Minimal Set")
+        self.qt_apply_btn.setEnabled(False)
+        self.qt_apply_btn.clicked.connect(self.apply_qt_plugin_analysis)
+
+        qt_plugins_layout.addWidget(self.qt_plugins_label, 0, 0)
+        qt_plugins_layout.addWidget(self.qt_plugins_input, 0, 1, 1, 3)
+        qt_plugins_layout.addWidget(self.qt_noinclude_plugins_label, 1, 0)
+        qt_plugins_layout.addWidget(self.qt_noinclude_plugins_input, 1, 1, 1, 3)
+        qt_plugins_layout.addWidget(self.noinclude_qt_translations_check, 2, 0, 1, 4)
+        qt_plugins_layout.addWidget(self.qt_trace_args_label, 3, 0)
+        qt_plugins_layout.addWidget(self.qt_trace_args_input, 3, 1)
+        qt_plugins_layout.addWidget(self.qt_trace_spin, 3, 2)
+        qt_plugins_layout.addWidget(self.qt_analyze_btn, 3, 3)
+        qt_plugins_layout.addWidget(self.qt_plugins_table, 4, 0, 1, 4)
+        qt_plugins_layout.addWidget(self.qt_analysis_label, 5, 0, 1, 3)
+        qt_plugins_layout.addWidget(self.qt_apply_btn, 5, 3)
+
+        plugins_layout.addWidget(qt_plugins_group)
         plugins_layout.addStretch()
 
         # Add plugin options tab to main tabs
@@ -501,6 +666,14 @@ class NuitkaPackager(QMainWindow):
         self.include_raw_dir_input.setMinimumHeight(20)  # Set minimum height
         self.include_raw_dir_input.textChanged.connect(self.update_command)
 
+        # Packages left to the interpreter
+        self.nofollow_import_label = QLabel("No Follow Import To:")
+        self.nofollow_import_input = QLineEdit()
+        self.nofollow_import_input.setPlaceholderText("Module or package pattern (e.g., tkinter, *.tests)")
+        self.nofollow_import_input.setMinimumWidth(300)  # Prevent compression
+        self.nofollow_import_input.setMinimumHeight(20)  # Set minimum height
+        self.nofollow_import_input.textChanged.connect(self.update_command)
+
         # Add include options to layout
         include_layout.addWidget(self.include_package_label, 0, 0)
         include_layout.addWidget(self.include_package_input, 0, 1)
@@ -526,6 +699,21 @@ class NuitkaPackager(QMainWindow):
         include_layout.addWidget(self.include_raw_dir_label, 7, 0)
         include_layout.addWidget(self.include_raw_dir_input, 7, 1)
 
+        include_layout.addWidget(self.nofollow_import_label, 8, 0)
+        include_layout.addWidget(self.nofollow_import_input, 8, 1)
+
+        # Live preview of what the data file fields select in the project tree
+        self.data_preview_label = QLabel("")
+        self.data_preview_label.setWordWrap(True)
+        include_layout.addWidget(self.data_preview_label, 9, 0, 1, 2)
+
+        self.data_preview_timer = QTimer(self)
+        self.data_preview_timer.setSingleShot(True)
+        self.data_preview_timer.setInterval(150)
+        self.data_preview_timer.timeout.connect(self.update_data_preview)
+        for field in (self.include_data_input, self.include_data_dir_input, self.noinclude_data_input):
+            field.textChanged.connect(self.data_preview_timer.start)
+
         advanced_layout.addWidget(include_group)
         advanced_layout.addStretch()
 
@@ -576,8 +764,61 @@ class NuitkaPackager(QMainWindow):
         onefile_group_layout.addWidget(self.onefile_no_compression_check, 2, 0)
         onefile_group_layout.addWidget(self.onefile_as_archive_check, 2, 1)
 
+        # Extraction presets built from the Metadata tab
+        self.onefile_preset_label = QLabel("Temp Directory Preset:")
+        self.onefile_preset_combo = QComboBox()
+        for key, (label, _) in data_tools.ONEFILE_CACHE_PRESETS.items():
+            self.onefile_preset_combo.addItem(label, key)
+        self.onefile_preset_combo.activated.connect(self.apply_tempdir_preset)
+        onefile_group_layout.addWidget(self.onefile_preset_label, 3, 0)
+        onefile_group_layout.addWidget(self.onefile_preset_combo, 3, 1)
+
         onefile_layout.addWidget(onefile_group)
 
+        # Extraction cache group
+        extraction_group = QGroupBox("Extraction Cache")
+        extraction_layout = QGridLayout(extraction_group)
+        extraction_layout.setSpacing(10)
+
+        self.stale_caches_btn = QPushButton("Find Stale Caches")
+        self.stale_caches_btn.clicked.connect(self.find_stale_caches)
+        self.prune_caches_btn = QPushButton("Prune Selected")
+        self.prune_caches_btn.clicked.connect(self.prune_stale_caches)
+
+        self.stale_caches_table = QTableWidget(0, 4)
+        self.stale_caches_table.setHorizontalHeaderLabels(["Folder", "Size (MB)", "Age (days)", "Reason"])
+        self.stale_caches_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.stale_caches_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.stale_caches_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.stale_caches_table.setMinimumHeight(120)
+
+        self.launch_args_label = QLabel("Startup Arguments:")
+        self.launch_args_input = QLineEdit()
+        self.launch_args_input.setPlaceholderText("Arguments that make the app exit right after startup (e.g., --version)")
+        self.launch_runs_spin = QSpinBox()
+        self.launch_runs_spin.setRange(1, 50)
+        self.launch_runs_spin.setValue(5)
+        self.launch_runs_spin.setPrefix("Warm runs: ")
+        self.launch_measure_btn = QPushButton("Measure Cold/Warm Launch")
+        self.launch_measure_btn.clicked.connect(self.measure_launch_times)
+
+        self.launch_history_table = QTableWidget(0, 4)
+        self.launch_history_table.setHorizontalHeaderLabels(["Build", "Temp Directory Spec", "Cold (ms)", "Warm (ms)"])
+        self.launch_history_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.launch_history_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.launch_history_table.setMinimumHeight(120)
+
+        extraction_layout.addWidget(self.stale_caches_btn, 0, 0)
+        extraction_layout.addWidget(self.prune_caches_btn, 0, 1)
+        extraction_layout.addWidget(self.stale_caches_table, 1, 0, 1, 4)
+        extraction_layout.addWidget(self.launch_args_label, 2, 0)
+        extraction_layout.addWidget(self.launch_args_input, 2, 1)
+        extraction_layout.addWidget(self.launch_runs_spin, 2, 2)
+        extraction_layout.addWidget(self.launch_measure_btn, 2, 3)
+        extraction_layout.addWidget(self.launch_history_table, 3, 0, 1, 4)
+
+        onefile_layout.addWidget(extraction_group)
+
         # DLL control group
         dll_group = QGroupBox("DLL Control")
         dll_layout = QGridLayout(dll_group)
@@ -585,7 +826,7 @@ class NuitkaPackager(QMainWindow):
         # DLL options
         self.noinclude_dlls_label = QLabel("Exclude DLLs:")
         self.noinclude_dlls_input = QLineEdit()
-        self.noinclude_dlls_input.setPlaceholderText("Pattern (e.g., someDLL.*)")
+        self.noinclude_dlls_input.setPlaceholderText("Patterns, comma separated (e.g., someDLL.*)")
         self.noinclude_dlls_input.textChanged.connect(self.update_command)
 
         # Add DLL options to layout
@@ -724,6 +965,36 @@ class NuitkaPackager(QMainWindow):
 
         debug_layout.addWidget(debug_group)
 
+        # Debug symbols group
+        symbols_group = QGroupBox("Debug Symbols")
+        symbols_layout = QGridLayout(symbols_group)
+        symbols_layout.setSpacing(10)
+
+        self.split_symbols_check = QCheckBox("Split debug info of --unstripped builds into a symbol store and strip the shipped binaries")
+        self.split_symbols_check.setChecked(self.settings.value("split_symbols", False, type=bool))
+        self.split_symbols_check.stateChanged.connect(self.save_symbol_settings)
+
+        self.symbol_store_label = QLabel("Symbol Store:")
+        self.symbol_store_input = QLineEdit()
+        self.symbol_store_input.setPlaceholderText(f"<project>/{project_store.STATE_DIR_NAME}/symbols (default)")
+        self.symbol_store_input.setText(self.settings.value("symbol_store", "", type=str))
+        self.symbol_store_input.editingFinished.connect(self.save_symbol_settings)
+        self.symbol_store_btn = QPushButton("Browse...")
+        self.symbol_store_btn.clicked.connect(self.select_symbol_store)
+
+        symbols_info = QLabel("ELF symbols are stored as .build-id/xx/<id>.debug for gdb/debuginfod, "
+                              "PDBs in the symbol server layout name.pdb/<signature>/name.pdb. "
+                              "Onefile payloads are packed before this step, build standalone to ship stripped files.")
+        symbols_info.setWordWrap(True)
+
+        symbols_layout.addWidget(self.split_symbols_check, 0, 0, 1, 3)
+        symbols_layout.addWidget(self.symbol_store_label, 1, 0)
+        symbols_layout.addWidget(self.symbol_store_input, 1, 1)
+        symbols_layout.addWidget(self.symbol_store_btn, 1, 2)
+        symbols_layout.addWidget(symbols_info, 2, 0, 1, 3)
+
+        debug_layout.addWidget(symbols_group)
+
         # Deployment control group
         deployment_group = QGroupBox("Deployment Control")
         deployment_layout = QGridLayout(deployment_group)
@@ -742,6 +1013,814 @@ class NuitkaPackager(QMainWindow):
         # Add debug options tab to main tabs
         main_tab.addTab(debug_tab, "Debug Options")
 
+        # ===== Build Environment Tab =====
+        build_env_tab = QWidget()
+        build_env_layout = QVBoxLayout(build_env_tab)
+        build_env_layout.setContentsMargins(10, 10, 10, 10)
+        build_env_layout.setSpacing(15)
+
+        # Build directory reuse group
+        build_store_group = QGroupBox("Build Directory Reuse")
+        build_store_layout = QGridLayout(build_store_group)
+        build_store_layout.setSpacing(10)
+
+        self.build_dir_reuse_check = QCheckBox("Reuse Nuitka build directories across runs (implies keeping build output)")
+        self.build_dir_reuse_check.setChecked(self.settings.value("build_dir_reuse", False, type=bool))
+        self.build_dir_reuse_check.stateChanged.connect(self.save_build_store_settings)
+        self.build_dir_reuse_check.stateChanged.connect(self.update_command)
+
+        self.build_store_label = QLabel("Store Directory:")
+        self.build_store_input = QLineEdit()
+        self.build_store_input.setPlaceholderText(os.path.join(build_env.user_cache_dir(), "build-dirs") + " (default)")
+        self.build_store_input.setText(self.settings.value("build_dir_store", "", type=str))
+        self.build_store_input.editingFinished.connect(self.save_build_store_settings)
+        self.build_store_btn = QPushButton("Browse...")
+        self.build_store_btn.clicked.connect(self.select_build_store_dir)
+
+        self.build_store_cap_label = QLabel("Size Cap:")
+        self.build_store_cap_spin = QSpinBox()
+        self.build_store_cap_spin.setRange(1, 1000)
+        self.build_store_cap_spin.setSuffix(" GB")
+        self.build_store_cap_spin.setValue(self.settings.value("build_dir_cap_gb", 10, type=int))
+        self.build_store_cap_spin.valueChanged.connect(self.save_build_store_settings)
+
+        self.build_store_table = QTableWidget(0, 4)
+        self.build_store_table.setHorizontalHeaderLabels(["Project", "Profile", "Size (MB)", "Last Used"])
+        self.build_store_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.build_store_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.build_store_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.build_store_table.setMinimumHeight(150)
+
+        self.build_store_total_label = QLabel("")
+
+        build_store_button_layout = QHBoxLayout()
+        self.build_store_refresh_btn = QPushButton("Refresh")
+        self.build_store_refresh_btn.clicked.connect(self.refresh_build_store)
+        self.build_store_delete_btn = QPushButton("Delete Selected")
+        self.build_store_delete_btn.clicked.connect(self.delete_build_store_entries)
+        self.build_store_evict_btn = QPushButton("Enforce Size Cap")
+        self.build_store_evict_btn.clicked.connect(self.evict_build_store)
+        build_store_button_layout.addWidget(self.build_store_refresh_btn)
+        build_store_button_layout.addWidget(self.build_store_delete_btn)
+        build_store_button_layout.addWidget(self.build_store_evict_btn)
+        build_store_button_layout.addWidget(self.build_store_total_label)
+        build_store_button_layout.addStretch()
+
+        build_store_layout.addWidget(self.build_dir_reuse_check, 0, 0, 1, 3)
+        build_store_layout.addWidget(self.build_store_label, 1, 0)
+        build_store_layout.addWidget(self.build_store_input, 1, 1)
+        build_store_layout.addWidget(self.build_store_btn, 1, 2)
+        build_store_layout.addWidget(self.build_store_cap_label, 2, 0)
+        build_store_layout.addWidget(self.build_store_cap_spin, 2, 1)
+        build_store_layout.addWidget(self.build_store_table, 3, 0, 1, 3)
+        build_store_layout.addLayout(build_store_button_layout, 4, 0, 1, 3)
+
+        build_env_layout.addWidget(build_store_group)
+
+        # Scratch staging group
+        scratch_group = QGroupBox("Scratch Staging")
+        scratch_layout = QGridLayout(scratch_group)
+        scratch_layout.setSpacing(10)
+
+        self.scratch_staging_check = QCheckBox("Stage builds in a fast scratch directory (tmpfs / RAM disk), move only final artifacts")
+        self.scratch_staging_check.setChecked(self.settings.value("scratch_staging", False, type=bool))
+        self.scratch_staging_check.stateChanged.connect(self.save_scratch_settings)
+
+        self.scratch_dir_label = QLabel("Scratch Directory:")
+        self.scratch_dir_input = QLineEdit()
+        self.scratch_dir_input.setPlaceholderText(build_env.default_scratch_dir() + " (default)")
+        self.scratch_dir_input.setText(self.settings.value("scratch_dir", "", type=str))
+        self.scratch_dir_input.editingFinished.connect(self.save_scratch_settings)
+        self.scratch_dir_btn = QPushButton("Browse...")
+        self.scratch_dir_btn.clicked.connect(self.select_scratch_dir)
+
+        scratch_info = QLabel("Free space is checked against the intermediate size of previous builds; "
+                              "when it is too small the build falls back to the output directory.")
+        scratch_info.setWordWrap(True)
+
+        scratch_layout.addWidget(self.scratch_staging_check, 0, 0, 1, 3)
+        scratch_layout.addWidget(self.scratch_dir_label, 1, 0)
+        scratch_layout.addWidget(self.scratch_dir_input, 1, 1)
+        scratch_layout.addWidget(self.scratch_dir_btn, 1, 2)
+        scratch_layout.addWidget(scratch_info, 2, 0, 1, 3)
+
+        build_env_layout.addWidget(scratch_group)
+
+        # Source snapshot group
+        snapshot_group = QGroupBox("Source Snapshot")
+        snapshot_layout = QVBoxLayout(snapshot_group)
+
+        self.source_snapshot_check = QCheckBox("Build from a frozen snapshot of the project tree, so edits made during a build don't leak into it")
+        self.source_snapshot_check.setChecked(self.settings.value("source_snapshot", False, type=bool))
+        self.source_snapshot_check.stateChanged.connect(
+            lambda: self.settings.setValue("source_snapshot", self.source_snapshot_check.isChecked()))
+
+        snapshot_info = QLabel("Files are reflinked where the filesystem supports it, other files are hardlinked "
+                               "and Python sources copied. The snapshot is kept in the user cache and only "
+                               "changed files are refreshed before each build.")
+        snapshot_info.setWordWrap(True)
+
+        snapshot_layout.addWidget(self.source_snapshot_check)
+        snapshot_layout.addWidget(snapshot_info)
+
+        build_env_layout.addWidget(snapshot_group)
+
+        # Preflight group
+        preflight_group = QGroupBox("Preflight Checks")
+        preflight_layout = QGridLayout(preflight_group)
+        preflight_layout.setSpacing(10)
+
+        self.preflight_check = QCheckBox("Byte-compile project sources and import the entry module before building, abort on errors")
+        self.preflight_check.setToolTip("The import runs the entry file's top-level code with the build interpreter, "
+                                        "only its if __name__ == \"__main__\" block is skipped")
+        self.preflight_check.setChecked(self.settings.value("preflight", False, type=bool))
+        self.preflight_check.stateChanged.connect(self.save_preflight_settings)
+
+        self.preflight_timeout_label = QLabel("Import Timeout (s):")
+        self.preflight_timeout_spin = QSpinBox()
+        self.preflight_timeout_spin.setRange(1, 600)
+        self.preflight_timeout_spin.setValue(self.settings.value("preflight_timeout", 30, type=int))
+        self.preflight_timeout_spin.valueChanged.connect(self.save_preflight_settings)
+
+        preflight_layout.addWidget(self.preflight_check, 0, 0, 1, 2)
+        preflight_layout.addWidget(self.preflight_timeout_label, 1, 0)
+        preflight_layout.addWidget(self.preflight_timeout_spin, 1, 1)
+
+        build_env_layout.addWidget(preflight_group)
+
+        # C compiler group
+        compiler_group = QGroupBox("C Compiler")
+        compiler_layout = QGridLayout(compiler_group)
+        compiler_layout.setSpacing(10)
+
+        self.compiler_label = QLabel("Compiler:")
+        self.compiler_combo = QComboBox()
+        self.compiler_combo.addItem("Auto (Nuitka default)", "")
+        for name in perf_tools.platform_compilers():
+            self.compiler_combo.addItem(name, name)
+        self.compiler_combo.setCurrentIndex(max(0, self.compiler_combo.findData(
+            self.settings.value("c_compiler", "", type=str))))
+        self.compiler_combo.currentIndexChanged.connect(self.save_compiler_setting)
+        self.compiler_combo.currentIndexChanged.connect(self.update_command)
+
+        self.detect_compilers_btn = QPushButton("Detect Toolchains")
+        self.detect_compilers_btn.clicked.connect(self.detect_compilers)
+
+        # Detected toolchains, checked compilers take part in the A/B comparison
+        self.compiler_table = QTableWidget(0, 3)
+        self.compiler_table.setHorizontalHeaderLabels(["Toolchain", "Path", "Version"])
+        self.compiler_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.compiler_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.compiler_table.setMinimumHeight(110)
+
+        self.compiler_args_label = QLabel("Startup Arguments:")
+        self.compiler_args_input = QLineEdit()
+        self.compiler_args_input.setPlaceholderText("Arguments that make the app exit right after startup (e.g., --version)")
+        self.compare_compilers_btn = QPushButton("Compare Checked Compilers")
+        self.compare_compilers_btn.clicked.connect(self.compare_compilers)
+
+        self.compiler_result_table = QTableWidget(0, 4)
+        self.compiler_result_table.setHorizontalHeaderLabels(["Compiler", "Build (s)", "Size (MB)", "Startup (ms)"])
+        self.compiler_result_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.compiler_result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.compiler_result_table.setMinimumHeight(110)
+
+        compiler_layout.addWidget(self.compiler_label, 0, 0)
+        compiler_layout.addWidget(self.compiler_combo, 0, 1)
+        compiler_layout.addWidget(self.detect_compilers_btn, 0, 2)
+        compiler_layout.addWidget(self.compiler_table, 1, 0, 1, 3)
+        compiler_layout.addWidget(self.compiler_args_label, 2, 0)
+        compiler_layout.addWidget(self.compiler_args_input, 2, 1)
+        compiler_layout.addWidget(self.compare_compilers_btn, 2, 2)
+        compiler_layout.addWidget(self.compiler_result_table, 3, 0, 1, 3)
+
+        build_env_layout.addWidget(compiler_group)
+
+        # Prebuilt module cache group
+        prebuilt_group = QGroupBox("Prebuilt Module Cache")
+        prebuilt_layout = QGridLayout(prebuilt_group)
+        prebuilt_layout.setSpacing(10)
+
+        self.prebuilt_check = QCheckBox("Use prebuilt extension modules for these third-party packages instead of compiling them with the app")
+        self.prebuilt_check.setChecked(self.settings.value("prebuilt_modules", False, type=bool))
+        self.prebuilt_check.stateChanged.connect(self.save_prebuilt_settings)
+        self.prebuilt_packages_label = QLabel("Packages:")
+        self.prebuilt_packages_input = QLineEdit()
+        self.prebuilt_packages_input.setPlaceholderText("Top-level package names (e.g., requests, pydantic)")
+        self.prebuilt_packages_input.setText(self.settings.value("prebuilt_packages", "", type=str))
+        self.prebuilt_packages_input.editingFinished.connect(self.save_prebuilt_settings)
+        self.prebuilt_build_btn = QPushButton("Build Missing Modules")
+        self.prebuilt_build_btn.clicked.connect(self.build_prebuilt_modules)
+
+        # One row per package, interpreter, Nuitka version and option set
+        self.prebuilt_table = QTableWidget(0, 7)
+        self.prebuilt_table.setHorizontalHeaderLabels(
+            ["Package", "Version", "Python", "Nuitka", "Options", "Size (MB)", "Build (s)"])
+        self.prebuilt_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.prebuilt_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.prebuilt_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.prebuilt_table.setMinimumHeight(110)
+        self.prebuilt_delete_btn = QPushButton("Delete Selected")
+        self.prebuilt_delete_btn.clicked.connect(self.delete_prebuilt_modules)
+
+        prebuilt_layout.addWidget(self.prebuilt_check, 0, 0, 1, 3)
+        prebuilt_layout.addWidget(self.prebuilt_packages_label, 1, 0)
+        prebuilt_layout.addWidget(self.prebuilt_packages_input, 1, 1)
+        prebuilt_layout.addWidget(self.prebuilt_build_btn, 1, 2)
+        prebuilt_layout.addWidget(self.prebuilt_table, 2, 0, 1, 3)
+        prebuilt_layout.addWidget(self.prebuilt_delete_btn, 3, 0)
+
+        build_env_layout.addWidget(prebuilt_group)
+        build_env_layout.addStretch()
+
+        # Add build environment tab to main tabs
+        main_tab.addTab(build_env_tab, "Build Environment")
+
+        # ===== Performance Tab =====
+        performance_tab = QWidget()
+        performance_layout = QVBoxLayout(performance_tab)
+        performance_layout.setContentsMargins(10, 10, 10, 10)
+        performance_layout.setSpacing(15)
+
+        # Option tuner group
+        tuner_group = QGroupBox("Option Combination Tuner")
+        tuner_layout = QGridLayout(tuner_group)
+        tuner_layout.setSpacing(10)
+
+        tuner_info = QLabel("Builds every combination of the checked options (using the compiler cache), "
+                            "then compares binary size, startup time and build time.")
+        tuner_info.setWordWrap(True)
+        tuner_layout.addWidget(tuner_info, 0, 0, 1, 4)
+
+        # One checkbox per tunable option
+        self.tuner_option_checks = {}
+        for i, (key, (flag, _)) in enumerate(perf_tools.TUNABLE_OPTIONS.items()):
+            check = QCheckBox(flag)
+            check.setChecked(key in ("lto", "no_docstrings", "no_asserts"))
+            self.tuner_option_checks[key] = check
+            tuner_layout.addWidget(check, 1 + i // 3, i % 3)
+
+        self.tuner_parallel_label = QLabel("Parallel Builds:")
+        self.tuner_parallel_spin = QSpinBox()
+        self.tuner_parallel_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.tuner_parallel_spin.setValue(min(2, os.cpu_count() or 1))
+
+        self.tuner_max_label = QLabel("Max Combinations:")
+        self.tuner_max_spin = QSpinBox()
+        self.tuner_max_spin.setRange(1, 64)
+        self.tuner_max_spin.setValue(8)
+
+        self.tuner_args_label = QLabel("Startup Arguments:")
+        self.tuner_args_input = QLineEdit()
+        self.tuner_args_input.setPlaceholderText("Arguments that make the app exit right after startup (e.g., --version)")
+
+        self.tuner_runs_label = QLabel("Startup Runs:")
+        self.tuner_runs_spin = QSpinBox()
+        self.tuner_runs_spin.setRange(1, 50)
+        self.tuner_runs_spin.setValue(5)
+
+        tuner_layout.addWidget(self.tuner_parallel_label, 3, 0)
+        tuner_layout.addWidget(self.tuner_parallel_spin, 3, 1)
+        tuner_layout.addWidget(self.tuner_max_label, 3, 2)
+        tuner_layout.addWidget(self.tuner_max_spin, 3, 3)
+        tuner_layout.addWidget(self.tuner_args_label, 4, 0)
+        tuner_layout.addWidget(self.tuner_args_input, 4, 1)
+        tuner_layout.addWidget(self.tuner_runs_label, 4, 2)
+        tuner_layout.addWidget(self.tuner_runs_spin, 4, 3)
+
+        # Results table, Pareto-optimal rows are marked with a star
+        self.tuner_table = QTableWidget(0, 5)
+        self.tuner_table.setHorizontalHeaderLabels(
+            ["Options", "Size (MB)", "Startup (ms)", "Build (s)", "Pareto"])
+        self.tuner_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tuner_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tuner_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tuner_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tuner_table.setMinimumHeight(180)
+        tuner_layout.addWidget(self.tuner_table, 5, 0, 1, 4)
+
+        tuner_button_layout = QHBoxLayout()
+        self.tuner_run_btn = QPushButton("Run Tuner")
+        self.tuner_run_btn.clicked.connect(self.run_option_tuner)
+        self.tuner_apply_btn = QPushButton("Apply Selected Configuration")
+        self.tuner_apply_btn.clicked.connect(self.apply_tuner_selection)
+        self.tuner_apply_btn.setEnabled(False)
+        tuner_button_layout.addWidget(self.tuner_run_btn)
+        tuner_button_layout.addWidget(self.tuner_apply_btn)
+        tuner_button_layout.addStretch()
+        tuner_layout.addLayout(tuner_button_layout, 6, 0, 1, 4)
+
+        performance_layout.addWidget(tuner_group)
+
+        # Build time per profile group
+        profile_stats_group = QGroupBox("Build Times per Profile")
+        profile_stats_layout = QVBoxLayout(profile_stats_group)
+
+        self.profile_stats_table = QTableWidget(0, 6)
+        self.profile_stats_table.setHorizontalHeaderLabels(
+            ["Profile", "Builds", "Successful", "Mean (s)", "Median (s)", "Last (s)"])
+        self.profile_stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.profile_stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.profile_stats_table.setMinimumHeight(120)
+        profile_stats_layout.addWidget(self.profile_stats_table)
+
+        self.profile_stats_btn = QPushButton("Refresh Build Times")
+        self.profile_stats_btn.clicked.connect(self.refresh_profile_stats)
+        profile_stats_layout.addWidget(self.profile_stats_btn, 0, Qt.AlignLeft)
+
+        performance_layout.addWidget(profile_stats_group)
+
+        # Import time profile group
+        import_profile_group = QGroupBox("Import Time Profile")
+        import_profile_layout = QGridLayout(import_profile_group)
+        import_profile_layout.setSpacing(10)
+
+        self.import_mode_label = QLabel("Run:")
+        self.import_mode_combo = QComboBox()
+        self.import_mode_combo.addItem("Built binary", "binary")
+        self.import_mode_combo.addItem("Entry point in the interpreter", "interpreter")
+        self.import_duration_label = QLabel("Stop After (s):")
+        self.import_duration_spin = QSpinBox()
+        self.import_duration_spin.setRange(1, 300)
+        self.import_duration_spin.setValue(15)
+        self.import_args_label = QLabel("Arguments:")
+        self.import_args_input = QLineEdit()
+        self.import_args_input.setPlaceholderText("Optional program arguments")
+
+        self.import_table = QTableWidget(0, 5)
+        self.import_table.setHorizontalHeaderLabels(
+            ["Package", "Cumulative (ms)", "Self (ms)", "Modules", "In Current Config"])
+        self.import_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.import_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.import_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.import_table.setMinimumHeight(160)
+        self.import_chains_label = QLabel("")
+        self.import_chains_label.setWordWrap(True)
+        self.import_chains_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        self.import_profile_btn = QPushButton("Profile Imports")
+        self.import_profile_btn.clicked.connect(self.profile_imports)
+        self.import_exclude_btn = QPushButton("Exclude Selected (--nofollow-import-to)")
+        self.import_exclude_btn.clicked.connect(self.exclude_selected_imports)
+        self.import_exclude_btn.setEnabled(False)
+
+        import_profile_layout.addWidget(self.import_mode_label, 0, 0)
+        import_profile_layout.addWidget(self.import_mode_combo, 0, 1)
+        import_profile_layout.addWidget(self.import_duration_label, 0, 2)
+        import_profile_layout.addWidget(self.import_duration_spin, 0, 3)
+        import_profile_layout.addWidget(self.import_args_label, 1, 0)
+        import_profile_layout.addWidget(self.import_args_input, 1, 1, 1, 3)
+        import_profile_layout.addWidget(self.import_table, 2, 0, 1, 4)
+        import_profile_layout.addWidget(self.import_chains_label, 3, 0, 1, 4)
+        import_profile_layout.addWidget(self.import_profile_btn, 4, 0)
+        import_profile_layout.addWidget(self.import_exclude_btn, 4, 1)
+
+        performance_layout.addWidget(import_profile_group)
+        performance_layout.addStretch()
+
+        # Add performance tab to main tabs
+        main_tab.addTab(performance_tab, "Performance")
+
+        # ===== Benchmark Tab =====
+        benchmark_tab = QWidget()
+        benchmark_layout = QVBoxLayout(benchmark_tab)
+        benchmark_layout.setContentsMargins(10, 10, 10, 10)
+        benchmark_layout.setSpacing(15)
+
+        # Runtime benchmark group
+        benchmark_group = QGroupBox("Compiled vs Interpreted Benchmark")
+        benchmark_group_layout = QGridLayout(benchmark_group)
+        benchmark_group_layout.setSpacing(10)
+
+        self.benchmark_mode_label = QLabel("Workload Type:")
+        self.benchmark_mode_combo = QComboBox()
+        self.benchmark_mode_combo.addItem("Command arguments", "command")
+        self.benchmark_mode_combo.addItem("Entry function (module:function, needs --module build)", "function")
+
+        self.benchmark_workload_label = QLabel("Workload:")
+        self.benchmark_workload_input = QLineEdit()
+        self.benchmark_workload_input.setPlaceholderText("Arguments (e.g., --bench data/sample.csv) or module:function")
+
+        self.benchmark_runs_label = QLabel("Runs:")
+        self.benchmark_runs_spin = QSpinBox()
+        self.benchmark_runs_spin.setRange(1, 1000)
+        self.benchmark_runs_spin.setValue(10)
+
+        self.benchmark_warmup_label = QLabel("Warm-up Runs:")
+        self.benchmark_warmup_spin = QSpinBox()
+        self.benchmark_warmup_spin.setRange(0, 100)
+        self.benchmark_warmup_spin.setValue(2)
+
+        self.benchmark_ops_label = QLabel("Operations per Run:")
+        self.benchmark_ops_spin = QSpinBox()
+        self.benchmark_ops_spin.setRange(1, 1000000)
+        self.benchmark_ops_spin.setValue(1)
+
+        self.benchmark_run_btn = QPushButton("Run Benchmark")
+        self.benchmark_run_btn.clicked.connect(self.run_runtime_benchmark)
+
+        benchmark_group_layout.addWidget(self.benchmark_mode_label, 0, 0)
+        benchmark_group_layout.addWidget(self.benchmark_mode_combo, 0, 1, 1, 3)
+        benchmark_group_layout.addWidget(self.benchmark_workload_label, 1, 0)
+        benchmark_group_layout.addWidget(self.benchmark_workload_input, 1, 1, 1, 3)
+        benchmark_group_layout.addWidget(self.benchmark_runs_label, 2, 0)
+        benchmark_group_layout.addWidget(self.benchmark_runs_spin, 2, 1)
+        benchmark_group_layout.addWidget(self.benchmark_warmup_label, 2, 2)
+        benchmark_group_layout.addWidget(self.benchmark_warmup_spin, 2, 3)
+        benchmark_group_layout.addWidget(self.benchmark_ops_label, 3, 0)
+        benchmark_group_layout.addWidget(self.benchmark_ops_spin, 3, 1)
+        benchmark_group_layout.addWidget(self.benchmark_run_btn, 3, 3)
+
+        # Side-by-side latency distribution
+        self.benchmark_metrics = [
+            ("runs", "Runs"), ("min_ms", "Min (ms)"), ("p50_ms", "Median (ms)"),
+            ("p90_ms", "P90 (ms)"), ("p99_ms", "P99 (ms)"), ("max_ms", "Max (ms)"),
+            ("mean_ms", "Mean (ms)"), ("stdev_ms", "Std Dev (ms)"), ("throughput_per_s", "Throughput (ops/s)"),
+        ]
+        self.benchmark_table = QTableWidget(len(self.benchmark_metrics), 2)
+        self.benchmark_table.setHorizontalHeaderLabels(["Interpreter", "Compiled"])
+        self.benchmark_table.setVerticalHeaderLabels([label for _, label in self.benchmark_metrics])
+        self.benchmark_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.benchmark_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.benchmark_table.setMinimumHeight(200)
+        benchmark_group_layout.addWidget(self.benchmark_table, 4, 0, 1, 4)
+
+        self.benchmark_speedup_label = QLabel("Speedup: -")
+        self.benchmark_speedup_label.setFont(QFont("Arial", 11, QFont.Bold))
+        benchmark_group_layout.addWidget(self.benchmark_speedup_label, 5, 0, 1, 4)
+
+        benchmark_layout.addWidget(benchmark_group)
+
+        # Benchmark history group
+        benchmark_history_group = QGroupBox("Benchmark History")
+        benchmark_history_layout = QVBoxLayout(benchmark_history_group)
+
+        self.benchmark_history_table = QTableWidget(0, 6)
+        self.benchmark_history_table.setHorizontalHeaderLabels(
+            ["Build", "Options", "Workload", "Interpreter p50 (ms)", "Compiled p50 (ms)", "Speedup"])
+        self.benchmark_history_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.benchmark_history_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.benchmark_history_table.setMinimumHeight(150)
+        benchmark_history_layout.addWidget(self.benchmark_history_table)
+
+        self.benchmark_history_btn = QPushButton("Refresh History")
+        self.benchmark_history_btn.clicked.connect(self.refresh_benchmark_history)
+        benchmark_history_layout.addWidget(self.benchmark_history_btn, 0, Qt.AlignLeft)
+
+        benchmark_layout.addWidget(benchmark_history_group)
+        benchmark_layout.addStretch()
+
+        # Add benchmark tab to main tabs
+        main_tab.addTab(benchmark_tab, "Benchmark")
+
+        # ===== Data Analysis Tab =====
+        data_tab = QWidget()
+        data_layout = QVBoxLayout(data_tab)
+        data_layout.setContentsMargins(10, 10, 10, 10)
+        data_layout.setSpacing(15)
+
+        # Duplicate data files group
+        duplicates_group = QGroupBox("Duplicate Data Files")
+        duplicates_layout = QGridLayout(duplicates_group)
+        duplicates_layout.setSpacing(10)
+
+        self.duplicates_scan_btn = QPushButton("Scan Included Data Files")
+        self.duplicates_scan_btn.clicked.connect(self.scan_duplicate_data)
+        self.duplicates_summary_label = QLabel("Hashes the files selected by the data file and directory fields")
+        self.duplicates_summary_label.setWordWrap(True)
+
+        self.duplicates_table = QTableWidget(0, 4)
+        self.duplicates_table.setHorizontalHeaderLabels(["Wasted (MB)", "File Size (MB)", "Copies", "Destinations"])
+        self.duplicates_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.duplicates_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.duplicates_table.setMinimumHeight(150)
+
+        self.duplicates_suggestions_list = QListWidget()
+        self.duplicates_suggestions_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.duplicates_suggestions_list.setMinimumHeight(100)
+        self.duplicates_apply_btn = QPushButton("Add Selected Exclusions")
+        self.duplicates_apply_btn.clicked.connect(self.apply_duplicate_exclusions)
+
+        duplicates_layout.addWidget(self.duplicates_scan_btn, 0, 0)
+        duplicates_layout.addWidget(self.duplicates_summary_label, 0, 1)
+        duplicates_layout.addWidget(self.duplicates_table, 1, 0, 1, 2)
+        duplicates_layout.addWidget(QLabel("Suggestions:"), 2, 0, 1, 2)
+        duplicates_layout.addWidget(self.duplicates_suggestions_list, 3, 0, 1, 2)
+        duplicates_layout.addWidget(self.duplicates_apply_btn, 4, 0)
+
+        data_layout.addWidget(duplicates_group)
+
+        # Onefile payload group
+        payload_group = QGroupBox("Onefile Payload Compression")
+        payload_layout = QGridLayout(payload_group)
+        payload_layout.setSpacing(10)
+
+        self.payload_levels_label = QLabel("zstd Levels:")
+        self.payload_levels_input = QLineEdit(",".join(str(level) for level in data_tools.ONEFILE_LEVELS))
+        self.payload_read_label = QLabel("Disk Read Speed (MB/s):")
+        self.payload_read_spin = QSpinBox()
+        self.payload_read_spin.setRange(10, 20000)
+        self.payload_read_spin.setValue(500)
+        self.payload_analyze_btn = QPushButton("Analyze Payload")
+        self.payload_analyze_btn.clicked.connect(self.analyze_onefile_payload)
+
+        self.payload_files_table = QTableWidget(0, 4)
+        self.payload_files_table.setHorizontalHeaderLabels(
+            ["Payload File", "Size (MB)", f"zstd {data_tools.SAMPLE_LEVEL} (MB)", "Ratio"])
+        self.payload_files_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.payload_files_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.payload_files_table.setMinimumHeight(150)
+
+        self.payload_settings_table = QTableWidget(0, 5)
+        self.payload_settings_table.setHorizontalHeaderLabels(
+            ["Compression", "Payload (MB)", "Compress (s)", "Decompress (ms)", "Est. Extraction (ms)"])
+        self.payload_settings_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.payload_settings_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.payload_settings_table.setMinimumHeight(150)
+
+        self.payload_result_label = QLabel("Analyzes the .dist folder of the last standalone/onefile build "
+                                           "(build without Remove Output to keep it)")
+        self.payload_result_label.setWordWrap(True)
+        self.payload_apply_btn = QPushButton("Apply Fastest Setting")
+        self.payload_apply_btn.setEnabled(False)
+        self.payload_apply_btn.clicked.connect(self.apply_payload_recommendation)
+
+        payload_layout.addWidget(self.payload_levels_label, 0, 0)
+        payload_layout.addWidget(self.payload_levels_input, 0, 1)
+        payload_layout.addWidget(self.payload_read_label, 0, 2)
+        payload_layout.addWidget(self.payload_read_spin, 0, 3)
+        payload_layout.addWidget(self.payload_analyze_btn, 0, 4)
+        payload_layout.addWidget(self.payload_files_table, 1, 0, 1, 5)
+        payload_layout.addWidget(self.payload_settings_table, 2, 0, 1, 5)
+        payload_layout.addWidget(self.payload_result_label, 3, 0, 1, 4)
+        payload_layout.addWidget(self.payload_apply_btn, 3, 4)
+
+        data_layout.addWidget(payload_group)
+
+        # Shared library dependencies group
+        dlls_group = QGroupBox("Shared Library Dependencies")
+        dlls_layout = QGridLayout(dlls_group)
+        dlls_layout.setSpacing(10)
+
+        self.dlls_scan_btn = QPushButton("Scan Built Libraries")
+        self.dlls_scan_btn.clicked.connect(self.scan_dist_libraries)
+        self.dlls_summary_label = QLabel("Parses the ELF/PE headers in the .dist folder of the last build")
+        self.dlls_summary_label.setWordWrap(True)
+
+        self.dlls_table = QTableWidget(0, 5)
+        self.dlls_table.setHorizontalHeaderLabels(["Library", "Size (MB)", "Status", "Needs", "Needed By"])
+        self.dlls_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.dlls_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.dlls_table.setMinimumHeight(150)
+
+        self.dlls_suggestions_list = QListWidget()
+        self.dlls_suggestions_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.dlls_suggestions_list.setMinimumHeight(100)
+        self.dlls_apply_btn = QPushButton("Exclude Selected DLLs")
+        self.dlls_apply_btn.clicked.connect(self.apply_dll_exclusions)
+
+        dlls_layout.addWidget(self.dlls_scan_btn, 0, 0)
+        dlls_layout.addWidget(self.dlls_summary_label, 0, 1)
+        dlls_layout.addWidget(self.dlls_table, 1, 0, 1, 2)
+        dlls_layout.addWidget(QLabel("Suggestions:"), 2, 0, 1, 2)
+        dlls_layout.addWidget(self.dlls_suggestions_list, 3, 0, 1, 2)
+        dlls_layout.addWidget(self.dlls_apply_btn, 4, 0)
+
+        data_layout.addWidget(dlls_group)
+        data_layout.addStretch()
+
+        # Add data analysis tab to main tabs
+        main_tab.addTab(data_tab, "Data Analysis")
+
+        # ===== Artifacts Tab =====
+        artifacts_tab = QWidget()
+        artifacts_layout = QVBoxLayout(artifacts_tab)
+        artifacts_layout.setContentsMargins(10, 10, 10, 10)
+        artifacts_layout.setSpacing(15)
+
+        # Artifact manifest group
+        manifest_group = QGroupBox("Artifact Manifest")
+        manifest_layout = QGridLayout(manifest_group)
+        manifest_layout.setSpacing(10)
+
+        self.artifact_manifest_check = QCheckBox("Write a SHA-256 manifest of the build output after each build")
+        self.artifact_manifest_check.setChecked(self.settings.value("artifact_manifest", True, type=bool))
+        self.artifact_manifest_check.stateChanged.connect(
+            lambda: self.settings.setValue("artifact_manifest", self.artifact_manifest_check.isChecked()))
+
+        self.manifest_verify_btn = QPushButton("Verify Latest Build")
+        self.manifest_verify_btn.clicked.connect(self.verify_latest_manifest)
+        self.manifest_compare_label = QLabel("Compare Latest Build With:")
+        self.manifest_compare_combo = QComboBox()
+        self.manifest_compare_btn = QPushButton("Compare")
+        self.manifest_compare_btn.clicked.connect(self.compare_build_manifests)
+
+        self.manifest_summary_label = QLabel("The manifest is stored with the build history and written "
+                                             "next to the output as <name>.sha256 (sha256sum -c format)")
+        self.manifest_summary_label.setWordWrap(True)
+
+        self.manifest_table = QTableWidget(0, 4)
+        self.manifest_table.setHorizontalHeaderLabels(["Change", "Path", "Old Size (KB)", "New Size (KB)"])
+        self.manifest_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.manifest_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.manifest_table.setMinimumHeight(150)
+
+        manifest_layout.addWidget(self.artifact_manifest_check, 0, 0, 1, 4)
+        manifest_layout.addWidget(self.manifest_verify_btn, 1, 0)
+        manifest_layout.addWidget(self.manifest_compare_label, 1, 1)
+        manifest_layout.addWidget(self.manifest_compare_combo, 1, 2)
+        manifest_layout.addWidget(self.manifest_compare_btn, 1, 3)
+        manifest_layout.addWidget(self.manifest_summary_label, 2, 0, 1, 4)
+        manifest_layout.addWidget(self.manifest_table, 3, 0, 1, 4)
+
+        artifacts_layout.addWidget(manifest_group)
+
+        # Smoke test group
+        smoke_group = QGroupBox("Smoke Tests")
+        smoke_layout = QGridLayout(smoke_group)
+        smoke_layout.setSpacing(10)
+
+        self.smoke_tests_check = QCheckBox("Run smoke tests against the built binary after each build and fail the build if one fails")
+        self.smoke_tests_check.setChecked(self.settings.value("smoke_tests", False, type=bool))
+        self.smoke_tests_check.stateChanged.connect(
+            lambda: self.settings.setValue("smoke_tests", self.smoke_tests_check.isChecked()))
+
+        self.smoke_table = QTableWidget(0, 6)
+        self.smoke_table.setHorizontalHeaderLabels(
+            ["Name", "Arguments", "Timeout (s)", "Exit Code", "Output Pattern (regex)", "Result"])
+        self.smoke_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.smoke_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.smoke_table.setMinimumHeight(120)
+        self.smoke_table.itemChanged.connect(self.save_smoke_tests)
+
+        self.smoke_add_btn = QPushButton("Add Test")
+        self.smoke_add_btn.clicked.connect(self.add_smoke_test)
+        self.smoke_remove_btn = QPushButton("Remove Test")
+        self.smoke_remove_btn.clicked.connect(self.remove_smoke_test_row)
+        self.smoke_run_btn = QPushButton("Run Now")
+        self.smoke_run_btn.clicked.connect(self.run_smoke_tests)
+        self.smoke_info_label = QLabel("Each test runs concurrently in its own temporary folder, which is also its HOME and TEMP")
+        self.smoke_info_label.setWordWrap(True)
+
+        smoke_layout.addWidget(self.smoke_tests_check, 0, 0, 1, 4)
+        smoke_layout.addWidget(self.smoke_table, 1, 0, 1, 4)
+        smoke_layout.addWidget(self.smoke_add_btn, 2, 0)
+        smoke_layout.addWidget(self.smoke_remove_btn, 2, 1)
+        smoke_layout.addWidget(self.smoke_run_btn, 2, 2)
+        smoke_layout.addWidget(self.smoke_info_label, 3, 0, 1, 4)
+
+        artifacts_layout.addWidget(smoke_group)
+
+        # Archive export group
+        export_group = QGroupBox("Archive Export")
+        export_layout = QGridLayout(export_group)
+        export_layout.setSpacing(10)
+
+        self.export_format_label = QLabel("Format:")
+        self.export_format_combo = QComboBox()
+        for fmt in artifact_tools.ARCHIVE_FORMATS:
+            self.export_format_combo.addItem(fmt, fmt)
+        self.export_format_combo.setCurrentIndex(
+            max(0, self.export_format_combo.findData(self.settings.value("export_format", "tar.zst", type=str))))
+        self.export_format_combo.currentIndexChanged.connect(self.save_export_settings)
+        self.export_level_label = QLabel("Compression Level:")
+        self.export_level_spin = QSpinBox()
+        self.export_level_spin.setRange(1, 22)
+        self.export_level_spin.setValue(self.settings.value("export_level", 3, type=int))
+        self.export_level_spin.setToolTip("zstd 1-22, zip uses 1-9")
+        self.export_level_spin.valueChanged.connect(self.save_export_settings)
+
+        self.export_dir_label = QLabel("Destination:")
+        self.export_dir_input = QLineEdit()
+        self.export_dir_input.setPlaceholderText("Output directory (default)")
+        self.export_dir_input.setText(self.settings.value("export_dir", "", type=str))
+        self.export_dir_input.editingFinished.connect(self.save_export_settings)
+        self.export_dir_btn = QPushButton("Browse...")
+        self.export_dir_btn.clicked.connect(self.select_export_dir)
+
+        self.export_incremental_check = QCheckBox("Reuse compressed data of files unchanged since the last export (tar.zst)")
+        self.export_incremental_check.setChecked(self.settings.value("export_incremental", False, type=bool))
+        self.export_incremental_check.stateChanged.connect(self.save_export_settings)
+        self.export_after_build_check = QCheckBox("Export after every successful build")
+        self.export_after_build_check.setChecked(self.settings.value("export_after_build", False, type=bool))
+        self.export_after_build_check.stateChanged.connect(self.save_export_settings)
+
+        self.export_btn = QPushButton("Export Now")
+        self.export_btn.clicked.connect(self.export_build_archive)
+        self.export_result_label = QLabel("")
+        self.export_result_label.setWordWrap(True)
+
+        export_layout.addWidget(self.export_format_label, 0, 0)
+        export_layout.addWidget(self.export_format_combo, 0, 1)
+        export_layout.addWidget(self.export_level_label, 0, 2)
+        export_layout.addWidget(self.export_level_spin, 0, 3)
+        export_layout.addWidget(self.export_dir_label, 1, 0)
+        export_layout.addWidget(self.export_dir_input, 1, 1, 1, 2)
+        export_layout.addWidget(self.export_dir_btn, 1, 3)
+        export_layout.addWidget(self.export_incremental_check, 2, 0, 1, 4)
+        export_layout.addWidget(self.export_after_build_check, 3, 0, 1, 4)
+        export_layout.addWidget(self.export_btn, 4, 0)
+        export_layout.addWidget(self.export_result_label, 4, 1, 1, 3)
+
+        artifacts_layout.addWidget(export_group)
+
+        # Delta update group
+        delta_group = QGroupBox("Delta Updates")
+        delta_layout = QGridLayout(delta_group)
+        delta_layout.setSpacing(10)
+
+        self.retain_releases_check = QCheckBox("Keep copies of recent build outputs to create delta packages from")
+        self.retain_releases_check.setChecked(self.settings.value("retain_releases", False, type=bool))
+        self.retain_releases_check.stateChanged.connect(self.save_delta_settings)
+        self.retain_count_label = QLabel("Copies:")
+        self.retain_count_spin = QSpinBox()
+        self.retain_count_spin.setRange(1, 20)
+        self.retain_count_spin.setValue(self.settings.value("retain_count", 3, type=int))
+        self.retain_count_spin.valueChanged.connect(self.save_delta_settings)
+
+        self.delta_from_label = QLabel("Update From Build:")
+        self.delta_from_combo = QComboBox()
+        self.delta_create_btn = QPushButton("Create Delta Package")
+        self.delta_create_btn.clicked.connect(self.create_delta_package)
+        self.delta_apply_btn = QPushButton("Verify && Apply Package...")
+        self.delta_apply_btn.clicked.connect(self.apply_delta_package)
+        self.delta_result_label = QLabel("Delta packages are written to the archive destination and only need the previous build installed")
+        self.delta_result_label.setWordWrap(True)
+
+        delta_layout.addWidget(self.retain_releases_check, 0, 0, 1, 2)
+        delta_layout.addWidget(self.retain_count_label, 0, 2)
+        delta_layout.addWidget(self.retain_count_spin, 0, 3)
+        delta_layout.addWidget(self.delta_from_label, 1, 0)
+        delta_layout.addWidget(self.delta_from_combo, 1, 1)
+        delta_layout.addWidget(self.delta_create_btn, 1, 2)
+        delta_layout.addWidget(self.delta_apply_btn, 1, 3)
+        delta_layout.addWidget(self.delta_result_label, 2, 0, 1, 4)
+
+        artifacts_layout.addWidget(delta_group)
+
+        # Content addressed artifact store group
+        store_group = QGroupBox("Artifact Store")
+        store_layout = QGridLayout(store_group)
+        store_layout.setSpacing(10)
+
+        self.artifact_store_check = QCheckBox("Keep each output file once in a content addressed store and hardlink build outputs to it")
+        self.artifact_store_check.setChecked(self.settings.value("artifact_store", False, type=bool))
+        self.artifact_store_check.stateChanged.connect(self.save_artifact_store_settings)
+        self.artifact_store_label = QLabel("Store:")
+        self.artifact_store_input = QLineEdit()
+        self.artifact_store_input.setPlaceholderText(artifact_tools.default_artifact_store())
+        self.artifact_store_input.setText(self.settings.value("artifact_store_dir", "", type=str))
+        self.artifact_store_input.setToolTip("Hardlinks need the store on the same drive as the output directory")
+        self.artifact_store_input.editingFinished.connect(self.save_artifact_store_settings)
+        self.artifact_store_btn = QPushButton("Browse...")
+        self.artifact_store_btn.clicked.connect(self.select_artifact_store)
+        self.artifact_store_gc_btn = QPushButton("Collect Garbage")
+        self.artifact_store_gc_btn.clicked.connect(self.collect_artifact_garbage)
+        self.artifact_store_usage_label = QLabel("")
+        self.artifact_store_usage_label.setWordWrap(True)
+
+        store_layout.addWidget(self.artifact_store_check, 0, 0, 1, 4)
+        store_layout.addWidget(self.artifact_store_label, 1, 0)
+        store_layout.addWidget(self.artifact_store_input, 1, 1, 1, 2)
+        store_layout.addWidget(self.artifact_store_btn, 1, 3)
+        store_layout.addWidget(self.artifact_store_gc_btn, 2, 0)
+        store_layout.addWidget(self.artifact_store_usage_label, 2, 1, 1, 3)
+
+        artifacts_layout.addWidget(store_group)
+
+        # Deployment sync group
+        deploy_group = QGroupBox("Deployment Sync")
+        deploy_layout = QGridLayout(deploy_group)
+        deploy_layout.setSpacing(10)
+
+        self.deploy_sync_check = QCheckBox("Sync the output to a deployment folder after every successful build")
+        self.deploy_sync_check.setChecked(self.settings.value("deploy_sync", False, type=bool))
+        self.deploy_sync_check.stateChanged.connect(self.save_deploy_settings)
+        self.deploy_dir_label = QLabel("Deploy To:")
+        self.deploy_dir_input = QLineEdit()
+        self.deploy_dir_input.setPlaceholderText("Shared test folder or any local folder")
+        self.deploy_dir_input.setText(self.settings.value("deploy_dir", "", type=str))
+        self.deploy_dir_input.editingFinished.connect(self.save_deploy_settings)
+        self.deploy_dir_btn = QPushButton("Browse...")
+        self.deploy_dir_btn.clicked.connect(self.select_deploy_dir)
+        self.deploy_sync_btn = QPushButton("Sync Now")
+        self.deploy_sync_btn.clicked.connect(self.sync_deployment)
+        self.deploy_result_label = QLabel("Only changed files are copied, the new version replaces the old one in a single step")
+        self.deploy_result_label.setWordWrap(True)
+
+        deploy_layout.addWidget(self.deploy_sync_check, 0, 0, 1, 4)
+        deploy_layout.addWidget(self.deploy_dir_label, 1, 0)
+        deploy_layout.addWidget(self.deploy_dir_input, 1, 1, 1, 2)
+        deploy_layout.addWidget(self.deploy_dir_btn, 1, 3)
+        deploy_layout.addWidget(self.deploy_sync_btn, 2, 0)
+        deploy_layout.addWidget(self.deploy_result_label, 2, 1, 1, 3)
+
+        artifacts_layout.addWidget(deploy_group)
+        artifacts_layout.addStretch()
+
+        # Add artifacts tab to main tabs
+        main_tab.addTab(artifacts_tab, "Artifacts")
+
         # ===== Operation Log Tab =====
         log_tab = QWidget()
         log_layout = QVBoxLayout(log_tab)
@@ -962,7 +2041,7 @@ class NuitkaPackager(QMainWindow):
                 padding: 5px;
                 color: #ffffff;
             }
-            QLineEdit, QComboBox, QListWidget {
+            QLineEdit, QComboBox, QListWidget, QTableWidget {
                 background-color: #1e1e1e;
                 border: 1px solid #555;
                 border-radius: 4px;
@@ -1135,7 +2214,7 @@ class NuitkaPackager(QMainWindow):
                 padding: 5px;
                 color: #2c3e50;
             }
-            QLineEdit, QComboBox, QListWidget {
+            QLineEdit, QComboBox, QListWidget, QTableWidget {
                 background-color: white;
                 border: 1px solid #dcdde1;
                 border-radius: 4px;
@@ -1423,6 +2502,12 @@ class NuitkaPackager(QMainWindow):
         if file_path:
             self.main_file = file_path
             self.file_input.setText(file_path)
+            self.reload_profiles()
+            self.refresh_profile_stats()
+            self.refresh_manifest_builds()
+            self.refresh_smoke_tests()
+            self.start_project_index()
+            self.refresh_launch_history()
 
     def select_icon(self):
         """Select icon file"""
@@ -1449,6 +2534,15 @@ class NuitkaPackager(QMainWindow):
                 "1. Select Python interpreter and main file \n2. Configure options to update command")
             return
 
+        command = self.build_command()
+        if command is None:
+            return
+
+        # Display command
+        self.command_edit.setPlainText(" ".join(command))
+
+    def build_command(self):
+        """Build packaging command arguments from user selections"""
         # Build base command
         command = [
             self.python_path,
@@ -1469,11 +2563,16 @@ class NuitkaPackager(QMainWindow):
         if self.disable_console_check.isChecked():
             command.append("--windows-disable-console")
 
-        if self.remove_output_check.isChecked():
+        # Reused build directories must survive the build
+        if self.remove_output_check.isChecked() and not self.build_dir_reuse_check.isChecked():
             command.append("--remove-output")
 
         if self.include_qt_check.isChecked():
-            command.append("--include-qt-plugins=sensible,styles")
+            command.append(f"--include-qt-plugins={self.qt_plugins_input.text().strip() or 'sensible,styles'}")
+            if self.qt_noinclude_plugins_input.text().strip():
+                command.append(f"--noinclude-qt-plugins={self.qt_noinclude_plugins_input.text().strip()}")
+            if self.noinclude_qt_translations_check.isChecked():
+                command.append("--noinclude-qt-translations")
 
         if self.show_progress_check.isChecked():
             command.append("--show-progress")
@@ -1519,6 +2618,16 @@ class NuitkaPackager(QMainWindow):
         if self.windows_uac_uiaccess_check.isChecked():
             command.append("--windows-uac-uiaccess")
 
+        # ===== Build Profile =====
+        jobs = project_store.profile_jobs(self.current_profile())
+        if jobs:
+            command.append(f"--jobs={jobs}")
+
+        # ===== C Compiler =====
+        compiler = self.compiler_combo.currentData()
+        if compiler:
+            command.extend(perf_tools.COMPILERS[compiler]["args"])
+
         # ===== Include Options =====
         # Include packages
         if self.include_package_input.text():
@@ -1538,6 +2647,17 @@ class NuitkaPackager(QMainWindow):
             for mod in modules:
                 command.append(f"--include-module={mod}")
 
+        # Include data files
+        if self.include_data_input.text():
+            data_files = [df.strip() for df in self.include_data_input.text().split(',') if df.strip()]
+            project_base_dir = os.path.dirname(self.main_file) if self.main_file else ""
+            for df in data_files:
+                src_pattern, _, dest_path = df.partition('=')
+                # Resolve relative patterns against the main file directory
+                if project_base_dir and not os.path.isabs(src_pattern):
+                    src_pattern = os.path.join(project_base_dir, src_pattern)
+                command.append(f"--include-data-files={src_pattern}={dest_path or './'}")
+
         # Include data directories
         if self.include_data_dir_input.text():
             data_dirs = [dd.strip() for dd in self.include_data_dir_input.text().split(',') if dd.strip()]
@@ -1545,7 +2665,7 @@ class NuitkaPackager(QMainWindow):
             # Get project base path from main file location
             if not self.main_file:
                 QMessageBox.warning(self, "Warning", "Please select main file first")
-                return
+                return None
 
             project_base_dir = os.path.dirname(self.main_file)
 
@@ -1558,22 +2678,10 @@ class NuitkaPackager(QMainWindow):
                     # Default destination is last part of source path
                     dest_path = os.path.basename(src_path)
 
-                # Ensure source path is absolute
+                # Resolve relative paths against the main file directory; missing
+                # paths are kept and reported by the validation before the build
                 if not os.path.isabs(src_path):
-                    # Resolve relative path based on main file directory
-                    resolved_path = os.path.join(project_base_dir, src_path)
-
-                    # Verify path exists
-                    if os.path.exists(resolved_path):
-                        src_path = resolved_path
-                    else:
-                        logging.warning(f"Resource path does not exist: {resolved_path}")
-                        continue
-
-                # Verify path exists
-                if not os.path.exists(src_path):
-                    logging.warning(f"Include data directory not found: {src_path}")
-                    continue
+                    src_path = os.path.join(project_base_dir, src_path)
 
                 # Add to command
                 command.append(f"--include-data-dir={src_path}={dest_path}")
@@ -1602,6 +2710,11 @@ class NuitkaPackager(QMainWindow):
             for rd in raw_dirs:
                 command.append(f"--include-raw-dir={rd}")
 
+        # Don't follow imports to
+        if self.nofollow_import_input.text():
+            for mod in [mod.strip() for mod in self.nofollow_import_input.text().split(',') if mod.strip()]:
+                command.append(f"--nofollow-import-to={mod}")
+
         # ===== Python Flags =====
         for i in range(self.flags_list.count()):
             command.append(self.flags_list.item(i).text())
@@ -1621,8 +2734,9 @@ class NuitkaPackager(QMainWindow):
                 command.append("--onefile-as-archive")
 
         # ===== DLL Control =====
-        if self.noinclude_dlls_input.text():
-            command.append(f"--noinclude-dlls={self.noinclude_dlls_input.text()}")
+        for pattern in self.noinclude_dlls_input.text().split(","):
+            if pattern.strip():
+                command.append(f"--noinclude-dlls={pattern.strip()}")
 
         # ===== Metadata =====
         if self.company_input.text():
@@ -1669,8 +2783,7 @@ class NuitkaPackager(QMainWindow):
         # Add main file
         command.append(self.main_file)
 
-        # Display command
-        self.command_edit.setPlainText(" ".join(command))
+        return command
 
     def execute_package(self):
         """Execute packaging command"""
@@ -1705,8 +2818,80 @@ class NuitkaPackager(QMainWindow):
         # Get command
         command = self.command_edit.toPlainText().split()
 
+        # Check referenced paths and modules in the background before anything is launched
+        python = None if self.python_path.endswith("nuitka.cmd") else self.python_path
+        build_python = self.python_path
+        prebuilt = self.prebuilt_packages() if self.prebuilt_check.isChecked() else []
+
+        def task(log, progress, should_stop):
+            problems = preflight.validate_command(command, python)
+            # Querying package versions for the prebuilt module cache starts the interpreter too
+            interpreter = None
+            if prebuilt and "--onefile" not in command and "--module" not in command:
+                try:
+                    interpreter = build_env.interpreter_info(build_python, prebuilt)
+                except (OSError, ValueError, RuntimeError, subprocess.TimeoutExpired) as e:
+                    interpreter = e
+            return problems, interpreter
+
+        self.input_check_thread = ToolThread(task)
+        self.input_check_thread.log_signal.connect(self.log_message)
+        self.input_check_thread.result_signal.connect(lambda result: self.start_package(command, *result))
+        self.input_check_thread.finished_signal.connect(self.input_check_finished)
+        self.execute_btn.setEnabled(False)
+        self.input_check_thread.start()
+        self.log_message("🔎 Checking build inputs...")
+
+    def input_check_finished(self, ok):
+        """Re-enable packaging when the input check did not start a build"""
+        if not (self.package_thread and self.package_thread.isRunning()):
+            self.execute_btn.setEnabled(True)
+
+    def start_package(self, command, problems, interpreter=None):
+        """Set up the build steps and start packaging once the inputs are checked"""
+        if not self.confirm_build_inputs(problems):
+            return
+
+        # Steps run by the packaging thread around the Nuitka build
+        before_build, after_build, cleanup = [], [], []
+        self.build_extra = {}
+        if self.source_snapshot_check.isChecked():
+            command = self.add_source_snapshot_steps(command, before_build, after_build)
+        if self.preflight_check.isChecked():
+            self.add_preflight_steps(command, before_build)
+        if self.scratch_staging_check.isChecked():
+            command = self.add_scratch_staging_steps(command, before_build, after_build, cleanup)
+        if self.build_dir_reuse_check.isChecked():
+            command = perf_tools.remove_options(command, ["--remove-output"])
+            self.add_build_dir_reuse_steps(command, before_build, cleanup)
+        if self.prebuilt_check.isChecked() and self.prebuilt_packages():
+            command = self.add_prebuilt_module_steps(command, after_build, interpreter)
+        if self.split_symbols_check.isChecked() and "--unstripped" in command:
+            self.add_symbol_split_steps(command, after_build)
+        if self.smoke_tests_check.isChecked() and self.smoke_tests():
+            self.add_smoke_test_steps(command, after_build)
+        if self.artifact_manifest_check.isChecked():
+            self.add_manifest_steps(command, after_build)
+            if self.retain_releases_check.isChecked():
+                self.add_release_steps(after_build)
+            if self.artifact_store_check.isChecked():
+                self.add_artifact_store_steps(command, before_build, after_build)
+        if self.deploy_sync_check.isChecked() and self.deploy_dir_input.text().strip():
+            self.add_deploy_steps(command, after_build)
+
+        if "--onefile" in command:
+            self.build_extra["onefile_tempdir_spec"] = perf_tools.get_option(command, "--onefile-tempdir-spec", "")
+
+        # Remember what is being built for the build history
+        self.build_command_args = command
+        self.build_profile = self.profile_combo.currentData() or ""
+        self.build_started = time.time()
+
         # Create and start packaging thread
-        self.package_thread = PackageThread(command)
+        compiler = self.compiler_combo.currentData()
+        env = perf_tools.compiler_env(compiler) if compiler else None
+        self.package_thread = PackageThread(command, before_build=before_build, after_build=after_build,
+                                            cleanup=cleanup, env=env)
         self.package_thread.log_signal.connect(self.log_message)
         self.package_thread.finished_signal.connect(self.package_finished)
 
@@ -1738,23 +2923,15 @@ class NuitkaPackager(QMainWindow):
     def stop_package(self):
         """Stop packaging process"""
         if self.package_thread and self.package_thread.isRunning():
+            # The thread stops Nuitka and skips the remaining steps, cleanup still runs before it finishes
             self.package_thread.stop()
-            self.log_message("🛑 User requested packaging stop...")
+            self.build_extra["cancelled"] = True
+            self.log_message("🛑 User requested packaging stop, waiting for the running step to finish...")
             self.stop_btn.setEnabled(False)
 
-            # Attempt normal thread termination
-            if not self.package_thread.wait(2000):  # Wait 2 seconds
-                # Force terminate if still running
-                self.package_thread.terminate()
-                self.log_message("⚠️ Forced packaging thread termination")
-
-            # Reset button state immediately
-            self.execute_btn.setEnabled(True)
-            self.progress_bar.setValue(0)
-
-            # Stop progress updates
-            if hasattr(self, 'progress_timer'):
-                self.killTimer(self.progress_timer)
+    def build_stopped(self):
+        """Whether the user stopped the running build, checked by long post-build steps"""
+        return self.package_thread is not None and not self.package_thread.running
 
     def package_finished(self, success):
         """Handle packaging completion"""
@@ -1769,6 +2946,11 @@ class NuitkaPackager(QMainWindow):
         if hasattr(self, 'progress_timer'):
             self.killTimer(self.progress_timer)
 
+        # Record the build in the project history
+        self.record_build(success)
+        if success and self.export_after_build_check.isChecked():
+            self.export_build_archive()
+
         if success:
             self.log_message("✅ Packaging completed successfully!")
             self.log_message(f"Output directory: {self.output_dir}")
@@ -1784,6 +2966,8 @@ class NuitkaPackager(QMainWindow):
             reply = msg_box.exec()  # Use exec() instead of static method
             if reply == QMessageBox.Yes:
                 os.startfile(self.output_dir)
+        elif self.build_extra.get("cancelled"):
+            self.log_message("🛑 Packaging stopped, recorded as cancelled")
         else:
             self.log_message("❌ Errors occurred during packaging, check log")
 
@@ -1793,6 +2977,1555 @@ class NuitkaPackager(QMainWindow):
         self.log_message("Log cleared")
         self.progress_bar.setValue(0)
 
+    def start_tool_task(self, task, on_result, button=None):
+        """Run a background tool task, routing its log and progress to the main window"""
+        if self.tool_thread and self.tool_thread.isRunning():
+            self.log_message("⚠️ Another tool is already running")
+            return False
+
+        self.tool_thread = ToolThread(task)
+        self.tool_thread.log_signal.connect(self.log_message)
+        self.tool_thread.progress_signal.connect(self.progress_bar.setValue)
+        self.tool_thread.result_signal.connect(on_result)
+        if button is not None:
+            button.setEnabled(False)
+            self.tool_thread.finished_signal.connect(lambda _: button.setEnabled(True))
+        self.progress_bar.setValue(0)
+        self.tool_thread.start()
+        return True
+
+    def run_option_tuner(self):
+        """Build and benchmark combinations of the selected options"""
+        if not self.python_path or not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "Missing Configuration",
+                                "Select Python interpreter, main file and output directory")
+            return
+
+        keys = [key for key, check in self.tuner_option_checks.items() if check.isChecked()]
+        if "onefile_no_compression" in keys and not self.onefile_check.isChecked():
+            keys.remove("onefile_no_compression")
+            self.log_message("ℹ️ --onefile-no-compression skipped: onefile mode is disabled")
+        if not keys:
+            QMessageBox.warning(self, "Missing Configuration", "Check at least one option to tune")
+            return
+
+        base_command = self.command_edit.toPlainText().split()
+        work_dir = os.path.join(self.output_dir, "tuner")
+        parallel = self.tuner_parallel_spin.value()
+        max_combinations = self.tuner_max_spin.value()
+        startup_args = self.tuner_args_input.text().split()
+        startup_runs = self.tuner_runs_spin.value()
+        main_file = self.main_file
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_tuner(
+                base_command, main_file, work_dir, keys, parallel=parallel,
+                max_combinations=max_combinations, startup_args=startup_args,
+                startup_runs=startup_runs, log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_tuner_results, self.tuner_run_btn):
+            self.log_message(f"▶ Tuning {len(keys)} options with {parallel} parallel builds...")
+
+    def show_tuner_results(self, results):
+        """Fill the tuner table, Pareto-optimal configurations first"""
+        self.tuner_results = sorted(results, key=lambda r: (not r.get("pareto"), r["index"]))
+        self.tuner_table.setRowCount(len(self.tuner_results))
+
+        def fmt(value, scale, digits):
+            return "-" if value is None else f"{value / scale:.{digits}f}"
+
+        for row, result in enumerate(self.tuner_results):
+            label = result["label"] if result["ok"] else f"{result['label']} (failed)"
+            cells = [
+                label,
+                fmt(result["size_bytes"], 1024 * 1024, 1),
+                fmt(result["startup_ms"], 1, 0),
+                fmt(result["build_s"], 1, 1),
+                "★" if result.get("pareto") else "",
+            ]
+            for column, text in enumerate(cells):
+                self.tuner_table.setItem(row, column, QTableWidgetItem(text))
+
+        self.tuner_apply_btn.setEnabled(bool(self.tuner_results))
+        front = [r["label"] for r in self.tuner_results if r.get("pareto")]
+        self.log_message(f"✅ Tuner finished, Pareto front: {', '.join(front) or 'none'}")
+
+    def apply_tuner_selection(self):
+        """Apply the configuration selected in the tuner table to the UI"""
+        row = self.tuner_table.currentRow()
+        if row < 0 or row >= len(self.tuner_results):
+            QMessageBox.warning(self, "No Selection", "Select a configuration in the tuner table")
+            return
+
+        combo = self.tuner_results[row]["combo"]
+        self.lto_check.setChecked("lto" in combo)
+        if self.onefile_check.isChecked():
+            self.onefile_no_compression_check.setChecked("onefile_no_compression" in combo)
+
+        # Sync tuned Python flags with the flags list
+        for key, (flag, _) in perf_tools.TUNABLE_OPTIONS.items():
+            if not flag.startswith("--python-flag="):
+                continue
+            if key in combo and not self.flag_exists(flag):
+                self.flags_list.addItem(flag)
+            elif key not in combo:
+                for item in self.flags_list.findItems(flag, Qt.MatchExactly):
+                    self.flags_list.takeItem(self.flags_list.row(item))
+
+        self.update_command()
+        self.log_message(f"✓ Applied tuner configuration: {self.tuner_results[row]['label']}")
+
+    def current_profile(self):
+        """Return the selected build profile, or None for custom settings"""
+        return self.profiles.get(self.profile_combo.currentData() or "")
+
+    def reload_profiles(self):
+        """Load built-in and project build profiles into the profile selector"""
+        selected = self.profile_combo.currentData() or self.settings.value("build_profile", "", type=str)
+        try:
+            self.profiles = project_store.load_profiles(self.main_file or None)
+        except OSError as e:
+            self.profiles = project_store.load_profiles()
+            self.log_message(f"⚠️ Failed to load project profiles: {str(e)}")
+
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItem("Custom", "")
+        for name in self.profiles:
+            self.profile_combo.addItem(name, name)
+        index = self.profile_combo.findData(selected)
+        self.profile_combo.setCurrentIndex(max(0, index))
+        self.profile_combo.blockSignals(False)
+
+    def apply_profile(self, index=None):
+        """Apply the selected profile's option defaults to the UI"""
+        name = self.profile_combo.currentData() or ""
+        self.settings.setValue("build_profile", name)
+        profile = self.current_profile()
+        if profile:
+            for key, value in profile.get("checks", {}).items():
+                check = getattr(self, f"{key}_check", None)
+                if check is not None:
+                    check.setChecked(value)
+            self.log_message(f"🧩 Switched to build profile: {name}")
+        self.update_command()
+
+    def save_current_profile(self):
+        """Save the current option states as a named profile in the project"""
+        if not self.main_file:
+            QMessageBox.warning(self, "Missing Configuration", "Select main file first, profiles are stored in the project")
+            return
+
+        name, ok = QInputDialog.getText(self, "Save Profile", "Profile name:",
+                                        text=self.profile_combo.currentData() or "")
+        name = name.strip()
+        if not ok or not name:
+            return
+
+        profile = {
+            "checks": {key: getattr(self, f"{key}_check").isChecked() for key in project_store.PROFILE_CHECKS},
+            "jobs": (self.current_profile() or {}).get("jobs"),
+        }
+        try:
+            project_store.save_profile(self.main_file, name, profile)
+        except OSError as e:
+            self.log_message(f"⚠️ Failed to save profile: {str(e)}")
+            return
+        if self.profile_combo.findData(name) < 0:
+            self.profile_combo.addItem(name, name)
+        self.profiles[name] = profile
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(name))
+        self.settings.setValue("build_profile", name)
+        self.log_message(f"💾 Saved build profile: {name}")
+
+    def refresh_profile_stats(self):
+        """Compare build times recorded for each profile"""
+        if not self.main_file:
+            return
+        stats = project_store.profile_build_stats(project_store.load_history(self.main_file))
+        self.profile_stats_table.setRowCount(len(stats))
+
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        for row, item in enumerate(stats):
+            cells = [item["profile"] or "Custom", str(item["builds"]), str(item["successful"]),
+                     fmt(item["mean_s"]), fmt(item["median_s"]), fmt(item["last_s"])]
+            for column, text in enumerate(cells):
+                self.profile_stats_table.setItem(row, column, QTableWidgetItem(text))
+
+    def build_dir_store(self):
+        """Return the build directory store configured in the UI"""
+        root = self.build_store_input.text().strip() or os.path.join(build_env.user_cache_dir(), "build-dirs")
+        return build_env.BuildDirStore(root, self.build_store_cap_spin.value() * 1024 ** 3)
+
+    def save_build_store_settings(self):
+        """Persist build directory reuse settings"""
+        self.settings.setValue("build_dir_reuse", self.build_dir_reuse_check.isChecked())
+        self.settings.setValue("build_dir_store", self.build_store_input.text().strip())
+        self.settings.setValue("build_dir_cap_gb", self.build_store_cap_spin.value())
+
+    def select_build_store_dir(self):
+        """Select build directory store location"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "Select Build Directory Store", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.build_store_input.setText(dir_path)
+            self.save_build_store_settings()
+            self.refresh_build_store()
+
+    def add_build_dir_reuse_steps(self, command, before_build, cleanup):
+        """Restore the stored build directory before the build and store it again afterwards"""
+        store = self.build_dir_store()
+        key = build_env.configuration_key(self.main_file, command)
+        main_file = self.main_file
+        output_dir = perf_tools.get_option(command, "--output-dir", self.output_dir)
+        label = self.profile_combo.currentData() or "custom"
+
+        def checkout(log):
+            # A cold start is no reason to abort, checkout only reports whether anything was reused
+            store.checkout(key, main_file, output_dir, log)
+
+        before_build.append(checkout)
+        # Stored back even after a failure or stop, and before scratch space is cleaned up
+        cleanup.insert(0, lambda log, success: store.checkin(key, main_file, output_dir, label, log))
+
+    def refresh_build_store(self):
+        """List stored build directories, most recently used first"""
+        store = self.build_dir_store()
+        entries = store.entries()
+        self.build_store_table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            cells = [
+                entry.get("project", ""),
+                entry.get("label", ""),
+                f"{entry.get('size', 0) / 1024 / 1024:.1f}",
+                datetime.fromtimestamp(entry.get("last_used", 0)).strftime("%Y-%m-%d %H:%M"),
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, entry["key"])
+                self.build_store_table.setItem(row, column, item)
+        total = sum(entry.get("size", 0) for entry in entries)
+        self.build_store_total_label.setText(
+            f"Total: {total / 1024 ** 3:.2f} GB of {self.build_store_cap_spin.value()} GB")
+
+    def delete_build_store_entries(self):
+        """Delete the selected stored build directories"""
+        store = self.build_dir_store()
+        rows = sorted({index.row() for index in self.build_store_table.selectedIndexes()})
+        for row in rows:
+            key = self.build_store_table.item(row, 0).data(Qt.UserRole)
+            store.remove(key)
+            self.log_message(f"🗑 Deleted stored build directory {key}")
+        self.refresh_build_store()
+
+    def evict_build_store(self):
+        """Evict least recently used build directories above the size cap"""
+        removed = self.build_dir_store().evict()
+        self.log_message(f"🗑 Evicted {len(removed)} stored build directories")
+        self.refresh_build_store()
+
+    def save_scratch_settings(self):
+        """Persist scratch staging settings"""
+        self.settings.setValue("scratch_staging", self.scratch_staging_check.isChecked())
+        self.settings.setValue("scratch_dir", self.scratch_dir_input.text().strip())
+
+    def select_scratch_dir(self):
+        """Select scratch staging directory"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "Select Scratch Directory", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.scratch_dir_input.setText(dir_path)
+            self.save_scratch_settings()
+
+    def add_scratch_staging_steps(self, command, before_build, after_build, cleanup):
+        """Redirect the build to the scratch directory if it has room, returns the command to run"""
+        scratch_root = self.scratch_dir_input.text().strip() or build_env.default_scratch_dir()
+        required = build_env.estimate_intermediate_bytes(project_store.load_history(self.main_file))
+        usable, free = build_env.check_scratch_space(scratch_root, required)
+        if not usable:
+            self.log_message(f"⚠️ Scratch directory {scratch_root} has {free / 1024 ** 2:.0f} MB free, "
+                             f"{required / 1024 ** 2:.0f} MB needed - building on disk")
+            return command
+
+        output_dir = perf_tools.get_option(command, "--output-dir", self.output_dir)
+        staging = build_env.ScratchStaging(scratch_root, output_dir, self.main_file)
+        command = perf_tools.remove_options(command, ["--remove-output"])
+        command = perf_tools.set_option(command, "--output-dir", staging.stage_dir)
+
+        def collect(log, success):
+            staging.collect(log, success)
+            if staging.intermediate_bytes:
+                self.build_extra["intermediate_bytes"] = staging.intermediate_bytes
+
+        before_build.append(staging.prepare)
+        after_build.append(collect)
+        cleanup.append(staging.cleanup)
+        return command
+
+    def add_source_snapshot_steps(self, command, before_build, after_build):
+        """Build from a frozen snapshot of the project tree, returns the command to run"""
+        snapshot = build_env.SourceSnapshot(self.main_file, self.output_dir)
+        before_build.append(snapshot.prepare)
+        after_build.append(snapshot.verify)
+        return snapshot.rewrite(command)
+
+    def confirm_build_inputs(self, problems):
+        """Report problems found in the build inputs, returns False if the build should not start"""
+        if not problems:
+            return True
+
+        lines = [f"{'❌' if p['level'] == 'error' else '⚠️'} {p['option']}: {p['message']}" for p in problems]
+        for line in lines:
+            self.log_message(line)
+
+        if any(p["level"] == "error" for p in problems):
+            msg_box = QMessageBox(QMessageBox.Critical, "Invalid Build Inputs",
+                                  "The build was not started:\n\n" + "\n".join(lines),
+                                  QMessageBox.Ok, self)
+            msg_box.setStyleSheet(self.get_messagebox_style())
+            msg_box.exec()
+            return False
+
+        msg_box = QMessageBox(QMessageBox.Question, "Build Input Warnings",
+                              "\n".join(lines) + "\n\nStart the build anyway?",
+                              QMessageBox.Yes | QMessageBox.No, self)
+        msg_box.setStyleSheet(self.get_messagebox_style())
+        return msg_box.exec() == QMessageBox.Yes
+
+    def start_project_index(self):
+        """Index the project tree in the background for the data file preview"""
+        if not self.main_file or (self.index_thread and self.index_thread.isRunning()):
+            return
+        index = data_tools.ProjectIndex(os.path.dirname(os.path.abspath(self.main_file)))
+        self.project_index = None
+        self.data_preview_label.setText("Indexing project files...")
+
+        def task(log, progress, should_stop):
+            index.build(should_stop=should_stop)
+            return index
+
+        self.index_thread = ToolThread(task)
+        self.index_thread.log_signal.connect(self.log_message)
+        self.index_thread.result_signal.connect(self.project_index_ready)
+        self.index_thread.start()
+
+    def project_index_ready(self, index):
+        """Start watching the indexed folders and show the preview"""
+        if self.index_watcher.directories():
+            self.index_watcher.removePaths(self.index_watcher.directories())
+        self.project_index = index
+        self.index_watcher.addPaths([index.abs_dir(rel) for rel in index.dirs])
+        self.log_message(f"🗂 Indexed {index.file_count()} project files in {len(index.dirs)} folders")
+        self.update_data_preview()
+
+    def refresh_project_index(self, path):
+        """Re-index a folder the file watcher reported as changed"""
+        if self.project_index is None:
+            return
+        added = self.project_index.refresh_dir(path)
+        if added:
+            self.index_watcher.addPaths([self.project_index.abs_dir(rel) for rel in added])
+        self.data_preview_timer.start()
+
+    def update_data_preview(self):
+        """Show which project files the data file fields include and exclude"""
+        if self.project_index is None:
+            return
+
+        def entries(field):
+            return [entry.strip() for entry in field.text().split(',') if entry.strip()]
+
+        data_dirs, data_files = entries(self.include_data_dir_input), entries(self.include_data_input)
+        if not data_dirs and not data_files:
+            self.data_preview_label.setText("")
+            return
+
+        result = data_tools.preview_data_files(
+            self.project_index, data_dirs, data_files, entries(self.noinclude_data_input), self.project_index.root)
+        text = (f"Preview: {result['included_files']} files ({result['included_bytes'] / 1024 / 1024:.1f} MB) included, "
+                f"{result['excluded_files']} files ({result['excluded_bytes'] / 1024 / 1024:.1f} MB) excluded")
+        if result["outside"]:
+            text += f" - not previewed (outside the project): {', '.join(result['outside'])}"
+        self.data_preview_label.setText(text)
+
+    def data_entries(self):
+        """Data directory, data file and exclude entries of the include fields"""
+        def entries(field):
+            return [entry.strip() for entry in field.text().split(',') if entry.strip()]
+        return entries(self.include_data_dir_input), entries(self.include_data_input), entries(self.noinclude_data_input)
+
+    def scan_duplicate_data(self):
+        """Hash the included data files and report identical copies"""
+        if not self.main_file:
+            QMessageBox.warning(self, "Missing Configuration", "Select main file")
+            return
+        data_dirs, data_files, excludes = self.data_entries()
+        if not data_dirs and not data_files:
+            QMessageBox.warning(self, "Missing Configuration", "Add data directories or data files first")
+            return
+        base_dir = os.path.dirname(os.path.abspath(self.main_file))
+
+        def task(log, progress, should_stop):
+            files = data_tools.included_data_files(data_dirs, data_files, excludes, base_dir)
+            duplicates = data_tools.find_duplicate_files(
+                files, data_tools.default_hash_cache(), log=log, should_stop=should_stop)
+            return {
+                "files": len(files),
+                "bytes": sum(size for _, _, size in files),
+                "duplicates": duplicates,
+                "suggestions": data_tools.duplicate_suggestions(duplicates, data_dirs, base_dir),
+            }
+
+        if self.start_tool_task(task, self.show_duplicate_data, self.duplicates_scan_btn):
+            self.log_message("▶ Scanning included data files for duplicates...")
+
+    def show_duplicate_data(self, result):
+        """Display duplicate sets and suggested exclusions"""
+        duplicates = result["duplicates"]
+        wasted = sum(d["wasted"] for d in duplicates)
+        self.duplicates_summary_label.setText(
+            f"{result['files']} files ({result['bytes'] / 1024 / 1024:.1f} MB), "
+            f"{len(duplicates)} duplicate sets wasting {wasted / 1024 / 1024:.1f} MB")
+
+        self.duplicates_table.setRowCount(len(duplicates))
+        for row, duplicate in enumerate(duplicates):
+            cells = [
+                f"{duplicate['wasted'] / 1024 / 1024:.2f}",
+                f"{duplicate['size'] / 1024 / 1024:.2f}",
+                str(len(duplicate["files"])),
+                ", ".join(target for _, target in duplicate["files"]),
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setToolTip("\n".join(source for source, _ in duplicate["files"]))
+                self.duplicates_table.setItem(row, column, item)
+
+        self.duplicates_suggestions_list.clear()
+        for suggestion in result["suggestions"]:
+            item = QListWidgetItem(suggestion["text"])
+            item.setData(Qt.UserRole, suggestion["exclude"])
+            self.duplicates_suggestions_list.addItem(item)
+        self.log_message(f"✅ Duplicate scan finished: {len(duplicates)} sets, {wasted / 1024 / 1024:.1f} MB wasted")
+
+    def apply_duplicate_exclusions(self):
+        """Append the exclusions of the selected suggestions to the exclude field"""
+        _, _, excludes = self.data_entries()
+        for item in self.duplicates_suggestions_list.selectedItems():
+            for pattern in item.data(Qt.UserRole):
+                if pattern not in excludes:
+                    excludes.append(pattern)
+        self.noinclude_data_input.setText(",".join(excludes))
+
+    def analyze_onefile_payload(self):
+        """Benchmark onefile payload compression levels on the last build's .dist folder"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "Missing Configuration", "Select main file and output directory")
+            return
+        dist_dir = perf_tools.find_dist_dir(self.output_dir, self.main_file)
+        if not dist_dir:
+            QMessageBox.warning(self, "Missing Build",
+                                "No .dist folder found in the output directory.\n"
+                                "Build in standalone or onefile mode without Remove Output first.")
+            return
+        try:
+            levels = [int(level) for level in self.payload_levels_input.text().split(',') if level.strip()]
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Levels", "Enter zstd levels as comma separated numbers (1-22)")
+            return
+        levels = [level for level in levels if 1 <= level <= 22]
+        read_mb_s = self.payload_read_spin.value()
+
+        def task(log, progress, should_stop):
+            return data_tools.benchmark_onefile_payload(dist_dir, levels, read_mb_s, log=log,
+                                                        progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_payload_analysis, self.payload_analyze_btn):
+            self.log_message(f"▶ Analyzing onefile payload in {dist_dir}")
+
+    def show_payload_analysis(self, result):
+        """Display payload files and compression settings"""
+        files = result["files"][:500]
+        self.payload_files_table.setRowCount(len(files))
+        for row, entry in enumerate(files):
+            compressed = entry["compressed"]
+            cells = [
+                entry["path"],
+                f"{entry['size'] / 1024 / 1024:.2f}",
+                "-" if compressed is None else f"{compressed / 1024 / 1024:.2f}",
+                "-" if not compressed or not entry["size"] else f"{entry['size'] / compressed:.1f}x",
+            ]
+            for column, text in enumerate(cells):
+                self.payload_files_table.setItem(row, column, QTableWidgetItem(text))
+
+        settings = result["settings"]
+        self.payload_settings_table.setRowCount(len(settings))
+        for row, setting in enumerate(settings):
+            cells = [
+                setting["setting"],
+                f"{setting['payload_bytes'] / 1024 / 1024:.1f}",
+                f"{setting['compress_s']:.1f}",
+                f"{setting['decompress_ms']:.0f}",
+                f"{setting['extract_ms']:.0f}",
+            ]
+            for column, text in enumerate(cells):
+                self.payload_settings_table.setItem(row, column, QTableWidgetItem(text))
+
+        fastest, smallest = result["fastest"], result["smallest"]
+        self.payload_recommendation = fastest
+        self.payload_result_label.setText(
+            f"Fastest launch: {fastest['setting']} (~{fastest['extract_ms']:.0f} ms to read and unpack), "
+            f"smallest download: {smallest['setting']} ({smallest['payload_bytes'] / 1024 / 1024:.1f} MB). "
+            f"Nuitka compresses with zstd at its built-in level; only compression on/off can be chosen.")
+        self.payload_apply_btn.setEnabled(True)
+        self.log_message(f"✅ Payload analysis finished, fastest launch: {fastest['setting']}")
+
+    def apply_payload_recommendation(self):
+        """Toggle onefile compression according to the fastest measured setting"""
+        uncompressed = self.payload_recommendation["level"] is None
+        self.onefile_no_compression_check.setChecked(uncompressed)
+        self.log_message(f"Onefile compression {'disabled' if uncompressed else 'enabled'} for the fastest launch")
+
+    def analyze_qt_plugins(self):
+        """Trace which Qt plugins and translations the app loads"""
+        if not self.python_path or not self.main_file:
+            QMessageBox.warning(self, "Missing Configuration", "Select Python interpreter and main file")
+            return
+        if self.python_path.endswith("nuitka.cmd"):
+            QMessageBox.warning(self, "Unsupported Interpreter", "Select a Python interpreter to run the app with")
+            return
+        python, main_file = self.python_path, self.main_file
+        args = self.qt_trace_args_input.text().split()
+        duration = self.qt_trace_spin.value()
+
+        def task(log, progress, should_stop):
+            return binary_tools.analyze_qt_plugins(python, main_file, args, duration, log=log)
+
+        if self.start_tool_task(task, self.show_qt_plugin_analysis, self.qt_analyze_btn):
+            self.log_message(f"▶ Running {os.path.basename(main_file)} to trace Qt plugin loads...")
+
+    def show_qt_plugin_analysis(self, result):
+        """Display which plugin categories are used"""
+        self.qt_analysis = result
+        if not result:
+            self.qt_apply_btn.setEnabled(False)
+            self.log_message("❌ No Qt binding found for the selected interpreter")
+            return
+        categories = result["categories"]
+        self.qt_plugins_table.setRowCount(len(categories))
+        for row, category in enumerate(categories):
+            cells = [
+                category["category"],
+                str(category["files"]),
+                f"{category['size'] / 1024 / 1024:.1f}",
+                ", ".join(category["loaded"]),
+                category["reason"] or "no",
+            ]
+            for column, text in enumerate(cells):
+                self.qt_plugins_table.setItem(row, column, QTableWidgetItem(text))
+
+        translations = "used" if result["translations_used"] else \
+            f"unused ({result['translations_bytes'] / 1024 / 1024:.1f} MB)"
+        self.qt_analysis_label.setText(f"{' '.join(result['options'])}\n"
+                                       f"Translations {translations}, "
+                                       f"~{result['saved_bytes'] / 1024 / 1024:.1f} MB less than the default set")
+        self.qt_apply_btn.setEnabled(True)
+        self.log_message(f"✅ Qt plugin analysis finished: {' '.join(result['options'])}")
+
+    def apply_qt_plugin_analysis(self):
+        """Use the minimal Qt plugin set found by the analysis"""
+        result = self.qt_analysis
+        self.include_qt_check.setChecked(True)
+        self.qt_plugins_input.setText(",".join(result["include"]))
+        self.qt_noinclude_plugins_input.setText(",".join(result["noinclude"]))
+        self.noinclude_qt_translations_check.setChecked(not result["translations_used"])
+        self.log_message("Applied the minimal Qt plugin set")
+
+    def scan_dist_libraries(self):
+        """Build the shared library dependency graph of the last build"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "Missing Configuration", "Select main file and output directory")
+            return
+        dist_dir = perf_tools.find_dist_dir(self.output_dir, self.main_file)
+        if not dist_dir:
+            QMessageBox.warning(self, "Missing Build",
+                                "No .dist folder found in the output directory.\n"
+                                "Build in standalone or onefile mode without Remove Output first.")
+            return
+
+        def task(log, progress, should_stop):
+            return binary_tools.dll_exclusion_advice(dist_dir, log=log, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_dist_libraries, self.dlls_scan_btn):
+            self.log_message(f"▶ Scanning shared libraries in {dist_dir}")
+
+    def show_dist_libraries(self, result):
+        """Display the dependency graph and exclusion suggestions"""
+        libraries = result["libraries"]
+        self.dlls_table.setRowCount(len(libraries))
+        for row, library in enumerate(libraries):
+            status = "root" if library["root"] else "used" if library["used"] else "unused"
+            cells = [
+                library["path"],
+                f"{library['size'] / 1024 / 1024:.2f}",
+                status,
+                ", ".join(library["needs"]),
+                ", ".join(library["needed_by"]),
+            ]
+            for column, text in enumerate(cells):
+                self.dlls_table.setItem(row, column, QTableWidgetItem(text))
+
+        self.dlls_suggestions_list.clear()
+        for suggestion in result["suggestions"]:
+            item = QListWidgetItem(f"{suggestion['pattern']} ({suggestion['bytes'] / 1024 / 1024:.2f} MB): "
+                                   f"{suggestion['reason']}")
+            item.setData(Qt.UserRole, suggestion["pattern"])
+            self.dlls_suggestions_list.addItem(item)
+
+        self.dlls_summary_label.setText(
+            f"{len(libraries)} binaries, {len(result['duplicates'])} version duplicates, "
+            f"{len(result['unresolved'])} dependencies taken from the system; "
+            f"suggestions save up to {result['saved_bytes'] / 1024 / 1024:.1f} MB")
+        self.log_message(f"✅ Library scan finished, {len(result['suggestions'])} exclusion suggestions")
+
+    def apply_dll_exclusions(self):
+        """Append the selected libraries to the DLL exclusion field"""
+        patterns = [p.strip() for p in self.noinclude_dlls_input.text().split(",") if p.strip()]
+        for item in self.dlls_suggestions_list.selectedItems():
+            if item.data(Qt.UserRole) not in patterns:
+                patterns.append(item.data(Qt.UserRole))
+        self.noinclude_dlls_input.setText(",".join(patterns))
+
+    def save_symbol_settings(self):
+        """Persist debug symbol settings"""
+        self.settings.setValue("split_symbols", self.split_symbols_check.isChecked())
+        self.settings.setValue("symbol_store", self.symbol_store_input.text().strip())
+
+    def select_symbol_store(self):
+        """Select symbol store directory"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "Select Symbol Store", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.symbol_store_input.setText(dir_path)
+            self.save_symbol_settings()
+
+    def add_symbol_split_steps(self, command, after_build):
+        """Move debug info of the built binaries into the symbol store after the build"""
+        main_file, output_dir = self.main_file, self.output_dir
+        store = self.symbol_store_input.text().strip() or os.path.join(project_store.state_dir(main_file), "symbols")
+        if "--onefile" in command:
+            self.log_message("⚠️ The onefile executable is packed before symbols are split, it stays unstripped")
+
+        def split(log, success):
+            dist_dir = perf_tools.find_dist_dir(output_dir, main_file) if success else None
+            if not dist_dir:
+                return
+            result = binary_tools.split_debug_symbols(dist_dir, store, log=log, should_stop=self.build_stopped)
+            if result is None:
+                return False
+            self.build_extra["debug_symbols"] = {
+                "store": store,
+                "before_bytes": result["before"],
+                "after_bytes": result["after"],
+                "build_ids": {b["path"]: b["build_id"] for b in result["binaries"] if b["status"] == "split"},
+            }
+
+        after_build.append(split)
+
+    def add_manifest_steps(self, command, after_build):
+        """Hash the build output into a manifest once Nuitka is done"""
+        main_file, output_dir = self.main_file, self.output_dir
+        onefile = "--onefile" in command
+
+        def manifest(log, success):
+            artifact = artifact_tools.artifact_path(output_dir, main_file, onefile) if success else None
+            if not artifact:
+                return
+            result = artifact_tools.build_manifest(artifact, artifact_tools.default_manifest_cache(), log=log,
+                                                   should_stop=self.build_stopped)
+            if self.build_stopped():
+                return False
+            path = artifact_tools.save_manifest(main_file, result, time.strftime("%Y%m%d-%H%M%S"))
+            artifact_tools.write_checksum_file(result, artifact + ".sha256")
+            self.build_extra["manifest"] = {
+                "path": path,
+                "artifact": artifact,
+                "files": len(result["files"]),
+                "bytes": result["total_bytes"],
+            }
+
+        after_build.append(manifest)
+
+    def manifest_builds(self):
+        """Recorded builds that have a manifest, newest first"""
+        if not self.main_file:
+            return []
+        return [entry for entry in reversed(project_store.load_history(self.main_file)) if entry.get("manifest")]
+
+    def refresh_manifest_builds(self):
+        """List builds with manifests for comparison"""
+        self.manifest_compare_combo.clear()
+        for entry in self.manifest_builds()[1:]:
+            manifest = entry["manifest"]
+            self.manifest_compare_combo.addItem(
+                f"{entry['id']} ({manifest['files']} files, {manifest['bytes'] / 1024 / 1024:.1f} MB)", entry["id"])
+        self.delta_from_combo.clear()
+        for entry in self.manifest_builds()[1:]:
+            if entry.get("release") and os.path.exists(entry["release"]):
+                self.delta_from_combo.addItem(entry["id"], entry["id"])
+
+    def verify_latest_manifest(self):
+        """Rehash the latest build output and check it against its manifest"""
+        builds = self.manifest_builds()
+        if not builds:
+            QMessageBox.warning(self, "No Manifest", "No build with a manifest recorded for this project")
+            return
+        info = builds[0]["manifest"]
+        manifest = artifact_tools.load_manifest(info["path"])
+        if not manifest or not os.path.exists(info["artifact"]):
+            QMessageBox.warning(self, "No Manifest", "The manifest or the build output no longer exists")
+            return
+
+        def task(log, progress, should_stop):
+            return artifact_tools.verify_manifest(info["artifact"], manifest, log=log, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_manifest_verification, self.manifest_verify_btn):
+            self.log_message(f"▶ Verifying {info['artifact']} against build {builds[0]['id']}")
+
+    def show_manifest_verification(self, result):
+        """Display files that don't match the manifest"""
+        rows = [(kind, path) for kind in ("missing", "changed", "extra") for path in result[kind]]
+        self.manifest_table.setRowCount(len(rows))
+        for row, (kind, path) in enumerate(rows):
+            for column, text in enumerate([kind, path, "", ""]):
+                self.manifest_table.setItem(row, column, QTableWidgetItem(text))
+        self.manifest_summary_label.setText("✅ Build output matches its manifest" if result["ok"] else
+                                            f"❌ {len(rows)} files differ from the manifest")
+
+    def compare_build_manifests(self):
+        """Show what changed between the selected build and the latest build"""
+        builds = {entry["id"]: entry for entry in self.manifest_builds()}
+        old_id = self.manifest_compare_combo.currentData()
+        if not old_id or old_id not in builds:
+            return
+        new_entry = self.manifest_builds()[0]
+        old = artifact_tools.load_manifest(builds[old_id]["manifest"]["path"])
+        new = artifact_tools.load_manifest(new_entry["manifest"]["path"])
+        if not old or not new:
+            QMessageBox.warning(self, "No Manifest", "The manifest file of one of the builds is missing")
+            return
+
+        result = artifact_tools.compare_manifests(old, new)
+        changes = result["changes"]
+        self.manifest_table.setRowCount(len(changes))
+        for row, change in enumerate(changes):
+            cells = [
+                change["change"],
+                change["path"],
+                "" if change["old_size"] is None else f"{change['old_size'] / 1024:.1f}",
+                "" if change["new_size"] is None else f"{change['new_size'] / 1024:.1f}",
+            ]
+            for column, text in enumerate(cells):
+                self.manifest_table.setItem(row, column, QTableWidgetItem(text))
+        self.manifest_summary_label.setText(
+            f"{old_id} -> {new_entry['id']}: {len(changes)} files differ, {result['unchanged']} unchanged, "
+            f"size {result['delta_bytes'] / 1024 / 1024:+.2f} MB")
+
+    def save_export_settings(self):
+        """Persist archive export settings"""
+        self.settings.setValue("export_format", self.export_format_combo.currentData())
+        self.settings.setValue("export_level", self.export_level_spin.value())
+        self.settings.setValue("export_dir", self.export_dir_input.text().strip())
+        self.settings.setValue("export_incremental", self.export_incremental_check.isChecked())
+        self.settings.setValue("export_after_build", self.export_after_build_check.isChecked())
+
+    def select_export_dir(self):
+        """Select archive destination directory"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "Select Archive Destination", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.export_dir_input.setText(dir_path)
+            self.save_export_settings()
+
+    def export_build_archive(self):
+        """Stream the build output into an archive in the background"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "Missing Configuration", "Select main file and output directory")
+            return
+        artifact = artifact_tools.artifact_path(self.output_dir, self.main_file, self.onefile_check.isChecked())
+        if not artifact:
+            QMessageBox.warning(self, "Missing Build", "No build output found in the output directory")
+            return
+        dest_dir = self.export_dir_input.text().strip() or self.output_dir
+        fmt = self.export_format_combo.currentData()
+        level = self.export_level_spin.value()
+        incremental = self.export_incremental_check.isChecked()
+
+        def task(log, progress, should_stop):
+            return artifact_tools.export_archive(artifact, dest_dir, fmt, level, incremental, log=log,
+                                                 progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_export_result, self.export_btn):
+            self.log_message(f"▶ Exporting {artifact} as {fmt}")
+
+    def show_export_result(self, result):
+        """Report the written archive"""
+        if not result:
+            return
+        reused = f", {result['reused']}/{result['files']} files reused" if result["reused"] else ""
+        self.export_result_label.setText(
+            f"{result['path']}: {result['bytes'] / 1024 / 1024:.1f} MB "
+            f"({result['bytes'] / max(1, result['source_bytes']):.0%} of the output) in {result['seconds']:.1f}s{reused}")
+
+    def save_delta_settings(self):
+        """Persist delta update settings"""
+        self.settings.setValue("retain_releases", self.retain_releases_check.isChecked())
+        self.settings.setValue("retain_count", self.retain_count_spin.value())
+
+    def add_release_steps(self, after_build):
+        """Keep a copy of the build output so later builds can be shipped as deltas"""
+        main_file, keep = self.main_file, self.retain_count_spin.value()
+
+        def retain(log, success):
+            manifest = self.build_extra.get("manifest")
+            if not success or not manifest:
+                return
+            name = os.path.splitext(os.path.basename(manifest["path"]))[0]
+            try:
+                self.build_extra["release"] = artifact_tools.retain_release(
+                    manifest["artifact"], main_file, name, keep, log=log)
+            except OSError as e:
+                log(f"⚠️ Failed to keep a copy of the build output: {str(e)}")
+
+        after_build.append(retain)
+
+    def create_delta_package(self):
+        """Write a delta package from the selected build to the latest build"""
+        builds = {entry["id"]: entry for entry in self.manifest_builds()}
+        old_id = self.delta_from_combo.currentData()
+        if not old_id or old_id not in builds:
+            QMessageBox.warning(self, "No Release", "No earlier build output was kept for this project")
+            return
+        old_entry, new_entry = builds[old_id], self.manifest_builds()[0]
+        old = artifact_tools.load_manifest(old_entry["manifest"]["path"])
+        new = artifact_tools.load_manifest(new_entry["manifest"]["path"])
+        if not old or not new:
+            QMessageBox.warning(self, "No Manifest", "The manifest file of one of the builds is missing")
+            return
+        new_artifact = new_entry.get("release") or new_entry["manifest"]["artifact"]
+        if not os.path.exists(new_artifact):
+            QMessageBox.warning(self, "Missing Build", "The output of the latest build no longer exists")
+            return
+        stem = os.path.splitext(os.path.basename(self.main_file))[0]
+        dest_dir = self.export_dir_input.text().strip() or self.output_dir or os.path.dirname(new_artifact)
+        dest = os.path.join(dest_dir, f"{stem}-{old_id}-to-{new_entry['id']}{artifact_tools.DELTA_SUFFIX}")
+
+        def task(log, progress, should_stop):
+            os.makedirs(dest_dir, exist_ok=True)
+            return artifact_tools.make_delta(old_entry["release"], old, new_artifact, new, dest, log=log,
+                                             progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_delta_result, self.delta_create_btn):
+            self.log_message(f"▶ Creating delta package {old_id} -> {new_entry['id']}")
+
+    def show_delta_result(self, result):
+        """Report the written delta package"""
+        if not result:
+            return
+        self.delta_result_label.setText(
+            f"{result['path']}: {result['bytes'] / 1024 / 1024:.2f} MB "
+            f"({result['bytes'] / max(1, result['full_bytes']):.1%} of the full output), "
+            f"{result['added']} added, {result['patched']} patched, "
+            f"{result['removed']} removed")
+
+    def apply_delta_package(self):
+        """Verify an installed build and update it with a delta package"""
+        package, _ = QFileDialog.getOpenFileName(
+            self, "Select Delta Package", self.export_dir_input.text().strip() or self.output_dir,
+            f"Delta Packages (*{artifact_tools.DELTA_SUFFIX});;All Files (*)"
+        )
+        if not package:
+            return
+        target = QFileDialog.getExistingDirectory(
+            self, "Select Installed .dist Folder (or Folder of the Onefile Executable)", "", QFileDialog.ShowDirsOnly
+        )
+        if not target:
+            return
+
+        def task(log, progress, should_stop):
+            return artifact_tools.apply_delta(package, target, log=log, progress=progress, should_stop=should_stop)
+
+        def done(result):
+            if not result:
+                return
+            if result["ok"]:
+                self.delta_result_label.setText(f"✅ Updated {target}: {result['written']} files written, "
+                                                f"{result['removed']} removed")
+            else:
+                self.delta_result_label.setText(f"❌ Not applied, files differ from the source build: "
+                                                + ", ".join(result["mismatched"][:5]))
+
+        if self.start_tool_task(task, done, self.delta_apply_btn):
+            self.log_message(f"▶ Applying {package} to {target}")
+
+    def artifact_store_dir(self):
+        """Return the artifact store folder configured in the UI"""
+        return self.artifact_store_input.text().strip() or artifact_tools.default_artifact_store()
+
+    def save_artifact_store_settings(self):
+        """Persist artifact store settings"""
+        self.settings.setValue("artifact_store", self.artifact_store_check.isChecked())
+        self.settings.setValue("artifact_store_dir", self.artifact_store_input.text().strip())
+
+    def select_artifact_store(self):
+        """Select artifact store directory"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "Select Artifact Store", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.artifact_store_input.setText(dir_path)
+            self.save_artifact_store_settings()
+
+    def add_artifact_store_steps(self, command, before_build, after_build):
+        """Deduplicate the build output and kept copies into the artifact store"""
+        main_file, output_dir = self.main_file, self.output_dir
+        onefile = "--onefile" in command
+        store = self.artifact_store_dir()
+
+        def detach(log):
+            artifact = artifact_tools.artifact_path(output_dir, main_file, onefile)
+            count = artifact_tools.detach_artifact(artifact) if artifact else 0
+            if count:
+                log(f"🔗 Unlinked {count} stored files from the previous output")
+
+        def ingest(log, success):
+            info = self.build_extra.get("manifest")
+            manifest = artifact_tools.load_manifest(info["path"]) if success and info else None
+            if not manifest:
+                return
+            try:
+                totals = artifact_tools.ingest_artifact(info["artifact"], manifest, store, log=log,
+                                                        should_stop=self.build_stopped)
+                release = self.build_extra.get("release")
+                if release and os.path.exists(release):
+                    artifact_tools.ingest_artifact(release, manifest, store, log=lambda message: None)
+                artifact_tools.collect_garbage(store, log=log)
+            except OSError as e:
+                log(f"⚠️ Artifact store failed: {str(e)}")
+                return
+            if totals:
+                self.build_extra["artifact_store"] = {"added": totals["added"], "added_bytes": totals["added_bytes"]}
+
+        before_build.append(detach)
+        after_build.append(ingest)
+
+    def collect_artifact_garbage(self):
+        """Remove stored files no kept build output references"""
+        store = self.artifact_store_dir()
+
+        def task(log, progress, should_stop):
+            return artifact_tools.collect_garbage(store, log=log)
+
+        def done(result):
+            self.artifact_store_usage_label.setText(
+                f"{result['objects']} files, {result['stored_bytes'] / 1024 / 1024:.1f} MB "
+                f"stored for {result['refs']} outputs totalling {result['logical_bytes'] / 1024 / 1024:.1f} MB"
+                f" (freed {result['freed_bytes'] / 1024 / 1024:.1f} MB)")
+
+        self.start_tool_task(task, done, self.artifact_store_gc_btn)
+
+    def save_deploy_settings(self):
+        """Persist deployment sync settings"""
+        self.settings.setValue("deploy_sync", self.deploy_sync_check.isChecked())
+        self.settings.setValue("deploy_dir", self.deploy_dir_input.text().strip())
+
+    def select_deploy_dir(self):
+        """Select deployment directory"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "Select Deployment Folder", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.deploy_dir_input.setText(dir_path)
+            self.save_deploy_settings()
+
+    def add_deploy_steps(self, command, after_build):
+        """Sync the build output to the deployment folder once Nuitka is done"""
+        main_file, output_dir = self.main_file, self.output_dir
+        onefile = "--onefile" in command
+        deploy_dir = self.deploy_dir_input.text().strip()
+
+        def deploy(log, success):
+            artifact = artifact_tools.artifact_path(output_dir, main_file, onefile) if success else None
+            if not artifact:
+                return
+            info = self.build_extra.get("manifest")
+            manifest = artifact_tools.load_manifest(info["path"]) if info else None
+            try:
+                result = artifact_tools.sync_artifact(artifact, deploy_dir, manifest, log=log,
+                                                      should_stop=self.build_stopped)
+            except OSError as e:
+                log(f"⚠️ Deployment sync failed: {str(e)}")
+                return
+            if result is None:
+                return False
+            self.build_extra["deploy"] = {key: result[key] for key in ("path", "copied", "removed", "bytes")}
+
+        after_build.append(deploy)
+
+    def sync_deployment(self):
+        """Sync the current build output to the deployment folder in the background"""
+        deploy_dir = self.deploy_dir_input.text().strip()
+        if not self.main_file or not self.output_dir or not deploy_dir:
+            QMessageBox.warning(self, "Missing Configuration", "Select main file, output directory and deployment folder")
+            return
+        artifact = artifact_tools.artifact_path(self.output_dir, self.main_file, self.onefile_check.isChecked())
+        if not artifact:
+            QMessageBox.warning(self, "Missing Build", "No build output found in the output directory")
+            return
+
+        def task(log, progress, should_stop):
+            return artifact_tools.sync_artifact(artifact, deploy_dir, log=log, should_stop=should_stop)
+
+        def done(result):
+            if result:
+                self.deploy_result_label.setText(
+                    f"{result['path']}: {result['copied']} copied ({result['bytes'] / 1024 / 1024:.1f} MB), "
+                    f"{result['removed']} removed, {result['unchanged']} unchanged "
+                    f"({result['seconds']:.1f}s)")
+
+        if self.start_tool_task(task, done, self.deploy_sync_btn):
+            self.log_message(f"▶ Syncing {artifact} to {deploy_dir}")
+
+    def refresh_smoke_tests(self):
+        """Load the project's smoke tests into the table"""
+        self.smoke_table.blockSignals(True)
+        self.smoke_table.setRowCount(0)
+        for test in project_store.load_smoke_tests(self.main_file) if self.main_file else []:
+            self.add_smoke_test_row(test)
+        self.smoke_table.blockSignals(False)
+
+    def add_smoke_test_row(self, test):
+        """Append a smoke test to the table"""
+        test = dict(perf_tools.SMOKE_TEST_DEFAULTS, **test)
+        self.smoke_table.blockSignals(True)
+        row = self.smoke_table.rowCount()
+        self.smoke_table.insertRow(row)
+        for column, key in enumerate(("name", "args", "timeout", "exit_code", "pattern")):
+            self.smoke_table.setItem(row, column, QTableWidgetItem(str(test[key])))
+        result = QTableWidgetItem("")
+        result.setFlags(result.flags() & ~Qt.ItemIsEditable)
+        self.smoke_table.setItem(row, 5, result)
+        self.smoke_table.blockSignals(False)
+
+    def add_smoke_test(self):
+        """Add a smoke test with default settings"""
+        self.add_smoke_test_row(perf_tools.SMOKE_TEST_DEFAULTS)
+        self.save_smoke_tests()
+
+    def remove_smoke_test_row(self):
+        """Remove the selected smoke test"""
+        row = self.smoke_table.currentRow()
+        if row >= 0:
+            self.smoke_table.removeRow(row)
+            self.save_smoke_tests()
+
+    def smoke_tests(self):
+        """Smoke tests as entered in the table, skipping invalid numbers"""
+        tests = []
+        for row in range(self.smoke_table.rowCount()):
+            cells = [self.smoke_table.item(row, column).text().strip() if self.smoke_table.item(row, column) else ""
+                     for column in range(5)]
+            try:
+                tests.append({"name": cells[0] or f"test{row + 1}", "args": cells[1], "timeout": float(cells[2] or 30),
+                              "exit_code": int(cells[3] or 0), "pattern": cells[4]})
+            except ValueError:
+                continue
+        return tests
+
+    def save_smoke_tests(self, item=None):
+        """Persist the smoke tests with the project"""
+        if not self.main_file or (item is not None and item.column() >= 5):
+            return
+        tests = self.smoke_tests()
+        errors = [f"{test['name']}: {error}" for test in tests for error in [perf_tools.smoke_test_error(test)] if error]
+        if errors:
+            QMessageBox.warning(self, "Invalid Smoke Test", "\n".join(errors))
+            return
+        project_store.save_smoke_tests(self.main_file, tests)
+
+    def smoke_test_binary(self, onefile):
+        """Executable the smoke tests run against"""
+        artifact = artifact_tools.artifact_path(self.output_dir, self.main_file, onefile)
+        if artifact and os.path.isdir(artifact):
+            return perf_tools.find_built_binary(artifact, self.main_file)
+        return artifact
+
+    def add_smoke_test_steps(self, command, after_build):
+        """Run the smoke tests once Nuitka is done and fail the build if one fails"""
+        tests, onefile = self.smoke_tests(), "--onefile" in command
+
+        def smoke(log, success):
+            if not success:
+                return None
+            binary = self.smoke_test_binary(onefile)
+            if not binary:
+                log("❌ Smoke tests: built executable not found")
+                return False
+            try:
+                passed, results = perf_tools.run_smoke_tests(binary, tests, log=log, should_stop=self.build_stopped)
+            except Exception as e:
+                # Tests that did not run must not count as passed
+                log(f"❌ Smoke tests could not run: {str(e)}")
+                return False
+            self.build_extra["smoke_tests"] = [{key: result[key] for key in ("name", "status", "exit_code", "seconds")}
+                                               for result in results]
+            return passed
+
+        after_build.append(smoke)
+
+    def run_smoke_tests(self):
+        """Run the smoke tests against the current output in the background"""
+        tests = self.smoke_tests()
+        binary = self.smoke_test_binary(self.onefile_check.isChecked()) if self.main_file and self.output_dir else None
+        if not tests or not binary:
+            QMessageBox.warning(self, "Missing Configuration", "Add a smoke test and build the project first")
+            return
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_smoke_tests(binary, tests, log=log, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_smoke_results, self.smoke_run_btn):
+            self.log_message(f"▶ Running {len(tests)} smoke tests against {binary}")
+
+    def show_smoke_results(self, outcome):
+        """Show each test's outcome next to it"""
+        _, results = outcome
+        by_name = {result["name"]: result for result in results}
+        for row in range(self.smoke_table.rowCount()):
+            name = self.smoke_table.item(row, 0).text().strip() if self.smoke_table.item(row, 0) else ""
+            result = by_name.get(name)
+            if result and self.smoke_table.item(row, 5):
+                text = result["status"] + (f": {result['reason']}" if result["reason"] else f" ({result['seconds']:.1f}s)")
+                self.smoke_table.item(row, 5).setText(text)
+
+    def profile_imports(self):
+        """Trace import times of the built binary or the entry point"""
+        if not self.python_path or not self.main_file:
+            QMessageBox.warning(self, "Missing Configuration", "Select Python interpreter and main file")
+            return
+        binary = None
+        if self.import_mode_combo.currentData() == "binary":
+            binary = perf_tools.find_built_binary(self.output_dir, self.main_file) if self.output_dir else None
+            if not binary:
+                QMessageBox.warning(self, "Missing Build", "No built executable found, build first or profile in the interpreter")
+                return
+        python, main_file = self.python_path, self.main_file
+        command = self.build_command() or []
+        args = shlex.split(self.import_args_input.text(), posix=not sys.platform.startswith("win"))
+        duration = self.import_duration_spin.value()
+
+        def task(log, progress, should_stop):
+            return perf_tools.profile_imports(python, main_file, command, binary, args, duration, log=log,
+                                              should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_import_profile, self.import_profile_btn):
+            self.log_message(f"▶ Profiling imports of {binary or main_file}")
+
+    def show_import_profile(self, result):
+        """Display import cost per package and the slowest import chains"""
+        packages = result["packages"]
+        self.import_table.setRowCount(len(packages))
+        for row, stats in enumerate(packages):
+            cells = [stats["package"], f"{stats['cumulative_ms']:.1f}", f"{stats['self_ms']:.1f}",
+                     str(stats["modules"]), stats["status"]]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, stats["package"])
+                self.import_table.setItem(row, column, item)
+        chains = ["  →  ".join(f"{name} ({ms:.0f} ms)" for name, ms in chain) for chain in result["chains"][:5]]
+        self.import_chains_label.setText(
+            f"Imports took {result['total_ms']:.0f} ms ({result['mode']}). "
+            f"Slowest import chains:\n" + "\n".join(chains))
+        self.import_exclude_btn.setEnabled(bool(packages))
+
+    def exclude_selected_imports(self):
+        """Add the selected packages to --nofollow-import-to"""
+        current = [mod.strip() for mod in self.nofollow_import_input.text().split(",") if mod.strip()]
+        for index in self.import_table.selectionModel().selectedRows():
+            package = self.import_table.item(index.row(), 0).data(Qt.UserRole)
+            if package not in current:
+                current.append(package)
+        self.nofollow_import_input.setText(",".join(current))
+        self.log_message(f"No longer following imports to: {', '.join(current)}")
+
+    def prebuilt_cache(self):
+        return build_env.PrebuiltModuleCache(os.path.join(build_env.user_cache_dir(), "prebuilt-modules"))
+
+    def prebuilt_packages(self):
+        return [pkg.strip() for pkg in self.prebuilt_packages_input.text().split(",") if pkg.strip()]
+
+    def save_prebuilt_settings(self):
+        """Persist prebuilt module settings"""
+        self.settings.setValue("prebuilt_modules", self.prebuilt_check.isChecked())
+        self.settings.setValue("prebuilt_packages", self.prebuilt_packages_input.text().strip())
+
+    def refresh_prebuilt_modules(self):
+        """List the modules in the prebuilt cache"""
+        entries = self.prebuilt_cache().entries()
+        self.prebuilt_table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            cells = [
+                entry["package"],
+                entry.get("version") or "",
+                entry.get("python") or "",
+                entry.get("nuitka") or "",
+                " ".join(entry.get("options") or []),
+                f"{entry['size'] / 1024 / 1024:.1f}",
+                f"{entry.get('build_s', 0):.0f}",
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, entry["key"])
+                self.prebuilt_table.setItem(row, column, item)
+
+    def build_prebuilt_modules(self):
+        """Compile the listed packages that have no module for the current configuration"""
+        packages = self.prebuilt_packages()
+        if not self.python_path or not packages:
+            QMessageBox.warning(self, "Missing Configuration", "Select a Python interpreter and enter the packages to prebuild")
+            return
+        cache, python = self.prebuilt_cache(), self.python_path
+        options = build_env.module_options(self.build_command() or [])
+
+        def task(log, progress, should_stop):
+            return cache.build_missing(python, packages, options, log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, lambda result: self.refresh_prebuilt_modules(), self.prebuilt_build_btn):
+            self.log_message(f"▶ Prebuilding {', '.join(packages)}")
+
+    def delete_prebuilt_modules(self):
+        """Delete the selected prebuilt modules"""
+        cache = self.prebuilt_cache()
+        for row in sorted({index.row() for index in self.prebuilt_table.selectedIndexes()}):
+            cache.remove(self.prebuilt_table.item(row, 0).data(Qt.UserRole))
+        self.refresh_prebuilt_modules()
+
+    def add_prebuilt_module_steps(self, command, after_build, info):
+        """Stop following into prebuilt packages and copy their modules next to the app after the build"""
+        if "--onefile" in command or "--module" in command:
+            self.log_message("ℹ️ Prebuilt modules are only used for standalone and accelerated builds")
+            return command
+        if info is None:
+            return command
+        if isinstance(info, Exception):
+            self.log_message(f"⚠️ Prebuilt modules not used: {str(info)}")
+            return command
+        packages = list(info["packages"])
+        cache = self.prebuilt_cache()
+        ready = {package: meta for package, meta in cache.lookup(info, packages, build_env.module_options(command)).items()
+                 if meta}
+        for package in packages:
+            if package not in ready:
+                self.log_message(f"⚠️ No prebuilt module of {package} for this configuration, compiling it with the app")
+        if not ready:
+            return command
+
+        # The modules they import are no longer seen by Nuitka and must be included explicitly
+        imports = sorted({name for meta in ready.values() for name in meta["imports"] if name.split(".")[0] not in ready})
+        extra = [f"--nofollow-import-to={package}" for package in ready] + [f"--include-module={name}" for name in imports]
+        command = command[:-1] + extra + command[-1:]
+        modules = [cache.module_path(meta) for meta in ready.values()]
+        main_file, output_dir, standalone = self.main_file, self.output_dir, "--standalone" in command
+
+        def install(log, success):
+            if not success:
+                return None
+            target = perf_tools.find_dist_dir(output_dir, main_file) if standalone else output_dir
+            if not target:
+                log("❌ No output folder to install the prebuilt modules into")
+                return False
+            build_env.transfer_files([(path, os.path.join(target, os.path.basename(path))) for path in modules],
+                                     log=log, stage="Installed prebuilt modules")
+            return None
+
+        after_build.append(install)
+        self.build_extra["prebuilt_modules"] = {package: meta["version"] for package, meta in ready.items()}
+        self.log_message(f"🧱 Using prebuilt {', '.join(ready)}")
+        return command
+
+    def save_preflight_settings(self):
+        """Persist preflight settings"""
+        self.settings.setValue("preflight", self.preflight_check.isChecked())
+        self.settings.setValue("preflight_timeout", self.preflight_timeout_spin.value())
+
+    def add_preflight_steps(self, command, before_build):
+        """Check the sources the command will build before Nuitka starts"""
+        python, main_file = command[0], command[-1]
+        timeout = self.preflight_timeout_spin.value()
+        before_build.append(lambda log: preflight.run_preflight(python, main_file, timeout, log))
+
+    def save_compiler_setting(self):
+        """Persist the selected C compiler"""
+        self.settings.setValue("c_compiler", self.compiler_combo.currentData())
+
+    def detect_compilers(self):
+        """Detect installed C toolchains and list their versions"""
+        toolchains = perf_tools.detect_compilers()
+        self.compiler_table.setRowCount(len(toolchains))
+        for row, toolchain in enumerate(toolchains):
+            name_item = QTableWidgetItem(toolchain["name"])
+            if toolchain["name"] in perf_tools.COMPILERS:
+                name_item.setFlags(name_item.flags() | Qt.ItemIsUserCheckable)
+                name_item.setCheckState(Qt.Checked)
+            self.compiler_table.setItem(row, 0, name_item)
+            self.compiler_table.setItem(row, 1, QTableWidgetItem(toolchain["path"]))
+            self.compiler_table.setItem(row, 2, QTableWidgetItem(toolchain["version"]))
+        names = ", ".join(t["name"] for t in toolchains) or "none"
+        self.log_message(f"🔧 Detected toolchains: {names}")
+
+    def compare_compilers(self):
+        """Build the project with each checked compiler and compare the results"""
+        if not self.python_path or not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "Missing Configuration",
+                                "Select Python interpreter, main file and output directory")
+            return
+
+        compilers = []
+        for row in range(self.compiler_table.rowCount()):
+            item = self.compiler_table.item(row, 0)
+            if item.text() in perf_tools.COMPILERS and item.checkState() == Qt.Checked:
+                compilers.append(item.text())
+        if len(compilers) < 2:
+            QMessageBox.warning(self, "Missing Configuration",
+                                "Detect toolchains and check at least two compilers to compare")
+            return
+
+        base_command = self.command_edit.toPlainText().split()
+        main_file = self.main_file
+        work_dir = os.path.join(self.output_dir, "compiler-ab")
+        startup_args = self.compiler_args_input.text().split()
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_compiler_comparison(
+                base_command, main_file, work_dir, compilers, startup_args=startup_args,
+                log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_compiler_comparison, self.compare_compilers_btn):
+            self.log_message(f"▶ Comparing compilers: {', '.join(compilers)}")
+
+    def show_compiler_comparison(self, results):
+        """Display the compiler A/B comparison"""
+        self.compiler_result_table.setRowCount(len(results))
+
+        def fmt(value, scale, digits):
+            return "-" if value is None else f"{value / scale:.{digits}f}"
+
+        for row, result in enumerate(results):
+            cells = [
+                result["compiler"] if result["ok"] else f"{result['compiler']} (failed)",
+                fmt(result["build_s"], 1, 1),
+                fmt(result["size_bytes"], 1024 * 1024, 1),
+                fmt(result["startup_ms"], 1, 0),
+            ]
+            for column, text in enumerate(cells):
+                self.compiler_result_table.setItem(row, column, QTableWidgetItem(text))
+
+        built = [r for r in results if r["ok"]]
+        if built:
+            fastest = min(built, key=lambda r: r["build_s"])
+            self.log_message(f"✅ Compiler comparison finished, fastest build: {fastest['compiler']} "
+                             f"({fastest['build_s']:.1f}s)")
+
+    def record_build(self, success):
+        """Save the finished build to the project's build history"""
+        if not self.build_started or not self.main_file:
+            return
+        duration = time.time() - self.build_started
+        self.build_started = None
+        try:
+            entry = project_store.add_build(self.main_file, self.build_command_args, success, duration,
+                                            output_dir=self.output_dir, profile=self.build_profile,
+                                            **self.build_extra)
+            self.last_build_id = entry["id"]
+            self.log_message(f"⏱ Build took {duration:.1f}s (recorded as {entry['id']})")
+            self.refresh_profile_stats()
+            self.refresh_manifest_builds()
+        except OSError as e:
+            self.log_message(f"⚠️ Failed to record build history: {str(e)}")
+
+    def run_runtime_benchmark(self):
+        """Run the workload interpreted and compiled and compare them"""
+        if not self.python_path or not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "Missing Configuration",
+                                "Select Python interpreter, main file and output directory")
+            return
+
+        python = self.python_path
+        main_file = self.main_file
+        output_dir = self.output_dir
+        workload = self.benchmark_workload_input.text().strip()
+        mode = self.benchmark_mode_combo.currentData()
+        runs = self.benchmark_runs_spin.value()
+        warmup = self.benchmark_warmup_spin.value()
+        ops_per_run = self.benchmark_ops_spin.value()
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_runtime_benchmark(
+                python, main_file, output_dir, workload, mode=mode, runs=runs, warmup=warmup,
+                ops_per_run=ops_per_run, log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_benchmark_result, self.benchmark_run_btn):
+            self.log_message(f"▶ Benchmarking workload ({runs} runs, {warmup} warm-up)...")
+
+    def show_benchmark_result(self, result):
+        """Display a benchmark result and store it with the latest build"""
+        for row, (key, _) in enumerate(self.benchmark_metrics):
+            for column, side in enumerate(("interpreted", "compiled")):
+                value = result[side][key]
+                text = "-" if value is None else (str(value) if key == "runs" else f"{value:.2f}")
+                self.benchmark_table.setItem(row, column, QTableWidgetItem(text))
+        self.benchmark_speedup_label.setText(f"Speedup: {result['speedup']:.2f}x (median latency)")
+        self.log_message(f"✅ Benchmark finished, compiled binary is {result['speedup']:.2f}x the interpreter speed")
+
+        try:
+            if project_store.attach_result(self.main_file, "benchmarks", result) is None:
+                self.log_message("ℹ️ No recorded build to attach the benchmark to, result not saved")
+        except OSError as e:
+            self.log_message(f"⚠️ Failed to save benchmark result: {str(e)}")
+        self.refresh_benchmark_history()
+
+    def refresh_benchmark_history(self):
+        """Show saved benchmark results of all builds of this project"""
+        if not self.main_file:
+            return
+        rows = []
+        for entry in project_store.load_history(self.main_file):
+            for result in entry.get("benchmarks", []):
+                rows.append((entry, result))
+
+        self.benchmark_history_table.setRowCount(len(rows))
+        for row, (entry, result) in enumerate(reversed(rows)):
+            cells = [
+                entry["id"],
+                " ".join(entry.get("options", [])),
+                result["workload"] or "-",
+                f"{result['interpreted']['p50_ms']:.2f}",
+                f"{result['compiled']['p50_ms']:.2f}",
+                f"{result['speedup']:.2f}x",
+            ]
+            for column, text in enumerate(cells):
+                self.benchmark_history_table.setItem(row, column, QTableWidgetItem(text))
+
+    def apply_tempdir_preset(self, index):
+        """Fill the temp directory spec from a preset and the metadata fields"""
+        _, base = data_tools.ONEFILE_CACHE_PRESETS[self.onefile_preset_combo.itemData(index)]
+        company = self.company_input.text().strip()
+        product = self.product_input.text().strip()
+        version = self.product_version_input.text().strip() or self.file_version_input.text().strip()
+        if base and not (company and product and version):
+            QMessageBox.warning(self, "Missing Metadata",
+                                "Fill in company name, product name and a version on the Metadata tab "
+                                "so every release extracts to its own cache folder")
+            return
+        spec = data_tools.cached_tempdir_spec(base, company, product, version)
+        self.onefile_tempdir_input.setText(spec)
+        self.log_message(f"Onefile temp directory: {spec or 'extract on every launch'}")
+
+    def find_stale_caches(self):
+        """List extraction folders that are no longer used"""
+        spec = self.onefile_tempdir_input.text().strip()
+        if self.start_tool_task(lambda log, progress, should_stop: data_tools.find_stale_caches(spec),
+                                self.show_stale_caches, self.stale_caches_btn):
+            self.log_message("▶ Looking for stale onefile extraction folders...")
+
+    def show_stale_caches(self, stale):
+        """Display stale extraction folders"""
+        self.stale_caches_table.setRowCount(len(stale))
+        for row, entry in enumerate(stale):
+            cells = [entry["path"], f"{entry['size'] / 1024 / 1024:.1f}", f"{entry['age_days']:.1f}", entry["reason"]]
+            for column, text in enumerate(cells):
+                self.stale_caches_table.setItem(row, column, QTableWidgetItem(text))
+        total = sum(entry["size"] for entry in stale)
+        self.log_message(f"🗂 Found {len(stale)} stale extraction folders ({total / 1024 / 1024:.1f} MB)")
+
+    def prune_stale_caches(self):
+        """Delete the selected stale extraction folders"""
+        rows = sorted({index.row() for index in self.stale_caches_table.selectedIndexes()})
+        paths = [self.stale_caches_table.item(row, 0).text() for row in rows]
+        if not paths:
+            return
+        msg_box = QMessageBox(QMessageBox.Question, "Prune Caches",
+                              f"Delete {len(paths)} extraction folders?", QMessageBox.Yes | QMessageBox.No, self)
+        msg_box.setStyleSheet(self.get_messagebox_style())
+        if msg_box.exec() != QMessageBox.Yes:
+            return
+        freed = data_tools.prune_caches(paths, log=self.log_message)
+        self.log_message(f"✅ Freed {freed / 1024 / 1024:.1f} MB")
+        for row in reversed(rows):
+            self.stale_caches_table.removeRow(row)
+
+    def measure_launch_times(self):
+        """Measure cold and warm launches of the last onefile build"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "Missing Configuration", "Select main file and output directory")
+            return
+        binary = perf_tools.find_built_binary(self.output_dir, self.main_file)
+        if not binary:
+            QMessageBox.warning(self, "Missing Build", "No built executable found in the output directory")
+            return
+        build = project_store.latest_build(self.main_file)
+        spec = build.get("onefile_tempdir_spec", "") if build else self.onefile_tempdir_input.text().strip()
+        build_id = build["id"] if build else None
+        args = self.launch_args_input.text().split()
+        runs = self.launch_runs_spin.value()
+        main_file = self.main_file
+
+        def task(log, progress, should_stop):
+            result = data_tools.measure_cold_warm(binary, spec, args, runs)
+            if result:
+                project_store.attach_result(main_file, "launch_benchmarks", result, build_id=build_id)
+            return result
+
+        if self.start_tool_task(task, self.show_launch_times, self.launch_measure_btn):
+            self.log_message(f"▶ Measuring cold and warm launches of {binary}")
+
+    def show_launch_times(self, result):
+        """Report a launch measurement and refresh the history"""
+        if not result:
+            self.log_message("❌ The executable did not finish within the timeout or exited with an error")
+            return
+        self.log_message(f"✅ Launch: cold {result['cold_ms']:.0f} ms, warm {result['warm_ms']:.0f} ms "
+                         f"({'cached' if result['cached'] else 'extracted on every launch'})")
+        if result["cached"] and not result.get("cleared"):
+            self.log_message("⚠️ The cache folder is not a company/product/version folder and was not cleared, "
+                             "the cold launch may have used the existing cache")
+        self.refresh_launch_history()
+
+    def refresh_launch_history(self):
+        """Show cold/warm launch measurements of all builds of this project"""
+        if not self.main_file:
+            return
+        rows = []
+        for entry in project_store.load_history(self.main_file):
+            for result in entry.get("launch_benchmarks", []):
+                rows.append((entry, result))
+
+        self.launch_history_table.setRowCount(len(rows))
+        for row, (entry, result) in enumerate(reversed(rows)):
+            cells = [
+                entry["id"],
+                result["spec"] or "(per launch)",
+                f"{result['cold_ms']:.0f}",
+                f"{result['warm_ms']:.0f}",
+            ]
+            for column, text in enumerate(cells):
+                self.launch_history_table.setItem(row, column, QTableWidgetItem(text))
+
     def closeEvent(self, event):
         """Handle window close event"""
         if self.package_thread and self.package_thread.isRunning():
@@ -1810,6 +4543,8 @@ class NuitkaPackager(QMainWindow):
 
             if reply == QMessageBox.Yes:
                 self.package_thread.stop()
+                # Let the thread clean up its scratch space before the application exits
+                self.package_thread.wait()
                 event.accept()
             else:
                 event.ignore()
@@ -2,16 +2,27 @@ import sys
 import os
 import subprocess
 import logging
+import time
+import shlex
 from datetime import datetime
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QLineEdit, QTextEdit, QPushButton, QCheckBox, QFileDialog, QMessageBox,
     QGroupBox, QFrame, QProgressBar, QSizePolicy, QTabWidget, QComboBox,
-    QSpinBox, QListWidget, QListWidgetItem, QAbstractItemView, QSplitter, QToolButton
+    QSpinBox, QListWidget, QListWidgetItem, QAbstractItemView, QSplitter, QToolButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QInputDialog
 )
-from PySide6.QtCore import Qt, QThread, Signal, QSettings
+from PySide6.QtCore import Qt, QThread, Signal, QSettings, QTimer, QFileSystemWatcher
 from PySide6.QtGui import QFont, QIcon, QTextCursor, QPalette, QColor
 
+import perf_tools
+import project_store
+import build_env
+import preflight
+import data_tools
+import binary_tools
+import artifact_tools
+
 # 设置日志格式
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
@@ -22,44 +33,83 @@ class PackageThread(QThread):
     progress_signal = Signal(int)
     finished_signal = Signal(bool)
 
-    def __init__(self, command, parent=None):
+    def __init__(self, command, parent=None, before_build=None, after_build=None, cleanup=None, env=None):
         super().__init__(parent)
         self.command = command
+        self.env = env
         self.running = True
         self.process = None  # 添加对子进程的引用
+        self.before_build = before_build or []  # 接收 (log) 的可调用对象，在Nuitka启动前执行，返回False时中止构建
+        self.after_build = after_build or []  # 接收 (log, success) 的可调用对象，返回False时构建判定为失败
+        self.cleanup = cleanup or []  # 接收(log, success)的可调用对象，总是最后执行，停止后也会执行
 
     def run(self):
         """执行打包命令并捕获输出"""
         self.log_signal.emit(f"开始执行打包命令: {' '.join(self.command)}\n")
+        success = False
         try:
-            # 创建子进程执行命令
-            self.process = subprocess.Popen(
-                self.command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                bufsize=1
-            )
+            # 准备构建(例如恢复可复用的构建目录)，步骤返回False时中止构建
+            aborted = any(not self.running or step(self.log_signal.emit) is False for step in self.before_build)
+            if aborted:
+                self.log_signal.emit("\n❌ 打包已在Nuitka启动前中止")
+            else:
+                # 创建子进程执行命令
+                self.process = subprocess.Popen(
+                    self.command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    encoding='utf-8',
+                    errors='replace',
+                    env=self.env,
+                    bufsize=1
+                )
 
-            # 实时读取输出
-            for line in iter(self.process.stdout.readline, ''):
-                if not self.running:
-                    break
-                self.log_signal.emit(line.strip())
+                # 实时读取输出
+                for line in iter(self.process.stdout.readline, ''):
+                    if not self.running:
+                        break
+                    self.log_signal.emit(line.strip())
 
-            # 等待进程结束
-            return_code = self.process.wait()
-            if return_code == 0:
-                self.log_signal.emit("\n✅ 打包成功完成！")
-                self.finished_signal.emit(True)
-            else:
-                self.log_signal.emit(f"\n❌ 打包失败，错误代码: {return_code}")
-                self.finished_signal.emit(False)
+                # 等待进程结束
+                if not self.running:
+                    # 已停止的Nuitka有几秒钟退出时间，超时则强制结束
+                    try:
+                        self.process.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        self.process.kill()
+                return_code = self.process.wait()
+                success = return_code == 0 and self.running
+                if not success:
+                    self.log_signal.emit(f"\n❌ 打包失败，错误代码: {return_code}")
         except Exception as e:
             self.log_signal.emit(f"\n❌ 执行过程中发生错误: {str(e)}")
-            self.finished_signal.emit(False)
+
+        # 构建后步骤在失败时同样执行，以便进行清理，停止后跳过剩余步骤
+        try:
+            for step in self.after_build:
+                if not self.running:
+                    success = False
+                    self.log_signal.emit("🛑 已跳过剩余的构建后步骤")
+                    break
+                try:
+                    if step(self.log_signal.emit, success) is False:
+                        success = False
+                except Exception as e:
+                    self.log_signal.emit(f"⚠️ 构建后步骤失败: {str(e)}")
+        finally:
+            # 无论构建如何结束都执行清理，避免在临时空间中残留文件
+            for step in self.cleanup:
+                try:
+                    step(self.log_signal.emit, success)
+                except Exception as e:
+                    self.log_signal.emit(f"⚠️ 清理步骤失败: {str(e)}")
+        if not self.running:
+            success = False
+
+        if success:
+            self.log_signal.emit("\n✅ 打包成功完成！")
+        self.finished_signal.emit(success)
 
     def stop(self):
         """停止打包过程"""
@@ -74,6 +124,33 @@ class PackageThread(QThread):
                 self.log_signal.emit(f"⚠️ 终止进程失败: {str(e)}")
 
 
+class ToolThread(QThread):
+    """在后台执行分析和基准测试任务的线程"""
+    log_signal = Signal(str)
+    progress_signal = Signal(int)
+    result_signal = Signal(object)
+    finished_signal = Signal(bool)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task  # 接收 (log, progress, should_stop) 的可调用对象
+        self.running = True
+
+    def run(self):
+        """执行任务并返回结果"""
+        try:
+            result = self.task(self.log_signal.emit, self.progress_signal.emit, lambda: not self.running)
+            self.result_signal.emit(result)
+            self.finished_signal.emit(True)
+        except Exception as e:
+            self.log_signal.emit(f"❌ 执行过程中发生错误: {str(e)}")
+            self.finished_signal.emit(False)
+
+    def stop(self):
+        """请求任务在下一个检查点停止"""
+        self.running = False
+
+
 class NuitkaPackager(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -105,6 +182,26 @@ class NuitkaPackager(QMainWindow):
         self.output_dir = ""
         self.package_thread = None
         self.plugins = []
+        self.tool_thread = None
+        self.tuner_results = []
+        self.build_started = None
+        self.build_command_args = []
+        self.last_build_id = None
+        self.build_profile = ""
+        self.build_extra = {}
+        self.profiles = {}
+        self.payload_recommendation = None
+        self.qt_analysis = None
+        self.project_index = None
+        self.index_thread = None
+        self.input_check_thread = None
+        self.index_watcher = QFileSystemWatcher(self)
+        self.index_watcher.directoryChanged.connect(self.refresh_project_index)
+
+        # 加载构建配置方案
+        self.reload_profiles()
+        self.refresh_build_store()
+        self.refresh_prebuilt_modules()
 
         # 设置样式
         self.set_style()
@@ -137,7 +234,21 @@ class NuitkaPackager(QMainWindow):
         self.theme_toggle_btn.setFixedWidth(120)
         self.theme_toggle_btn.clicked.connect(self.toggle_theme)
 
+        # 构建配置方案选择器
+        self.profile_label = QLabel("配置方案:")
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumWidth(140)
+        self.profile_combo.setToolTip("构建配置方案: 应用其默认选项和 --jobs 设置")
+        self.profile_combo.activated.connect(self.apply_profile)
+
+        self.save_profile_btn = QPushButton("保存方案")
+        self.save_profile_btn.setFixedHeight(30)
+        self.save_profile_btn.clicked.connect(self.save_current_profile)
+
         title_layout.addWidget(title_label)
+        title_layout.addWidget(self.profile_label)
+        title_layout.addWidget(self.profile_combo)
+        title_layout.addWidget(self.save_profile_btn)
         title_layout.addWidget(self.theme_toggle_btn)
         main_layout.addLayout(title_layout)
 
@@ -303,6 +414,60 @@ class NuitkaPackager(QMainWindow):
         self.plugins_list.itemSelectionChanged.connect(self.update_command)
 
         plugins_layout.addWidget(plugins_group)
+
+        # Qt插件组
+        qt_plugins_group = QGroupBox("Qt插件 (配合 --include-qt 使用)")
+        qt_plugins_layout = QGridLayout(qt_plugins_group)
+        qt_plugins_layout.setSpacing(10)
+
+        self.qt_plugins_label = QLabel("包含的Qt插件:")
+        self.qt_plugins_input = QLineEdit("sensible,styles")
+        self.qt_plugins_input.textChanged.connect(self.update_command)
+        self.qt_noinclude_plugins_label = QLabel("排除的Qt插件:")
+        self.qt_noinclude_plugins_input = QLineEdit()
+        self.qt_noinclude_plugins_input.setPlaceholderText("从 'sensible' 中排除的插件类别(例如: tls,printsupport)")
+        self.qt_noinclude_plugins_input.textChanged.connect(self.update_command)
+        self.noinclude_qt_translations_check = QCheckBox("--noinclude-qt-translations (不包含Qt翻译文件)")
+        self.noinclude_qt_translations_check.stateChanged.connect(self.update_command)
+
+        self.qt_trace_args_label = QLabel("跟踪参数:")
+        self.qt_trace_args_input = QLineEdit()
+        self.qt_trace_args_input.setPlaceholderText("跟踪运行时传给程序的参数")
+        self.qt_trace_spin = QSpinBox()
+        self.qt_trace_spin.setRange(1, 300)
+        self.qt_trace_spin.setValue(10)
+        self.qt_trace_spin.setPrefix("运行: ")
+        self.qt_trace_spin.setSuffix(" 秒")
+        self.qt_analyze_btn = QPushButton("分析Qt插件")
+        self.qt_analyze_btn.clicked.connect(self.analyze_qt_plugins)
+
+        self.qt_plugins_table = QTableWidget(0, 5)
+        self.qt_plugins_table.setHorizontalHeaderLabels(["类别", "文件数", "大小 (MB)", "已加载", "保留"])
+        self.qt_plugins_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.qt_plugins_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.qt_plugins_table.setMinimumHeight(150)
+
+        self.qt_analysis_label = QLabel("使用 QT_DEBUG_PLUGINS 运行程序以查看加载了哪些插件；"
+                                        "运行期间请打开所有窗口并显示各类图片")
+        self.qt_analysis_label.setWordWrap(True)
+        self.qt_apply_btn = QPushButton("应用最小插件集")
+        self.qt_apply_btn.setEnabled(False)
+        self.qt_apply_btn.clicked.connect(self.apply_qt_plugin_analysis)
+
+        qt_plugins_layout.addWidget(self.qt_plugins_label, 0, 0)
+        qt_plugins_layout.addWidget(self.qt_plugins_input, 0, 1, 1, 3)
+        qt_plugins_layout.addWidget(self.qt_noinclude_plugins_label, 1, 0)
+        qt_plugins_layout.addWidget(self.qt_noinclude_plugins_input, 1, 1, 1, 3)
+        qt_plugins_layout.addWidget(self.noinclude_qt_translations_check, 2, 0, 1, 4)
+        qt_plugins_layout.addWidget(self.qt_trace_args_label, 3, 0)
+        qt_plugins_layout.addWidget(self.qt_trace_args_input, 3, 1)
+        qt_plugins_layout.addWidget(self.qt_trace_spin, 3, 2)
+        qt_plugins_layout.addWidget(self.qt_analyze_btn, 3, 3)
+        qt_plugins_layout.addWidget(self.qt_plugins_table, 4, 0, 1, 4)
+        qt_plugins_layout.addWidget(self.qt_analysis_label, 5, 0, 1, 3)
+        qt_plugins_layout.addWidget(self.qt_apply_btn, 5, 3)
+
+        plugins_layout.addWidget(qt_plugins_group)
         plugins_layout.addStretch()
 
         # 将插件选项标签页添加到主选项卡
@@ -501,6 +666,14 @@ class NuitkaPackager(QMainWindow):
         self.include_raw_dir_input.setMinimumHeight(20)  # 设置最小高度
         self.include_raw_dir_input.textChanged.connect(self.update_command)
 
+        # 交给解释器处理的包
+        self.nofollow_import_label = QLabel("不跟随导入:")
+        self.nofollow_import_input = QLineEdit()
+        self.nofollow_import_input.setPlaceholderText("模块或包模式 (e.g., tkinter, *.tests)")
+        self.nofollow_import_input.setMinimumWidth(300)  # 防止压缩
+        self.nofollow_import_input.setMinimumHeight(20)  # 设置最小高度
+        self.nofollow_import_input.textChanged.connect(self.update_command)
+
         # 添加包含选项到布局
         include_layout.addWidget(self.include_package_label, 0, 0)
         include_layout.addWidget(self.include_package_input, 0, 1)
@@ -526,6 +699,21 @@ class NuitkaPackager(QMainWindow):
         include_layout.addWidget(self.include_raw_dir_label, 7, 0)
         include_layout.addWidget(self.include_raw_dir_input, 7, 1)
 
+        include_layout.addWidget(self.nofollow_import_label, 8, 0)
+        include_layout.addWidget(self.nofollow_import_input, 8, 1)
+
+        # 实时预览数据文件字段在项目目录中选中的文件
+        self.data_preview_label = QLabel("")
+        self.data_preview_label.setWordWrap(True)
+        include_layout.addWidget(self.data_preview_label, 9, 0, 1, 2)
+
+        self.data_preview_timer = QTimer(self)
+        self.data_preview_timer.setSingleShot(True)
+        self.data_preview_timer.setInterval(150)
+        self.data_preview_timer.timeout.connect(self.update_data_preview)
+        for field in (self.include_data_input, self.include_data_dir_input, self.noinclude_data_input):
+            field.textChanged.connect(self.data_preview_timer.start)
+
         advanced_layout.addWidget(include_group)
         advanced_layout.addStretch()
 
@@ -576,8 +764,62 @@ class NuitkaPackager(QMainWindow):
         onefile_group_layout.addWidget(self.onefile_no_compression_check, 2, 0)
         onefile_group_layout.addWidget(self.onefile_as_archive_check, 2, 1)
 
+        # 基于元数据选项卡生成的解压目录预设
+        self.onefile_preset_label = QLabel("临时目录预设:")
+        self.onefile_preset_combo = QComboBox()
+        for key, label in (("per_launch", "每次启动时解压(默认)"), ("user_cache", "用户缓存目录中的版本化缓存"),
+                           ("temp_cache", "临时目录中的版本化缓存")):
+            self.onefile_preset_combo.addItem(label, key)
+        self.onefile_preset_combo.activated.connect(self.apply_tempdir_preset)
+        onefile_group_layout.addWidget(self.onefile_preset_label, 3, 0)
+        onefile_group_layout.addWidget(self.onefile_preset_combo, 3, 1)
+
         onefile_layout.addWidget(onefile_group)
 
+        # 解压缓存组
+        extraction_group = QGroupBox("解压缓存")
+        extraction_layout = QGridLayout(extraction_group)
+        extraction_layout.setSpacing(10)
+
+        self.stale_caches_btn = QPushButton("查找过期缓存")
+        self.stale_caches_btn.clicked.connect(self.find_stale_caches)
+        self.prune_caches_btn = QPushButton("清理所选")
+        self.prune_caches_btn.clicked.connect(self.prune_stale_caches)
+
+        self.stale_caches_table = QTableWidget(0, 4)
+        self.stale_caches_table.setHorizontalHeaderLabels(["目录", "大小 (MB)", "存在天数", "原因"])
+        self.stale_caches_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.stale_caches_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.stale_caches_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.stale_caches_table.setMinimumHeight(120)
+
+        self.launch_args_label = QLabel("启动参数:")
+        self.launch_args_input = QLineEdit()
+        self.launch_args_input.setPlaceholderText("使程序启动后立即退出的参数(例如: --version)")
+        self.launch_runs_spin = QSpinBox()
+        self.launch_runs_spin.setRange(1, 50)
+        self.launch_runs_spin.setValue(5)
+        self.launch_runs_spin.setPrefix("热启动次数: ")
+        self.launch_measure_btn = QPushButton("测量冷/热启动")
+        self.launch_measure_btn.clicked.connect(self.measure_launch_times)
+
+        self.launch_history_table = QTableWidget(0, 4)
+        self.launch_history_table.setHorizontalHeaderLabels(["构建", "临时目录规则", "冷启动 (ms)", "热启动 (ms)"])
+        self.launch_history_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.launch_history_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.launch_history_table.setMinimumHeight(120)
+
+        extraction_layout.addWidget(self.stale_caches_btn, 0, 0)
+        extraction_layout.addWidget(self.prune_caches_btn, 0, 1)
+        extraction_layout.addWidget(self.stale_caches_table, 1, 0, 1, 4)
+        extraction_layout.addWidget(self.launch_args_label, 2, 0)
+        extraction_layout.addWidget(self.launch_args_input, 2, 1)
+        extraction_layout.addWidget(self.launch_runs_spin, 2, 2)
+        extraction_layout.addWidget(self.launch_measure_btn, 2, 3)
+        extraction_layout.addWidget(self.launch_history_table, 3, 0, 1, 4)
+
+        onefile_layout.addWidget(extraction_group)
+
         # DLL选项组
         dll_group = QGroupBox("DLL控制")
         dll_layout = QGridLayout(dll_group)
@@ -585,7 +827,7 @@ class NuitkaPackager(QMainWindow):
         # DLL选项
         self.noinclude_dlls_label = QLabel("排除DLL:")
         self.noinclude_dlls_input = QLineEdit()
-        self.noinclude_dlls_input.setPlaceholderText("DLL文件名模式 (e.g., someDLL.*)")
+        self.noinclude_dlls_input.setPlaceholderText("DLL文件名模式，多个用逗号分隔 (e.g., someDLL.*)")
         self.noinclude_dlls_input.textChanged.connect(self.update_command)
 
         # 添加DLL选项到布局
@@ -724,6 +966,36 @@ class NuitkaPackager(QMainWindow):
 
         debug_layout.addWidget(debug_group)
 
+        # 调试符号组
+        symbols_group = QGroupBox("调试符号")
+        symbols_layout = QGridLayout(symbols_group)
+        symbols_layout.setSpacing(10)
+
+        self.split_symbols_check = QCheckBox("将 --unstripped 构建的调试信息拆分到符号库，并剥离发布的二进制文件")
+        self.split_symbols_check.setChecked(self.settings.value("split_symbols", False, type=bool))
+        self.split_symbols_check.stateChanged.connect(self.save_symbol_settings)
+
+        self.symbol_store_label = QLabel("符号库:")
+        self.symbol_store_input = QLineEdit()
+        self.symbol_store_input.setPlaceholderText(f"<项目>/{project_store.STATE_DIR_NAME}/symbols (默认)")
+        self.symbol_store_input.setText(self.settings.value("symbol_store", "", type=str))
+        self.symbol_store_input.editingFinished.connect(self.save_symbol_settings)
+        self.symbol_store_btn = QPushButton("浏览...")
+        self.symbol_store_btn.clicked.connect(self.select_symbol_store)
+
+        symbols_info = QLabel("ELF符号按 .build-id/xx/<id>.debug 存放，可供 gdb/debuginfod 使用；"
+                              "PDB按符号服务器结构 name.pdb/<签名>/name.pdb 存放。"
+                              "单文件载荷在此步骤之前打包，如需发布剥离后的文件请使用独立模式构建。")
+        symbols_info.setWordWrap(True)
+
+        symbols_layout.addWidget(self.split_symbols_check, 0, 0, 1, 3)
+        symbols_layout.addWidget(self.symbol_store_label, 1, 0)
+        symbols_layout.addWidget(self.symbol_store_input, 1, 1)
+        symbols_layout.addWidget(self.symbol_store_btn, 1, 2)
+        symbols_layout.addWidget(symbols_info, 2, 0, 1, 3)
+
+        debug_layout.addWidget(symbols_group)
+
         # 部署控制组
         deployment_group = QGroupBox("部署控制")
         deployment_layout = QGridLayout(deployment_group)
@@ -742,6 +1014,811 @@ class NuitkaPackager(QMainWindow):
         # 将调试选项标签页添加到主选项卡
         main_tab.addTab(debug_tab, "调试选项")
 
+        # ===== 构建环境标签页 =====
+        build_env_tab = QWidget()
+        build_env_layout = QVBoxLayout(build_env_tab)
+        build_env_layout.setContentsMargins(10, 10, 10, 10)
+        build_env_layout.setSpacing(15)
+
+        # 构建目录复用组
+        build_store_group = QGroupBox("构建目录复用")
+        build_store_layout = QGridLayout(build_store_group)
+        build_store_layout.setSpacing(10)
+
+        self.build_dir_reuse_check = QCheckBox("在多次构建之间复用Nuitka构建目录(将保留构建输出)")
+        self.build_dir_reuse_check.setChecked(self.settings.value("build_dir_reuse", False, type=bool))
+        self.build_dir_reuse_check.stateChanged.connect(self.save_build_store_settings)
+        self.build_dir_reuse_check.stateChanged.connect(self.update_command)
+
+        self.build_store_label = QLabel("存储目录:")
+        self.build_store_input = QLineEdit()
+        self.build_store_input.setPlaceholderText(os.path.join(build_env.user_cache_dir(), "build-dirs") + " (默认)")
+        self.build_store_input.setText(self.settings.value("build_dir_store", "", type=str))
+        self.build_store_input.editingFinished.connect(self.save_build_store_settings)
+        self.build_store_btn = QPushButton("浏览...")
+        self.build_store_btn.clicked.connect(self.select_build_store_dir)
+
+        self.build_store_cap_label = QLabel("容量上限:")
+        self.build_store_cap_spin = QSpinBox()
+        self.build_store_cap_spin.setRange(1, 1000)
+        self.build_store_cap_spin.setSuffix(" GB")
+        self.build_store_cap_spin.setValue(self.settings.value("build_dir_cap_gb", 10, type=int))
+        self.build_store_cap_spin.valueChanged.connect(self.save_build_store_settings)
+
+        self.build_store_table = QTableWidget(0, 4)
+        self.build_store_table.setHorizontalHeaderLabels(["项目", "配置方案", "大小 (MB)", "最近使用"])
+        self.build_store_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.build_store_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.build_store_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.build_store_table.setMinimumHeight(150)
+
+        self.build_store_total_label = QLabel("")
+
+        build_store_button_layout = QHBoxLayout()
+        self.build_store_refresh_btn = QPushButton("刷新")
+        self.build_store_refresh_btn.clicked.connect(self.refresh_build_store)
+        self.build_store_delete_btn = QPushButton("删除所选")
+        self.build_store_delete_btn.clicked.connect(self.delete_build_store_entries)
+        self.build_store_evict_btn = QPushButton("执行容量上限")
+        self.build_store_evict_btn.clicked.connect(self.evict_build_store)
+        build_store_button_layout.addWidget(self.build_store_refresh_btn)
+        build_store_button_layout.addWidget(self.build_store_delete_btn)
+        build_store_button_layout.addWidget(self.build_store_evict_btn)
+        build_store_button_layout.addWidget(self.build_store_total_label)
+        build_store_button_layout.addStretch()
+
+        build_store_layout.addWidget(self.build_dir_reuse_check, 0, 0, 1, 3)
+        build_store_layout.addWidget(self.build_store_label, 1, 0)
+        build_store_layout.addWidget(self.build_store_input, 1, 1)
+        build_store_layout.addWidget(self.build_store_btn, 1, 2)
+        build_store_layout.addWidget(self.build_store_cap_label, 2, 0)
+        build_store_layout.addWidget(self.build_store_cap_spin, 2, 1)
+        build_store_layout.addWidget(self.build_store_table, 3, 0, 1, 3)
+        build_store_layout.addLayout(build_store_button_layout, 4, 0, 1, 3)
+
+        build_env_layout.addWidget(build_store_group)
+
+        # 临时暂存组
+        scratch_group = QGroupBox("高速暂存")
+        scratch_layout = QGridLayout(scratch_group)
+        scratch_layout.setSpacing(10)
+
+        self.scratch_staging_check = QCheckBox("在高速暂存目录(tmpfs / 内存盘)中构建，仅移动最终产物")
+        self.scratch_staging_check.setChecked(self.settings.value("scratch_staging", False, type=bool))
+        self.scratch_staging_check.stateChanged.connect(self.save_scratch_settings)
+
+        self.scratch_dir_label = QLabel("暂存目录:")
+        self.scratch_dir_input = QLineEdit()
+        self.scratch_dir_input.setPlaceholderText(build_env.default_scratch_dir() + " (默认)")
+        self.scratch_dir_input.setText(self.settings.value("scratch_dir", "", type=str))
+        self.scratch_dir_input.editingFinished.connect(self.save_scratch_settings)
+        self.scratch_dir_btn = QPushButton("浏览...")
+        self.scratch_dir_btn.clicked.connect(self.select_scratch_dir)
+
+        scratch_info = QLabel("将根据以往构建的中间文件大小检查可用空间；"
+                              "空间不足时自动回退到输出目录中构建。")
+        scratch_info.setWordWrap(True)
+
+        scratch_layout.addWidget(self.scratch_staging_check, 0, 0, 1, 3)
+        scratch_layout.addWidget(self.scratch_dir_label, 1, 0)
+        scratch_layout.addWidget(self.scratch_dir_input, 1, 1)
+        scratch_layout.addWidget(self.scratch_dir_btn, 1, 2)
+        scratch_layout.addWidget(scratch_info, 2, 0, 1, 3)
+
+        build_env_layout.addWidget(scratch_group)
+
+        # 源码快照组
+        snapshot_group = QGroupBox("源码快照")
+        snapshot_layout = QVBoxLayout(snapshot_group)
+
+        self.source_snapshot_check = QCheckBox("基于项目目录的冻结快照进行构建，构建期间的编辑不会混入产物")
+        self.source_snapshot_check.setChecked(self.settings.value("source_snapshot", False, type=bool))
+        self.source_snapshot_check.stateChanged.connect(
+            lambda: self.settings.setValue("source_snapshot", self.source_snapshot_check.isChecked()))
+
+        snapshot_info = QLabel("文件系统支持时使用reflink克隆文件，其他文件使用硬链接，Python源码则直接复制。"
+                               "快照保存在用户缓存目录中，每次构建前只刷新有变化的文件。")
+        snapshot_info.setWordWrap(True)
+
+        snapshot_layout.addWidget(self.source_snapshot_check)
+        snapshot_layout.addWidget(snapshot_info)
+
+        build_env_layout.addWidget(snapshot_group)
+
+        # 预检组
+        preflight_group = QGroupBox("预检")
+        preflight_layout = QGridLayout(preflight_group)
+        preflight_layout.setSpacing(10)
+
+        self.preflight_check = QCheckBox("构建前编译项目源码并导入入口模块，出错时中止构建")
+        self.preflight_check.setToolTip("导入会用构建解释器执行入口文件的顶层代码，"
+                                        "只跳过其 if __name__ == \"__main__\" 代码块")
+        self.preflight_check.setChecked(self.settings.value("preflight", False, type=bool))
+        self.preflight_check.stateChanged.connect(self.save_preflight_settings)
+
+        self.preflight_timeout_label = QLabel("导入超时 (秒):")
+        self.preflight_timeout_spin = QSpinBox()
+        self.preflight_timeout_spin.setRange(1, 600)
+        self.preflight_timeout_spin.setValue(self.settings.value("preflight_timeout", 30, type=int))
+        self.preflight_timeout_spin.valueChanged.connect(self.save_preflight_settings)
+
+        preflight_layout.addWidget(self.preflight_check, 0, 0, 1, 2)
+        preflight_layout.addWidget(self.preflight_timeout_label, 1, 0)
+        preflight_layout.addWidget(self.preflight_timeout_spin, 1, 1)
+
+        build_env_layout.addWidget(preflight_group)
+
+        # C编译器组
+        compiler_group = QGroupBox("C编译器")
+        compiler_layout = QGridLayout(compiler_group)
+        compiler_layout.setSpacing(10)
+
+        self.compiler_label = QLabel("编译器:")
+        self.compiler_combo = QComboBox()
+        self.compiler_combo.addItem("自动 (Nuitka默认)", "")
+        for name in perf_tools.platform_compilers():
+            self.compiler_combo.addItem(name, name)
+        self.compiler_combo.setCurrentIndex(max(0, self.compiler_combo.findData(
+            self.settings.value("c_compiler", "", type=str))))
+        self.compiler_combo.currentIndexChanged.connect(self.save_compiler_setting)
+        self.compiler_combo.currentIndexChanged.connect(self.update_command)
+
+        self.detect_compilers_btn = QPushButton("检测工具链")
+        self.detect_compilers_btn.clicked.connect(self.detect_compilers)
+
+        # 检测到的工具链，勾选的编译器参与A/B对比
+        self.compiler_table = QTableWidget(0, 3)
+        self.compiler_table.setHorizontalHeaderLabels(["工具链", "路径", "版本"])
+        self.compiler_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.compiler_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.compiler_table.setMinimumHeight(110)
+
+        self.compiler_args_label = QLabel("启动参数:")
+        self.compiler_args_input = QLineEdit()
+        self.compiler_args_input.setPlaceholderText("使程序启动后立即退出的参数(例如: --version)")
+        self.compare_compilers_btn = QPushButton("对比勾选的编译器")
+        self.compare_compilers_btn.clicked.connect(self.compare_compilers)
+
+        self.compiler_result_table = QTableWidget(0, 4)
+        self.compiler_result_table.setHorizontalHeaderLabels(["编译器", "构建 (s)", "大小 (MB)", "启动 (ms)"])
+        self.compiler_result_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.compiler_result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.compiler_result_table.setMinimumHeight(110)
+
+        compiler_layout.addWidget(self.compiler_label, 0, 0)
+        compiler_layout.addWidget(self.compiler_combo, 0, 1)
+        compiler_layout.addWidget(self.detect_compilers_btn, 0, 2)
+        compiler_layout.addWidget(self.compiler_table, 1, 0, 1, 3)
+        compiler_layout.addWidget(self.compiler_args_label, 2, 0)
+        compiler_layout.addWidget(self.compiler_args_input, 2, 1)
+        compiler_layout.addWidget(self.compare_compilers_btn, 2, 2)
+        compiler_layout.addWidget(self.compiler_result_table, 3, 0, 1, 3)
+
+        build_env_layout.addWidget(compiler_group)
+
+        # 预编译模块缓存组
+        prebuilt_group = QGroupBox("预编译模块缓存")
+        prebuilt_layout = QGridLayout(prebuilt_group)
+        prebuilt_layout.setSpacing(10)
+
+        self.prebuilt_check = QCheckBox("对以下第三方包使用预编译扩展模块，而不是随应用一起编译")
+        self.prebuilt_check.setChecked(self.settings.value("prebuilt_modules", False, type=bool))
+        self.prebuilt_check.stateChanged.connect(self.save_prebuilt_settings)
+        self.prebuilt_packages_label = QLabel("包:")
+        self.prebuilt_packages_input = QLineEdit()
+        self.prebuilt_packages_input.setPlaceholderText("顶层包名 (e.g., requests, pydantic)")
+        self.prebuilt_packages_input.setText(self.settings.value("prebuilt_packages", "", type=str))
+        self.prebuilt_packages_input.editingFinished.connect(self.save_prebuilt_settings)
+        self.prebuilt_build_btn = QPushButton("编译缺失的模块")
+        self.prebuilt_build_btn.clicked.connect(self.build_prebuilt_modules)
+
+        # 每个包、解释器、Nuitka 版本和选项组合一行
+        self.prebuilt_table = QTableWidget(0, 7)
+        self.prebuilt_table.setHorizontalHeaderLabels(
+            ["包", "版本", "Python", "Nuitka", "选项", "大小 (MB)", "编译 (秒)"])
+        self.prebuilt_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.prebuilt_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.prebuilt_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.prebuilt_table.setMinimumHeight(110)
+        self.prebuilt_delete_btn = QPushButton("删除所选")
+        self.prebuilt_delete_btn.clicked.connect(self.delete_prebuilt_modules)
+
+        prebuilt_layout.addWidget(self.prebuilt_check, 0, 0, 1, 3)
+        prebuilt_layout.addWidget(self.prebuilt_packages_label, 1, 0)
+        prebuilt_layout.addWidget(self.prebuilt_packages_input, 1, 1)
+        prebuilt_layout.addWidget(self.prebuilt_build_btn, 1, 2)
+        prebuilt_layout.addWidget(self.prebuilt_table, 2, 0, 1, 3)
+        prebuilt_layout.addWidget(self.prebuilt_delete_btn, 3, 0)
+
+        build_env_layout.addWidget(prebuilt_group)
+        build_env_layout.addStretch()
+
+        # 将构建环境标签页添加到主选项卡
+        main_tab.addTab(build_env_tab, "构建环境")
+
+        # ===== 性能标签页 =====
+        performance_tab = QWidget()
+        performance_layout = QVBoxLayout(performance_tab)
+        performance_layout.setContentsMargins(10, 10, 10, 10)
+        performance_layout.setSpacing(15)
+
+        # 选项调优组
+        tuner_group = QGroupBox("选项组合调优")
+        tuner_layout = QGridLayout(tuner_group)
+        tuner_layout.setSpacing(10)
+
+        tuner_info = QLabel("对勾选的选项逐一组合进行构建(使用编译器缓存)，"
+                            "然后比较可执行文件大小、启动时间和构建时间。")
+        tuner_info.setWordWrap(True)
+        tuner_layout.addWidget(tuner_info, 0, 0, 1, 4)
+
+        # 每个可调选项一个复选框
+        self.tuner_option_checks = {}
+        for i, (key, (flag, _)) in enumerate(perf_tools.TUNABLE_OPTIONS.items()):
+            check = QCheckBox(flag)
+            check.setChecked(key in ("lto", "no_docstrings", "no_asserts"))
+            self.tuner_option_checks[key] = check
+            tuner_layout.addWidget(check, 1 + i // 3, i % 3)
+
+        self.tuner_parallel_label = QLabel("并行构建数:")
+        self.tuner_parallel_spin = QSpinBox()
+        self.tuner_parallel_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.tuner_parallel_spin.setValue(min(2, os.cpu_count() or 1))
+
+        self.tuner_max_label = QLabel("最大组合数:")
+        self.tuner_max_spin = QSpinBox()
+        self.tuner_max_spin.setRange(1, 64)
+        self.tuner_max_spin.setValue(8)
+
+        self.tuner_args_label = QLabel("启动参数:")
+        self.tuner_args_input = QLineEdit()
+        self.tuner_args_input.setPlaceholderText("使程序启动后立即退出的参数(例如: --version)")
+
+        self.tuner_runs_label = QLabel("启动测试次数:")
+        self.tuner_runs_spin = QSpinBox()
+        self.tuner_runs_spin.setRange(1, 50)
+        self.tuner_runs_spin.setValue(5)
+
+        tuner_layout.addWidget(self.tuner_parallel_label, 3, 0)
+        tuner_layout.addWidget(self.tuner_parallel_spin, 3, 1)
+        tuner_layout.addWidget(self.tuner_max_label, 3, 2)
+        tuner_layout.addWidget(self.tuner_max_spin, 3, 3)
+        tuner_layout.addWidget(self.tuner_args_label, 4, 0)
+        tuner_layout.addWidget(self.tuner_args_input, 4, 1)
+        tuner_layout.addWidget(self.tuner_runs_label, 4, 2)
+        tuner_layout.addWidget(self.tuner_runs_spin, 4, 3)
+
+        # 结果表格，帕累托最优的行以星号标记
+        self.tuner_table = QTableWidget(0, 5)
+        self.tuner_table.setHorizontalHeaderLabels(
+            ["选项", "大小 (MB)", "启动 (ms)", "构建 (s)", "帕累托"])
+        self.tuner_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tuner_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tuner_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tuner_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tuner_table.setMinimumHeight(180)
+        tuner_layout.addWidget(self.tuner_table, 5, 0, 1, 4)
+
+        tuner_button_layout = QHBoxLayout()
+        self.tuner_run_btn = QPushButton("开始调优")
+        self.tuner_run_btn.clicked.connect(self.run_option_tuner)
+        self.tuner_apply_btn = QPushButton("应用所选配置")
+        self.tuner_apply_btn.clicked.connect(self.apply_tuner_selection)
+        self.tuner_apply_btn.setEnabled(False)
+        tuner_button_layout.addWidget(self.tuner_run_btn)
+        tuner_button_layout.addWidget(self.tuner_apply_btn)
+        tuner_button_layout.addStretch()
+        tuner_layout.addLayout(tuner_button_layout, 6, 0, 1, 4)
+
+        performance_layout.addWidget(tuner_group)
+
+        # 各配置方案构建时间组
+        profile_stats_group = QGroupBox("各配置方案构建时间")
+        profile_stats_layout = QVBoxLayout(profile_stats_group)
+
+        self.profile_stats_table = QTableWidget(0, 6)
+        self.profile_stats_table.setHorizontalHeaderLabels(
+            ["配置方案", "构建次数", "成功次数", "平均 (s)", "中位数 (s)", "最近 (s)"])
+        self.profile_stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.profile_stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.profile_stats_table.setMinimumHeight(120)
+        profile_stats_layout.addWidget(self.profile_stats_table)
+
+        self.profile_stats_btn = QPushButton("刷新构建时间")
+        self.profile_stats_btn.clicked.connect(self.refresh_profile_stats)
+        profile_stats_layout.addWidget(self.profile_stats_btn, 0, Qt.AlignLeft)
+
+        performance_layout.addWidget(profile_stats_group)
+
+        # 导入耗时分析组
+        import_profile_group = QGroupBox("导入耗时分析")
+        import_profile_layout = QGridLayout(import_profile_group)
+        import_profile_layout.setSpacing(10)
+
+        self.import_mode_label = QLabel("运行:")
+        self.import_mode_combo = QComboBox()
+        self.import_mode_combo.addItem("已构建的程序", "binary")
+        self.import_mode_combo.addItem("在解释器中运行入口文件", "interpreter")
+        self.import_duration_label = QLabel("运行时长 (秒):")
+        self.import_duration_spin = QSpinBox()
+        self.import_duration_spin.setRange(1, 300)
+        self.import_duration_spin.setValue(15)
+        self.import_args_label = QLabel("参数:")
+        self.import_args_input = QLineEdit()
+        self.import_args_input.setPlaceholderText("可选的程序参数")
+
+        self.import_table = QTableWidget(0, 5)
+        self.import_table.setHorizontalHeaderLabels(
+            ["包", "累计 (ms)", "自身 (ms)", "模块数", "当前配置"])
+        self.import_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.import_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.import_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.import_table.setMinimumHeight(160)
+        self.import_chains_label = QLabel("")
+        self.import_chains_label.setWordWrap(True)
+        self.import_chains_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        self.import_profile_btn = QPushButton("分析导入耗时")
+        self.import_profile_btn.clicked.connect(self.profile_imports)
+        self.import_exclude_btn = QPushButton("排除所选 (--nofollow-import-to)")
+        self.import_exclude_btn.clicked.connect(self.exclude_selected_imports)
+        self.import_exclude_btn.setEnabled(False)
+
+        import_profile_layout.addWidget(self.import_mode_label, 0, 0)
+        import_profile_layout.addWidget(self.import_mode_combo, 0, 1)
+        import_profile_layout.addWidget(self.import_duration_label, 0, 2)
+        import_profile_layout.addWidget(self.import_duration_spin, 0, 3)
+        import_profile_layout.addWidget(self.import_args_label, 1, 0)
+        import_profile_layout.addWidget(self.import_args_input, 1, 1, 1, 3)
+        import_profile_layout.addWidget(self.import_table, 2, 0, 1, 4)
+        import_profile_layout.addWidget(self.import_chains_label, 3, 0, 1, 4)
+        import_profile_layout.addWidget(self.import_profile_btn, 4, 0)
+        import_profile_layout.addWidget(self.import_exclude_btn, 4, 1)
+
+        performance_layout.addWidget(import_profile_group)
+        performance_layout.addStretch()
+
+        # 将性能标签页添加到主选项卡
+        main_tab.addTab(performance_tab, "性能")
+
+        # ===== 基准测试标签页 =====
+        benchmark_tab = QWidget()
+        benchmark_layout = QVBoxLayout(benchmark_tab)
+        benchmark_layout.setContentsMargins(10, 10, 10, 10)
+        benchmark_layout.setSpacing(15)
+
+        # 运行时基准测试组
+        benchmark_group = QGroupBox("编译版与解释版基准测试")
+        benchmark_group_layout = QGridLayout(benchmark_group)
+        benchmark_group_layout.setSpacing(10)
+
+        self.benchmark_mode_label = QLabel("负载类型:")
+        self.benchmark_mode_combo = QComboBox()
+        self.benchmark_mode_combo.addItem("命令参数", "command")
+        self.benchmark_mode_combo.addItem("入口函数 (module:function，需要 --module 构建)", "function")
+
+        self.benchmark_workload_label = QLabel("负载:")
+        self.benchmark_workload_input = QLineEdit()
+        self.benchmark_workload_input.setPlaceholderText("参数(例如: --bench data/sample.csv)或 module:function")
+
+        self.benchmark_runs_label = QLabel("运行次数:")
+        self.benchmark_runs_spin = QSpinBox()
+        self.benchmark_runs_spin.setRange(1, 1000)
+        self.benchmark_runs_spin.setValue(10)
+
+        self.benchmark_warmup_label = QLabel("预热次数:")
+        self.benchmark_warmup_spin = QSpinBox()
+        self.benchmark_warmup_spin.setRange(0, 100)
+        self.benchmark_warmup_spin.setValue(2)
+
+        self.benchmark_ops_label = QLabel("每次运行的操作数:")
+        self.benchmark_ops_spin = QSpinBox()
+        self.benchmark_ops_spin.setRange(1, 1000000)
+        self.benchmark_ops_spin.setValue(1)
+
+        self.benchmark_run_btn = QPushButton("运行基准测试")
+        self.benchmark_run_btn.clicked.connect(self.run_runtime_benchmark)
+
+        benchmark_group_layout.addWidget(self.benchmark_mode_label, 0, 0)
+        benchmark_group_layout.addWidget(self.benchmark_mode_combo, 0, 1, 1, 3)
+        benchmark_group_layout.addWidget(self.benchmark_workload_label, 1, 0)
+        benchmark_group_layout.addWidget(self.benchmark_workload_input, 1, 1, 1, 3)
+        benchmark_group_layout.addWidget(self.benchmark_runs_label, 2, 0)
+        benchmark_group_layout.addWidget(self.benchmark_runs_spin, 2, 1)
+        benchmark_group_layout.addWidget(self.benchmark_warmup_label, 2, 2)
+        benchmark_group_layout.addWidget(self.benchmark_warmup_spin, 2, 3)
+        benchmark_group_layout.addWidget(self.benchmark_ops_label, 3, 0)
+        benchmark_group_layout.addWidget(self.benchmark_ops_spin, 3, 1)
+        benchmark_group_layout.addWidget(self.benchmark_run_btn, 3, 3)
+
+        # 并排显示的延迟分布
+        self.benchmark_metrics = [
+            ("runs", "运行次数"), ("min_ms", "最小值 (ms)"), ("p50_ms", "中位数 (ms)"),
+            ("p90_ms", "P90 (ms)"), ("p99_ms", "P99 (ms)"), ("max_ms", "最大值 (ms)"),
+            ("mean_ms", "平均值 (ms)"), ("stdev_ms", "标准差 (ms)"), ("throughput_per_s", "吞吐量 (次/秒)"),
+        ]
+        self.benchmark_table = QTableWidget(len(self.benchmark_metrics), 2)
+        self.benchmark_table.setHorizontalHeaderLabels(["解释器", "编译版"])
+        self.benchmark_table.setVerticalHeaderLabels([label for _, label in self.benchmark_metrics])
+        self.benchmark_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.benchmark_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.benchmark_table.setMinimumHeight(200)
+        benchmark_group_layout.addWidget(self.benchmark_table, 4, 0, 1, 4)
+
+        self.benchmark_speedup_label = QLabel("加速比: -")
+        self.benchmark_speedup_label.setFont(QFont("Arial", 11, QFont.Bold))
+        benchmark_group_layout.addWidget(self.benchmark_speedup_label, 5, 0, 1, 4)
+
+        benchmark_layout.addWidget(benchmark_group)
+
+        # 基准测试历史组
+        benchmark_history_group = QGroupBox("基准测试历史")
+        benchmark_history_layout = QVBoxLayout(benchmark_history_group)
+
+        self.benchmark_history_table = QTableWidget(0, 6)
+        self.benchmark_history_table.setHorizontalHeaderLabels(
+            ["构建", "选项", "负载", "解释器 p50 (ms)", "编译版 p50 (ms)", "加速比"])
+        self.benchmark_history_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.benchmark_history_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.benchmark_history_table.setMinimumHeight(150)
+        benchmark_history_layout.addWidget(self.benchmark_history_table)
+
+        self.benchmark_history_btn = QPushButton("刷新历史")
+        self.benchmark_history_btn.clicked.connect(self.refresh_benchmark_history)
+        benchmark_history_layout.addWidget(self.benchmark_history_btn, 0, Qt.AlignLeft)
+
+        benchmark_layout.addWidget(benchmark_history_group)
+        benchmark_layout.addStretch()
+
+        # 将基准测试标签页添加到主选项卡
+        main_tab.addTab(benchmark_tab, "基准测试")
+
+        # ===== 数据分析选项卡 =====
+        data_tab = QWidget()
+        data_layout = QVBoxLayout(data_tab)
+        data_layout.setContentsMargins(10, 10, 10, 10)
+        data_layout.setSpacing(15)
+
+        # 重复数据文件组
+        duplicates_group = QGroupBox("重复数据文件")
+        duplicates_layout = QGridLayout(duplicates_group)
+        duplicates_layout.setSpacing(10)
+
+        self.duplicates_scan_btn = QPushButton("扫描包含的数据文件")
+        self.duplicates_scan_btn.clicked.connect(self.scan_duplicate_data)
+        self.duplicates_summary_label = QLabel("对数据文件和数据目录字段选中的文件计算哈希")
+        self.duplicates_summary_label.setWordWrap(True)
+
+        self.duplicates_table = QTableWidget(0, 4)
+        self.duplicates_table.setHorizontalHeaderLabels(["浪费 (MB)", "文件大小 (MB)", "副本数", "目标路径"])
+        self.duplicates_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.duplicates_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.duplicates_table.setMinimumHeight(150)
+
+        self.duplicates_suggestions_list = QListWidget()
+        self.duplicates_suggestions_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.duplicates_suggestions_list.setMinimumHeight(100)
+        self.duplicates_apply_btn = QPushButton("添加所选排除项")
+        self.duplicates_apply_btn.clicked.connect(self.apply_duplicate_exclusions)
+
+        duplicates_layout.addWidget(self.duplicates_scan_btn, 0, 0)
+        duplicates_layout.addWidget(self.duplicates_summary_label, 0, 1)
+        duplicates_layout.addWidget(self.duplicates_table, 1, 0, 1, 2)
+        duplicates_layout.addWidget(QLabel("建议:"), 2, 0, 1, 2)
+        duplicates_layout.addWidget(self.duplicates_suggestions_list, 3, 0, 1, 2)
+        duplicates_layout.addWidget(self.duplicates_apply_btn, 4, 0)
+
+        data_layout.addWidget(duplicates_group)
+
+        # 单文件载荷组
+        payload_group = QGroupBox("单文件载荷压缩")
+        payload_layout = QGridLayout(payload_group)
+        payload_layout.setSpacing(10)
+
+        self.payload_levels_label = QLabel("zstd级别:")
+        self.payload_levels_input = QLineEdit(",".join(str(level) for level in data_tools.ONEFILE_LEVELS))
+        self.payload_read_label = QLabel("磁盘读取速度 (MB/s):")
+        self.payload_read_spin = QSpinBox()
+        self.payload_read_spin.setRange(10, 20000)
+        self.payload_read_spin.setValue(500)
+        self.payload_analyze_btn = QPushButton("分析载荷")
+        self.payload_analyze_btn.clicked.connect(self.analyze_onefile_payload)
+
+        self.payload_files_table = QTableWidget(0, 4)
+        self.payload_files_table.setHorizontalHeaderLabels(
+            ["载荷文件", "大小 (MB)", f"zstd {data_tools.SAMPLE_LEVEL} (MB)", "压缩比"])
+        self.payload_files_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.payload_files_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.payload_files_table.setMinimumHeight(150)
+
+        self.payload_settings_table = QTableWidget(0, 5)
+        self.payload_settings_table.setHorizontalHeaderLabels(
+            ["压缩", "载荷 (MB)", "压缩 (s)", "解压 (ms)", "预计解包 (ms)"])
+        self.payload_settings_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.payload_settings_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.payload_settings_table.setMinimumHeight(150)
+
+        self.payload_result_label = QLabel("分析最近一次独立/单文件构建的 .dist 目录(构建时不要勾选删除输出以保留该目录)")
+        self.payload_result_label.setWordWrap(True)
+        self.payload_apply_btn = QPushButton("应用最快设置")
+        self.payload_apply_btn.setEnabled(False)
+        self.payload_apply_btn.clicked.connect(self.apply_payload_recommendation)
+
+        payload_layout.addWidget(self.payload_levels_label, 0, 0)
+        payload_layout.addWidget(self.payload_levels_input, 0, 1)
+        payload_layout.addWidget(self.payload_read_label, 0, 2)
+        payload_layout.addWidget(self.payload_read_spin, 0, 3)
+        payload_layout.addWidget(self.payload_analyze_btn, 0, 4)
+        payload_layout.addWidget(self.payload_files_table, 1, 0, 1, 5)
+        payload_layout.addWidget(self.payload_settings_table, 2, 0, 1, 5)
+        payload_layout.addWidget(self.payload_result_label, 3, 0, 1, 4)
+        payload_layout.addWidget(self.payload_apply_btn, 3, 4)
+
+        data_layout.addWidget(payload_group)
+
+        # 共享库依赖组
+        dlls_group = QGroupBox("共享库依赖")
+        dlls_layout = QGridLayout(dlls_group)
+        dlls_layout.setSpacing(10)
+
+        self.dlls_scan_btn = QPushButton("扫描已构建的库")
+        self.dlls_scan_btn.clicked.connect(self.scan_dist_libraries)
+        self.dlls_summary_label = QLabel("解析最近一次构建的 .dist 目录中的 ELF/PE 文件头")
+        self.dlls_summary_label.setWordWrap(True)
+
+        self.dlls_table = QTableWidget(0, 5)
+        self.dlls_table.setHorizontalHeaderLabels(["库", "大小 (MB)", "状态", "依赖", "被依赖"])
+        self.dlls_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.dlls_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.dlls_table.setMinimumHeight(150)
+
+        self.dlls_suggestions_list = QListWidget()
+        self.dlls_suggestions_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.dlls_suggestions_list.setMinimumHeight(100)
+        self.dlls_apply_btn = QPushButton("排除所选DLL")
+        self.dlls_apply_btn.clicked.connect(self.apply_dll_exclusions)
+
+        dlls_layout.addWidget(self.dlls_scan_btn, 0, 0)
+        dlls_layout.addWidget(self.dlls_summary_label, 0, 1)
+        dlls_layout.addWidget(self.dlls_table, 1, 0, 1, 2)
+        dlls_layout.addWidget(QLabel("建议:"), 2, 0, 1, 2)
+        dlls_layout.addWidget(self.dlls_suggestions_list, 3, 0, 1, 2)
+        dlls_layout.addWidget(self.dlls_apply_btn, 4, 0)
+
+        data_layout.addWidget(dlls_group)
+        data_layout.addStretch()
+
+        # 将数据分析选项卡添加到主选项卡
+        main_tab.addTab(data_tab, "数据分析")
+
+        # ===== 产物选项卡 =====
+        artifacts_tab = QWidget()
+        artifacts_layout = QVBoxLayout(artifacts_tab)
+        artifacts_layout.setContentsMargins(10, 10, 10, 10)
+        artifacts_layout.setSpacing(15)
+
+        # 产物清单组
+        manifest_group = QGroupBox("产物清单")
+        manifest_layout = QGridLayout(manifest_group)
+        manifest_layout.setSpacing(10)
+
+        self.artifact_manifest_check = QCheckBox("每次构建后为输出生成 SHA-256 清单")
+        self.artifact_manifest_check.setChecked(self.settings.value("artifact_manifest", True, type=bool))
+        self.artifact_manifest_check.stateChanged.connect(
+            lambda: self.settings.setValue("artifact_manifest", self.artifact_manifest_check.isChecked()))
+
+        self.manifest_verify_btn = QPushButton("校验最近一次构建")
+        self.manifest_verify_btn.clicked.connect(self.verify_latest_manifest)
+        self.manifest_compare_label = QLabel("将最近一次构建与以下构建比较:")
+        self.manifest_compare_combo = QComboBox()
+        self.manifest_compare_btn = QPushButton("比较")
+        self.manifest_compare_btn.clicked.connect(self.compare_build_manifests)
+
+        self.manifest_summary_label = QLabel("清单随构建历史保存，并以 <名称>.sha256 (sha256sum -c 格式) 写在输出旁")
+        self.manifest_summary_label.setWordWrap(True)
+
+        self.manifest_table = QTableWidget(0, 4)
+        self.manifest_table.setHorizontalHeaderLabels(["变化", "路径", "原大小 (KB)", "新大小 (KB)"])
+        self.manifest_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.manifest_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.manifest_table.setMinimumHeight(150)
+
+        manifest_layout.addWidget(self.artifact_manifest_check, 0, 0, 1, 4)
+        manifest_layout.addWidget(self.manifest_verify_btn, 1, 0)
+        manifest_layout.addWidget(self.manifest_compare_label, 1, 1)
+        manifest_layout.addWidget(self.manifest_compare_combo, 1, 2)
+        manifest_layout.addWidget(self.manifest_compare_btn, 1, 3)
+        manifest_layout.addWidget(self.manifest_summary_label, 2, 0, 1, 4)
+        manifest_layout.addWidget(self.manifest_table, 3, 0, 1, 4)
+
+        artifacts_layout.addWidget(manifest_group)
+
+        # 冒烟测试组
+        smoke_group = QGroupBox("冒烟测试")
+        smoke_layout = QGridLayout(smoke_group)
+        smoke_layout.setSpacing(10)
+
+        self.smoke_tests_check = QCheckBox("每次构建后对生成的程序运行冒烟测试，任一失败则判定构建失败")
+        self.smoke_tests_check.setChecked(self.settings.value("smoke_tests", False, type=bool))
+        self.smoke_tests_check.stateChanged.connect(
+            lambda: self.settings.setValue("smoke_tests", self.smoke_tests_check.isChecked()))
+
+        self.smoke_table = QTableWidget(0, 6)
+        self.smoke_table.setHorizontalHeaderLabels(
+            ["名称", "参数", "超时 (秒)", "退出码", "输出匹配 (正则)", "结果"])
+        self.smoke_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.smoke_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.smoke_table.setMinimumHeight(120)
+        self.smoke_table.itemChanged.connect(self.save_smoke_tests)
+
+        self.smoke_add_btn = QPushButton("添加测试")
+        self.smoke_add_btn.clicked.connect(self.add_smoke_test)
+        self.smoke_remove_btn = QPushButton("删除测试")
+        self.smoke_remove_btn.clicked.connect(self.remove_smoke_test_row)
+        self.smoke_run_btn = QPushButton("立即运行")
+        self.smoke_run_btn.clicked.connect(self.run_smoke_tests)
+        self.smoke_info_label = QLabel("每个测试在各自的临时目录中并行运行，该目录同时作为其 HOME 和 TEMP")
+        self.smoke_info_label.setWordWrap(True)
+
+        smoke_layout.addWidget(self.smoke_tests_check, 0, 0, 1, 4)
+        smoke_layout.addWidget(self.smoke_table, 1, 0, 1, 4)
+        smoke_layout.addWidget(self.smoke_add_btn, 2, 0)
+        smoke_layout.addWidget(self.smoke_remove_btn, 2, 1)
+        smoke_layout.addWidget(self.smoke_run_btn, 2, 2)
+        smoke_layout.addWidget(self.smoke_info_label, 3, 0, 1, 4)
+
+        artifacts_layout.addWidget(smoke_group)
+
+        # 归档导出组
+        export_group = QGroupBox("归档导出")
+        export_layout = QGridLayout(export_group)
+        export_layout.setSpacing(10)
+
+        self.export_format_label = QLabel("格式:")
+        self.export_format_combo = QComboBox()
+        for fmt in artifact_tools.ARCHIVE_FORMATS:
+            self.export_format_combo.addItem(fmt, fmt)
+        self.export_format_combo.setCurrentIndex(
+            max(0, self.export_format_combo.findData(self.settings.value("export_format", "tar.zst", type=str))))
+        self.export_format_combo.currentIndexChanged.connect(self.save_export_settings)
+        self.export_level_label = QLabel("压缩级别:")
+        self.export_level_spin = QSpinBox()
+        self.export_level_spin.setRange(1, 22)
+        self.export_level_spin.setValue(self.settings.value("export_level", 3, type=int))
+        self.export_level_spin.setToolTip("zstd 为 1-22，zip 使用 1-9")
+        self.export_level_spin.valueChanged.connect(self.save_export_settings)
+
+        self.export_dir_label = QLabel("目标目录:")
+        self.export_dir_input = QLineEdit()
+        self.export_dir_input.setPlaceholderText("输出目录 (默认)")
+        self.export_dir_input.setText(self.settings.value("export_dir", "", type=str))
+        self.export_dir_input.editingFinished.connect(self.save_export_settings)
+        self.export_dir_btn = QPushButton("浏览...")
+        self.export_dir_btn.clicked.connect(self.select_export_dir)
+
+        self.export_incremental_check = QCheckBox("复用自上次导出以来未变化文件的压缩数据 (tar.zst)")
+        self.export_incremental_check.setChecked(self.settings.value("export_incremental", False, type=bool))
+        self.export_incremental_check.stateChanged.connect(self.save_export_settings)
+        self.export_after_build_check = QCheckBox("每次构建成功后导出")
+        self.export_after_build_check.setChecked(self.settings.value("export_after_build", False, type=bool))
+        self.export_after_build_check.stateChanged.connect(self.save_export_settings)
+
+        self.export_btn = QPushButton("立即导出")
+        self.export_btn.clicked.connect(self.export_build_archive)
+        self.export_result_label = QLabel("")
+        self.export_result_label.setWordWrap(True)
+
+        export_layout.addWidget(self.export_format_label, 0, 0)
+        export_layout.addWidget(self.export_format_combo, 0, 1)
+        export_layout.addWidget(self.export_level_label, 0, 2)
+        export_layout.addWidget(self.export_level_spin, 0, 3)
+        export_layout.addWidget(self.export_dir_label, 1, 0)
+        export_layout.addWidget(self.export_dir_input, 1, 1, 1, 2)
+        export_layout.addWidget(self.export_dir_btn, 1, 3)
+        export_layout.addWidget(self.export_incremental_check, 2, 0, 1, 4)
+        export_layout.addWidget(self.export_after_build_check, 3, 0, 1, 4)
+        export_layout.addWidget(self.export_btn, 4, 0)
+        export_layout.addWidget(self.export_result_label, 4, 1, 1, 3)
+
+        artifacts_layout.addWidget(export_group)
+
+        # 增量更新组
+        delta_group = QGroupBox("增量更新")
+        delta_layout = QGridLayout(delta_group)
+        delta_layout.setSpacing(10)
+
+        self.retain_releases_check = QCheckBox("保留最近构建产物的副本以生成增量包")
+        self.retain_releases_check.setChecked(self.settings.value("retain_releases", False, type=bool))
+        self.retain_releases_check.stateChanged.connect(self.save_delta_settings)
+        self.retain_count_label = QLabel("保留份数:")
+        self.retain_count_spin = QSpinBox()
+        self.retain_count_spin.setRange(1, 20)
+        self.retain_count_spin.setValue(self.settings.value("retain_count", 3, type=int))
+        self.retain_count_spin.valueChanged.connect(self.save_delta_settings)
+
+        self.delta_from_label = QLabel("从构建更新:")
+        self.delta_from_combo = QComboBox()
+        self.delta_create_btn = QPushButton("生成增量包")
+        self.delta_create_btn.clicked.connect(self.create_delta_package)
+        self.delta_apply_btn = QPushButton("校验并应用增量包...")
+        self.delta_apply_btn.clicked.connect(self.apply_delta_package)
+        self.delta_result_label = QLabel("增量包写入归档目标目录，只需已安装上一次构建即可应用")
+        self.delta_result_label.setWordWrap(True)
+
+        delta_layout.addWidget(self.retain_releases_check, 0, 0, 1, 2)
+        delta_layout.addWidget(self.retain_count_label, 0, 2)
+        delta_layout.addWidget(self.retain_count_spin, 0, 3)
+        delta_layout.addWidget(self.delta_from_label, 1, 0)
+        delta_layout.addWidget(self.delta_from_combo, 1, 1)
+        delta_layout.addWidget(self.delta_create_btn, 1, 2)
+        delta_layout.addWidget(self.delta_apply_btn, 1, 3)
+        delta_layout.addWidget(self.delta_result_label, 2, 0, 1, 4)
+
+        artifacts_layout.addWidget(delta_group)
+
+        # 内容寻址产物存储组
+        store_group = QGroupBox("产物存储")
+        store_layout = QGridLayout(store_group)
+        store_layout.setSpacing(10)
+
+        self.artifact_store_check = QCheckBox("按内容哈希只存储一份输出文件，并以硬链接方式生成构建产物")
+        self.artifact_store_check.setChecked(self.settings.value("artifact_store", False, type=bool))
+        self.artifact_store_check.stateChanged.connect(self.save_artifact_store_settings)
+        self.artifact_store_label = QLabel("存储目录:")
+        self.artifact_store_input = QLineEdit()
+        self.artifact_store_input.setPlaceholderText(artifact_tools.default_artifact_store())
+        self.artifact_store_input.setText(self.settings.value("artifact_store_dir", "", type=str))
+        self.artifact_store_input.setToolTip("硬链接要求存储目录与输出目录位于同一磁盘")
+        self.artifact_store_input.editingFinished.connect(self.save_artifact_store_settings)
+        self.artifact_store_btn = QPushButton("浏览...")
+        self.artifact_store_btn.clicked.connect(self.select_artifact_store)
+        self.artifact_store_gc_btn = QPushButton("清理未引用文件")
+        self.artifact_store_gc_btn.clicked.connect(self.collect_artifact_garbage)
+        self.artifact_store_usage_label = QLabel("")
+        self.artifact_store_usage_label.setWordWrap(True)
+
+        store_layout.addWidget(self.artifact_store_check, 0, 0, 1, 4)
+        store_layout.addWidget(self.artifact_store_label, 1, 0)
+        store_layout.addWidget(self.artifact_store_input, 1, 1, 1, 2)
+        store_layout.addWidget(self.artifact_store_btn, 1, 3)
+        store_layout.addWidget(self.artifact_store_gc_btn, 2, 0)
+        store_layout.addWidget(self.artifact_store_usage_label, 2, 1, 1, 3)
+
+        artifacts_layout.addWidget(store_group)
+
+        # 部署同步组
+        deploy_group = QGroupBox("部署同步")
+        deploy_layout = QGridLayout(deploy_group)
+        deploy_layout.setSpacing(10)
+
+        self.deploy_sync_check = QCheckBox("每次构建成功后将产物同步到部署目录")
+        self.deploy_sync_check.setChecked(self.settings.value("deploy_sync", False, type=bool))
+        self.deploy_sync_check.stateChanged.connect(self.save_deploy_settings)
+        self.deploy_dir_label = QLabel("部署到:")
+        self.deploy_dir_input = QLineEdit()
+        self.deploy_dir_input.setPlaceholderText("共享测试目录或任意本地目录")
+        self.deploy_dir_input.setText(self.settings.value("deploy_dir", "", type=str))
+        self.deploy_dir_input.editingFinished.connect(self.save_deploy_settings)
+        self.deploy_dir_btn = QPushButton("浏览...")
+        self.deploy_dir_btn.clicked.connect(self.select_deploy_dir)
+        self.deploy_sync_btn = QPushButton("立即同步")
+        self.deploy_sync_btn.clicked.connect(self.sync_deployment)
+        self.deploy_result_label = QLabel("只复制有变化的文件，新版本一次性替换旧版本")
+        self.deploy_result_label.setWordWrap(True)
+
+        deploy_layout.addWidget(self.deploy_sync_check, 0, 0, 1, 4)
+        deploy_layout.addWidget(self.deploy_dir_label, 1, 0)
+        deploy_layout.addWidget(self.deploy_dir_input, 1, 1, 1, 2)
+        deploy_layout.addWidget(self.deploy_dir_btn, 1, 3)
+        deploy_layout.addWidget(self.deploy_sync_btn, 2, 0)
+        deploy_layout.addWidget(self.deploy_result_label, 2, 1, 1, 3)
+
+        artifacts_layout.addWidget(deploy_group)
+        artifacts_layout.addStretch()
+
+        # 添加产物选项卡到主选项卡
+        main_tab.addTab(artifacts_tab, "产物")
+
         # ===== 操作日志标签页 =====
         log_tab = QWidget()
         log_layout = QVBoxLayout(log_tab)
@@ -960,7 +2037,7 @@ class NuitkaPackager(QMainWindow):
                 padding: 5px;
                 color: #ffffff;
             }
-            QLineEdit, QComboBox, QListWidget {
+            QLineEdit, QComboBox, QListWidget, QTableWidget {
                 background-color: #1e1e1e;
                 border: 1px solid #555;
                 border-radius: 4px;
@@ -1133,7 +2210,7 @@ class NuitkaPackager(QMainWindow):
                 padding: 5px;
                 color: #2c3e50;
             }
-            QLineEdit, QComboBox, QListWidget {
+            QLineEdit, QComboBox, QListWidget, QTableWidget {
                 background-color: white;
                 border: 1px solid #dcdde1;
                 border-radius: 4px;
@@ -1421,6 +2498,12 @@ class NuitkaPackager(QMainWindow):
         if file_path:
             self.main_file = file_path
             self.file_input.setText(file_path)
+            self.reload_profiles()
+            self.refresh_profile_stats()
+            self.refresh_manifest_builds()
+            self.refresh_smoke_tests()
+            self.start_project_index()
+            self.refresh_launch_history()
 
     def select_icon(self):
         """选择图标文件"""
@@ -1446,6 +2529,15 @@ class NuitkaPackager(QMainWindow):
             self.command_edit.setPlainText("1.请先选择Python解释器和主文件 \n2.选择常用选项以更新打包命令")
             return
 
+        command = self.build_command()
+        if command is None:
+            return
+
+        # 显示命令
+        self.command_edit.setPlainText(" ".join(command))
+
+    def build_command(self):
+        """根据用户选择生成打包命令参数列表"""
         # 构建基本命令
         command = [
             self.python_path,
@@ -1466,11 +2558,16 @@ class NuitkaPackager(QMainWindow):
         if self.disable_console_check.isChecked():
             command.append("--windows-disable-console")
 
-        if self.remove_output_check.isChecked():
+        # 复用的构建目录必须在构建后保留
+        if self.remove_output_check.isChecked() and not self.build_dir_reuse_check.isChecked():
             command.append("--remove-output")
 
         if self.include_qt_check.isChecked():
-            command.append("--include-qt-plugins=sensible,styles")
+            command.append(f"--include-qt-plugins={self.qt_plugins_input.text().strip() or 'sensible,styles'}")
+            if self.qt_noinclude_plugins_input.text().strip():
+                command.append(f"--noinclude-qt-plugins={self.qt_noinclude_plugins_input.text().strip()}")
+            if self.noinclude_qt_translations_check.isChecked():
+                command.append("--noinclude-qt-translations")
 
         if self.show_progress_check.isChecked():
             command.append("--show-progress")
@@ -1516,6 +2613,16 @@ class NuitkaPackager(QMainWindow):
         if self.windows_uac_uiaccess_check.isChecked():
             command.append("--windows-uac-uiaccess")
 
+        # ===== 构建配置方案 =====
+        jobs = project_store.profile_jobs(self.current_profile())
+        if jobs:
+            command.append(f"--jobs={jobs}")
+
+        # ===== C编译器 =====
+        compiler = self.compiler_combo.currentData()
+        if compiler:
+            command.extend(perf_tools.COMPILERS[compiler]["args"])
+
         # ===== 包含选项 =====
         # 包含包
         if self.include_package_input.text():
@@ -1535,6 +2642,17 @@ class NuitkaPackager(QMainWindow):
             for mod in modules:
                 command.append(f"--include-module={mod}")
 
+        # 包含数据文件
+        if self.include_data_input.text():
+            data_files = [df.strip() for df in self.include_data_input.text().split(',') if df.strip()]
+            project_base_dir = os.path.dirname(self.main_file) if self.main_file else ""
+            for df in data_files:
+                src_pattern, _, dest_path = df.partition('=')
+                # 基于主文件所在目录解析相对路径
+                if project_base_dir and not os.path.isabs(src_pattern):
+                    src_pattern = os.path.join(project_base_dir, src_pattern)
+                command.append(f"--include-data-files={src_pattern}={dest_path or './'}")
+
         # 包含数据目录
         if self.include_data_dir_input.text():
             data_dirs = [dd.strip() for dd in self.include_data_dir_input.text().split(',') if dd.strip()]
@@ -1542,7 +2660,7 @@ class NuitkaPackager(QMainWindow):
             # 获取主文件所在目录作为项目基础路径
             if not self.main_file:
                 QMessageBox.warning(self, "警告", "请先选择主文件")
-                return
+                return None
 
             project_base_dir = os.path.dirname(self.main_file)
 
@@ -1555,22 +2673,10 @@ class NuitkaPackager(QMainWindow):
                     # 默认目标路径为源路径的最后一部分
                     dest_path = os.path.basename(src_path)
 
-                # 确保源路径是绝对路径
+                # 基于主文件所在目录解析相对路径；不存在的路径保留在命令中，
+                # 由构建前的校验统一报告
                 if not os.path.isabs(src_path):
-                    # 基于主文件所在目录解析相对路径
-                    resolved_path = os.path.join(project_base_dir, src_path)
-
-                    # 验证路径是否存在
-                    if os.path.exists(resolved_path):
-                        src_path = resolved_path
-                    else:
-                        logging.warning(f"资源路径不存在: {resolved_path}")
-                        continue
-
-                # 验证路径是否存在
-                if not os.path.exists(src_path):
-                    logging.warning(f"包含数据目录不存在: {src_path}")
-                    continue
+                    src_path = os.path.join(project_base_dir, src_path)
 
                 # 添加到命令
                 command.append(f"--include-data-dir={src_path}={dest_path}")
@@ -1599,6 +2705,11 @@ class NuitkaPackager(QMainWindow):
             for rd in raw_dirs:
                 command.append(f"--include-raw-dir={rd}")
 
+        # 不跟随导入
+        if self.nofollow_import_input.text():
+            for mod in [mod.strip() for mod in self.nofollow_import_input.text().split(',') if mod.strip()]:
+                command.append(f"--nofollow-import-to={mod}")
+
         # ===== Python标志 =====
         for i in range(self.flags_list.count()):
             command.append(self.flags_list.item(i).text())
@@ -1618,8 +2729,9 @@ class NuitkaPackager(QMainWindow):
                 command.append("--onefile-as-archive")
 
         # ===== DLL控制 =====
-        if self.noinclude_dlls_input.text():
-            command.append(f"--noinclude-dlls={self.noinclude_dlls_input.text()}")
+        for pattern in self.noinclude_dlls_input.text().split(","):
+            if pattern.strip():
+                command.append(f"--noinclude-dlls={pattern.strip()}")
 
         # ===== 元数据 =====
         if self.company_input.text():
@@ -1666,8 +2778,7 @@ class NuitkaPackager(QMainWindow):
         # 添加主文件
         command.append(self.main_file)
 
-        # 显示命令
-        self.command_edit.setPlainText(" ".join(command))
+        return command
 
     def execute_package(self):
         """执行打包命令"""
@@ -1702,8 +2813,80 @@ class NuitkaPackager(QMainWindow):
         # 获取命令
         command = self.command_edit.toPlainText().split()
 
+        # 启动前在后台检查引用的路径和模块
+        python = None if self.python_path.endswith("nuitka.cmd") else self.python_path
+        build_python = self.python_path
+        prebuilt = self.prebuilt_packages() if self.prebuilt_check.isChecked() else []
+
+        def task(log, progress, should_stop):
+            problems = preflight.validate_command(command, python)
+            # 为预编译模块缓存查询包版本同样需要启动解释器
+            interpreter = None
+            if prebuilt and "--onefile" not in command and "--module" not in command:
+                try:
+                    interpreter = build_env.interpreter_info(build_python, prebuilt)
+                except (OSError, ValueError, RuntimeError, subprocess.TimeoutExpired) as e:
+                    interpreter = e
+            return problems, interpreter
+
+        self.input_check_thread = ToolThread(task)
+        self.input_check_thread.log_signal.connect(self.log_message)
+        self.input_check_thread.result_signal.connect(lambda result: self.start_package(command, *result))
+        self.input_check_thread.finished_signal.connect(self.input_check_finished)
+        self.execute_btn.setEnabled(False)
+        self.input_check_thread.start()
+        self.log_message("🔎 正在检查构建输入...")
+
+    def input_check_finished(self, ok):
+        """输入检查未启动构建时重新启用打包按钮"""
+        if not (self.package_thread and self.package_thread.isRunning()):
+            self.execute_btn.setEnabled(True)
+
+    def start_package(self, command, problems, interpreter=None):
+        """输入检查完成后设置构建步骤并开始打包"""
+        if not self.confirm_build_inputs(problems):
+            return
+
+        # 打包线程在Nuitka构建前后执行的步骤
+        before_build, after_build, cleanup = [], [], []
+        self.build_extra = {}
+        if self.source_snapshot_check.isChecked():
+            command = self.add_source_snapshot_steps(command, before_build, after_build)
+        if self.preflight_check.isChecked():
+            self.add_preflight_steps(command, before_build)
+        if self.scratch_staging_check.isChecked():
+            command = self.add_scratch_staging_steps(command, before_build, after_build, cleanup)
+        if self.build_dir_reuse_check.isChecked():
+            command = perf_tools.remove_options(command, ["--remove-output"])
+            self.add_build_dir_reuse_steps(command, before_build, cleanup)
+        if self.prebuilt_check.isChecked() and self.prebuilt_packages():
+            command = self.add_prebuilt_module_steps(command, after_build, interpreter)
+        if self.split_symbols_check.isChecked() and "--unstripped" in command:
+            self.add_symbol_split_steps(command, after_build)
+        if self.smoke_tests_check.isChecked() and self.smoke_tests():
+            self.add_smoke_test_steps(command, after_build)
+        if self.artifact_manifest_check.isChecked():
+            self.add_manifest_steps(command, after_build)
+            if self.retain_releases_check.isChecked():
+                self.add_release_steps(after_build)
+            if self.artifact_store_check.isChecked():
+                self.add_artifact_store_steps(command, before_build, after_build)
+        if self.deploy_sync_check.isChecked() and self.deploy_dir_input.text().strip():
+            self.add_deploy_steps(command, after_build)
+
+        if "--onefile" in command:
+            self.build_extra["onefile_tempdir_spec"] = perf_tools.get_option(command, "--onefile-tempdir-spec", "")
+
+        # 记录本次构建内容，用于构建历史
+        self.build_command_args = command
+        self.build_profile = self.profile_combo.currentData() or ""
+        self.build_started = time.time()
+
         # 创建并启动打包线程
-        self.package_thread = PackageThread(command)
+        compiler = self.compiler_combo.currentData()
+        env = perf_tools.compiler_env(compiler) if compiler else None
+        self.package_thread = PackageThread(command, before_build=before_build, after_build=after_build,
+                                            cleanup=cleanup, env=env)
         self.package_thread.log_signal.connect(self.log_message)
         self.package_thread.finished_signal.connect(self.package_finished)
 
@@ -1737,23 +2920,15 @@ class NuitkaPackager(QMainWindow):
     def stop_package(self):
         """停止打包过程"""
         if self.package_thread and self.package_thread.isRunning():
+            # 线程会停止Nuitka并跳过剩余步骤，结束前仍会执行清理
             self.package_thread.stop()
-            self.log_message("🛑 用户请求停止打包...")
+            self.build_extra["cancelled"] = True
+            self.log_message("🛑 用户请求停止打包，正在等待当前步骤结束...")
             self.stop_btn.setEnabled(False)
 
-            # 尝试正常等待线程结束
-            if not self.package_thread.wait(2000):  # 等待2秒
-                # 如果线程仍在运行，强制终止
-                self.package_thread.terminate()
-                self.log_message("⚠️ 强制终止打包线程")
-
-            # 立即重置按钮状态
-            self.execute_btn.setEnabled(True)
-            self.progress_bar.setValue(0)
-
-            # 停止进度更新
-            if hasattr(self, 'progress_timer'):
-                self.killTimer(self.progress_timer)
+    def build_stopped(self):
+        """用户是否停止了正在运行的构建，供耗时的构建后步骤检查"""
+        return self.package_thread is not None and not self.package_thread.running
 
     def package_finished(self, success):
         """打包完成后的处理"""
@@ -1768,6 +2943,11 @@ class NuitkaPackager(QMainWindow):
         if hasattr(self, 'progress_timer'):
             self.killTimer(self.progress_timer)
 
+        # 将本次构建记录到项目历史
+        self.record_build(success)
+        if success and self.export_after_build_check.isChecked():
+            self.export_build_archive()
+
         if success:
             self.log_message("✅ 打包成功完成！")
             self.log_message(f"输出目录: {self.output_dir}")
@@ -1783,6 +2963,8 @@ class NuitkaPackager(QMainWindow):
             reply = msg_box.exec()  # 使用exec()而不是静态方法
             if reply == QMessageBox.Yes:
                 os.startfile(self.output_dir)
+        elif self.build_extra.get("cancelled"):
+            self.log_message("🛑 打包已停止，已记录为取消")
         else:
             self.log_message("❌ 打包过程中出现错误，请检查日志")
 
@@ -1792,6 +2974,1549 @@ class NuitkaPackager(QMainWindow):
         self.log_message("日志已清除")
         self.progress_bar.setValue(0)
 
+    def start_tool_task(self, task, on_result, button=None):
+        """在后台执行工具任务，并将日志和进度转发到主窗口"""
+        if self.tool_thread and self.tool_thread.isRunning():
+            self.log_message("⚠️ 已有其他工具正在运行")
+            return False
+
+        self.tool_thread = ToolThread(task)
+        self.tool_thread.log_signal.connect(self.log_message)
+        self.tool_thread.progress_signal.connect(self.progress_bar.setValue)
+        self.tool_thread.result_signal.connect(on_result)
+        if button is not None:
+            button.setEnabled(False)
+            self.tool_thread.finished_signal.connect(lambda _: button.setEnabled(True))
+        self.progress_bar.setValue(0)
+        self.tool_thread.start()
+        return True
+
+    def run_option_tuner(self):
+        """构建所选选项的各种组合并进行基准测试"""
+        if not self.python_path or not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择Python解释器、主文件和输出目录")
+            return
+
+        keys = [key for key, check in self.tuner_option_checks.items() if check.isChecked()]
+        if "onefile_no_compression" in keys and not self.onefile_check.isChecked():
+            keys.remove("onefile_no_compression")
+            self.log_message("ℹ️ 未启用单文件模式，已跳过 --onefile-no-compression")
+        if not keys:
+            QMessageBox.warning(self, "缺少配置", "请至少勾选一个需要调优的选项")
+            return
+
+        base_command = self.command_edit.toPlainText().split()
+        work_dir = os.path.join(self.output_dir, "tuner")
+        parallel = self.tuner_parallel_spin.value()
+        max_combinations = self.tuner_max_spin.value()
+        startup_args = self.tuner_args_input.text().split()
+        startup_runs = self.tuner_runs_spin.value()
+        main_file = self.main_file
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_tuner(
+                base_command, main_file, work_dir, keys, parallel=parallel,
+                max_combinations=max_combinations, startup_args=startup_args,
+                startup_runs=startup_runs, log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_tuner_results, self.tuner_run_btn):
+            self.log_message(f"▶ 正在以 {parallel} 个并行构建调优 {len(keys)} 个选项...")
+
+    def show_tuner_results(self, results):
+        """填充调优结果表格，帕累托最优配置排在前面"""
+        self.tuner_results = sorted(results, key=lambda r: (not r.get("pareto"), r["index"]))
+        self.tuner_table.setRowCount(len(self.tuner_results))
+
+        def fmt(value, scale, digits):
+            return "-" if value is None else f"{value / scale:.{digits}f}"
+
+        for row, result in enumerate(self.tuner_results):
+            label = result["label"].replace("baseline", "基线")
+            if not result["ok"]:
+                label = f"{label} (失败)"
+            cells = [
+                label,
+                fmt(result["size_bytes"], 1024 * 1024, 1),
+                fmt(result["startup_ms"], 1, 0),
+                fmt(result["build_s"], 1, 1),
+                "★" if result.get("pareto") else "",
+            ]
+            for column, text in enumerate(cells):
+                self.tuner_table.setItem(row, column, QTableWidgetItem(text))
+
+        self.tuner_apply_btn.setEnabled(bool(self.tuner_results))
+        front = [r["label"] for r in self.tuner_results if r.get("pareto")]
+        self.log_message(f"✅ 调优完成，帕累托前沿: {', '.join(front) or '无'}")
+
+    def apply_tuner_selection(self):
+        """将调优表格中选中的配置应用到界面"""
+        row = self.tuner_table.currentRow()
+        if row < 0 or row >= len(self.tuner_results):
+            QMessageBox.warning(self, "未选择", "请在调优表格中选择一个配置")
+            return
+
+        combo = self.tuner_results[row]["combo"]
+        self.lto_check.setChecked("lto" in combo)
+        if self.onefile_check.isChecked():
+            self.onefile_no_compression_check.setChecked("onefile_no_compression" in combo)
+
+        # 将调优的Python标志同步到标志列表
+        for key, (flag, _) in perf_tools.TUNABLE_OPTIONS.items():
+            if not flag.startswith("--python-flag="):
+                continue
+            if key in combo and not self.flag_exists(flag):
+                self.flags_list.addItem(flag)
+            elif key not in combo:
+                for item in self.flags_list.findItems(flag, Qt.MatchExactly):
+                    self.flags_list.takeItem(self.flags_list.row(item))
+
+        self.update_command()
+        self.log_message(f"✓ 已应用调优配置: {self.tuner_results[row]['label']}")
+
+    def current_profile(self):
+        """返回当前选中的构建配置方案，自定义设置时返回None"""
+        return self.profiles.get(self.profile_combo.currentData() or "")
+
+    def reload_profiles(self):
+        """将内置和项目中的构建配置方案加载到选择器"""
+        selected = self.profile_combo.currentData() or self.settings.value("build_profile", "", type=str)
+        try:
+            self.profiles = project_store.load_profiles(self.main_file or None)
+        except OSError as e:
+            self.profiles = project_store.load_profiles()
+            self.log_message(f"⚠️ 加载项目配置方案失败: {str(e)}")
+
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItem("自定义", "")
+        for name in self.profiles:
+            self.profile_combo.addItem(name, name)
+        index = self.profile_combo.findData(selected)
+        self.profile_combo.setCurrentIndex(max(0, index))
+        self.profile_combo.blockSignals(False)
+
+    def apply_profile(self, index=None):
+        """将选中配置方案的默认选项应用到界面"""
+        name = self.profile_combo.currentData() or ""
+        self.settings.setValue("build_profile", name)
+        profile = self.current_profile()
+        if profile:
+            for key, value in profile.get("checks", {}).items():
+                check = getattr(self, f"{key}_check", None)
+                if check is not None:
+                    check.setChecked(value)
+            self.log_message(f"🧩 已切换到构建配置方案: {name}")
+        self.update_command()
+
+    def save_current_profile(self):
+        """将当前选项状态保存为项目中的命名配置方案"""
+        if not self.main_file:
+            QMessageBox.warning(self, "缺少配置", "请先选择主文件，配置方案保存在项目中")
+            return
+
+        name, ok = QInputDialog.getText(self, "保存配置方案", "方案名称:",
+                                        text=self.profile_combo.currentData() or "")
+        name = name.strip()
+        if not ok or not name:
+            return
+
+        profile = {
+            "checks": {key: getattr(self, f"{key}_check").isChecked() for key in project_store.PROFILE_CHECKS},
+            "jobs": (self.current_profile() or {}).get("jobs"),
+        }
+        try:
+            project_store.save_profile(self.main_file, name, profile)
+        except OSError as e:
+            self.log_message(f"⚠️ 保存配置方案失败: {str(e)}")
+            return
+        if self.profile_combo.findData(name) < 0:
+            self.profile_combo.addItem(name, name)
+        self.profiles[name] = profile
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(name))
+        self.settings.setValue("build_profile", name)
+        self.log_message(f"💾 已保存构建配置方案: {name}")
+
+    def refresh_profile_stats(self):
+        """比较各配置方案记录的构建时间"""
+        if not self.main_file:
+            return
+        stats = project_store.profile_build_stats(project_store.load_history(self.main_file))
+        self.profile_stats_table.setRowCount(len(stats))
+
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        for row, item in enumerate(stats):
+            cells = [item["profile"] or "自定义", str(item["builds"]), str(item["successful"]),
+                     fmt(item["mean_s"]), fmt(item["median_s"]), fmt(item["last_s"])]
+            for column, text in enumerate(cells):
+                self.profile_stats_table.setItem(row, column, QTableWidgetItem(text))
+
+    def build_dir_store(self):
+        """返回界面中配置的构建目录存储"""
+        root = self.build_store_input.text().strip() or os.path.join(build_env.user_cache_dir(), "build-dirs")
+        return build_env.BuildDirStore(root, self.build_store_cap_spin.value() * 1024 ** 3)
+
+    def save_build_store_settings(self):
+        """持久化构建目录复用设置"""
+        self.settings.setValue("build_dir_reuse", self.build_dir_reuse_check.isChecked())
+        self.settings.setValue("build_dir_store", self.build_store_input.text().strip())
+        self.settings.setValue("build_dir_cap_gb", self.build_store_cap_spin.value())
+
+    def select_build_store_dir(self):
+        """选择构建目录存储位置"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "选择构建目录存储位置", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.build_store_input.setText(dir_path)
+            self.save_build_store_settings()
+            self.refresh_build_store()
+
+    def add_build_dir_reuse_steps(self, command, before_build, cleanup):
+        """构建前恢复已存储的构建目录，构建后重新存储"""
+        store = self.build_dir_store()
+        key = build_env.configuration_key(self.main_file, command)
+        main_file = self.main_file
+        output_dir = perf_tools.get_option(command, "--output-dir", self.output_dir)
+        label = self.profile_combo.currentData() or "custom"
+
+        def checkout(log):
+            # 冷启动不是中止构建的理由，checkout 的返回值只表示是否复用
+            store.checkout(key, main_file, output_dir, log)
+
+        before_build.append(checkout)
+        # 即使构建失败或停止也会存回，并且在清理临时空间之前执行
+        cleanup.insert(0, lambda log, success: store.checkin(key, main_file, output_dir, label, log))
+
+    def refresh_build_store(self):
+        """列出已存储的构建目录，最近使用的排在前面"""
+        store = self.build_dir_store()
+        entries = store.entries()
+        self.build_store_table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            cells = [
+                entry.get("project", ""),
+                entry.get("label", ""),
+                f"{entry.get('size', 0) / 1024 / 1024:.1f}",
+                datetime.fromtimestamp(entry.get("last_used", 0)).strftime("%Y-%m-%d %H:%M"),
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, entry["key"])
+                self.build_store_table.setItem(row, column, item)
+        total = sum(entry.get("size", 0) for entry in entries)
+        self.build_store_total_label.setText(
+            f"合计: {total / 1024 ** 3:.2f} GB / {self.build_store_cap_spin.value()} GB")
+
+    def delete_build_store_entries(self):
+        """删除选中的已存储构建目录"""
+        store = self.build_dir_store()
+        rows = sorted({index.row() for index in self.build_store_table.selectedIndexes()})
+        for row in rows:
+            key = self.build_store_table.item(row, 0).data(Qt.UserRole)
+            store.remove(key)
+            self.log_message(f"🗑 已删除存储的构建目录 {key}")
+        self.refresh_build_store()
+
+    def evict_build_store(self):
+        """淘汰超出容量上限的最久未使用构建目录"""
+        removed = self.build_dir_store().evict()
+        self.log_message(f"🗑 已淘汰 {len(removed)} 个存储的构建目录")
+        self.refresh_build_store()
+
+    def save_scratch_settings(self):
+        """持久化高速暂存设置"""
+        self.settings.setValue("scratch_staging", self.scratch_staging_check.isChecked())
+        self.settings.setValue("scratch_dir", self.scratch_dir_input.text().strip())
+
+    def select_scratch_dir(self):
+        """选择高速暂存目录"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "选择暂存目录", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.scratch_dir_input.setText(dir_path)
+            self.save_scratch_settings()
+
+    def add_scratch_staging_steps(self, command, before_build, after_build, cleanup):
+        """暂存目录空间足够时将构建重定向到该目录，返回实际执行的命令"""
+        scratch_root = self.scratch_dir_input.text().strip() or build_env.default_scratch_dir()
+        required = build_env.estimate_intermediate_bytes(project_store.load_history(self.main_file))
+        usable, free = build_env.check_scratch_space(scratch_root, required)
+        if not usable:
+            self.log_message(f"⚠️ 暂存目录 {scratch_root} 可用空间 {free / 1024 ** 2:.0f} MB，"
+                             f"需要 {required / 1024 ** 2:.0f} MB - 改为在磁盘上构建")
+            return command
+
+        output_dir = perf_tools.get_option(command, "--output-dir", self.output_dir)
+        staging = build_env.ScratchStaging(scratch_root, output_dir, self.main_file)
+        command = perf_tools.remove_options(command, ["--remove-output"])
+        command = perf_tools.set_option(command, "--output-dir", staging.stage_dir)
+
+        def collect(log, success):
+            staging.collect(log, success)
+            if staging.intermediate_bytes:
+                self.build_extra["intermediate_bytes"] = staging.intermediate_bytes
+
+        before_build.append(staging.prepare)
+        after_build.append(collect)
+        cleanup.append(staging.cleanup)
+        return command
+
+    def add_source_snapshot_steps(self, command, before_build, after_build):
+        """基于项目目录的冻结快照构建，返回要执行的命令"""
+        snapshot = build_env.SourceSnapshot(self.main_file, self.output_dir)
+        before_build.append(snapshot.prepare)
+        after_build.append(snapshot.verify)
+        return snapshot.rewrite(command)
+
+    def confirm_build_inputs(self, problems):
+        """报告构建输入中的问题，返回False时不启动构建"""
+        if not problems:
+            return True
+
+        lines = [f"{'❌' if p['level'] == 'error' else '⚠️'} {p['option']}: {p['message']}" for p in problems]
+        for line in lines:
+            self.log_message(line)
+
+        if any(p["level"] == "error" for p in problems):
+            msg_box = QMessageBox(QMessageBox.Critical, "构建输入无效",
+                                  "构建未启动:\n\n" + "\n".join(lines),
+                                  QMessageBox.Ok, self)
+            msg_box.setStyleSheet(self.get_messagebox_style())
+            msg_box.exec()
+            return False
+
+        msg_box = QMessageBox(QMessageBox.Question, "构建输入警告",
+                              "\n".join(lines) + "\n\n仍然开始构建?",
+                              QMessageBox.Yes | QMessageBox.No, self)
+        msg_box.setStyleSheet(self.get_messagebox_style())
+        return msg_box.exec() == QMessageBox.Yes
+
+    def start_project_index(self):
+        """在后台索引项目目录，用于数据文件预览"""
+        if not self.main_file or (self.index_thread and self.index_thread.isRunning()):
+            return
+        index = data_tools.ProjectIndex(os.path.dirname(os.path.abspath(self.main_file)))
+        self.project_index = None
+        self.data_preview_label.setText("正在索引项目文件...")
+
+        def task(log, progress, should_stop):
+            index.build(should_stop=should_stop)
+            return index
+
+        self.index_thread = ToolThread(task)
+        self.index_thread.log_signal.connect(self.log_message)
+        self.index_thread.result_signal.connect(self.project_index_ready)
+        self.index_thread.start()
+
+    def project_index_ready(self, index):
+        """开始监视已索引的目录并显示预览"""
+        if self.index_watcher.directories():
+            self.index_watcher.removePaths(self.index_watcher.directories())
+        self.project_index = index
+        self.index_watcher.addPaths([index.abs_dir(rel) for rel in index.dirs])
+        self.log_message(f"🗂 已索引 {len(index.dirs)} 个目录中的 {index.file_count()} 个项目文件")
+        self.update_data_preview()
+
+    def refresh_project_index(self, path):
+        """重新索引文件监视器报告有变化的目录"""
+        if self.project_index is None:
+            return
+        added = self.project_index.refresh_dir(path)
+        if added:
+            self.index_watcher.addPaths([self.project_index.abs_dir(rel) for rel in added])
+        self.data_preview_timer.start()
+
+    def update_data_preview(self):
+        """显示数据文件字段包含和排除的项目文件"""
+        if self.project_index is None:
+            return
+
+        def entries(field):
+            return [entry.strip() for entry in field.text().split(',') if entry.strip()]
+
+        data_dirs, data_files = entries(self.include_data_dir_input), entries(self.include_data_input)
+        if not data_dirs and not data_files:
+            self.data_preview_label.setText("")
+            return
+
+        result = data_tools.preview_data_files(
+            self.project_index, data_dirs, data_files, entries(self.noinclude_data_input), self.project_index.root)
+        text = (f"预览: 包含 {result['included_files']} 个文件 ({result['included_bytes'] / 1024 / 1024:.1f} MB)，"
+                f"排除 {result['excluded_files']} 个文件 ({result['excluded_bytes'] / 1024 / 1024:.1f} MB)")
+        if result["outside"]:
+            text += f" - 未预览(位于项目之外): {', '.join(result['outside'])}"
+        self.data_preview_label.setText(text)
+
+    def data_entries(self):
+        """包含字段中的数据目录、数据文件和排除项"""
+        def entries(field):
+            return [entry.strip() for entry in field.text().split(',') if entry.strip()]
+        return entries(self.include_data_dir_input), entries(self.include_data_input), entries(self.noinclude_data_input)
+
+    def scan_duplicate_data(self):
+        """对包含的数据文件计算哈希并报告内容相同的副本"""
+        if not self.main_file:
+            QMessageBox.warning(self, "缺少配置", "请选择主文件")
+            return
+        data_dirs, data_files, excludes = self.data_entries()
+        if not data_dirs and not data_files:
+            QMessageBox.warning(self, "缺少配置", "请先添加数据目录或数据文件")
+            return
+        base_dir = os.path.dirname(os.path.abspath(self.main_file))
+
+        def task(log, progress, should_stop):
+            files = data_tools.included_data_files(data_dirs, data_files, excludes, base_dir)
+            duplicates = data_tools.find_duplicate_files(
+                files, data_tools.default_hash_cache(), log=log, should_stop=should_stop)
+            return {
+                "files": len(files),
+                "bytes": sum(size for _, _, size in files),
+                "duplicates": duplicates,
+                "suggestions": data_tools.duplicate_suggestions(duplicates, data_dirs, base_dir),
+            }
+
+        if self.start_tool_task(task, self.show_duplicate_data, self.duplicates_scan_btn):
+            self.log_message("▶ 正在扫描包含的数据文件中的重复项...")
+
+    def show_duplicate_data(self, result):
+        """显示重复文件集合和建议的排除项"""
+        duplicates = result["duplicates"]
+        wasted = sum(d["wasted"] for d in duplicates)
+        self.duplicates_summary_label.setText(
+            f"{result['files']} 个文件 ({result['bytes'] / 1024 / 1024:.1f} MB)，"
+            f"{len(duplicates)} 组重复，浪费 {wasted / 1024 / 1024:.1f} MB")
+
+        self.duplicates_table.setRowCount(len(duplicates))
+        for row, duplicate in enumerate(duplicates):
+            cells = [
+                f"{duplicate['wasted'] / 1024 / 1024:.2f}",
+                f"{duplicate['size'] / 1024 / 1024:.2f}",
+                str(len(duplicate["files"])),
+                ", ".join(target for _, target in duplicate["files"]),
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setToolTip("\n".join(source for source, _ in duplicate["files"]))
+                self.duplicates_table.setItem(row, column, item)
+
+        self.duplicates_suggestions_list.clear()
+        for suggestion in result["suggestions"]:
+            item = QListWidgetItem(suggestion["text"])
+            item.setData(Qt.UserRole, suggestion["exclude"])
+            self.duplicates_suggestions_list.addItem(item)
+        self.log_message(f"✅ 重复扫描完成: {len(duplicates)} 组，浪费 {wasted / 1024 / 1024:.1f} MB")
+
+    def apply_duplicate_exclusions(self):
+        """将所选建议的排除项追加到排除字段"""
+        _, _, excludes = self.data_entries()
+        for item in self.duplicates_suggestions_list.selectedItems():
+            for pattern in item.data(Qt.UserRole):
+                if pattern not in excludes:
+                    excludes.append(pattern)
+        self.noinclude_data_input.setText(",".join(excludes))
+
+    def analyze_onefile_payload(self):
+        """基于最近一次构建的 .dist 目录测试单文件载荷的压缩级别"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择主文件和输出目录")
+            return
+        dist_dir = perf_tools.find_dist_dir(self.output_dir, self.main_file)
+        if not dist_dir:
+            QMessageBox.warning(self, "缺少构建",
+                                "输出目录中未找到 .dist 目录。\n"
+                                "请先以独立或单文件模式构建，且不要勾选删除输出。")
+            return
+        try:
+            levels = [int(level) for level in self.payload_levels_input.text().split(',') if level.strip()]
+        except ValueError:
+            QMessageBox.warning(self, "级别无效", "请输入以逗号分隔的zstd级别(1-22)")
+            return
+        levels = [level for level in levels if 1 <= level <= 22]
+        read_mb_s = self.payload_read_spin.value()
+
+        def task(log, progress, should_stop):
+            return data_tools.benchmark_onefile_payload(dist_dir, levels, read_mb_s, log=log,
+                                                        progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_payload_analysis, self.payload_analyze_btn):
+            self.log_message(f"▶ 正在分析单文件载荷: {dist_dir}")
+
+    def show_payload_analysis(self, result):
+        """显示载荷文件和各压缩设置"""
+        files = result["files"][:500]
+        self.payload_files_table.setRowCount(len(files))
+        for row, entry in enumerate(files):
+            compressed = entry["compressed"]
+            cells = [
+                entry["path"],
+                f"{entry['size'] / 1024 / 1024:.2f}",
+                "-" if compressed is None else f"{compressed / 1024 / 1024:.2f}",
+                "-" if not compressed or not entry["size"] else f"{entry['size'] / compressed:.1f}x",
+            ]
+            for column, text in enumerate(cells):
+                self.payload_files_table.setItem(row, column, QTableWidgetItem(text))
+
+        settings = result["settings"]
+        self.payload_settings_table.setRowCount(len(settings))
+        for row, setting in enumerate(settings):
+            cells = [
+                setting["setting"],
+                f"{setting['payload_bytes'] / 1024 / 1024:.1f}",
+                f"{setting['compress_s']:.1f}",
+                f"{setting['decompress_ms']:.0f}",
+                f"{setting['extract_ms']:.0f}",
+            ]
+            for column, text in enumerate(cells):
+                self.payload_settings_table.setItem(row, column, QTableWidgetItem(text))
+
+        fastest, smallest = result["fastest"], result["smallest"]
+        self.payload_recommendation = fastest
+        self.payload_result_label.setText(
+            f"启动最快: {fastest['setting']} (读取并解包约 {fastest['extract_ms']:.0f} ms)，"
+            f"下载最小: {smallest['setting']} ({smallest['payload_bytes'] / 1024 / 1024:.1f} MB)。"
+            f"Nuitka使用内置级别的zstd压缩，只能选择是否压缩。")
+        self.payload_apply_btn.setEnabled(True)
+        self.log_message(f"✅ 载荷分析完成，启动最快: {fastest['setting']}")
+
+    def apply_payload_recommendation(self):
+        """根据测得的最快设置切换单文件压缩"""
+        uncompressed = self.payload_recommendation["level"] is None
+        self.onefile_no_compression_check.setChecked(uncompressed)
+        self.log_message(f"已{'禁用' if uncompressed else '启用'}单文件压缩以获得最快启动")
+
+    def analyze_qt_plugins(self):
+        """跟踪程序加载了哪些Qt插件和翻译文件"""
+        if not self.python_path or not self.main_file:
+            QMessageBox.warning(self, "缺少配置", "请选择Python解释器和主文件")
+            return
+        if self.python_path.endswith("nuitka.cmd"):
+            QMessageBox.warning(self, "不支持的解释器", "请选择可运行程序的Python解释器")
+            return
+        python, main_file = self.python_path, self.main_file
+        args = self.qt_trace_args_input.text().split()
+        duration = self.qt_trace_spin.value()
+
+        def task(log, progress, should_stop):
+            return binary_tools.analyze_qt_plugins(python, main_file, args, duration, log=log)
+
+        if self.start_tool_task(task, self.show_qt_plugin_analysis, self.qt_analyze_btn):
+            self.log_message(f"▶ 正在运行 {os.path.basename(main_file)} 以跟踪Qt插件加载...")
+
+    def show_qt_plugin_analysis(self, result):
+        """显示各插件类别的使用情况"""
+        self.qt_analysis = result
+        if not result:
+            self.qt_apply_btn.setEnabled(False)
+            self.log_message("❌ 所选解释器中未找到Qt绑定")
+            return
+        categories = result["categories"]
+        self.qt_plugins_table.setRowCount(len(categories))
+        for row, category in enumerate(categories):
+            cells = [
+                category["category"],
+                str(category["files"]),
+                f"{category['size'] / 1024 / 1024:.1f}",
+                ", ".join(category["loaded"]),
+                category["reason"] or "否",
+            ]
+            for column, text in enumerate(cells):
+                self.qt_plugins_table.setItem(row, column, QTableWidgetItem(text))
+
+        translations = "已使用" if result["translations_used"] else \
+            f"未使用 ({result['translations_bytes'] / 1024 / 1024:.1f} MB)"
+        self.qt_analysis_label.setText(f"{' '.join(result['options'])}\n"
+                                       f"翻译文件{translations}，"
+                                       f"比默认插件集约小 {result['saved_bytes'] / 1024 / 1024:.1f} MB")
+        self.qt_apply_btn.setEnabled(True)
+        self.log_message(f"✅ Qt插件分析完成: {' '.join(result['options'])}")
+
+    def apply_qt_plugin_analysis(self):
+        """使用分析得出的最小Qt插件集"""
+        result = self.qt_analysis
+        self.include_qt_check.setChecked(True)
+        self.qt_plugins_input.setText(",".join(result["include"]))
+        self.qt_noinclude_plugins_input.setText(",".join(result["noinclude"]))
+        self.noinclude_qt_translations_check.setChecked(not result["translations_used"])
+        self.log_message("已应用最小Qt插件集")
+
+    def scan_dist_libraries(self):
+        """构建最近一次构建的共享库依赖图"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择主文件和输出目录")
+            return
+        dist_dir = perf_tools.find_dist_dir(self.output_dir, self.main_file)
+        if not dist_dir:
+            QMessageBox.warning(self, "缺少构建",
+                                "输出目录中未找到 .dist 目录。\n"
+                                "请先以独立或单文件模式构建，并且不要勾选清理输出。")
+            return
+
+        def task(log, progress, should_stop):
+            return binary_tools.dll_exclusion_advice(dist_dir, log=log, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_dist_libraries, self.dlls_scan_btn):
+            self.log_message(f"▶ 正在扫描 {dist_dir} 中的共享库")
+
+    def show_dist_libraries(self, result):
+        """显示依赖图和排除建议"""
+        libraries = result["libraries"]
+        self.dlls_table.setRowCount(len(libraries))
+        for row, library in enumerate(libraries):
+            status = "入口" if library["root"] else "已使用" if library["used"] else "未使用"
+            cells = [
+                library["path"],
+                f"{library['size'] / 1024 / 1024:.2f}",
+                status,
+                ", ".join(library["needs"]),
+                ", ".join(library["needed_by"]),
+            ]
+            for column, text in enumerate(cells):
+                self.dlls_table.setItem(row, column, QTableWidgetItem(text))
+
+        self.dlls_suggestions_list.clear()
+        for suggestion in result["suggestions"]:
+            item = QListWidgetItem(f"{suggestion['pattern']} ({suggestion['bytes'] / 1024 / 1024:.2f} MB): "
+                                   f"{suggestion['reason']}")
+            item.setData(Qt.UserRole, suggestion["pattern"])
+            self.dlls_suggestions_list.addItem(item)
+
+        self.dlls_summary_label.setText(
+            f"{len(libraries)} 个二进制文件，{len(result['duplicates'])} 组版本重复，"
+            f"{len(result['unresolved'])} 个依赖由系统提供；"
+            f"建议最多可节省 {result['saved_bytes'] / 1024 / 1024:.1f} MB")
+        self.log_message(f"✅ 库扫描完成，{len(result['suggestions'])} 条排除建议")
+
+    def apply_dll_exclusions(self):
+        """将所选库追加到DLL排除字段"""
+        patterns = [p.strip() for p in self.noinclude_dlls_input.text().split(",") if p.strip()]
+        for item in self.dlls_suggestions_list.selectedItems():
+            if item.data(Qt.UserRole) not in patterns:
+                patterns.append(item.data(Qt.UserRole))
+        self.noinclude_dlls_input.setText(",".join(patterns))
+
+    def save_symbol_settings(self):
+        """持久化调试符号设置"""
+        self.settings.setValue("split_symbols", self.split_symbols_check.isChecked())
+        self.settings.setValue("symbol_store", self.symbol_store_input.text().strip())
+
+    def select_symbol_store(self):
+        """选择符号库目录"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "选择符号库", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.symbol_store_input.setText(dir_path)
+            self.save_symbol_settings()
+
+    def add_symbol_split_steps(self, command, after_build):
+        """构建完成后将二进制文件的调试信息移入符号库"""
+        main_file, output_dir = self.main_file, self.output_dir
+        store = self.symbol_store_input.text().strip() or os.path.join(project_store.state_dir(main_file), "symbols")
+        if "--onefile" in command:
+            self.log_message("⚠️ 单文件可执行程序在拆分符号之前打包，将保持未剥离状态")
+
+        def split(log, success):
+            dist_dir = perf_tools.find_dist_dir(output_dir, main_file) if success else None
+            if not dist_dir:
+                return
+            result = binary_tools.split_debug_symbols(dist_dir, store, log=log, should_stop=self.build_stopped)
+            if result is None:
+                return False
+            self.build_extra["debug_symbols"] = {
+                "store": store,
+                "before_bytes": result["before"],
+                "after_bytes": result["after"],
+                "build_ids": {b["path"]: b["build_id"] for b in result["binaries"] if b["status"] == "split"},
+            }
+
+        after_build.append(split)
+
+    def add_manifest_steps(self, command, after_build):
+        """Nuitka 完成后为构建输出生成哈希清单"""
+        main_file, output_dir = self.main_file, self.output_dir
+        onefile = "--onefile" in command
+
+        def manifest(log, success):
+            artifact = artifact_tools.artifact_path(output_dir, main_file, onefile) if success else None
+            if not artifact:
+                return
+            result = artifact_tools.build_manifest(artifact, artifact_tools.default_manifest_cache(), log=log,
+                                                   should_stop=self.build_stopped)
+            if self.build_stopped():
+                return False
+            path = artifact_tools.save_manifest(main_file, result, time.strftime("%Y%m%d-%H%M%S"))
+            artifact_tools.write_checksum_file(result, artifact + ".sha256")
+            self.build_extra["manifest"] = {
+                "path": path,
+                "artifact": artifact,
+                "files": len(result["files"]),
+                "bytes": result["total_bytes"],
+            }
+
+        after_build.append(manifest)
+
+    def manifest_builds(self):
+        """带有清单的已记录构建，最新的在前"""
+        if not self.main_file:
+            return []
+        return [entry for entry in reversed(project_store.load_history(self.main_file)) if entry.get("manifest")]
+
+    def refresh_manifest_builds(self):
+        """列出可供比较的带清单构建"""
+        self.manifest_compare_combo.clear()
+        for entry in self.manifest_builds()[1:]:
+            manifest = entry["manifest"]
+            self.manifest_compare_combo.addItem(
+                f"{entry['id']} ({manifest['files']} 个文件, {manifest['bytes'] / 1024 / 1024:.1f} MB)", entry["id"])
+        self.delta_from_combo.clear()
+        for entry in self.manifest_builds()[1:]:
+            if entry.get("release") and os.path.exists(entry["release"]):
+                self.delta_from_combo.addItem(entry["id"], entry["id"])
+
+    def verify_latest_manifest(self):
+        """重新计算最近一次构建输出的哈希并与清单核对"""
+        builds = self.manifest_builds()
+        if not builds:
+            QMessageBox.warning(self, "没有清单", "本项目没有记录带清单的构建")
+            return
+        info = builds[0]["manifest"]
+        manifest = artifact_tools.load_manifest(info["path"])
+        if not manifest or not os.path.exists(info["artifact"]):
+            QMessageBox.warning(self, "没有清单", "清单或构建输出已不存在")
+            return
+
+        def task(log, progress, should_stop):
+            return artifact_tools.verify_manifest(info["artifact"], manifest, log=log, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_manifest_verification, self.manifest_verify_btn):
+            self.log_message(f"▶ 正在按构建 {builds[0]['id']} 的清单校验 {info['artifact']}")
+
+    def show_manifest_verification(self, result):
+        """显示与清单不符的文件"""
+        rows = [(kind, path) for kind in ("missing", "changed", "extra") for path in result[kind]]
+        self.manifest_table.setRowCount(len(rows))
+        for row, (kind, path) in enumerate(rows):
+            for column, text in enumerate([kind, path, "", ""]):
+                self.manifest_table.setItem(row, column, QTableWidgetItem(text))
+        self.manifest_summary_label.setText("✅ 构建输出与清单一致" if result["ok"] else
+                                            f"❌ {len(rows)} 个文件与清单不符")
+
+    def compare_build_manifests(self):
+        """显示所选构建与最近一次构建之间的变化"""
+        builds = {entry["id"]: entry for entry in self.manifest_builds()}
+        old_id = self.manifest_compare_combo.currentData()
+        if not old_id or old_id not in builds:
+            return
+        new_entry = self.manifest_builds()[0]
+        old = artifact_tools.load_manifest(builds[old_id]["manifest"]["path"])
+        new = artifact_tools.load_manifest(new_entry["manifest"]["path"])
+        if not old or not new:
+            QMessageBox.warning(self, "没有清单", "其中一个构建的清单文件已丢失")
+            return
+
+        result = artifact_tools.compare_manifests(old, new)
+        changes = result["changes"]
+        self.manifest_table.setRowCount(len(changes))
+        for row, change in enumerate(changes):
+            cells = [
+                change["change"],
+                change["path"],
+                "" if change["old_size"] is None else f"{change['old_size'] / 1024:.1f}",
+                "" if change["new_size"] is None else f"{change['new_size'] / 1024:.1f}",
+            ]
+            for column, text in enumerate(cells):
+                self.manifest_table.setItem(row, column, QTableWidgetItem(text))
+        self.manifest_summary_label.setText(
+            f"{old_id} -> {new_entry['id']}: {len(changes)} 个文件不同，{result['unchanged']} 个未变，"
+            f"大小变化 {result['delta_bytes'] / 1024 / 1024:+.2f} MB")
+
+    def save_export_settings(self):
+        """持久化归档导出设置"""
+        self.settings.setValue("export_format", self.export_format_combo.currentData())
+        self.settings.setValue("export_level", self.export_level_spin.value())
+        self.settings.setValue("export_dir", self.export_dir_input.text().strip())
+        self.settings.setValue("export_incremental", self.export_incremental_check.isChecked())
+        self.settings.setValue("export_after_build", self.export_after_build_check.isChecked())
+
+    def select_export_dir(self):
+        """选择归档目标目录"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "选择归档目标目录", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.export_dir_input.setText(dir_path)
+            self.save_export_settings()
+
+    def export_build_archive(self):
+        """在后台将构建输出流式写入归档"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择主文件和输出目录")
+            return
+        artifact = artifact_tools.artifact_path(self.output_dir, self.main_file, self.onefile_check.isChecked())
+        if not artifact:
+            QMessageBox.warning(self, "缺少构建", "输出目录中未找到构建输出")
+            return
+        dest_dir = self.export_dir_input.text().strip() or self.output_dir
+        fmt = self.export_format_combo.currentData()
+        level = self.export_level_spin.value()
+        incremental = self.export_incremental_check.isChecked()
+
+        def task(log, progress, should_stop):
+            return artifact_tools.export_archive(artifact, dest_dir, fmt, level, incremental, log=log,
+                                                 progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_export_result, self.export_btn):
+            self.log_message(f"▶ 正在将 {artifact} 导出为 {fmt}")
+
+    def show_export_result(self, result):
+        """报告已写入的归档"""
+        if not result:
+            return
+        reused = f"，复用 {result['reused']}/{result['files']} 个文件" if result["reused"] else ""
+        self.export_result_label.setText(
+            f"{result['path']}: {result['bytes'] / 1024 / 1024:.1f} MB "
+            f"(为输出的 {result['bytes'] / max(1, result['source_bytes']):.0%})，用时 {result['seconds']:.1f}s{reused}")
+
+    def save_delta_settings(self):
+        """保存增量更新设置"""
+        self.settings.setValue("retain_releases", self.retain_releases_check.isChecked())
+        self.settings.setValue("retain_count", self.retain_count_spin.value())
+
+    def add_release_steps(self, after_build):
+        """保留构建输出的副本，以便后续构建以增量包形式发布"""
+        main_file, keep = self.main_file, self.retain_count_spin.value()
+
+        def retain(log, success):
+            manifest = self.build_extra.get("manifest")
+            if not success or not manifest:
+                return
+            name = os.path.splitext(os.path.basename(manifest["path"]))[0]
+            try:
+                self.build_extra["release"] = artifact_tools.retain_release(
+                    manifest["artifact"], main_file, name, keep, log=log)
+            except OSError as e:
+                log(f"⚠️ 保留构建产物副本失败: {str(e)}")
+
+        after_build.append(retain)
+
+    def create_delta_package(self):
+        """生成从所选构建到最新构建的增量包"""
+        builds = {entry["id"]: entry for entry in self.manifest_builds()}
+        old_id = self.delta_from_combo.currentData()
+        if not old_id or old_id not in builds:
+            QMessageBox.warning(self, "没有可用构建", "此项目没有保留更早的构建产物")
+            return
+        old_entry, new_entry = builds[old_id], self.manifest_builds()[0]
+        old = artifact_tools.load_manifest(old_entry["manifest"]["path"])
+        new = artifact_tools.load_manifest(new_entry["manifest"]["path"])
+        if not old or not new:
+            QMessageBox.warning(self, "没有清单", "其中一个构建的清单文件已丢失")
+            return
+        new_artifact = new_entry.get("release") or new_entry["manifest"]["artifact"]
+        if not os.path.exists(new_artifact):
+            QMessageBox.warning(self, "缺少构建", "最新构建的产物已不存在")
+            return
+        stem = os.path.splitext(os.path.basename(self.main_file))[0]
+        dest_dir = self.export_dir_input.text().strip() or self.output_dir or os.path.dirname(new_artifact)
+        dest = os.path.join(dest_dir, f"{stem}-{old_id}-to-{new_entry['id']}{artifact_tools.DELTA_SUFFIX}")
+
+        def task(log, progress, should_stop):
+            os.makedirs(dest_dir, exist_ok=True)
+            return artifact_tools.make_delta(old_entry["release"], old, new_artifact, new, dest, log=log,
+                                             progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_delta_result, self.delta_create_btn):
+            self.log_message(f"▶ 正在生成增量包 {old_id} -> {new_entry['id']}")
+
+    def show_delta_result(self, result):
+        """报告已生成的增量包"""
+        if not result:
+            return
+        self.delta_result_label.setText(
+            f"{result['path']}: {result['bytes'] / 1024 / 1024:.2f} MB "
+            f"(占完整产物的 {result['bytes'] / max(1, result['full_bytes']):.1%})，"
+            f"新增 {result['added']}，修补 {result['patched']}，删除 {result['removed']}")
+
+    def apply_delta_package(self):
+        """校验已安装的构建并用增量包更新"""
+        package, _ = QFileDialog.getOpenFileName(
+            self, "选择增量包", self.export_dir_input.text().strip() or self.output_dir,
+            f"增量包 (*{artifact_tools.DELTA_SUFFIX});;所有文件 (*)"
+        )
+        if not package:
+            return
+        target = QFileDialog.getExistingDirectory(
+            self, "选择已安装的 .dist 文件夹（或单文件可执行程序所在文件夹）", "", QFileDialog.ShowDirsOnly
+        )
+        if not target:
+            return
+
+        def task(log, progress, should_stop):
+            return artifact_tools.apply_delta(package, target, log=log, progress=progress, should_stop=should_stop)
+
+        def done(result):
+            if not result:
+                return
+            if result["ok"]:
+                self.delta_result_label.setText(f"✅ 已更新 {target}: {result['written']} 个文件写入, "
+                                                f"{result['removed']} 个删除")
+            else:
+                self.delta_result_label.setText(f"❌ 未应用，以下文件与源构建不一致: "
+                                                + ", ".join(result["mismatched"][:5]))
+
+        if self.start_tool_task(task, done, self.delta_apply_btn):
+            self.log_message(f"▶ 正在应用 {package} 到 {target}")
+
+    def artifact_store_dir(self):
+        """返回界面中配置的制品库目录"""
+        return self.artifact_store_input.text().strip() or artifact_tools.default_artifact_store()
+
+    def save_artifact_store_settings(self):
+        """保存制品库设置"""
+        self.settings.setValue("artifact_store", self.artifact_store_check.isChecked())
+        self.settings.setValue("artifact_store_dir", self.artifact_store_input.text().strip())
+
+    def select_artifact_store(self):
+        """选择制品库目录"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "选择产物存储目录", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.artifact_store_input.setText(dir_path)
+            self.save_artifact_store_settings()
+
+    def add_artifact_store_steps(self, command, before_build, after_build):
+        """将构建输出和保留的副本去重存入制品库"""
+        main_file, output_dir = self.main_file, self.output_dir
+        onefile = "--onefile" in command
+        store = self.artifact_store_dir()
+
+        def detach(log):
+            artifact = artifact_tools.artifact_path(output_dir, main_file, onefile)
+            count = artifact_tools.detach_artifact(artifact) if artifact else 0
+            if count:
+                log(f"🔗 已断开 {count} 个上次输出中的存储文件链接")
+
+        def ingest(log, success):
+            info = self.build_extra.get("manifest")
+            manifest = artifact_tools.load_manifest(info["path"]) if success and info else None
+            if not manifest:
+                return
+            try:
+                totals = artifact_tools.ingest_artifact(info["artifact"], manifest, store, log=log,
+                                                        should_stop=self.build_stopped)
+                release = self.build_extra.get("release")
+                if release and os.path.exists(release):
+                    artifact_tools.ingest_artifact(release, manifest, store, log=lambda message: None)
+                artifact_tools.collect_garbage(store, log=log)
+            except OSError as e:
+                log(f"⚠️ 产物存储失败: {str(e)}")
+                return
+            if totals:
+                self.build_extra["artifact_store"] = {"added": totals["added"], "added_bytes": totals["added_bytes"]}
+
+        before_build.append(detach)
+        after_build.append(ingest)
+
+    def collect_artifact_garbage(self):
+        """删除不再被任何保留构建引用的存储文件"""
+        store = self.artifact_store_dir()
+
+        def task(log, progress, should_stop):
+            return artifact_tools.collect_garbage(store, log=log)
+
+        def done(result):
+            self.artifact_store_usage_label.setText(
+                f"{result['refs']} 个产物共 {result['logical_bytes'] / 1024 / 1024:.1f} MB，实际存储 "
+                f"{result['objects']} 个文件 {result['stored_bytes'] / 1024 / 1024:.1f} MB"
+                f"（释放 {result['freed_bytes'] / 1024 / 1024:.1f} MB）")
+
+        self.start_tool_task(task, done, self.artifact_store_gc_btn)
+
+    def save_deploy_settings(self):
+        """保存部署同步设置"""
+        self.settings.setValue("deploy_sync", self.deploy_sync_check.isChecked())
+        self.settings.setValue("deploy_dir", self.deploy_dir_input.text().strip())
+
+    def select_deploy_dir(self):
+        """选择部署目录"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "选择部署目录", "", QFileDialog.ShowDirsOnly
+        )
+        if dir_path:
+            self.deploy_dir_input.setText(dir_path)
+            self.save_deploy_settings()
+
+    def add_deploy_steps(self, command, after_build):
+        """Nuitka 完成后将构建输出同步到部署目录"""
+        main_file, output_dir = self.main_file, self.output_dir
+        onefile = "--onefile" in command
+        deploy_dir = self.deploy_dir_input.text().strip()
+
+        def deploy(log, success):
+            artifact = artifact_tools.artifact_path(output_dir, main_file, onefile) if success else None
+            if not artifact:
+                return
+            info = self.build_extra.get("manifest")
+            manifest = artifact_tools.load_manifest(info["path"]) if info else None
+            try:
+                result = artifact_tools.sync_artifact(artifact, deploy_dir, manifest, log=log,
+                                                      should_stop=self.build_stopped)
+            except OSError as e:
+                log(f"⚠️ 部署同步失败: {str(e)}")
+                return
+            if result is None:
+                return False
+            self.build_extra["deploy"] = {key: result[key] for key in ("path", "copied", "removed", "bytes")}
+
+        after_build.append(deploy)
+
+    def sync_deployment(self):
+        """在后台将当前构建输出同步到部署目录"""
+        deploy_dir = self.deploy_dir_input.text().strip()
+        if not self.main_file or not self.output_dir or not deploy_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择主文件、输出目录和部署目录")
+            return
+        artifact = artifact_tools.artifact_path(self.output_dir, self.main_file, self.onefile_check.isChecked())
+        if not artifact:
+            QMessageBox.warning(self, "缺少构建", "输出目录中未找到构建输出")
+            return
+
+        def task(log, progress, should_stop):
+            return artifact_tools.sync_artifact(artifact, deploy_dir, log=log, should_stop=should_stop)
+
+        def done(result):
+            if result:
+                self.deploy_result_label.setText(
+                    f"{result['path']}: 复制 {result['copied']} 个 ({result['bytes'] / 1024 / 1024:.1f} MB)，"
+                    f"删除 {result['removed']} 个，未变 {result['unchanged']} 个 ({result['seconds']:.1f}s)")
+
+        if self.start_tool_task(task, done, self.deploy_sync_btn):
+            self.log_message(f"▶ 正在同步 {artifact} 到 {deploy_dir}")
+
+    def refresh_smoke_tests(self):
+        """将项目的冒烟测试加载到表格"""
+        self.smoke_table.blockSignals(True)
+        self.smoke_table.setRowCount(0)
+        for test in project_store.load_smoke_tests(self.main_file) if self.main_file else []:
+            self.add_smoke_test_row(test)
+        self.smoke_table.blockSignals(False)
+
+    def add_smoke_test_row(self, test):
+        """将冒烟测试追加到表格"""
+        test = dict(perf_tools.SMOKE_TEST_DEFAULTS, **test)
+        self.smoke_table.blockSignals(True)
+        row = self.smoke_table.rowCount()
+        self.smoke_table.insertRow(row)
+        for column, key in enumerate(("name", "args", "timeout", "exit_code", "pattern")):
+            self.smoke_table.setItem(row, column, QTableWidgetItem(str(test[key])))
+        result = QTableWidgetItem("")
+        result.setFlags(result.flags() & ~Qt.ItemIsEditable)
+        self.smoke_table.setItem(row, 5, result)
+        self.smoke_table.blockSignals(False)
+
+    def add_smoke_test(self):
+        """以默认设置添加冒烟测试"""
+        self.add_smoke_test_row(perf_tools.SMOKE_TEST_DEFAULTS)
+        self.save_smoke_tests()
+
+    def remove_smoke_test_row(self):
+        """删除所选冒烟测试"""
+        row = self.smoke_table.currentRow()
+        if row >= 0:
+            self.smoke_table.removeRow(row)
+            self.save_smoke_tests()
+
+    def smoke_tests(self):
+        """表格中填写的冒烟测试，跳过无效数字"""
+        tests = []
+        for row in range(self.smoke_table.rowCount()):
+            cells = [self.smoke_table.item(row, column).text().strip() if self.smoke_table.item(row, column) else ""
+                     for column in range(5)]
+            try:
+                tests.append({"name": cells[0] or f"test{row + 1}", "args": cells[1], "timeout": float(cells[2] or 30),
+                              "exit_code": int(cells[3] or 0), "pattern": cells[4]})
+            except ValueError:
+                continue
+        return tests
+
+    def save_smoke_tests(self, item=None):
+        """随项目保存冒烟测试"""
+        if not self.main_file or (item is not None and item.column() >= 5):
+            return
+        tests = self.smoke_tests()
+        errors = [f"{test['name']}: {error}" for test in tests for error in [perf_tools.smoke_test_error(test)] if error]
+        if errors:
+            QMessageBox.warning(self, "无效的冒烟测试", "\n".join(errors))
+            return
+        project_store.save_smoke_tests(self.main_file, tests)
+
+    def smoke_test_binary(self, onefile):
+        """冒烟测试所运行的可执行文件"""
+        artifact = artifact_tools.artifact_path(self.output_dir, self.main_file, onefile)
+        if artifact and os.path.isdir(artifact):
+            return perf_tools.find_built_binary(artifact, self.main_file)
+        return artifact
+
+    def add_smoke_test_steps(self, command, after_build):
+        """Nuitka 完成后运行冒烟测试，任一失败则构建失败"""
+        tests, onefile = self.smoke_tests(), "--onefile" in command
+
+        def smoke(log, success):
+            if not success:
+                return None
+            binary = self.smoke_test_binary(onefile)
+            if not binary:
+                log("❌ 冒烟测试: 未找到生成的可执行文件")
+                return False
+            try:
+                passed, results = perf_tools.run_smoke_tests(binary, tests, log=log, should_stop=self.build_stopped)
+            except Exception as e:
+                # 未运行的冒烟测试不能算作通过
+                log(f"❌ 冒烟测试无法运行: {str(e)}")
+                return False
+            self.build_extra["smoke_tests"] = [{key: result[key] for key in ("name", "status", "exit_code", "seconds")}
+                                               for result in results]
+            return passed
+
+        after_build.append(smoke)
+
+    def run_smoke_tests(self):
+        """在后台对当前输出运行冒烟测试"""
+        tests = self.smoke_tests()
+        binary = self.smoke_test_binary(self.onefile_check.isChecked()) if self.main_file and self.output_dir else None
+        if not tests or not binary:
+            QMessageBox.warning(self, "缺少配置", "请先添加冒烟测试并构建项目")
+            return
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_smoke_tests(binary, tests, log=log, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_smoke_results, self.smoke_run_btn):
+            self.log_message(f"▶ 正在运行 {len(tests)} 个冒烟测试: {binary}")
+
+    def show_smoke_results(self, outcome):
+        """在每个测试旁显示其结果"""
+        _, results = outcome
+        by_name = {result["name"]: result for result in results}
+        for row in range(self.smoke_table.rowCount()):
+            name = self.smoke_table.item(row, 0).text().strip() if self.smoke_table.item(row, 0) else ""
+            result = by_name.get(name)
+            if result and self.smoke_table.item(row, 5):
+                text = result["status"] + (f": {result['reason']}" if result["reason"] else f" ({result['seconds']:.1f}s)")
+                self.smoke_table.item(row, 5).setText(text)
+
+    def profile_imports(self):
+        """跟踪已构建程序或入口文件的导入耗时"""
+        if not self.python_path or not self.main_file:
+            QMessageBox.warning(self, "缺少配置", "请选择 Python 解释器和主文件")
+            return
+        binary = None
+        if self.import_mode_combo.currentData() == "binary":
+            binary = perf_tools.find_built_binary(self.output_dir, self.main_file) if self.output_dir else None
+            if not binary:
+                QMessageBox.warning(self, "缺少构建", "未找到已构建的可执行文件，请先构建或在解释器中分析")
+                return
+        python, main_file = self.python_path, self.main_file
+        command = self.build_command() or []
+        args = shlex.split(self.import_args_input.text(), posix=not sys.platform.startswith("win"))
+        duration = self.import_duration_spin.value()
+
+        def task(log, progress, should_stop):
+            return perf_tools.profile_imports(python, main_file, command, binary, args, duration, log=log,
+                                              should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_import_profile, self.import_profile_btn):
+            self.log_message(f"▶ 正在分析导入耗时: {binary or main_file}")
+
+    def show_import_profile(self, result):
+        """显示每个包的导入耗时和最慢的导入链"""
+        packages = result["packages"]
+        self.import_table.setRowCount(len(packages))
+        for row, stats in enumerate(packages):
+            cells = [stats["package"], f"{stats['cumulative_ms']:.1f}", f"{stats['self_ms']:.1f}",
+                     str(stats["modules"]), stats["status"]]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, stats["package"])
+                self.import_table.setItem(row, column, item)
+        chains = ["  →  ".join(f"{name} ({ms:.0f} ms)" for name, ms in chain) for chain in result["chains"][:5]]
+        self.import_chains_label.setText(
+            f"导入耗时 {result['total_ms']:.0f} ms ({result['mode']}). "
+            f"最慢的导入链:\n" + "\n".join(chains))
+        self.import_exclude_btn.setEnabled(bool(packages))
+
+    def exclude_selected_imports(self):
+        """将所选包加入 --nofollow-import-to"""
+        current = [mod.strip() for mod in self.nofollow_import_input.text().split(",") if mod.strip()]
+        for index in self.import_table.selectionModel().selectedRows():
+            package = self.import_table.item(index.row(), 0).data(Qt.UserRole)
+            if package not in current:
+                current.append(package)
+        self.nofollow_import_input.setText(",".join(current))
+        self.log_message(f"不再跟随导入: {', '.join(current)}")
+
+    def prebuilt_cache(self):
+        return build_env.PrebuiltModuleCache(os.path.join(build_env.user_cache_dir(), "prebuilt-modules"))
+
+    def prebuilt_packages(self):
+        return [pkg.strip() for pkg in self.prebuilt_packages_input.text().split(",") if pkg.strip()]
+
+    def save_prebuilt_settings(self):
+        """保存预编译模块设置"""
+        self.settings.setValue("prebuilt_modules", self.prebuilt_check.isChecked())
+        self.settings.setValue("prebuilt_packages", self.prebuilt_packages_input.text().strip())
+
+    def refresh_prebuilt_modules(self):
+        """列出预编译缓存中的模块"""
+        entries = self.prebuilt_cache().entries()
+        self.prebuilt_table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            cells = [
+                entry["package"],
+                entry.get("version") or "",
+                entry.get("python") or "",
+                entry.get("nuitka") or "",
+                " ".join(entry.get("options") or []),
+                f"{entry['size'] / 1024 / 1024:.1f}",
+                f"{entry.get('build_s', 0):.0f}",
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.UserRole, entry["key"])
+                self.prebuilt_table.setItem(row, column, item)
+
+    def build_prebuilt_modules(self):
+        """编译当前配置下尚无模块的所列包"""
+        packages = self.prebuilt_packages()
+        if not self.python_path or not packages:
+            QMessageBox.warning(self, "缺少配置", "请选择 Python 解释器并填写要预编译的包")
+            return
+        cache, python = self.prebuilt_cache(), self.python_path
+        options = build_env.module_options(self.build_command() or [])
+
+        def task(log, progress, should_stop):
+            return cache.build_missing(python, packages, options, log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, lambda result: self.refresh_prebuilt_modules(), self.prebuilt_build_btn):
+            self.log_message(f"▶ 正在预编译 {', '.join(packages)}")
+
+    def delete_prebuilt_modules(self):
+        """删除所选的预编译模块"""
+        cache = self.prebuilt_cache()
+        for row in sorted({index.row() for index in self.prebuilt_table.selectedIndexes()}):
+            cache.remove(self.prebuilt_table.item(row, 0).data(Qt.UserRole))
+        self.refresh_prebuilt_modules()
+
+    def add_prebuilt_module_steps(self, command, after_build, info):
+        """不再跟踪进入预编译包，并在构建后将其模块复制到应用旁"""
+        if "--onefile" in command or "--module" in command:
+            self.log_message("ℹ️ 预编译模块仅用于 standalone 和加速模式构建")
+            return command
+        if info is None:
+            return command
+        if isinstance(info, Exception):
+            self.log_message(f"⚠️ 未使用预编译模块: {str(info)}")
+            return command
+        packages = list(info["packages"])
+        cache = self.prebuilt_cache()
+        ready = {package: meta for package, meta in cache.lookup(info, packages, build_env.module_options(command)).items()
+                 if meta}
+        for package in packages:
+            if package not in ready:
+                self.log_message(f"⚠️ 当前配置下没有预编译的 {package} 模块，将随应用一起编译")
+        if not ready:
+            return command
+
+        # 这些包导入的模块 Nuitka 不再能看到，需要显式包含
+        imports = sorted({name for meta in ready.values() for name in meta["imports"] if name.split(".")[0] not in ready})
+        extra = [f"--nofollow-import-to={package}" for package in ready] + [f"--include-module={name}" for name in imports]
+        command = command[:-1] + extra + command[-1:]
+        modules = [cache.module_path(meta) for meta in ready.values()]
+        main_file, output_dir, standalone = self.main_file, self.output_dir, "--standalone" in command
+
+        def install(log, success):
+            if not success:
+                return None
+            target = perf_tools.find_dist_dir(output_dir, main_file) if standalone else output_dir
+            if not target:
+                log("❌ 找不到用于安装预编译模块的输出目录")
+                return False
+            build_env.transfer_files([(path, os.path.join(target, os.path.basename(path))) for path in modules],
+                                     log=log, stage="已安装预编译模块")
+            return None
+
+        after_build.append(install)
+        self.build_extra["prebuilt_modules"] = {package: meta["version"] for package, meta in ready.items()}
+        self.log_message(f"🧱 使用预编译模块: {', '.join(ready)}")
+        return command
+
+    def save_preflight_settings(self):
+        """持久化预检设置"""
+        self.settings.setValue("preflight", self.preflight_check.isChecked())
+        self.settings.setValue("preflight_timeout", self.preflight_timeout_spin.value())
+
+    def add_preflight_steps(self, command, before_build):
+        """在Nuitka启动前检查将要构建的源码"""
+        python, main_file = command[0], command[-1]
+        timeout = self.preflight_timeout_spin.value()
+        before_build.append(lambda log: preflight.run_preflight(python, main_file, timeout, log))
+
+    def save_compiler_setting(self):
+        """持久化所选C编译器"""
+        self.settings.setValue("c_compiler", self.compiler_combo.currentData())
+
+    def detect_compilers(self):
+        """检测已安装的C工具链并列出其版本"""
+        toolchains = perf_tools.detect_compilers()
+        self.compiler_table.setRowCount(len(toolchains))
+        for row, toolchain in enumerate(toolchains):
+            name_item = QTableWidgetItem(toolchain["name"])
+            if toolchain["name"] in perf_tools.COMPILERS:
+                name_item.setFlags(name_item.flags() | Qt.ItemIsUserCheckable)
+                name_item.setCheckState(Qt.Checked)
+            self.compiler_table.setItem(row, 0, name_item)
+            self.compiler_table.setItem(row, 1, QTableWidgetItem(toolchain["path"]))
+            self.compiler_table.setItem(row, 2, QTableWidgetItem(toolchain["version"]))
+        names = ", ".join(t["name"] for t in toolchains) or "无"
+        self.log_message(f"🔧 检测到的工具链: {names}")
+
+    def compare_compilers(self):
+        """分别使用勾选的编译器构建项目并比较结果"""
+        if not self.python_path or not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择Python解释器、主文件和输出目录")
+            return
+
+        compilers = []
+        for row in range(self.compiler_table.rowCount()):
+            item = self.compiler_table.item(row, 0)
+            if item.text() in perf_tools.COMPILERS and item.checkState() == Qt.Checked:
+                compilers.append(item.text())
+        if len(compilers) < 2:
+            QMessageBox.warning(self, "缺少配置", "请先检测工具链并至少勾选两个编译器进行对比")
+            return
+
+        base_command = self.command_edit.toPlainText().split()
+        main_file = self.main_file
+        work_dir = os.path.join(self.output_dir, "compiler-ab")
+        startup_args = self.compiler_args_input.text().split()
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_compiler_comparison(
+                base_command, main_file, work_dir, compilers, startup_args=startup_args,
+                log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_compiler_comparison, self.compare_compilers_btn):
+            self.log_message(f"▶ 正在对比编译器: {', '.join(compilers)}")
+
+    def show_compiler_comparison(self, results):
+        """显示编译器A/B对比结果"""
+        self.compiler_result_table.setRowCount(len(results))
+
+        def fmt(value, scale, digits):
+            return "-" if value is None else f"{value / scale:.{digits}f}"
+
+        for row, result in enumerate(results):
+            cells = [
+                result["compiler"] if result["ok"] else f"{result['compiler']} (失败)",
+                fmt(result["build_s"], 1, 1),
+                fmt(result["size_bytes"], 1024 * 1024, 1),
+                fmt(result["startup_ms"], 1, 0),
+            ]
+            for column, text in enumerate(cells):
+                self.compiler_result_table.setItem(row, column, QTableWidgetItem(text))
+
+        built = [r for r in results if r["ok"]]
+        if built:
+            fastest = min(built, key=lambda r: r["build_s"])
+            self.log_message(f"✅ 编译器对比完成，构建最快: {fastest['compiler']} "
+                             f"({fastest['build_s']:.1f} 秒)")
+
+    def record_build(self, success):
+        """将完成的构建保存到项目构建历史"""
+        if not self.build_started or not self.main_file:
+            return
+        duration = time.time() - self.build_started
+        self.build_started = None
+        try:
+            entry = project_store.add_build(self.main_file, self.build_command_args, success, duration,
+                                            output_dir=self.output_dir, profile=self.build_profile,
+                                            **self.build_extra)
+            self.last_build_id = entry["id"]
+            self.log_message(f"⏱ 构建耗时 {duration:.1f} 秒 (记录为 {entry['id']})")
+            self.refresh_profile_stats()
+            self.refresh_manifest_builds()
+        except OSError as e:
+            self.log_message(f"⚠️ 记录构建历史失败: {str(e)}")
+
+    def run_runtime_benchmark(self):
+        """分别以解释方式和编译方式运行负载并进行比较"""
+        if not self.python_path or not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择Python解释器、主文件和输出目录")
+            return
+
+        python = self.python_path
+        main_file = self.main_file
+        output_dir = self.output_dir
+        workload = self.benchmark_workload_input.text().strip()
+        mode = self.benchmark_mode_combo.currentData()
+        runs = self.benchmark_runs_spin.value()
+        warmup = self.benchmark_warmup_spin.value()
+        ops_per_run = self.benchmark_ops_spin.value()
+
+        def task(log, progress, should_stop):
+            return perf_tools.run_runtime_benchmark(
+                python, main_file, output_dir, workload, mode=mode, runs=runs, warmup=warmup,
+                ops_per_run=ops_per_run, log=log, progress=progress, should_stop=should_stop)
+
+        if self.start_tool_task(task, self.show_benchmark_result, self.benchmark_run_btn):
+            self.log_message(f"▶ 正在进行基准测试 ({runs} 次运行，{warmup} 次预热)...")
+
+    def show_benchmark_result(self, result):
+        """显示基准测试结果并将其保存到最近一次构建"""
+        for row, (key, _) in enumerate(self.benchmark_metrics):
+            for column, side in enumerate(("interpreted", "compiled")):
+                value = result[side][key]
+                text = "-" if value is None else (str(value) if key == "runs" else f"{value:.2f}")
+                self.benchmark_table.setItem(row, column, QTableWidgetItem(text))
+        self.benchmark_speedup_label.setText(f"加速比: {result['speedup']:.2f}x (中位延迟)")
+        self.log_message(f"✅ 基准测试完成，编译版速度为解释器的 {result['speedup']:.2f} 倍")
+
+        try:
+            if project_store.attach_result(self.main_file, "benchmarks", result) is None:
+                self.log_message("ℹ️ 没有可关联的构建记录，结果未保存")
+        except OSError as e:
+            self.log_message(f"⚠️ 保存基准测试结果失败: {str(e)}")
+        self.refresh_benchmark_history()
+
+    def refresh_benchmark_history(self):
+        """显示本项目所有构建已保存的基准测试结果"""
+        if not self.main_file:
+            return
+        rows = []
+        for entry in project_store.load_history(self.main_file):
+            for result in entry.get("benchmarks", []):
+                rows.append((entry, result))
+
+        self.benchmark_history_table.setRowCount(len(rows))
+        for row, (entry, result) in enumerate(reversed(rows)):
+            cells = [
+                entry["id"],
+                " ".join(entry.get("options", [])),
+                result["workload"] or "-",
+                f"{result['interpreted']['p50_ms']:.2f}",
+                f"{result['compiled']['p50_ms']:.2f}",
+                f"{result['speedup']:.2f}x",
+            ]
+            for column, text in enumerate(cells):
+                self.benchmark_history_table.setItem(row, column, QTableWidgetItem(text))
+
+    def apply_tempdir_preset(self, index):
+        """根据预设和元数据字段填写临时目录规则"""
+        _, base = data_tools.ONEFILE_CACHE_PRESETS[self.onefile_preset_combo.itemData(index)]
+        company = self.company_input.text().strip()
+        product = self.product_input.text().strip()
+        version = self.product_version_input.text().strip() or self.file_version_input.text().strip()
+        if base and not (company and product and version):
+            QMessageBox.warning(self, "缺少元数据",
+                                "请在元数据选项卡中填写公司名称、产品名称和版本号，使每个版本解压到独立的缓存目录")
+            return
+        spec = data_tools.cached_tempdir_spec(base, company, product, version)
+        self.onefile_tempdir_input.setText(spec)
+        self.log_message(f"单文件临时目录: {spec or '每次启动时解压'}")
+
+    def find_stale_caches(self):
+        """列出不再使用的解压目录"""
+        spec = self.onefile_tempdir_input.text().strip()
+        if self.start_tool_task(lambda log, progress, should_stop: data_tools.find_stale_caches(spec),
+                                self.show_stale_caches, self.stale_caches_btn):
+            self.log_message("▶ 正在查找过期的单文件解压目录...")
+
+    def show_stale_caches(self, stale):
+        """显示过期的解压目录"""
+        self.stale_caches_table.setRowCount(len(stale))
+        for row, entry in enumerate(stale):
+            cells = [entry["path"], f"{entry['size'] / 1024 / 1024:.1f}", f"{entry['age_days']:.1f}", entry["reason"]]
+            for column, text in enumerate(cells):
+                self.stale_caches_table.setItem(row, column, QTableWidgetItem(text))
+        total = sum(entry["size"] for entry in stale)
+        self.log_message(f"🗂 找到 {len(stale)} 个过期解压目录 ({total / 1024 / 1024:.1f} MB)")
+
+    def prune_stale_caches(self):
+        """删除所选的过期解压目录"""
+        rows = sorted({index.row() for index in self.stale_caches_table.selectedIndexes()})
+        paths = [self.stale_caches_table.item(row, 0).text() for row in rows]
+        if not paths:
+            return
+        msg_box = QMessageBox(QMessageBox.Question, "清理缓存",
+                              f"删除 {len(paths)} 个解压目录?", QMessageBox.Yes | QMessageBox.No, self)
+        msg_box.setStyleSheet(self.get_messagebox_style())
+        if msg_box.exec() != QMessageBox.Yes:
+            return
+        freed = data_tools.prune_caches(paths, log=self.log_message)
+        self.log_message(f"✅ 已释放 {freed / 1024 / 1024:.1f} MB")
+        for row in reversed(rows):
+            self.stale_caches_table.removeRow(row)
+
+    def measure_launch_times(self):
+        """测量最近一次单文件构建的冷启动和热启动"""
+        if not self.main_file or not self.output_dir:
+            QMessageBox.warning(self, "缺少配置", "请选择主文件和输出目录")
+            return
+        binary = perf_tools.find_built_binary(self.output_dir, self.main_file)
+        if not binary:
+            QMessageBox.warning(self, "缺少构建", "输出目录中未找到已构建的可执行文件")
+            return
+        build = project_store.latest_build(self.main_file)
+        spec = build.get("onefile_tempdir_spec", "") if build else self.onefile_tempdir_input.text().strip()
+        build_id = build["id"] if build else None
+        args = self.launch_args_input.text().split()
+        runs = self.launch_runs_spin.value()
+        main_file = self.main_file
+
+        def task(log, progress, should_stop):
+            result = data_tools.measure_cold_warm(binary, spec, args, runs)
+            if result:
+                project_store.attach_result(main_file, "launch_benchmarks", result, build_id=build_id)
+            return result
+
+        if self.start_tool_task(task, self.show_launch_times, self.launch_measure_btn):
+            self.log_message(f"▶ 正在测量 {binary} 的冷启动和热启动")
+
+    def show_launch_times(self, result):
+        """报告启动测量结果并刷新历史"""
+        if not result:
+            self.log_message("❌ 可执行文件未在超时时间内结束或以错误退出")
+            return
+        self.log_message(f"✅ 启动: 冷启动 {result['cold_ms']:.0f} ms，热启动 {result['warm_ms']:.0f} ms "
+                         f"({'已缓存' if result['cached'] else '每次启动解压'})")
+        if result["cached"] and not result.get("cleared"):
+            self.log_message("⚠️ 缓存目录不是 公司/产品/版本 形式，未被清空，冷启动可能使用了已有缓存")
+        self.refresh_launch_history()
+
+    def refresh_launch_history(self):
+        """显示本项目所有构建的冷/热启动测量结果"""
+        if not self.main_file:
+            return
+        rows = []
+        for entry in project_store.load_history(self.main_file):
+            for result in entry.get("launch_benchmarks", []):
+                rows.append((entry, result))
+
+        self.launch_history_table.setRowCount(len(rows))
+        for row, (entry, result) in enumerate(reversed(rows)):
+            cells = [
+                entry["id"],
+                result["spec"] or "(每次启动)",
+                f"{result['cold_ms']:.0f}",
+                f"{result['warm_ms']:.0f}",
+            ]
+            for column, text in enumerate(cells):
+                self.launch_history_table.setItem(row, column, QTableWidgetItem(text))
+
     def closeEvent(self, event):
         """处理窗口关闭事件"""
         if self.package_thread and self.package_thread.isRunning():
@@ -1809,6 +4534,8 @@ class NuitkaPackager(QMainWindow):
 
             if reply == QMessageBox.Yes:
                 self.package_thread.stop()
+                # 在程序退出前让线程清理临时空间
+                self.package_thread.wait()
                 event.accept()
             else:
                 event.ignore()
@@ -0,0 +1,745 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import shlex
+import shutil
+import tempfile
+import fnmatch
+import itertools
+import subprocess
+import statistics
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Hide console windows of helper processes on Windows (no-op elsewhere)
+NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Options the tuner knows how to toggle: key -> (command-line flag, label)
+TUNABLE_OPTIONS = {
+    "lto": ("--lto", "LTO"),
+    "onefile_no_compression": ("--onefile-no-compression", "No onefile compression"),
+    "no_site": ("--python-flag=no_site", "no_site"),
+    "static_hashes": ("--python-flag=static_hashes", "static_hashes"),
+    "no_docstrings": ("--python-flag=no_docstrings", "no_docstrings"),
+    "no_asserts": ("--python-flag=no_asserts", "no_asserts"),
+}
+
+
+def option_name(arg):
+    """Return the option part of a command argument (e.g. --output-dir)"""
+    return arg.split("=", 1)[0]
+
+
+def remove_options(command, names):
+    """Return a copy of command without any argument whose option name is in names"""
+    names = set(names)
+    return [arg for arg in command if arg not in names and option_name(arg) not in names]
+
+
+def set_option(command, name, value=None):
+    """Return a copy of command with option name set (or replaced), placed before the main file"""
+    command = remove_options(command, [name])
+    arg = name if value is None else f"{name}={value}"
+    return command[:-1] + [arg] + command[-1:]
+
+
+def get_option(command, name, default=None):
+    """Return the value of the last --name=value argument in command"""
+    value = default
+    for arg in command:
+        if arg == name:
+            value = True
+        elif arg.startswith(name + "="):
+            value = arg.split("=", 1)[1]
+    return value
+
+
+def find_built_binary(output_dir, main_file):
+    """Locate the executable Nuitka produced for main_file inside output_dir"""
+    stem = os.path.splitext(os.path.basename(main_file))[0]
+    names = [stem + ".exe", stem + ".bin", stem]
+    candidates = []
+    for name in names:
+        candidates.append(os.path.join(output_dir, name))
+    for name in names:
+        candidates.append(os.path.join(output_dir, stem + ".dist", name))
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def find_dist_dir(output_dir, main_file):
+    """Return the .dist folder of a standalone build, or None"""
+    stem = os.path.splitext(os.path.basename(main_file))[0]
+    path = os.path.join(output_dir, stem + ".dist")
+    return path if os.path.isdir(path) else None
+
+
+def path_size(path):
+    """Total size in bytes of a file or directory tree"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def artifact_size(binary):
+    """Size of what gets shipped: the .dist folder for standalone builds, else the binary"""
+    parent = os.path.dirname(binary)
+    if parent.endswith(".dist"):
+        return path_size(parent)
+    return os.path.getsize(binary)
+
+
+def measure_startup(binary, args=None, runs=5, warmup=1, timeout=30, env=None):
+    """Run binary repeatedly and return startup statistics in milliseconds
+
+    Returns None if a run times out or exits with a nonzero code, a crash is not a fast start.
+    """
+    samples = []
+    for i in range(warmup + runs):
+        start = time.perf_counter()
+        try:
+            proc = subprocess.run(
+                [binary] + list(args or []),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=timeout,
+                env=env,
+                cwd=os.path.dirname(binary),
+                creationflags=NO_WINDOW
+            )
+        except subprocess.TimeoutExpired:
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            return None
+        if i >= warmup:
+            samples.append(elapsed)
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.mean(samples),
+    }
+
+
+def option_combinations(keys, max_combinations=None):
+    """Yield option sets to try, from the baseline (nothing enabled) upwards"""
+    count = 0
+    for size in range(len(keys) + 1):
+        for combo in itertools.combinations(keys, size):
+            if max_combinations and count >= max_combinations:
+                return
+            count += 1
+            yield combo
+
+
+def variant_label(combo):
+    """Human readable description of an option set"""
+    if not combo:
+        return "baseline"
+    return " + ".join(TUNABLE_OPTIONS[key][1] for key in combo)
+
+
+def variant_command(base_command, combo, output_dir, jobs):
+    """Derive the build command for one tuner variant from the current command"""
+    flags = [flag for flag, _ in TUNABLE_OPTIONS.values()]
+    command = remove_options(base_command, flags + ["--disable-ccache", "--output-dir", "--jobs"])
+    for key in combo:
+        command = set_option(command, TUNABLE_OPTIONS[key][0])
+    command = set_option(command, "--output-dir", output_dir)
+    command = set_option(command, "--jobs", jobs)
+    command = set_option(command, "--remove-output")
+    if "--assume-yes-for-downloads" not in command:
+        command = set_option(command, "--assume-yes-for-downloads")
+    return command
+
+
+def pareto_front(rows, keys):
+    """Return indices of rows not dominated on keys (all minimised, None is worst)"""
+    def value(row, key):
+        v = row.get(key)
+        return float("inf") if v is None else v
+
+    front = []
+    for i, row in enumerate(rows):
+        dominated = False
+        for j, other in enumerate(rows):
+            if i == j:
+                continue
+            not_worse = all(value(other, k) <= value(row, k) for k in keys)
+            better = any(value(other, k) < value(row, k) for k in keys)
+            if not_worse and better:
+                dominated = True
+                break
+        if not dominated:
+            front.append(i)
+    return front
+
+
+def build_and_measure(command, main_file, out_dir, env=None, log=print, tag=""):
+    """Run a build into a fresh out_dir and return its build time and artifact size"""
+    shutil.rmtree(out_dir, ignore_errors=True)
+    start = time.perf_counter()
+    proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, encoding="utf-8", errors="replace", env=env,
+                          creationflags=NO_WINDOW)
+    row = {"build_s": time.perf_counter() - start, "size_bytes": None, "startup_ms": None,
+           "ok": proc.returncode == 0}
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stdout.splitlines()[-5:])
+        log(f"{tag} build failed ({proc.returncode}):\n{tail}")
+        return row
+    binary = find_built_binary(out_dir, main_file)
+    if not binary:
+        log(f"{tag} build finished but no binary was found in {out_dir}")
+        row["ok"] = False
+        return row
+    row["binary"] = binary
+    row["size_bytes"] = artifact_size(binary)
+    return row
+
+
+def run_tuner(base_command, main_file, work_dir, keys, parallel=2, max_combinations=None,
+              startup_args=None, startup_runs=5, log=print, progress=None, should_stop=None):
+    """Build every option combination in parallel and benchmark the resulting binaries"""
+    combos = list(option_combinations(keys, max_combinations))
+    parallel = max(1, min(parallel, len(combos)))
+    jobs = max(1, (os.cpu_count() or 1) // parallel)
+    results = []
+
+    def build(index, combo):
+        if should_stop and should_stop():
+            return None
+        out_dir = os.path.join(work_dir, f"variant_{index:03d}")
+        command = variant_command(base_command, combo, out_dir, jobs)
+        log(f"[{index}] building {variant_label(combo)}")
+        row = build_and_measure(command, main_file, out_dir, log=log, tag=f"[{index}]")
+        row.update({"index": index, "combo": list(combo), "label": variant_label(combo)})
+        return row
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        futures = [pool.submit(build, i, combo) for i, combo in enumerate(combos)]
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            if row is not None:
+                results.append(row)
+            if progress:
+                progress(int(done * 80 / len(combos)))
+
+    # Benchmark sequentially so concurrent builds don't skew startup numbers
+    for done, row in enumerate(results, 1):
+        if should_stop and should_stop():
+            break
+        if row["ok"]:
+            stats = measure_startup(row["binary"], startup_args, runs=startup_runs)
+            row["startup_ms"] = stats["median_ms"] if stats else None
+            if stats is None:
+                log(f"[{row['index']}] startup benchmark failed: the app timed out or exited with an error "
+                    f"(does it exit on its own with code 0?)")
+        if progress:
+            progress(80 + int(done * 20 / max(1, len(results))))
+
+    results.sort(key=lambda r: r["index"])
+    ok_rows = [r for r in results if r["ok"]]
+    front = pareto_front(ok_rows, ["size_bytes", "startup_ms", "build_s"])
+    for i, row in enumerate(ok_rows):
+        row["pareto"] = i in front
+    return results
+
+
+# Script executed by the interpreter to time an entry function in-process
+FUNCTION_HARNESS = r"""
+import sys, json, time, importlib, importlib.machinery
+paths, module, function, runs, warmup, compiled = json.loads(sys.argv[1])
+sys.path[:0] = paths
+imported = importlib.import_module(module)
+extension = str(getattr(imported, "__file__", "")).endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+if extension != compiled:
+    expected = "a compiled extension module" if compiled else "its source file"
+    sys.exit(f"{module} was imported from {getattr(imported, '__file__', None)}, not from {expected}")
+func = getattr(imported, function)
+samples = []
+for i in range(warmup + runs):
+    start = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) * 1000
+    if i >= warmup:
+        samples.append(elapsed)
+print("BENCHMARK_SAMPLES=" + json.dumps(samples))
+"""
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return None
+    index = min(len(sorted_samples), max(1, math.ceil(fraction * len(sorted_samples)))) - 1
+    return sorted_samples[index]
+
+
+def latency_stats(samples, ops_per_run=1):
+    """Summarise latency samples (ms) into a distribution and throughput"""
+    ordered = sorted(samples)
+    mean = statistics.mean(ordered)
+    return {
+        "runs": len(ordered),
+        "min_ms": ordered[0],
+        "p50_ms": statistics.median(ordered),
+        "p90_ms": percentile(ordered, 0.90),
+        "p99_ms": percentile(ordered, 0.99),
+        "max_ms": ordered[-1],
+        "mean_ms": mean,
+        "stdev_ms": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "throughput_per_s": ops_per_run * 1000 / mean if mean else None,
+    }
+
+
+def time_command(argv, runs=10, warmup=2, timeout=300, cwd=None, log=None, should_stop=None):
+    """Run argv repeatedly and return wall-clock latencies in milliseconds"""
+    samples = []
+    for i in range(warmup + runs):
+        if should_stop and should_stop():
+            break
+        start = time.perf_counter()
+        try:
+            proc = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                  timeout=timeout, cwd=cwd, creationflags=NO_WINDOW)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"{os.path.basename(argv[0])} did not finish within {timeout}s")
+        elapsed = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            error = proc.stderr.decode("utf-8", "replace").strip().splitlines()[-1:] or [""]
+            raise RuntimeError(f"{os.path.basename(argv[0])} exited with {proc.returncode}: {error[0]}")
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def time_function(python, module, function, paths, runs=10, warmup=2, timeout=300, cwd=None, compiled=False):
+    """Time module.function() in-process under python, with paths prepended to sys.path
+
+    With compiled, fails unless the module is imported from an extension module, without it
+    fails if it is.
+    """
+    spec = json.dumps([paths, module, function, runs, warmup, compiled])
+    try:
+        proc = subprocess.run([python, "-c", FUNCTION_HARNESS, spec], stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace",
+                              timeout=timeout, cwd=cwd, creationflags=NO_WINDOW)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"{module}.{function} did not finish within {timeout}s")
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCHMARK_SAMPLES="):
+            return json.loads(line.split("=", 1)[1])
+    error = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+    raise RuntimeError(f"{module}.{function} failed: {error[0]}")
+
+
+def find_compiled_module(output_dir, main_file):
+    """Locate the extension module produced by a --module build"""
+    stem = os.path.splitext(os.path.basename(main_file))[0]
+    try:
+        names = os.listdir(output_dir)
+    except OSError:
+        return None
+    for name in names:
+        if name.split(".", 1)[0] == stem and name.endswith((".pyd", ".so")):
+            return os.path.join(output_dir, name)
+    return None
+
+
+def run_runtime_benchmark(python, main_file, output_dir, workload, mode="command", runs=10,
+                          warmup=2, ops_per_run=1, log=print, progress=None, should_stop=None):
+    """Benchmark a workload interpreted versus compiled and return both distributions"""
+    source_dir = os.path.dirname(os.path.abspath(main_file))
+    if mode == "function":
+        module, _, function = workload.partition(":")
+        if not function:
+            raise ValueError("Entry function must be given as module:function")
+        # The extension module would shadow the source in the interpreted run
+        if os.path.normcase(os.path.realpath(output_dir)) == os.path.normcase(os.path.realpath(source_dir)):
+            raise ValueError("Function benchmarks need an output directory other than the main file's folder")
+        compiled_module = find_compiled_module(output_dir, main_file)
+        if not compiled_module:
+            raise RuntimeError("Function benchmarks need a --module build of the main file in the output directory")
+        # Only the main file is compiled, any other module would be timed interpreted twice
+        stem = os.path.splitext(os.path.basename(main_file))[0]
+        if module != stem:
+            raise ValueError(f"Only the compiled main module can be benchmarked, use {stem}:{function}")
+        log(f"Timing {workload} under the interpreter...")
+        interpreted = time_function(python, module, function, [source_dir], runs, warmup, cwd=source_dir)
+        if progress:
+            progress(50)
+        log(f"Timing {workload} from {os.path.basename(compiled_module)}...")
+        compiled = time_function(python, module, function, [output_dir, source_dir], runs, warmup,
+                                 cwd=source_dir, compiled=True)
+    else:
+        binary = find_built_binary(output_dir, main_file)
+        if not binary:
+            raise RuntimeError(f"No built binary found in {output_dir}")
+        args = workload.split()
+        log(f"Timing interpreter: {os.path.basename(main_file)} {workload}")
+        interpreted = time_command([python, main_file] + args, runs, warmup, cwd=source_dir,
+                                   should_stop=should_stop)
+        if progress:
+            progress(50)
+        log(f"Timing binary: {os.path.basename(binary)} {workload}")
+        compiled = time_command([binary] + args, runs, warmup, cwd=os.path.dirname(binary),
+                                should_stop=should_stop)
+    if progress:
+        progress(100)
+    if not interpreted or not compiled:
+        raise RuntimeError("Benchmark was stopped before collecting samples")
+
+    result = {
+        "time": time.time(),
+        "mode": mode,
+        "workload": workload,
+        "warmup": warmup,
+        "interpreted": latency_stats(interpreted, ops_per_run),
+        "compiled": latency_stats(compiled, ops_per_run),
+    }
+    result["speedup"] = result["interpreted"]["p50_ms"] / result["compiled"]["p50_ms"]
+    return result
+
+
+# C compilers Nuitka can be pointed at: executable to look for, Nuitka flags, and whether CC is set
+COMPILERS = {
+    "gcc": {"executable": "gcc", "args": [], "set_cc": True, "platforms": ("linux", "darwin")},
+    "clang": {"executable": "clang", "args": ["--clang"], "set_cc": True, "platforms": ("linux", "darwin", "win")},
+    "mingw64": {"executable": "gcc", "args": ["--mingw64"], "set_cc": False, "platforms": ("win",)},
+    "msvc": {"executable": "cl", "args": ["--msvc=latest"], "set_cc": False, "platforms": ("win",)},
+}
+COMPILER_FLAGS = ["--clang", "--mingw64", "--msvc"]
+
+
+def current_platform():
+    if sys.platform.startswith("win"):
+        return "win"
+    return "darwin" if sys.platform == "darwin" else "linux"
+
+
+def platform_compilers():
+    """Names of the compilers that make sense on this platform"""
+    return [name for name, info in COMPILERS.items() if current_platform() in info["platforms"]]
+
+
+def tool_version(path):
+    """First line of a tool's version output"""
+    # cl prints its banner on stderr and has no --version switch
+    args = [path] if os.path.basename(path).lower().startswith("cl") else [path, "--version"]
+    try:
+        proc = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                              encoding="utf-8", errors="replace", timeout=10, creationflags=NO_WINDOW)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    lines = [line.strip() for line in proc.stdout.splitlines() if line.strip()]
+    return lines[0] if lines else ""
+
+
+def detect_compilers():
+    """Installed C toolchains (and ccache) with their path and version"""
+    found = []
+    for name in platform_compilers():
+        path = shutil.which(COMPILERS[name]["executable"])
+        if path:
+            found.append({"name": name, "path": path, "version": tool_version(path)})
+    ccache = shutil.which("ccache")
+    if ccache:
+        found.append({"name": "ccache", "path": ccache, "version": tool_version(ccache)})
+    return found
+
+
+def compiler_command(command, name):
+    """Return command with the Nuitka compiler selection flags for name (None keeps Nuitka's choice)"""
+    command = remove_options(command, COMPILER_FLAGS)
+    if name in COMPILERS:
+        for arg in COMPILERS[name]["args"]:
+            command = command[:-1] + [arg] + command[-1:]
+    return command
+
+
+def compiler_env(name, base_env=None):
+    """Environment for building with compiler name, setting CC where Nuitka honours it"""
+    env = dict(os.environ if base_env is None else base_env)
+    info = COMPILERS.get(name)
+    if info and info["set_cc"]:
+        path = shutil.which(info["executable"])
+        if path:
+            env["CC"] = path
+    elif name in COMPILERS:
+        env.pop("CC", None)
+    return env
+
+
+def run_compiler_comparison(base_command, main_file, work_dir, compilers, startup_args=None,
+                            startup_runs=5, log=print, progress=None, should_stop=None):
+    """Build the project once per compiler and compare build time, size and startup latency"""
+    results = []
+    base_command = remove_options(base_command, ["--output-dir", "--disable-ccache"])
+    for index, name in enumerate(compilers):
+        if should_stop and should_stop():
+            break
+        out_dir = os.path.join(work_dir, name)
+        command = set_option(compiler_command(base_command, name), "--output-dir", out_dir)
+        if "--assume-yes-for-downloads" not in command:
+            command = set_option(command, "--assume-yes-for-downloads")
+        log(f"[{name}] building...")
+        row = build_and_measure(command, main_file, out_dir, env=compiler_env(name), log=log, tag=f"[{name}]")
+        row["compiler"] = name
+        if row["ok"]:
+            stats = measure_startup(row["binary"], startup_args, runs=startup_runs)
+            row["startup_ms"] = stats["median_ms"] if stats else None
+            log(f"[{name}] built in {row['build_s']:.1f}s")
+            if stats is None:
+                log(f"[{name}] startup benchmark failed: the app timed out or exited with an error")
+        results.append(row)
+        if progress:
+            progress(int((index + 1) * 100 / len(compilers)))
+    return results
+
+
+# Output kept per smoke test for the log and the build history
+SMOKE_OUTPUT_TAIL = 2000
+SMOKE_TEST_DEFAULTS = {"name": "launch", "args": "", "timeout": 30, "exit_code": 0, "pattern": ""}
+
+
+def isolated_env(home):
+    """Environment pointing home, temp and app data folders at home"""
+    env = dict(os.environ)
+    for name in ("HOME", "USERPROFILE", "TMP", "TEMP", "TMPDIR", "APPDATA", "LOCALAPPDATA",
+                 "XDG_CONFIG_HOME", "XDG_CACHE_HOME", "XDG_DATA_HOME"):
+        env[name] = home
+    return env
+
+
+def smoke_test_error(test):
+    """Why a smoke test can't run (malformed arguments or output pattern), or None"""
+    try:
+        shlex.split(test.get("args") or "", posix=not sys.platform.startswith("win"))
+    except ValueError as e:
+        return f"invalid arguments: {e}"
+    try:
+        re.compile(test.get("pattern") or "", re.MULTILINE)
+    except re.error as e:
+        return f"invalid pattern: {e}"
+    return None
+
+
+def run_smoke_test(binary, test):
+    """Run one smoke test in a fresh temporary folder and check exit code and output"""
+    test = dict(SMOKE_TEST_DEFAULTS, **test)
+    result = {"name": test["name"], "status": "passed", "exit_code": None, "reason": "", "output": ""}
+    error = smoke_test_error(test)
+    if error:
+        result.update(status="error", reason=error, seconds=0.0)
+        return result
+    args = shlex.split(test["args"], posix=not sys.platform.startswith("win"))
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="nuitka-smoke-") as home:
+        try:
+            proc = subprocess.run([binary] + args, cwd=home, env=isolated_env(home), stdin=subprocess.DEVNULL,
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=test["timeout"],
+                                  creationflags=NO_WINDOW)
+        except subprocess.TimeoutExpired as e:
+            result.update(status="timeout", reason=f"no exit within {test['timeout']:g}s")
+            output = e.output or b""
+        except OSError as e:
+            result.update(status="error", reason=str(e))
+            output = b""
+        else:
+            output = proc.stdout
+            result["exit_code"] = proc.returncode
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    text = output.decode("utf-8", "replace")
+    result["output"] = text[-SMOKE_OUTPUT_TAIL:]
+    if result["status"] == "passed":
+        if result["exit_code"] != test["exit_code"]:
+            result.update(status="failed", reason=f"exit code {result['exit_code']}, expected {test['exit_code']}")
+        elif test["pattern"] and not re.search(test["pattern"], text, re.MULTILINE):
+            result.update(status="failed", reason=f"output doesn't match {test['pattern']!r}")
+    return result
+
+
+def run_smoke_tests(binary, tests, workers=None, log=print, should_stop=lambda: False):
+    """Run smoke tests against a built binary concurrently, returns (all passed, results)"""
+    results = []
+    with ThreadPoolExecutor(max_workers=workers or max(1, min(len(tests), os.cpu_count() or 1))) as pool:
+        futures = [pool.submit(run_smoke_test, binary, test) for test in tests if not should_stop()]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            icon = "✅" if result["status"] == "passed" else "❌"
+            log(f"{icon} Smoke test {result['name']}: {result['status']} in {result['seconds']:.1f}s"
+                + (f" ({result['reason']})" if result["reason"] else ""))
+            if result["status"] != "passed" and result["output"].strip():
+                log("   " + "\n   ".join(result["output"].strip().splitlines()[-10:]))
+    order = [test.get("name") for test in tests]
+    results.sort(key=lambda result: order.index(result["name"]) if result["name"] in order else len(order))
+    return all(result["status"] == "passed" for result in results) and bool(results), results
+
+
+# One line of -X importtime output: self us, cumulative us, two spaces of indent per nesting level
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s+)(\S+)")
+# find_spec origins and stdlib membership of top-level packages
+IMPORT_ORIGIN_SCRIPT = r"""
+import sys, json, importlib.util
+sys.path.insert(0, sys.argv[1])
+origins = {}
+for name in sys.argv[2:]:
+    try:
+        spec = importlib.util.find_spec(name)
+    except Exception:
+        spec = None
+    origins[name] = [getattr(spec, "origin", None), name in getattr(sys, "stdlib_module_names", ())]
+print(json.dumps(origins))
+"""
+EXTENSION_SUFFIXES = (".so", ".pyd", ".dylib")
+
+
+def parse_import_times(text):
+    """Import tree from -X importtime output, children are printed before their parent"""
+    pending = {}
+    for line in text.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match.group(3)) - 1) // 2
+        node = {"name": match.group(4), "self_us": int(match.group(1)), "cumulative_us": int(match.group(2)),
+                "children": pending.pop(depth + 1, [])}
+        pending.setdefault(depth, []).append(node)
+    # Imports still running when the program was stopped leave their children without a parent
+    return [node for depth in sorted(pending) for node in pending[depth]]
+
+
+def import_chain(node, min_fraction=0.1):
+    """Heaviest path below node while a child still costs a noticeable share of it"""
+    chain = [(node["name"], node["cumulative_us"] / 1000)]
+    while node["children"]:
+        child = max(node["children"], key=lambda item: item["cumulative_us"])
+        if child["cumulative_us"] < chain[0][1] * 1000 * min_fraction:
+            break
+        chain.append((child["name"], child["cumulative_us"] / 1000))
+        node = child
+    return chain
+
+
+def import_package_stats(roots):
+    """Self and cumulative import cost per top-level package"""
+    packages = {}
+
+    def walk(node, parent_package):
+        package = node["name"].split(".")[0]
+        stats = packages.setdefault(package, {"package": package, "self_ms": 0.0, "cumulative_ms": 0.0,
+                                              "modules": 0})
+        stats["self_ms"] += node["self_us"] / 1000
+        stats["modules"] += 1
+        # Only the outermost import of a package counts towards its cumulative cost
+        if package != parent_package:
+            stats["cumulative_ms"] += node["cumulative_us"] / 1000
+        for child in node["children"]:
+            walk(child, package)
+
+    for root in roots:
+        walk(root, None)
+    return sorted(packages.values(), key=lambda stats: stats["cumulative_ms"], reverse=True)
+
+
+def option_values(command, name):
+    """All comma separated values of a repeatable option"""
+    values = []
+    for arg in command:
+        if arg.startswith(name + "="):
+            values.extend(value.strip() for value in arg.split("=", 1)[1].split(",") if value.strip())
+    return values
+
+
+def matches_module(name, patterns):
+    return any(fnmatch.fnmatch(name, pattern) or name.startswith(pattern + ".") for pattern in patterns)
+
+
+def package_build_status(python, main_file, packages, command):
+    """Whether each package is compiled, excluded or left to the interpreter by the command"""
+    try:
+        proc = subprocess.run([python, "-c", IMPORT_ORIGIN_SCRIPT, os.path.dirname(os.path.abspath(main_file))]
+                              + list(packages), capture_output=True, text=True, timeout=60,
+                              creationflags=NO_WINDOW)
+        origins = json.loads(proc.stdout)
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        origins = {}
+    standalone = "--standalone" in command or "--onefile" in command
+    follow_all = standalone or "--follow-imports" in command
+    follow_stdlib = standalone or "--follow-stdlib" in command
+    excluded = option_values(command, "--nofollow-import-to")
+    followed = option_values(command, "--follow-import-to") + option_values(command, "--include-package")
+
+    status = {}
+    for package in packages:
+        origin, stdlib = origins.get(package, [None, False])
+        if matches_module(package, excluded):
+            status[package] = "excluded"
+        elif origin in ("built-in", "frozen"):
+            status[package] = "built-in"
+        elif origin and origin.endswith(EXTENSION_SUFFIXES):
+            status[package] = "extension module"
+        elif stdlib and not follow_stdlib:
+            status[package] = "interpreter (stdlib)"
+        elif follow_all or matches_module(package, followed):
+            status[package] = "compiled"
+        else:
+            status[package] = "not followed"
+    return status
+
+
+def profile_imports(python, main_file, command, binary=None, args=None, duration=15, log=print,
+                    should_stop=lambda: False):
+    """Trace import times of the built binary, or of main_file in the interpreter when binary is None
+
+    GUI programs are stopped after duration seconds, by then the imports before the first window are done.
+    """
+    if binary:
+        argv = [binary] + list(args or [])
+        cwd = os.path.dirname(binary)
+    else:
+        argv = [python, "-X", "importtime", main_file] + list(args or [])
+        cwd = os.path.dirname(os.path.abspath(main_file))
+    env = dict(os.environ, PYTHONPROFILEIMPORTTIME="1")
+    log(f"Tracing imports of {os.path.basename(argv[0] if binary else main_file)} for up to {duration}s...")
+    proc = subprocess.Popen(argv, cwd=cwd, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, creationflags=NO_WINDOW)
+    deadline = time.monotonic() + duration
+    while True:
+        try:
+            _, stderr = proc.communicate(timeout=0.5)
+            break
+        except subprocess.TimeoutExpired:
+            # communicate keeps what was read so far, so polling loses no output
+            if should_stop() or time.monotonic() > deadline:
+                proc.kill()
+                _, stderr = proc.communicate()
+                break
+    roots = parse_import_times(stderr.decode("utf-8", "replace"))
+    if not roots:
+        raise RuntimeError("No import times were reported" + (
+            ", the binary may have been built to ignore PYTHON* environment variables; "
+            "profile in the interpreter instead" if binary else ""))
+
+    packages = import_package_stats(roots)
+    status = package_build_status(python, main_file, [stats["package"] for stats in packages], command)
+    for stats in packages:
+        stats["status"] = status.get(stats["package"], "unknown")
+    chains = [import_chain(root) for root in sorted(roots, key=lambda node: node["cumulative_us"], reverse=True)[:10]]
+    total_ms = sum(root["cumulative_us"] for root in roots) / 1000
+    log(f"Imports took {total_ms:.0f} ms over {sum(stats['modules'] for stats in packages)} modules")
+    return {"mode": "binary" if binary else "interpreter", "total_ms": total_ms, "packages": packages,
+            "chains": chains}
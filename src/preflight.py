@@ -0,0 +1,303 @@
+import os
+import re
+import ast
+import glob
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from perf_tools import NO_WINDOW
+
+# Byte-compiles the files listed on stdin with the build interpreter, printing [path, line, message] errors
+COMPILE_SCRIPT = r"""
+import sys, json
+errors = []
+for path in json.load(sys.stdin):
+    try:
+        with open(path, "rb") as f:
+            compile(f.read(), path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        errors.append([e.filename or path, e.lineno or 0, f"{type(e).__name__}: {e.msg}"])
+    except (ValueError, OSError) as e:
+        errors.append([path, 0, f"{type(e).__name__}: {e}"])
+print(json.dumps(errors))
+"""
+
+TRACEBACK_FILE = re.compile(r'^\s*File "(.+)", line (\d+)')
+
+
+def module_file(root, dotted):
+    """Source file of the project module dotted under root, or None"""
+    base = os.path.join(root, *dotted.split("."))
+    for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def package_parts(root, path):
+    """Dotted package name of the folder containing path, relative to root"""
+    rel = os.path.relpath(os.path.dirname(path), root)
+    return [] if rel == os.curdir else rel.split(os.sep)
+
+
+def imported_modules(root, path, tree):
+    """Project modules imported by the parsed file at path"""
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package_parts(root, path)
+                parts = parts[:max(0, len(parts) - node.level + 1)]
+                base = ".".join(parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            if base:
+                names.append(base)
+            # "from pkg import name" may import the submodule pkg.name
+            names.extend(f"{base}.{alias.name}" if base else alias.name for alias in node.names)
+    modules = []
+    for name in names:
+        parts = name.split(".")
+        # Parent packages are imported too
+        for i in range(1, len(parts) + 1):
+            found = module_file(root, ".".join(parts[:i]))
+            if found:
+                modules.append(found)
+    return modules
+
+
+def reachable_sources(main_file):
+    """Project source files reachable from main_file through imports"""
+    root = os.path.dirname(os.path.abspath(main_file))
+    pending = [os.path.abspath(main_file)]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            with open(path, "rb") as f:
+                tree = ast.parse(f.read(), path)
+        except (SyntaxError, ValueError, OSError):
+            continue  # Reported by the compile check
+        pending.extend(m for m in imported_modules(root, path, tree) if m not in seen)
+    return sorted(seen)
+
+
+def compile_sources(python, paths, workers=None, timeout=120):
+    """Byte-compile paths with the build interpreter in parallel processes, returns errors"""
+    if not paths:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    chunks = [paths[i::workers] for i in range(workers)]
+
+    def run(chunk):
+        try:
+            result = subprocess.run([python, "-c", COMPILE_SCRIPT], input=json.dumps(chunk),
+                                    capture_output=True, text=True, timeout=timeout,
+                                    creationflags=NO_WINDOW)
+        except subprocess.TimeoutExpired:
+            return [["<interpreter>", 0, f"Byte-compiling did not finish within {timeout}s"]]
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return [["<interpreter>", 0, lines[-1] if lines else f"exit code {result.returncode}"]]
+        return json.loads(result.stdout)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        errors = [error for chunk_errors in pool.map(run, chunks) for error in chunk_errors]
+    return sorted(errors)
+
+
+def import_check(python, main_file, timeout=30):
+    """Import the entry module without running it as __main__
+
+    The entry file's top-level code runs, only its if __name__ == "__main__" block is skipped.
+    Returns (ok, errors, timed_out); ok is None if the import timed out, errors are
+    [path, line, message] from the traceback.
+    """
+    path = os.path.abspath(main_file)
+    root = os.path.dirname(path)
+    # run_path also works for file names that aren't identifiers, such as my-app.py
+    code = f"import sys, runpy; sys.path.insert(0, {root!r}); runpy.run_path({path!r}, run_name='preflight')"
+    try:
+        result = subprocess.run([python, "-c", code], cwd=root, capture_output=True, text=True,
+                                encoding="utf-8", errors="replace", timeout=timeout,
+                                creationflags=NO_WINDOW)
+    except subprocess.TimeoutExpired:
+        return None, [], True
+    if result.returncode == 0:
+        return True, [], False
+
+    lines = result.stderr.strip().splitlines()
+    message = lines[-1] if lines else f"exit code {result.returncode}"
+    location = ["<import>", 0]
+    for line in lines:
+        match = TRACEBACK_FILE.match(line)
+        if match and not match.group(1).startswith("<"):
+            location = [match.group(1), int(match.group(2))]
+    return False, [location + [message]], False
+
+
+def format_errors(errors):
+    return [f"{path}:{line}: {message}" if line else f"{path}: {message}" for path, line, message in errors]
+
+
+def run_preflight(python, main_file, import_timeout=30, log=print):
+    """Compile and import-check the project before a build, returns False if it would fail
+
+    An import that times out is reported as unverified and doesn't stop the build.
+    """
+    sources = reachable_sources(main_file)
+    log(f"🔎 Preflight: byte-compiling {len(sources)} project sources")
+    errors = compile_sources(python, sources)
+    if errors:
+        for line in format_errors(errors):
+            log(f"❌ {line}")
+        return False
+
+    ok, errors, timed_out = import_check(python, main_file, timeout=import_timeout)
+    if timed_out:
+        log(f"⚠️ Preflight: sources compile, but importing the entry module did not finish within "
+            f"{import_timeout}s, its imports were not verified")
+        return True
+    if not ok:
+        for line in format_errors(errors):
+            log(f"❌ {line}")
+        return False
+    log("🔎 Preflight passed")
+    return True
+
+
+# Seconds to wait for a single path check before assuming an unresponsive (network) path
+PATH_CHECK_TIMEOUT = 5
+
+# Reports which of the module names on stdin the build interpreter can't find
+MODULE_CHECK_SCRIPT = r"""
+import sys, json, importlib.util
+sys.path.insert(0, sys.argv[1])
+missing = []
+for name in json.load(sys.stdin):
+    try:
+        found = importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        found = False
+    if not found:
+        missing.append(name)
+print(json.dumps(missing))
+"""
+
+# Leading bytes of the icon formats Nuitka accepts
+ICON_MAGIC = {
+    ".ico": b"\x00\x00\x01\x00",
+    ".png": b"\x89PNG",
+    ".icns": b"icns",
+}
+ICON_OPTIONS = ("--windows-icon-from-ico", "--linux-icon", "--macos-app-icon")
+MODULE_OPTIONS = ("--include-module", "--include-package", "--include-package-data")
+
+
+def problem(level, option, message):
+    return {"level": level, "option": option, "message": message}
+
+
+def check_icon(option, path):
+    if not os.path.isfile(path):
+        return [problem("error", option, f"Icon file not found: {path}")]
+    magic = ICON_MAGIC.get(os.path.splitext(path)[1].lower())
+    if magic:
+        with open(path, "rb") as f:
+            if not f.read(len(magic)) == magic:
+                return [problem("error", option, f"Not a valid {os.path.splitext(path)[1]} file: {path}")]
+    return []
+
+
+def check_dir(option, path):
+    if not os.path.isdir(path):
+        return [problem("error", option, f"Directory not found: {path}")]
+    if not os.listdir(path):
+        return [problem("warning", option, f"Directory is empty: {path}")]
+    return []
+
+
+def check_files(option, pattern):
+    if glob.has_magic(pattern):
+        if not glob.glob(pattern, recursive=True):
+            return [problem("error", option, f"Pattern matches no files: {pattern}")]
+        return []
+    if not os.path.isfile(pattern):
+        return [problem("error", option, f"File not found: {pattern}")]
+    return []
+
+
+def check_modules(python, names, search_dir, timeout=30):
+    """Report module names the build interpreter can't import"""
+    try:
+        result = subprocess.run([python, "-c", MODULE_CHECK_SCRIPT, search_dir], input=json.dumps(names),
+                                capture_output=True, text=True, timeout=timeout, creationflags=NO_WINDOW)
+        missing = json.loads(result.stdout)
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        return [problem("warning", "--include-module", f"Could not check modules: {e}")]
+    return [problem("error", "--include-module", f"Module not found by {python}: {name}") for name in missing]
+
+
+def command_checks(command):
+    """Path checks (callable, target) and module names referenced by command"""
+    checks, modules = [], []
+    main_file = command[-1] if command else ""
+    for arg in command[1:-1]:
+        name, _, value = arg.partition("=")
+        if not value:
+            continue
+        if name in ICON_OPTIONS:
+            for path in value.split(","):
+                checks.append((lambda o=name, p=path: check_icon(o, p), path))
+        elif name == "--include-data-dir":
+            source = value.split("=", 1)[0]
+            checks.append((lambda o=name, p=source: check_dir(o, p), source))
+        elif name == "--include-raw-dir":
+            checks.append((lambda o=name, p=value: check_dir(o, p), value))
+        elif name == "--include-data-files":
+            source = value.split("=", 1)[0]
+            checks.append((lambda o=name, p=source: check_files(o, p), source))
+        elif name in MODULE_OPTIONS:
+            modules.append(value.split(":", 1)[0])
+
+    checks.append((lambda: [] if os.path.isfile(main_file)
+                   else [problem("error", "main file", f"Main file not found: {main_file}")], main_file))
+    return checks, sorted(set(modules))
+
+
+def validate_command(command, python=None, timeout=PATH_CHECK_TIMEOUT, module_timeout=30):
+    """Check all paths, globs and modules of command concurrently, returns the problems found
+
+    Each path check gets timeout seconds, the module check module_timeout seconds. Runs for up to
+    module_timeout seconds, so call it off the GUI thread.
+    """
+    checks, modules = command_checks(command)
+    # One worker per check, so every check starts right away and gets the whole timeout
+    pool = ThreadPoolExecutor(max_workers=len(checks) + 1)
+    module_future = None
+    if modules and python:
+        search_dir = os.path.dirname(os.path.abspath(command[-1]))
+        module_future = pool.submit(check_modules, python, modules, search_dir, module_timeout)
+
+    problems = []
+    futures = {pool.submit(check): target for check, target in checks}
+    done, pending = wait(futures, timeout=timeout)
+    for future in done:
+        try:
+            problems.extend(future.result())
+        except OSError as e:
+            problems.append(problem("error", futures[future], str(e)))
+    for future in pending:
+        problems.append(problem("warning", futures[future],
+                                f"No response within {timeout}s (unreachable network path?)"))
+    if module_future:
+        problems.extend(module_future.result())
+    # Don't wait for checks stuck on an unresponsive path
+    pool.shutdown(wait=False, cancel_futures=True)
+    return sorted(problems, key=lambda p: (p["level"] != "error", p["option"], p["message"]))
@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import statistics
+
+# Per-project state lives next to the main file so it travels with the project
+STATE_DIR_NAME = ".nuitka-packager"
+HISTORY_FILE = "history.json"
+MAX_HISTORY = 200
+
+# Options whose value is a path and therefore not part of a build's configuration
+PATH_OPTIONS = (
+    "--output-dir", "--windows-icon-from-ico", "--include-data-dir", "--include-data-files",
+    "--include-raw-dir", "--onefile-tempdir-spec",
+)
+
+
+def project_dir(main_file):
+    """Directory containing the main file"""
+    return os.path.dirname(os.path.abspath(main_file))
+
+
+def state_dir(main_file, create=True):
+    """Return the packager state directory for the project of main_file"""
+    path = os.path.join(project_dir(main_file), STATE_DIR_NAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def read_json(path, default):
+    """Read a JSON file, returning default when it is missing or unreadable"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    """Atomically write data as JSON"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def build_options(command):
+    """Configuration-relevant options of a build command (flags without paths)"""
+    return [arg for arg in command
+            if arg.startswith("--") and arg.split("=", 1)[0] not in PATH_OPTIONS]
+
+
+def load_history(main_file):
+    """Return the list of recorded builds, oldest first"""
+    return read_json(os.path.join(state_dir(main_file), HISTORY_FILE), [])
+
+
+def save_history(main_file, history):
+    """Persist the build history, keeping only the most recent entries"""
+    write_json(os.path.join(state_dir(main_file), HISTORY_FILE), history[-MAX_HISTORY:])
+
+
+def add_build(main_file, command, success, duration_s, **fields):
+    """Record a finished build and return the stored entry"""
+    history = load_history(main_file)
+    entry = {
+        "id": time.strftime("%Y%m%d-%H%M%S"),
+        "finished": time.time(),
+        "success": success,
+        "duration_s": round(duration_s, 2),
+        "options": build_options(command),
+    }
+    entry.update(fields)
+    # Keep ids unique when two builds finish within the same second
+    existing = {item.get("id") for item in history}
+    base_id, n = entry["id"], 1
+    while entry["id"] in existing:
+        n += 1
+        entry["id"] = f"{base_id}-{n}"
+    history.append(entry)
+    save_history(main_file, history)
+    return entry
+
+
+def update_build(main_file, build_id, **fields):
+    """Merge fields into the recorded build with build_id"""
+    history = load_history(main_file)
+    for entry in history:
+        if entry.get("id") == build_id:
+            entry.update(fields)
+            save_history(main_file, history)
+            return entry
+    return None
+
+
+def latest_build(main_file, success_only=True):
+    """Most recent recorded build, optionally only successful ones"""
+    for entry in reversed(load_history(main_file)):
+        if entry.get("success") or not success_only:
+            return entry
+    return None
+
+
+def attach_result(main_file, key, result, build_id=None):
+    """Append a result (benchmark, report...) to a build entry's list under key"""
+    history = load_history(main_file)
+    target = None
+    for entry in reversed(history):
+        if (build_id and entry.get("id") == build_id) or (not build_id and entry.get("success")):
+            target = entry
+            break
+    if target is None:
+        return None
+    target.setdefault(key, []).append(result)
+    save_history(main_file, history)
+    return target
+
+
+# Checkboxes a build profile may set, by widget name without the "_check" suffix
+PROFILE_CHECKS = (
+    "onefile", "standalone", "remove_output", "lto", "disable_ccache", "deployment",
+    "onefile_no_compression", "follow_stdlib", "debug", "unstripped",
+)
+PROFILES_FILE = "profiles.json"
+SMOKE_TESTS_FILE = "smoke_tests.json"
+
+# Built-in profiles; a project may override them by saving a profile with the same name
+BUILTIN_PROFILES = {
+    "dev-fast": {
+        "checks": {"lto": False, "onefile": False, "standalone": True, "remove_output": False,
+                   "disable_ccache": False, "deployment": False, "onefile_no_compression": False},
+        "jobs": "max",
+    },
+    "release": {
+        "checks": {"lto": True, "onefile": True, "standalone": True, "remove_output": True,
+                   "deployment": True, "debug": False, "unstripped": False},
+        "jobs": None,
+    },
+}
+
+
+def load_profiles(main_file=None):
+    """Return all build profiles: built-ins overlaid with the project's own"""
+    profiles = {name: dict(profile) for name, profile in BUILTIN_PROFILES.items()}
+    if main_file:
+        profiles.update(read_json(os.path.join(state_dir(main_file), PROFILES_FILE), {}))
+    return profiles
+
+
+def save_profile(main_file, name, profile):
+    """Store a named profile in the project"""
+    path = os.path.join(state_dir(main_file), PROFILES_FILE)
+    profiles = read_json(path, {})
+    profiles[name] = profile
+    write_json(path, profiles)
+
+
+def load_smoke_tests(main_file):
+    """Smoke tests configured for the project"""
+    return read_json(os.path.join(state_dir(main_file, create=False), SMOKE_TESTS_FILE), [])
+
+
+def save_smoke_tests(main_file, tests):
+    write_json(os.path.join(state_dir(main_file), SMOKE_TESTS_FILE), tests)
+
+
+def profile_jobs(profile):
+    """Number of parallel C compile jobs a profile asks for, or None for Nuitka's default"""
+    jobs = (profile or {}).get("jobs")
+    if jobs == "max":
+        return os.cpu_count() or 1
+    return int(jobs) if jobs else None
+
+
+def profile_build_stats(history):
+    """Build time statistics grouped by profile"""
+    grouped = {}
+    for entry in history:
+        grouped.setdefault(entry.get("profile") or "", []).append(entry)
+    stats = []
+    for name, entries in sorted(grouped.items()):
+        times = [e["duration_s"] for e in entries if e.get("success")]
+        stats.append({
+            "profile": name,
+            "builds": len(entries),
+            "successful": len(times),
+            "mean_s": sum(times) / len(times) if times else None,
+            "median_s": statistics.median(times) if times else None,
+            "last_s": entries[-1]["duration_s"],
+        })
+    return stats
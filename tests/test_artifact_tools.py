@@ -0,0 +1,160 @@
+import os
+import tarfile
+import time
+import zipfile
+
+import zstandard
+
+import artifact_tools
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def make_dist(root, files):
+    dist = os.path.join(root, "app.dist")
+    for rel, data in files.items():
+        write(os.path.join(dist, *rel.split("/")), data)
+    return dist
+
+
+def test_manifest_round_trip(tmp_path):
+    dist = make_dist(str(tmp_path), {"app.bin": b"main", "lib/a.so": b"a" * 100})
+    manifest = artifact_tools.build_manifest(dist, log=lambda message: None)
+    path = artifact_tools.save_manifest(str(tmp_path / "main.py"), manifest, "build-1")
+
+    loaded = artifact_tools.load_manifest(path)
+    assert loaded == manifest
+    assert loaded["files"]["lib/a.so"][0] == 100
+    assert loaded["total_bytes"] == 104
+    assert artifact_tools.verify_manifest(dist, loaded, log=lambda message: None)["ok"]
+
+    write(os.path.join(dist, "lib", "a.so"), b"b" * 100)
+    result = artifact_tools.verify_manifest(dist, loaded, log=lambda message: None)
+    assert result["changed"] == ["lib/a.so"] and not result["ok"]
+
+
+def test_manifest_records_symlinks(tmp_path):
+    dist = make_dist(str(tmp_path), {"lib/libfoo.so.1": b"foo"})
+    os.symlink("libfoo.so.1", os.path.join(dist, "lib", "libfoo.so"))
+    manifest = artifact_tools.build_manifest(dist, log=lambda message: None)
+    assert manifest["links"] == {"lib/libfoo.so": "libfoo.so.1"}
+    assert list(manifest["files"]) == ["lib/libfoo.so.1"]
+
+    os.remove(os.path.join(dist, "lib", "libfoo.so"))
+    os.symlink("missing.so", os.path.join(dist, "lib", "libfoo.so"))
+    result = artifact_tools.verify_manifest(dist, manifest, log=lambda message: None)
+    assert result["changed"] == ["lib/libfoo.so"]
+
+
+def test_exports_keep_symlinks(tmp_path):
+    dist = make_dist(str(tmp_path), {"lib/libfoo.so.1": b"foo"})
+    os.symlink("libfoo.so.1", os.path.join(dist, "lib", "libfoo.so"))
+
+    tar_result = artifact_tools.export_archive(dist, str(tmp_path / "out"), "tar.zst", log=lambda message: None)
+    with open(tar_result["path"], "rb") as f:
+        with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                members = {member.name: member for member in tar}
+    assert members["app.dist/lib/libfoo.so"].issym()
+    assert members["app.dist/lib/libfoo.so"].linkname == "libfoo.so.1"
+
+    zip_result = artifact_tools.export_archive(dist, str(tmp_path / "out"), "zip", log=lambda message: None)
+    with zipfile.ZipFile(zip_result["path"]) as archive:
+        info = archive.getinfo("app.dist/lib/libfoo.so")
+        assert info.external_attr >> 16 & 0o170000 == 0o120000
+        assert archive.read(info) == b"libfoo.so.1"
+
+
+def test_sync_recreates_symlinks(tmp_path):
+    dist = make_dist(str(tmp_path), {"lib/libfoo.so.1": b"foo", "lib/libfoo.so.2": b"foo2"})
+    os.symlink("libfoo.so.1", os.path.join(dist, "lib", "libfoo.so"))
+    deploy = str(tmp_path / "deploy")
+    link = os.path.join(deploy, "app.dist", "lib", "libfoo.so")
+
+    def sync():
+        manifest = artifact_tools.build_manifest(dist, log=lambda message: None)
+        artifact_tools.sync_artifact(dist, deploy, manifest, log=lambda message: None)
+
+    sync()
+    assert os.readlink(link) == "libfoo.so.1"
+    # Both slots get the retargeted link
+    os.remove(os.path.join(dist, "lib", "libfoo.so"))
+    os.symlink("libfoo.so.2", os.path.join(dist, "lib", "libfoo.so"))
+    for _ in range(2):
+        sync()
+        assert os.readlink(link) == "libfoo.so.2"
+        with open(link, "rb") as f:
+            assert f.read() == b"foo2"
+
+
+def test_garbage_collection_keeps_objects_being_written(tmp_path):
+    store = str(tmp_path / "store")
+    dist = make_dist(str(tmp_path), {"app.bin": b"main"})
+    manifest = artifact_tools.build_manifest(dist, log=lambda message: None)
+    artifact_tools.ingest_artifact(dist, manifest, store, log=lambda message: None)
+
+    bucket = os.path.join(store, "objects", "ab")
+    write(os.path.join(bucket, "cdef"), b"unused")
+    write(os.path.join(bucket, "cdef2.1234.tmp"), b"still copying")
+    write(os.path.join(bucket, "cdef3.1234.tmp"), b"left by a crash")
+    old = time.time() - artifact_tools.STORE_TEMP_GRACE - 60
+    os.utime(os.path.join(bucket, "cdef3.1234.tmp"), (old, old))
+
+    result = artifact_tools.collect_garbage(store, log=lambda message: None)
+    assert sorted(os.listdir(bucket)) == ["cdef2.1234.tmp"]
+    assert result["removed_objects"] == 2 and result["objects"] == 1
+    with open(os.path.join(dist, "app.bin"), "rb") as f:
+        assert f.read() == b"main"
+
+
+def test_delta_round_trip(tmp_path):
+    old_files = {"app.bin": b"version 1" * 1000, "lib/gone.so": b"removed", "data/keep.txt": b"same"}
+    old_dist = make_dist(str(tmp_path / "old"), old_files)
+    new_dist = make_dist(str(tmp_path / "new"), {
+        "app.bin": b"version 2" * 1000, "lib/new.so": b"added", "data/keep.txt": b"same"})
+    old = artifact_tools.build_manifest(old_dist, log=lambda message: None)
+    new = artifact_tools.build_manifest(new_dist, log=lambda message: None)
+    package = str(tmp_path / "app.delta.tar")
+    made = artifact_tools.make_delta(old_dist, old, new_dist, new, package, level=3, log=lambda message: None)
+    assert (made["added"], made["patched"], made["removed"], made["unchanged"]) == (1, 1, 1, 1)
+
+    installed = make_dist(str(tmp_path / "installed"), old_files)
+    result = artifact_tools.apply_delta(package, installed, log=lambda message: None)
+    assert result["ok"] and result["written"] == 2 and result["removed"] == 1
+    applied = artifact_tools.build_manifest(installed, log=lambda message: None)
+    assert applied["files"] == new["files"]
+    assert not os.path.exists(os.path.join(installed, ".delta-staging"))
+
+
+def test_delta_refuses_a_modified_install(tmp_path):
+    old_dist = make_dist(str(tmp_path / "old"), {"app.bin": b"1"})
+    new_dist = make_dist(str(tmp_path / "new"), {"app.bin": b"2"})
+    old = artifact_tools.build_manifest(old_dist, log=lambda message: None)
+    new = artifact_tools.build_manifest(new_dist, log=lambda message: None)
+    package = str(tmp_path / "app.delta.tar")
+    artifact_tools.make_delta(old_dist, old, new_dist, new, package, level=3, log=lambda message: None)
+
+    installed = make_dist(str(tmp_path / "installed"), {"app.bin": b"3"})
+    result = artifact_tools.apply_delta(package, installed, log=lambda message: None)
+    assert not result["ok"] and result["mismatched"] == ["app.bin"]
+    with open(os.path.join(installed, "app.bin"), "rb") as f:
+        assert f.read() == b"3"
+
+
+def test_delta_keeps_relative_target_folder(tmp_path, monkeypatch):
+    old_dist = make_dist(str(tmp_path / "old"), {"sub/gone.so": b"removed"})
+    new_dist = str(tmp_path / "new" / "app.dist")
+    os.makedirs(new_dist)
+    old = artifact_tools.build_manifest(old_dist, log=lambda message: None)
+    new = artifact_tools.build_manifest(new_dist, log=lambda message: None)
+    package = str(tmp_path / "app.delta.tar")
+    artifact_tools.make_delta(old_dist, old, new_dist, new, package, level=3, log=lambda message: None)
+
+    make_dist(str(tmp_path / "installed"), {"sub/gone.so": b"removed"})
+    monkeypatch.chdir(tmp_path / "installed")
+    assert artifact_tools.apply_delta(package, "app.dist", log=lambda message: None)["ok"]
+    assert os.listdir("app.dist") == []
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+import data_tools
+
+
+def matches(pattern, path, cross_dirs=True):
+    return data_tools.compile_patterns([pattern], cross_dirs).search(path) is not None
+
+
+def test_negated_class_matches_n_and_backslash():
+    assert matches("data/[!x].txt", "data/n.txt")
+    assert matches("data/[!x].txt", "data/\\.txt")
+    assert not matches("data/[!x].txt", "data/x.txt")
+
+
+def test_negated_class_never_spans_lines():
+    assert data_tools.compile_patterns(["a[!x]b"]).search("a\nb") is None
+
+
+def test_class_keeps_literal_caret():
+    assert matches("[^a].py", "^.py")
+    assert not matches("[^a].py", "b.py")
+
+
+def test_star_stays_in_its_folder_unless_crossing():
+    assert matches("assets/*.png", "assets/icons/a.png")
+    assert not matches("assets/*.png", "assets/icons/a.png", cross_dirs=False)
+    assert matches("assets/**/*.png", "assets/icons/a.png", cross_dirs=False)
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def entries(tmp_path, files):
+    return [(write(tmp_path / source, data), target, len(data)) for source, target, data in files]
+
+
+def test_duplicates_grouped_by_content(tmp_path):
+    big = b"x" * (data_tools.HEAD_BYTES + 10)
+    files = entries(tmp_path, [
+        ("a/logo.png", "assets/logo.png", b"logo"),
+        ("b/logo.png", "images/logo.png", b"logo"),
+        ("a/other.png", "assets/other.png", b"LOGO"),
+        ("a/big.bin", "assets/big.bin", big),
+        ("b/big.bin", "copy/big.bin", big),
+        ("a/tail.bin", "assets/tail.bin", big[:-1] + b"y"),
+    ])
+    duplicates = data_tools.find_duplicate_files(files, log=lambda message: None)
+    assert [[target for _, target in d["files"]] for d in duplicates] == [
+        ["assets/big.bin", "copy/big.bin"], ["assets/logo.png", "images/logo.png"]]
+    assert duplicates[0]["wasted"] == len(big)
+
+
+def test_same_source_included_twice_is_a_duplicate(tmp_path):
+    source = write(tmp_path / "data" / "a.txt", b"text")
+    files = [(source, "data/a.txt", 4), (source, "more/a.txt", 4)]
+    duplicates = data_tools.find_duplicate_files(files, log=lambda message: None)
+    assert len(duplicates) == 1 and duplicates[0]["wasted"] == 4
+
+
+def test_nested_data_dir_suggestion(tmp_path):
+    suggestions = data_tools.duplicate_suggestions([], ["assets", "assets/icons=icons"], str(tmp_path))
+    assert suggestions[0]["exclude"] == ["assets/icons/*"]
+
+
+def test_payload_benchmark_ratios(tmp_path):
+    dist = tmp_path / "app.dist"
+    write(dist / "text.txt", b"hello world " * 20000)
+    write(dist / "lib" / "random.bin", os.urandom(50000))
+    result = data_tools.benchmark_onefile_payload(str(dist), levels=(1, 19), read_mb_s=100,
+                                                  log=lambda message: None)
+    assert result["raw_bytes"] == 12 * 20000 + 50000
+    none, fast, small = result["settings"]
+    assert none["payload_bytes"] == result["raw_bytes"] and none["decompress_ms"] == 0
+    assert none["extract_ms"] == pytest.approx(result["raw_bytes"] / (100 * 1024 * 1024) * 1000)
+    # Repeated text shrinks, random bytes don't, so the payload ends up a bit above the random part
+    for setting in (fast, small):
+        assert 50000 < setting["payload_bytes"] < result["raw_bytes"] / 4
+        assert setting["extract_ms"] >= setting["decompress_ms"]
+    assert result["smallest"] is min(fast, small, key=lambda setting: setting["payload_bytes"])
+
+    files = {entry["path"]: entry for entry in result["files"]}
+    assert files["text.txt"]["compressed"] < files["text.txt"]["size"] / 100
+    assert files["lib/random.bin"]["compressed"] >= files["lib/random.bin"]["size"]
+    assert [entry["path"] for entry in result["files"]] == ["text.txt", "lib/random.bin"]
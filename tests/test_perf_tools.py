@@ -0,0 +1,68 @@
+import sys
+import importlib.machinery
+
+import pytest
+
+import perf_tools
+
+
+def test_startup_fails_on_nonzero_exit():
+    assert perf_tools.measure_startup(sys.executable, ["-c", "raise SystemExit(3)"], runs=1, warmup=0) is None
+    stats = perf_tools.measure_startup(sys.executable, ["-c", "pass"], runs=2, warmup=0)
+    assert stats["min_ms"] <= stats["median_ms"]
+
+
+def test_function_benchmark_rejects_output_in_source_dir(tmp_path):
+    main_file = tmp_path / "app.py"
+    main_file.write_text("def run():\n    pass\n")
+    with pytest.raises(ValueError, match="output directory"):
+        perf_tools.run_runtime_benchmark(sys.executable, str(main_file), str(tmp_path), "app:run", mode="function")
+
+
+@pytest.mark.skipif(not getattr(__import__("_json"), "__file__", "").endswith(
+    tuple(importlib.machinery.EXTENSION_SUFFIXES)), reason="_json is built into this interpreter")
+def test_interpreted_timing_refuses_an_extension_module():
+    with pytest.raises(RuntimeError, match="its source file"):
+        perf_tools.time_function(sys.executable, "_json", "make_scanner", [], runs=1, warmup=0)
+
+
+def test_pareto_front_keeps_undominated_rows():
+    rows = [
+        {"size_bytes": 10, "startup_ms": 50, "build_s": 5},
+        {"size_bytes": 20, "startup_ms": 30, "build_s": 5},
+        {"size_bytes": 20, "startup_ms": 60, "build_s": 6},
+        {"size_bytes": 10, "startup_ms": 50, "build_s": 5},
+        {"size_bytes": 5, "startup_ms": None, "build_s": 1},
+        {"size_bytes": 5, "startup_ms": None, "build_s": 2},
+    ]
+    # Equal rows don't dominate each other, a missing value is the worst one
+    assert perf_tools.pareto_front(rows, ["size_bytes", "startup_ms", "build_s"]) == [0, 1, 3, 4]
+    assert perf_tools.pareto_front(rows, ["size_bytes"]) == [4, 5]
+    assert perf_tools.pareto_front([], ["size_bytes"]) == []
+
+
+IMPORT_TIMES = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       300 |        300 |     pkg.sub
+import time:       200 |        500 |   pkg
+import time:        50 |        650 | app
+import time:        20 |         20 | late
+not an import time line
+import time:        10 |         10 |     orphan
+"""
+
+
+def test_parse_import_times_builds_the_tree():
+    roots = perf_tools.parse_import_times(IMPORT_TIMES)
+    app = roots[0]
+    assert (app["name"], app["self_us"], app["cumulative_us"]) == ("app", 50, 650)
+    assert [child["name"] for child in app["children"]] == ["_io", "pkg"]
+    assert [child["name"] for child in app["children"][1]["children"]] == ["pkg.sub"]
+    # An import interrupted by the stop leaves its finished children as roots
+    assert [root["name"] for root in roots] == ["app", "late", "orphan"]
+
+    assert perf_tools.import_chain(app) == [("app", 0.65), ("pkg", 0.5), ("pkg.sub", 0.3)]
+    stats = {entry["package"]: entry for entry in perf_tools.import_package_stats(roots)}
+    assert stats["pkg"]["modules"] == 2
+    assert stats["pkg"]["cumulative_ms"] == 0.5 and stats["pkg"]["self_ms"] == 0.5
@@ -0,0 +1,29 @@
+import sys
+
+import preflight
+
+
+def run(tmp_path, source, timeout=30):
+    main_file = tmp_path / "app.py"
+    main_file.write_text(source)
+    messages = []
+    ok = preflight.run_preflight(sys.executable, str(main_file), timeout, messages.append)
+    return ok, messages
+
+
+def test_import_error_fails_preflight(tmp_path):
+    ok, messages = run(tmp_path, "import missing_module_for_preflight\n")
+    assert not ok
+    assert any("missing_module_for_preflight" in message for message in messages)
+
+
+def test_main_block_is_not_run(tmp_path):
+    ok, messages = run(tmp_path, "if __name__ == '__main__':\n    raise SystemExit(1)\n")
+    assert ok and messages[-1] == "🔎 Preflight passed"
+
+
+def test_import_timeout_is_not_reported_as_passed(tmp_path):
+    ok, messages = run(tmp_path, "import time\ntime.sleep(30)\n", timeout=1)
+    assert ok
+    assert not any("passed" in message for message in messages)
+    assert "not verified" in messages[-1]